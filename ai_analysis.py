@@ -0,0 +1,649 @@
+# ============================================================
+# AI 분석 프롬프트 / 응답 캐시 (Streamlit 비의존)
+# 대시보드의 AI 분석 탭과 헤드리스 리포트 작업(report_job.py)이 같은 프롬프트를 만들고,
+# 같은 프롬프트의 Gemini 응답은 로컬 파일 캐시에서 재사용
+# ============================================================
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from analytics import CORRELATION_MODES
+
+GEMINI_MODEL = 'gemini-2.0-flash-exp'
+ANALYSIS_TYPES = ["종합분석", "유동성분석", "달러분석", "신용분석", "트레이딩전략"]
+RESPONSE_TTL = 24 * 3600    # 같은 프롬프트의 응답을 재사용하는 기간 (초)
+
+
+def scenario_section(scenario):
+    """시나리오 시뮬레이션 요약을 프롬프트 뒤에 붙일 섹션 (없으면 빈 문자열)"""
+    if not scenario:
+        return ""
+    return f"""
+## 유동성 충격 시나리오 시뮬레이션 (사용자 설정)
+{scenario}
+
+위 시나리오가 실현될 경우의 영향도 분석에 반영해주세요.
+"""
+
+
+def standard_prompt(analysis_type, data_summary, correlations, signals, scenario=None):
+    """
+    일반 분석 프롬프트
+    scenario: 유동성 충격 시나리오 요약 (ScenarioResult.to_prompt) - 있으면 프롬프트에 추가
+    """
+    prompts = {
+        "종합분석": f"""
+당신은 20년 경력의 거시경제 및 퀀트 투자 전문가입니다.
+
+## 현재 시장 데이터
+{data_summary}
+
+## 주요 상관관계
+{correlations}
+
+## 현재 시그널
+{signals}
+
+다음을 **명확하고 간결하게** 분석해주세요:
+
+1. **현재 거시경제 상황 요약** (3-4문장)
+2. **주요 리스크 요인** (2-3가지)
+3. **투자 전략 제안** (구체적인 자산별 추천)
+4. **주의사항** (1-2가지)
+
+전문가답게, 하지만 일반 투자자도 이해할 수 있게 작성해주세요.
+""",
+        
+        "유동성분석": f"""
+당신은 연준(Fed) 정책 및 유동성 전문가입니다.
+
+## Net Liquidity 데이터
+{data_summary}
+
+## 상관관계
+{correlations}
+
+다음을 분석해주세요:
+
+1. **현재 유동성 상태 평가** (확장/축소/중립)
+2. **Fed 정책 방향성** 해석
+3. **비트코인/나스닥에 미치는 영향**
+4. **향후 3개월 전망**
+
+간결하고 명확하게 답변해주세요.
+""",
+        
+        "달러분석": f"""
+당신은 외환 및 글로벌 매크로 전문가입니다.
+
+## Dollar Index vs 위험자산 데이터
+{data_summary}
+
+## 상관관계
+{correlations}
+
+다음을 분석해주세요:
+
+1. **현재 달러 강도 평가**
+2. **달러-비트코인 역상관 상태**
+3. **달러-S&P 500 관계**
+4. **글로벌 자금 흐름 해석**
+5. **투자 전략 제안**
+
+핵심만 간결하게 답변해주세요.
+""",
+        
+        "신용분석": f"""
+당신은 신용시장 및 위험관리 전문가입니다.
+
+## High Yield Spread 데이터
+{data_summary}
+
+## 상관관계
+{correlations}
+
+## 현재 시그널
+{signals}
+
+다음을 분석해주세요:
+
+1. **현재 신용시장 상태** (안전/경계/위험)
+2. **HY Spread가 의미하는 것**
+3. **주식시장/비트코인에 대한 시사점**
+4. **리스크 관리 방안**
+
+명확하고 실용적으로 답변해주세요.
+""",
+        
+        "트레이딩전략": f"""
+당신은 퀀트 트레이딩 전문가입니다.
+
+## 현재 시그널 종합
+{signals}
+
+## 상관관계 매트릭스
+{correlations}
+
+## 시장 데이터
+{data_summary}
+
+다음을 제시해주세요:
+
+1. **현재 포지션 추천** (매수/매도/관망)
+2. **자산별 비중** (BTC/주식/현금)
+3. **진입/청산 타이밍**
+4. **손절/익절 기준**
+
+구체적이고 실행 가능한 전략을 제시해주세요.
+"""
+    }
+    return prompts.get(analysis_type, prompts["종합분석"]) + scenario_section(scenario)
+
+
+def deep_dive_prompt(analysis_type, data_summary, correlations, signals, df_recent, latest, volatility=None,
+                     scenario=None, outlook=None):
+    """
+    심층 분석(Deep Dive) 프롬프트
+    volatility: (최신 일간 변동성 Series(%), 가중 방식 이름) - 없으면 최근 90일 표준편차
+    scenario: 유동성 충격 시나리오 요약 (ScenarioResult.to_prompt) - 있으면 프롬프트에 추가
+    outlook: 블록 부트스트랩 시나리오 확률 (OutlookResult) - 있으면 Bull/Base/Bear 확률을 추정치로 대체
+    """
+    if volatility is None:
+        volatility = (df_recent.pct_change().tail(90).std() * 100, "최근 90일")
+    latest_volatility, volatility_label = volatility
+
+    # 추가 통계 정보 생성
+    stats_summary = f"""
+## 통계 분석 (일간 변동성: {volatility_label})
+- Net Liquidity 변동성: {latest_volatility['NetLiq']:.2f}%
+- BTC 변동성: {latest_volatility['BTC']:.2f}%
+- NASDAQ 변동성: {latest_volatility['NASDAQ']:.2f}%
+- DXY 변동성: {latest_volatility['DXY']:.2f}%
+
+## 추세 분석
+- Net Liquidity 30일 평균: ${df_recent['NetLiq'].tail(30).mean()/1e6:.2f}T
+- Net Liquidity 90일 평균: ${df_recent['NetLiq'].tail(90).mean()/1e6:.2f}T
+- BTC 30일 평균: ${df_recent['BTC'].tail(30).mean():,.0f}
+- BTC 90일 평균: ${df_recent['BTC'].tail(90).mean():,.0f}
+
+## 최근 변화 (7일/30일/90일)
+- Net Liquidity: {df_recent['NetLiq'].pct_change(7).iloc[-1]*100:+.2f}% / {df_recent['NetLiq'].pct_change(30).iloc[-1]*100:+.2f}% / {df_recent['NetLiq'].pct_change(90).iloc[-1]*100:+.2f}%
+- BTC: {df_recent['BTC'].pct_change(7).iloc[-1]*100:+.2f}% / {df_recent['BTC'].pct_change(30).iloc[-1]*100:+.2f}% / {df_recent['BTC'].pct_change(90).iloc[-1]*100:+.2f}%
+- NASDAQ: {df_recent['NASDAQ'].pct_change(7).iloc[-1]*100:+.2f}% / {df_recent['NASDAQ'].pct_change(30).iloc[-1]*100:+.2f}% / {df_recent['NASDAQ'].pct_change(90).iloc[-1]*100:+.2f}%
+"""
+
+    # 시나리오 확률: 블록 부트스트랩 추정치가 있으면 사용 (없으면 기존 고정 비율)
+    if outlook is not None:
+        probabilities = outlook.primary().probabilities
+        stats_summary += f"""
+## 시나리오 확률 추정 (블록 부트스트랩 몬테카를로)
+{outlook.to_prompt()}
+"""
+        probability_note = " - 몬테카를로 추정"
+    else:
+        probabilities = {'Bull': 30, 'Base': 50, 'Bear': 20}
+        probability_note = ""
+    
+    deep_dive_prompts = {
+        "종합분석": f"""
+당신은 20년 경력의 거시경제 및 퀀트 투자 전문가입니다. **매우 상세하고 심층적인 분석**을 제공해주세요.
+
+## 현재 시장 데이터
+{data_summary}
+
+## 주요 상관관계
+{correlations}
+
+## 현재 시그널
+{signals}
+
+## 통계 및 추세 분석
+{stats_summary}
+
+다음을 **매우 상세하게** 분석해주세요:
+
+### 1. 거시경제 환경 심층 분석 (5-7문장)
+- Fed 정책 사이클상 현재 위치
+- 유동성 확장/축소의 역사적 맥락
+- 주요 중앙은행들의 정책 방향성
+- 글로벌 자금 흐름의 변화
+
+### 2. 기술적 분석 및 패턴 인식 (5-6문장)
+- 가격 추세와 모멘텀 분석
+- 주요 지지/저항 레벨 (데이터 기반)
+- 과매수/과매도 구간 판단
+- 이동평균선 배열과 시사점
+
+### 3. 리스크 매트릭스 (4가지 이상)
+- 단기(1주-1개월) 리스크 요인
+- 중기(1-3개월) 리스크 요인
+- 구조적 리스크 (장기)
+- Black Swan 시나리오
+
+### 4. 시나리오 분석
+**Bull Case (낙관적 시나리오 {probabilities['Bull']:.0f}%{probability_note}):**
+- 전개 조건
+- 예상 가격 타겟
+- 포지셔닝 전략
+
+**Base Case (중립적 시나리오 {probabilities['Base']:.0f}%{probability_note}):**
+- 전개 조건
+- 예상 가격 레인지
+- 포지셔닝 전략
+
+**Bear Case (비관적 시나리오 {probabilities['Bear']:.0f}%{probability_note}):**
+- 전개 조건
+- 하방 타겟
+- 방어 전략
+
+### 5. 구체적 투자 전략 (자산별)
+**Bitcoin:**
+- 진입 가격대
+- 목표가 / 손절가
+- 포지션 사이징
+
+**NASDAQ / 주식:**
+- 섹터별 전략
+- 진입/청산 타이밍
+- 리스크 관리
+
+**현금 / 안전자산:**
+- 비중 조절 기준
+- 재진입 조건
+
+### 6. 향후 3개월 로드맵
+- Week 1-2: 단기 전략
+- Month 1: 중기 전략
+- Month 2-3: 포지션 조정 계획
+
+### 7. 모니터링 체크리스트
+- 매일 체크할 지표
+- 매주 체크할 지표
+- 트리거 이벤트 (포지션 변경 조건)
+
+**전문가답게, 하지만 실행 가능하게 작성해주세요. 수치와 근거를 명확히 제시하세요.**
+""",
+        
+        "유동성분석": f"""
+당신은 연준(Fed) 정책 및 유동성 전문가입니다. **심층 유동성 분석**을 제공해주세요.
+
+## Net Liquidity 데이터
+{data_summary}
+
+## 상관관계
+{correlations}
+
+## 통계 분석
+{stats_summary}
+
+다음을 **매우 상세하게** 분석해주세요:
+
+### 1. Fed 대차대조표 심층 분석 (5-6문장)
+- WALCL (Fed 총자산) 추세와 의미
+- TGA (재무부 계좌) 변화와 정책 시사점
+- RRP (역RP) 수준과 은행 유동성 상태
+- Net Liquidity의 역사적 위치
+
+### 2. 유동성 사이클 분석
+- 현재 사이클상 위치 (확장/정점/축소/저점)
+- 과거 유사 패턴과 비교
+- 전환점 시그널 (Leading Indicators)
+
+### 3. 시장 영향 메커니즘
+- Net Liquidity → Bitcoin 전달 경로
+- Net Liquidity → 주식시장 영향 시차
+- 유동성 변화의 선행/후행 지표
+
+### 4. Fed 정책 전망 (3-6개월)
+- FOMC 회의 일정과 예상 시나리오
+- QT (양적긴축) 지속 여부
+- 정책 전환 가능성과 조건
+
+### 5. 투자 전략 (유동성 기반)
+**확장 구간 전략:**
+- 공격적 포지셔닝 타이밍
+- 레버리지 활용 방안
+
+**축소 구간 전략:**
+- 방어적 포지셔닝
+- 현금 비중 확대 기준
+
+**전환점 대응:**
+- 조기 시그널 포착 방법
+- 포지션 전환 타이밍
+
+### 6. 리스크 시나리오
+- 급격한 유동성 축소 시나리오
+- 정책 오류 가능성
+- 비상 대응 계획
+
+**수치와 역사적 데이터를 활용하여 설득력 있게 작성해주세요.**
+""",
+        
+        "달러분석": f"""
+당신은 외환 및 글로벌 매크로 전문가입니다. **심층 달러 분석**을 제공해주세요.
+
+## Dollar Index vs 위험자산 데이터
+{data_summary}
+
+## 상관관계
+{correlations}
+
+## 통계 분석
+{stats_summary}
+
+다음을 **매우 상세하게** 분석해주세요:
+
+### 1. 달러 강도 심층 분석 (5-6문장)
+- DXY 현재 수준의 역사적 의미
+- 주요 통화 (EUR, JPY, GBP) 대비 달러 강도
+- 금리 차이와 달러 움직임
+- 실질 달러 vs 명목 달러
+
+### 2. 달러-비트코인 역학 분석
+- 역상관 메커니즘 설명
+- 현재 상관계수의 의미
+- 역상관 붕괴 시나리오
+- 과거 패턴과 비교
+
+### 3. 달러-S&P 500 관계 분석
+- 달러 강세가 미국 주식에 미치는 영향
+- 수출 기업 vs 내수 기업 영향 차이
+- 달러-주식 상관관계 변화 추이
+
+### 4. 글로벌 자금 흐름
+- 신흥국 → 선진국 흐름
+- 안전자산 선호도 (Risk-off 정도)
+- 캐리 트레이드 상황
+- 달러 환류 vs 유출
+
+### 5. 지정학적 요인
+- 미중 관계와 달러
+- 에너지 가격과 달러 연계성
+- BRICS 탈달러화 영향
+
+### 6. 시나리오별 전략
+**달러 강세 시나리오:**
+- BTC/알트코인 대응
+- 신흥국 자산 전략
+- 방어 포트폴리오
+
+**달러 약세 시나리오:**
+- 위험자산 공격적 배분
+- 상품/귀금속 전략
+- 레버리지 활용
+
+### 7. 트레이딩 전략
+- DXY 기준 매매 시그널
+- 옵션 전략 (달러 헤지)
+- 포트폴리오 통화 배분
+
+**글로벌 매크로 관점에서 종합적으로 분석해주세요.**
+""",
+        
+        "신용분석": f"""
+당신은 신용시장 및 위험관리 전문가입니다. **심층 신용 분석**을 제공해주세요.
+
+## High Yield Spread 데이터
+{data_summary}
+
+## 현재 시그널
+{signals}
+
+## 상관관계
+{correlations}
+
+## 통계 분석
+{stats_summary}
+
+다음을 **매우 상세하게** 분석해주세요:
+
+### 1. HY Spread 심층 해석 (5-6문장)
+- 현재 스프레드의 역사적 위치
+- Investment Grade vs High Yield 스프레드 비교
+- 크레딧 사이클상 위치
+- 디폴트율 전망
+
+### 2. 신용 리스크 분석
+- 기업 부채 수준과 지속가능성
+- 이자 커버리지 비율 추세
+- 리파이낸싱 리스크 (만기 wall)
+- 섹터별 신용 건전성
+
+### 3. HY Spread의 선행성 분석
+- 주식 시장 대비 선행/후행
+- 비트코인 시장과의 관계
+- 과거 경기침체 전 패턴
+- 현재와 과거 비교
+- False Signal vs True Signal 구분
+
+### 4. Divergence 심층 분석
+- S&P 상승 + HY Spread 상승의 의미
+- 과거 Divergence 사례 연구
+- 해소 패턴 (수렴 방향 예측)
+- 지속 기간과 거래 전략
+
+### 5. 시나리오별 대응
+**신용경색 시나리오 (HY Spread 급등):**
+- 조기 경보 시그널
+- 포트폴리오 방어 전략
+- 현금 확보 계획
+
+**정상화 시나리오 (스프레드 안정):**
+- 리스크 재진입 타이밍
+- 섹터/종목 선별 전략
+
+### 6. 리스크 관리 프레임워크
+- Stop-loss 기준 (HY Spread 기준)
+- 포지션 사이징 공식
+- 헤지 전략 (옵션, 인버스 ETF)
+
+### 7. 모니터링 체크리스트
+- 일일 체크: HY Spread, 주식 가격, BTC
+- 주간 체크: 신용 등급 변화, 디폴트
+- 월간 체크: 기업 실적, 부채 추이
+
+**신용시장 전문가 관점에서 리스크를 정량화하여 제시해주세요.**
+""",
+        
+        "트레이딩전략": f"""
+당신은 퀀트 트레이딩 전문가입니다. **실행 가능한 상세 트레이딩 전략**을 제공해주세요.
+
+## 현재 시그널 종합
+{signals}
+
+## 상관관계 매트릭스
+{correlations}
+
+## 시장 데이터
+{data_summary}
+
+## 통계 분석
+{stats_summary}
+
+다음을 **매우 구체적으로** 제시해주세요:
+
+### 1. 현재 시장 진단
+- 시장 regime (Trending/Mean-reverting/Volatile)
+- Risk-on vs Risk-off 정도 (0-100 점수)
+- 과매수/과매도 지표
+
+### 2. 포트폴리오 구성 (구체적 비중)
+**현재 추천 배분:**
+- Bitcoin: ___%
+- 주식 (NASDAQ): ___%
+- 현금/안전자산: ___%
+- 이유와 근거
+
+**리밸런싱 조건:**
+- 언제 비중을 조정할 것인가
+- 트리거 가격/지표
+
+### 3. 진입 전략 (자산별)
+**Bitcoin 진입:**
+- 1차 진입가: $____
+- 2차 진입가: $____  
+- 평균 단가 전략
+- 포지션 사이즈: 총 자산의 ___%
+
+**주식 진입:**
+- NASDAQ 레벨: ____포인트
+- 분할 매수 계획
+- 섹터 배분
+
+### 4. 청산 전략
+**익절 기준:**
+- 1차 익절: +___% (물량 ___%)
+- 2차 익절: +___% (물량 ___%)
+- 최종 익절: +___% (잔량 전부)
+
+**손절 기준:**
+- 손절 라인: -___%
+- 타임 스탑 (시간 기반): ___일
+- 시그널 전환 시 즉시 청산 조건
+
+### 5. 리스크 관리
+- 1회 거래 최대 리스크: ___%
+- 총 포트폴리오 리스크: ___%
+- 최대 드로다운 허용: ___%
+- 연속 손실 시 대응 (___회 연속 손실 시 휴식)
+
+### 6. 시나리오별 대응 플레이북
+**시나리오 A: Net Liquidity 급격 확장**
+→ 액션: ________________
+→ 타겟: ________________
+
+**시나리오 B: HY Spread 5% 돌파**
+→ 액션: ________________
+→ 타겟: ________________
+
+**시나리오 C: DXY 급등**
+→ 액션: ________________
+→ 타겟: ________________
+
+### 7. 일간/주간 체크리스트
+**매일 체크할 것:**
+- [ ] Net Liquidity 확인
+- [ ] DXY 레벨 확인
+- [ ] HY Spread 확인
+- [ ] 포지션 손익 계산
+
+**매주 체크할 것:**
+- [ ] 상관관계 변화
+- [ ] 포트폴리오 리밸런싱 필요성
+- [ ] 다음 주 주요 이벤트
+
+### 8. 백테스트 아이디어
+- 과거 유사 상황에서의 성과
+- Win rate / Profit factor 추정
+- 최대 드로다운 예상
+
+**실전에서 바로 실행 가능하도록, 수치와 조건을 명확히 제시해주세요. 
+애매한 표현 없이, 구체적인 가격과 %로 제시하세요.**
+"""
+    }
+    return deep_dive_prompts.get(analysis_type, deep_dive_prompts["종합분석"]) + scenario_section(scenario)
+
+
+def get_data_summary(df_recent, latest, netliq_60d):
+    """현재 데이터 요약 생성"""
+    return f"""
+- Net Liquidity: ${latest['NetLiq']/1e6:.2f}T ({netliq_60d:+.2f}% / 60일)
+- Bitcoin: ${latest['BTC']:,.0f} ({df_recent['BTC'].pct_change(30).iloc[-1]*100:+.2f}% / 30일)
+- NASDAQ: {latest['NASDAQ']:,.0f} ({df_recent['NASDAQ'].pct_change(30).iloc[-1]*100:+.2f}% / 30일)
+- S&P 500: {latest['SP500']:,.0f} ({df_recent['SP500'].pct_change(30).iloc[-1]*100:+.2f}% / 30일)
+- Dollar Index: {latest['DXY']:.2f} ({df_recent['DXY'].pct_change(30).iloc[-1]*100:+.2f}% / 30일)
+- HY Spread: {latest['HYSpread']:.2f}%
+"""
+
+
+def get_correlations_summary(corr_matrix, mode):
+    """상관관계 요약 생성 (mode: 상관계수 매트릭스 기준)"""
+    return f"""
+(기준: {CORRELATION_MODES[mode]}, 분석 기간 전체)
+- Net Liquidity ↔ BTC: {corr_matrix.loc['NetLiq', 'BTC']:.3f}
+- Net Liquidity ↔ NASDAQ: {corr_matrix.loc['NetLiq', 'NASDAQ']:.3f}
+- Dollar Index ↔ BTC: {corr_matrix.loc['DXY', 'BTC']:.3f}
+- Dollar Index ↔ S&P500: {corr_matrix.loc['DXY', 'SP500']:.3f}
+- HY Spread ↔ S&P500: {corr_matrix.loc['HYSpread', 'SP500']:.3f}
+- HY Spread ↔ BTC: {corr_matrix.loc['HYSpread', 'BTC']:.3f}
+"""
+
+
+def get_signals_summary(netliq_60d, latest, corr_dxy_btc, recent_divergence):
+    """시그널 요약 생성"""
+    netliq_signal = "확장 🟢" if netliq_60d > 2 else ("축소 🔴" if netliq_60d < -2 else "중립 ⚪")
+    dxy_signal = "강한 역상관 🟢" if corr_dxy_btc < -0.5 else ("비정상 동행 🔴" if corr_dxy_btc > 0 else "약한 역상관 ⚪")
+    hy_signal = "위험 🔴" if latest['HYSpread'] > 5.0 else ("경계 🟡" if latest['HYSpread'] > 4.0 else "안정 🟢")
+    div_signal = f"발생 ({recent_divergence}일) 🔴" if recent_divergence > 0 else "없음 🟢"
+    
+    return f"""
+1. Net Liquidity: {netliq_signal} ({netliq_60d:+.2f}%)
+2. DXY-BTC 관계: {dxy_signal} ({corr_dxy_btc:.3f})
+3. HY Spread: {hy_signal} ({latest['HYSpread']:.2f}%)
+4. Divergence: {div_signal}
+"""
+
+
+class ResponseCache:
+    """
+    directory/{sha256(모델, 프롬프트)}.json 에 Gemini 응답 보관 (ttl 초 동안 재사용).
+    데이터가 바뀌면 프롬프트도 바뀌므로 같은 데이터의 같은 분석만 캐시를 공유
+    """
+
+    def __init__(self, directory, ttl=RESPONSE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, model_name, prompt):
+        digest = hashlib.sha256(f"{model_name}\n{prompt}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def entry(self, model_name, prompt):
+        """ttl 안의 캐시 항목 {'text', 'created'(epoch 초)} (없으면 None)"""
+        try:
+            with open(self.path(model_name, prompt), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if time.time() - entry['created'] < self.ttl else None
+
+    def get(self, model_name, prompt):
+        """ttl 안의 캐시된 응답 (없으면 None)"""
+        entry = self.entry(model_name, prompt)
+        return entry['text'] if entry is not None else None
+
+    def put(self, model_name, prompt, text):
+        """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록). 저장한 항목 반환"""
+        entry = {'model': model_name, 'created': time.time(), 'text': text}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path(model_name, prompt))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return entry
+
+    def generate(self, model, prompt, refresh=False):
+        """
+        캐시에 있으면 그 응답, 없거나 refresh=True 면 model.generate_content 후 저장
+        (오류는 저장하지 않고 그대로 전달). (본문, 생성 시각 epoch 초, 캐시 적중 여부) 반환
+        """
+        model_name = getattr(model, 'model_name', GEMINI_MODEL)
+        entry = None
+        if not refresh:
+            with self._lock:
+                entry = self.entry(model_name, prompt)
+        if entry is not None:
+            return entry['text'], entry['created'], True
+        text = model.generate_content(prompt).text
+        with self._lock:
+            entry = self.put(model_name, prompt, text)
+        return text, entry['created'], False
@@ -0,0 +1,269 @@
+# ============================================================
+# 시그널 임계값 알림 엔진 (Streamlit 비의존)
+# 데이터 갱신마다 사용자 정의 규칙(지표 / 비교 연산 / 기준값)을 새로 들어온
+# 영업일들에 한꺼번에 평가하고, 조건이 거짓 -> 참으로 바뀐 시점만 알림으로 만들어
+# 로컬 outbox(JSON Lines 파일 / 웹훅 대기 파일)에 기록. 규칙 상태와 마지막 평가일은
+# 파일에 보관하므로 같은 돌파가 갱신 / 재시작마다 반복 발송되지 않음
+# ============================================================
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from events import (
+    DIVERGENCE_HORIZON, DXY_BTC_POSITIVE, DXY_BTC_STRONG_INVERSE, HY_CAUTION, HY_DANGER, NETLIQ_CONTRACTION,
+    NETLIQ_EXPANSION, divergence_state, signal_context
+)
+
+OPERATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+}
+OPERATOR_CODES = list(OPERATORS)
+STATE_FILE = 'alert_state.json'
+OUTBOX_FILE = 'outbox.jsonl'
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """metric op threshold 가 참이 되는 순간 알림 (cooldown_days 안의 재돌파는 무시)"""
+    name: str
+    metric: str
+    op: str
+    threshold: float
+    cooldown_days: int = 0
+    severity: str = 'info'
+
+    def describe(self):
+        return f"{self.metric} {self.op} {self.threshold:g}"
+
+
+# 트레이딩 시그널 탭과 같은 기준값
+DEFAULT_RULES = (
+    AlertRule('Net Liquidity 강한 확장', 'NetLiq 60일(%)', '>', NETLIQ_EXPANSION),
+    AlertRule('Net Liquidity 강한 축소', 'NetLiq 60일(%)', '<', NETLIQ_CONTRACTION, severity='warning'),
+    AlertRule('DXY-BTC 강한 역상관', 'DXY-BTC 상관', '<', DXY_BTC_STRONG_INVERSE),
+    AlertRule('DXY-BTC 양의 상관', 'DXY-BTC 상관', '>', DXY_BTC_POSITIVE, severity='warning'),
+    AlertRule('HY Spread 경계', 'HY Spread(%)', '>', HY_CAUTION, severity='warning'),
+    AlertRule('HY Spread 위험', 'HY Spread(%)', '>', HY_DANGER, severity='danger'),
+    AlertRule('SP500-HY Divergence', 'Divergence', '>=', 1, cooldown_days=DIVERGENCE_HORIZON, severity='warning'),
+)
+
+
+def load_rules(source):
+    """
+    규칙 목록 읽기. source 는 JSON 파일 경로 또는 dict 목록 (secrets 의 ALERT_RULES 등),
+    None 이면 DEFAULT_RULES. 알 수 없는 연산자는 ValueError
+    """
+    if source is None:
+        return DEFAULT_RULES
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            source = json.load(f)
+    rules = tuple(AlertRule(**dict(item)) for item in source)
+    unknown = [rule.op for rule in rules if rule.op not in OPERATORS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 연산자: {unknown} (사용 가능: {OPERATOR_CODES})")
+    names = [rule.name for rule in rules]
+    if len(set(names)) != len(names):
+        raise ValueError("규칙 이름이 중복되었습니다 (이름으로 알림 상태를 구분합니다)")
+    return rules
+
+
+def alert_metrics(df, window, halflife=None):
+    """
+    규칙에서 참조할 수 있는 지표 = 시그널 판단 지표 + Divergence(최근 DIVERGENCE_RECENT_DAYS 일 중 발생 0/1)
+    + df 의 원본 시리즈
+    """
+    context = signal_context(df, window, halflife)
+    metrics = context.assign(Divergence=divergence_state(context))
+    return metrics.join(df[[column for column in df.columns if column not in metrics.columns]])
+
+
+def evaluate_rules(values, metric_positions, op_codes, thresholds):
+    """
+    values(T, 지표) 에 모든 규칙을 한 번에 적용 -> (T, 규칙) bool.
+    연산자별로 규칙을 묶어 비교하므로 규칙 수와 관계없이 배열 연산 몇 번 (NaN 은 거짓)
+    """
+    selected = values[:, metric_positions]
+    result = np.zeros(selected.shape, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        for code, name in enumerate(OPERATOR_CODES):
+            columns = op_codes == code
+            if columns.any():
+                result[:, columns] = OPERATORS[name](selected[:, columns], thresholds[columns])
+    return result
+
+
+def _atomic_write_json(path, payload):
+    """임시 파일에 쓴 뒤 교체 (중간에 중단되어도 이전 상태 유지)"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class FileOutbox:
+    """알림을 directory/outbox.jsonl 에 한 줄씩 추가 (다른 프로세스가 읽어 발송)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, OUTBOX_FILE)
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, alerts):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+
+    def recent(self, limit=50):
+        """최근 기록된 알림 (최신이 위)"""
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.readlines()[-limit:]
+        return pd.DataFrame([json.loads(line) for line in reversed(lines)])
+
+
+class WebhookOutbox(FileOutbox):
+    """
+    웹훅 발송 대기열 (스텁). outbox.jsonl 기록에 더해 directory/webhook/ 에 알림별
+    {url, payload} 파일을 남기며, 실제 전송은 별도 발송기가 이 파일들을 처리
+    """
+
+    def __init__(self, directory, url):
+        super().__init__(directory)
+        self.url = url
+        self.pending = os.path.join(directory, 'webhook')
+        os.makedirs(self.pending, exist_ok=True)
+
+    def send(self, alerts):
+        super().send(alerts)
+        for alert in alerts:
+            _atomic_write_json(os.path.join(self.pending, f"{alert['id']}.json"), {'url': self.url, 'payload': alert})
+
+
+class AlertEngine:
+    """
+    규칙 상태(직전 평가일의 참 / 거짓, 마지막 발송일)를 directory/alert_state.json 에 보관하며
+    새로 들어온 영업일만 평가합니다. 처음 실행하면 마지막 이틀만 보고 현재 상태를 기준으로
+    삼으므로 과거 이력 전체의 돌파를 한꺼번에 보내지 않습니다. 규칙 구성이 바뀌면 새 규칙만 같은 방식으로 시작
+    """
+
+    def __init__(self, rules, outbox, directory):
+        self.rules = tuple(rules)
+        self.outbox = outbox
+        self.state_path = os.path.join(directory, STATE_FILE)
+        self._lock = threading.Lock()
+        self.last_run = None
+        os.makedirs(directory, exist_ok=True)
+
+        self._op_codes = np.array([OPERATOR_CODES.index(rule.op) for rule in self.rules], dtype=np.int8)
+        self._thresholds = np.array([rule.threshold for rule in self.rules], dtype=float)
+        self._cooldowns = np.array([rule.cooldown_days for rule in self.rules], dtype='timedelta64[D]')
+        self._state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'evaluated_through': None, 'rules': {}}
+
+    def describe(self):
+        """규칙별 정의와 현재 상태"""
+        states = self._state['rules']
+        return pd.DataFrame([
+            {
+                '규칙': rule.name,
+                '조건': rule.describe(),
+                '등급': rule.severity,
+                '재알림 간격(일)': rule.cooldown_days,
+                '현재 충족': states.get(rule.name, {}).get('active'),
+                '마지막 알림': states.get(rule.name, {}).get('last_fired'),
+            }
+            for rule in self.rules
+        ]).set_index('규칙')
+
+    def evaluate(self, metrics):
+        """
+        metrics(날짜 × 지표, alert_metrics 결과)의 마지막 평가일 이후 영업일에 규칙을 적용하고
+        새로 발생한 알림을 outbox 로 보냄. 보낸 알림 목록 반환
+        """
+        with self._lock:
+            state = self._state
+            missing = sorted({rule.metric for rule in self.rules} - set(metrics.columns))
+            if missing:
+                raise KeyError(f"알림 규칙의 지표가 없습니다: {missing}")
+
+            through = state['evaluated_through']
+            start = metrics.index.searchsorted(pd.Timestamp(through), side='right') if through else len(metrics) - 1
+            # 직전 행은 전환 판단의 기준으로만 사용
+            frame = metrics.iloc[max(start - 1, 0):]
+            if start >= len(metrics) or len(frame) < 2:
+                return []
+
+            columns = list(metrics.columns)
+            positions = np.array([columns.index(rule.metric) for rule in self.rules], dtype=int)
+            values = frame.to_numpy(dtype=float)
+            active = evaluate_rules(values, positions, self._op_codes, self._thresholds)
+
+            # 이미 상태가 있는 규칙은 저장된 참 / 거짓을 직전 값으로 사용 (직전 행이 수정되어도 중복 발송 없음)
+            known = np.array([rule.name in state['rules'] for rule in self.rules], dtype=bool)
+            previous_active = np.array([state['rules'].get(rule.name, {}).get('active', False) for rule in self.rules])
+            active[0, known] = previous_active[known]
+            crossed = active[1:] & ~active[:-1]
+
+            dates = frame.index[1:].to_numpy(dtype='datetime64[D]')
+            last_fired = np.array([
+                state['rules'].get(rule.name, {}).get('last_fired') or 'NaT' for rule in self.rules
+            ], dtype='datetime64[D]')
+            alerts = []
+            now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            # 규칙별 재알림 간격은 같은 평가 안의 연속 돌파에도 적용해야 하므로 돌파 시점만 순서대로 확인
+            for row, k in zip(*np.nonzero(crossed)):
+                if not np.isnat(last_fired[k]) and dates[row] - last_fired[k] < self._cooldowns[k]:
+                    continue
+                last_fired[k] = dates[row]
+                rule = self.rules[k]
+                date = str(dates[row])
+                alerts.append({
+                    'id': f"{date}-{hashlib.sha1(rule.name.encode('utf-8')).hexdigest()[:10]}",
+                    'date': date,
+                    'rule': rule.name,
+                    'condition': rule.describe(),
+                    'value': float(values[row + 1, positions[k]]),
+                    'severity': rule.severity,
+                    'created_at': now,
+                })
+            alerts.sort(key=lambda alert: (alert['date'], alert['rule']))
+
+            if alerts:
+                self.outbox.send(alerts)
+            state = {
+                'evaluated_through': str(dates[-1]),
+                'rules': {
+                    rule.name: {
+                        'active': bool(active[-1, k]),
+                        'last_fired': None if np.isnat(last_fired[k]) else str(last_fired[k]),
+                    }
+                    for k, rule in enumerate(self.rules)
+                },
+            }
+            _atomic_write_json(self.state_path, state)
+            self._state = state
+            self.last_run = {'at': now, 'rows': len(dates), 'rules': len(self.rules), 'alerts': len(alerts)}
+            return alerts
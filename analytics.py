@@ -0,0 +1,509 @@
+# ============================================================
+# 분석 엔진 (Streamlit 비의존)
+# 상관계수 / Z-score / Divergence 계산과 세션 간 공유 캐시
+# ============================================================
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+from events import DIVERGENCE_RECENT_DAYS
+from registry import liquidity_components
+
+
+# 롤링 상관계수 필드 -> (x, y) 수익률 컬럼
+ROLLING_PAIRS = {
+    'corr_btc': ('NetLiq', 'BTC'),
+    'corr_nasdaq': ('NetLiq', 'NASDAQ'),
+    'corr_dxy_btc': ('DXY', 'BTC'),
+    'corr_dxy_sp': ('DXY', 'SP500'),
+    'corr_hy_sp': ('HYSpread', 'SP500'),
+    'corr_hy_btc': ('HYSpread', 'BTC'),
+}
+
+
+# 상관계수 매트릭스 모드 -> 표시 이름 (순위 상관은 로그 수익률 기준)
+CORRELATION_MODES = {
+    'levels': '가격 수준 (Pearson)',
+    'log_returns': '로그 수익률 (Pearson)',
+    'spearman': '수익률 순위 (Spearman)',
+    'kendall': '수익률 순위 (Kendall τ-b)',
+}
+DEFAULT_CORRELATION_MODE = 'log_returns'
+# Net Liquidity 기여도 분석 기간 (영업일)
+ATTRIBUTION_HORIZONS = (7, 30, 60, 90)
+# Kendall 계산 시 한 번에 비교하는 행 수 (행 × 전체 관측 × 컬럼 부호 배열 크기 제한)
+KENDALL_BLOCK_ROWS = 256
+
+
+def zscore(series):
+    """Z-score 정규화"""
+    return (series - series.mean()) / series.std()
+
+# ============================================================
+# 메모리 절약 모드 (Compact Representation)
+# ============================================================
+def compact_frame(df):
+    """float64 컬럼을 float32 로 변환 (인덱스는 그대로 공유)"""
+    float_cols = df.select_dtypes(include='float64').columns
+    return df.astype({col: 'float32' for col in float_cols}, copy=False)
+
+def pack_flags(mask):
+    """불리언 Series 를 비트 단위로 압축 (1행 = 1비트)"""
+    return np.packbits(mask.to_numpy(dtype=bool))
+
+def unpack_flags(packed, index):
+    """pack_flags 로 압축한 플래그를 인덱스에 맞춰 복원"""
+    return pd.Series(
+        np.unpackbits(packed, count=len(index)).astype(bool),
+        index=index
+    )
+
+def memory_report(objects):
+    """분석 객체별 메모리 사용량 (KB)"""
+    rows = []
+    for name, obj in objects.items():
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            usage = obj.memory_usage(index=False, deep=True)
+            nbytes = int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+            dtypes = obj.dtypes if isinstance(obj, pd.DataFrame) else [obj.dtype]
+            dtype = ', '.join(sorted({str(d) for d in dtypes}))
+        else:
+            nbytes = int(np.asarray(obj).nbytes)
+            dtype = str(np.asarray(obj).dtype)
+        rows.append({'객체': name, 'dtype': dtype, 'KB': nbytes / 1024})
+    report = pd.DataFrame(rows).set_index('객체')
+    return report.sort_values('KB', ascending=False)
+
+# ============================================================
+# 상관계수 매트릭스 (수준 / 로그 수익률 / 순위)
+# ============================================================
+def average_ranks(values):
+    """컬럼별 순위 (동률은 평균 순위, pandas rank() 와 같은 결과)를 정렬 한 번으로 계산"""
+    n = len(values)
+    order = np.argsort(values, axis=0, kind='stable')
+    ordered = np.take_along_axis(values, order, axis=0)
+    position = np.broadcast_to(np.arange(n)[:, None], values.shape)
+    # 정렬된 값에서 동률 구간의 첫 위치 / 마지막 위치
+    start = np.ones(values.shape, dtype=bool)
+    start[1:] = ordered[1:] != ordered[:-1]
+    end = np.ones(values.shape, dtype=bool)
+    end[:-1] = start[1:]
+    first = np.maximum.accumulate(np.where(start, position, 0), axis=0)
+    last = np.minimum.accumulate(np.where(end, position, n)[::-1], axis=0)[::-1]
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, (first + last) / 2 + 1, axis=0)
+    return ranks
+
+
+def _pearson_matrix(values):
+    """컬럼 간 Pearson 상관계수 행렬"""
+    centered = values - values.mean(axis=0)
+    cov = centered.T @ centered
+    scale = np.sqrt(np.diag(cov))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return cov / np.outer(scale, scale)
+
+
+def kendall_matrix(values, block=KENDALL_BLOCK_ROWS):
+    """
+    전체 컬럼 쌍의 Kendall τ-b. 관측 쌍 (i < j) 의 부호 sign(x_i - x_j) 를 컬럼별로 늘어놓으면
+    τ-b = ΣS_aS_b / √(ΣS_a² ΣS_b²) 이므로 행 묶음마다 행렬곱 한 번으로 모든 쌍을 누적
+    """
+    # 순위는 정수 / 반정수라 2n 이 float32 가수부(2²⁴) 안이면 float32 로도 부호가 정확함
+    ranks = average_ranks(values)
+    if 2 * len(ranks) <= 2 ** 24:
+        ranks = ranks.astype(np.float32)
+    n, k = ranks.shape
+    total = np.zeros((k, k))
+    for first in range(0, n - 1, block):
+        last = min(first + block, n)
+        signs = np.sign(ranks[first:last, None, :] - ranks[None, first + 1:, :])
+        # 같은 묶음 안의 j <= i 쌍은 제외
+        signs[np.tri(last - first, n - first - 1, -1, dtype=bool)] = 0
+        flat = signs.reshape(-1, k)
+        total += flat.T @ flat
+    scale = np.sqrt(np.diag(total))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / np.outer(scale, scale)
+
+
+def correlation_matrices(df):
+    """CORRELATION_MODES 의 모든 상관계수 매트릭스를 한 번에 계산 {모드: DataFrame}"""
+    levels = df.to_numpy(dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_returns = np.diff(np.log(levels), axis=0)
+    log_returns = log_returns[np.isfinite(log_returns).all(axis=1)]
+    matrices = {
+        'levels': _pearson_matrix(levels),
+        'log_returns': _pearson_matrix(log_returns),
+        'spearman': _pearson_matrix(average_ranks(log_returns)),
+        'kendall': kendall_matrix(log_returns),
+    }
+    return {
+        mode: pd.DataFrame(matrix, index=df.columns, columns=df.columns)
+        for mode, matrix in matrices.items()
+    }
+
+# ============================================================
+# 지수가중 (EWMA) 상관계수 / 변동성
+# ============================================================
+def ewm_decay(halflife):
+    """반감기(영업일) -> 하루 감쇠율 λ"""
+    return 0.5 ** (1 / halflife)
+
+
+def effective_window(halflife):
+    """EWMA 가중치의 유효 표본 수 (Σw)² / Σw² = (1 + λ) / (1 - λ)"""
+    decay = ewm_decay(halflife)
+    return int(round((1 + decay) / (1 - decay)))
+
+
+def ewm_covariance(values, halflife):
+    """
+    values(T, k) 의 지수가중 공분산 (T, k, k). 1차 / 2차 모멘트 전체 컬럼에
+    EWMA 재귀를 한 번 적용하므로 반감기와 관계없이 O(n), 처음 halflife-1 행은 NaN
+    """
+    n, k = values.shape
+    # 전체 평균을 먼저 빼서 2차 모멘트의 자릿수 손실을 줄임 (공분산은 평행이동에 불변)
+    values = values - values.mean(axis=0)
+    moments = np.concatenate([values, (values[:, :, None] * values[:, None, :]).reshape(n, k * k)], axis=1)
+    smoothed = pd.DataFrame(moments).ewm(halflife=halflife, min_periods=int(halflife)).mean().to_numpy()
+    mean = smoothed[:, :k]
+    # 표본 공분산과 같은 불편 추정으로 보정 (pandas ewm().cov(bias=False) 와 동일)
+    decay = ewm_decay(halflife)
+    count = np.arange(1, n + 1)
+    weight_sum = (1 - decay ** count) / (1 - decay)
+    weight_sq_sum = (1 - decay ** (2 * count)) / (1 - decay ** 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correction = weight_sum ** 2 / (weight_sum ** 2 - weight_sq_sum)
+    return (smoothed[:, k:].reshape(n, k, k) - mean[:, :, None] * mean[:, None, :]) * correction[:, None, None]
+
+# ============================================================
+# Net Liquidity 구성 요소 기여도
+# ============================================================
+@dataclass(frozen=True)
+class LiquidityAttribution:
+    """
+    changes[h, t, c] = horizons[h] 영업일 동안 구성 요소 c 가 Net Liquidity 에 더한 변화 (백만 달러, 부호 반영).
+    구성 요소 합 = Net Liquidity 변화, base[h, t] = 기간 시작 시점 Net Liquidity
+    """
+    index: pd.DatetimeIndex
+    horizons: tuple
+    components: list
+    changes: np.ndarray
+    base: np.ndarray
+
+    def contributions(self, horizon, percent=True):
+        """horizon 기간 구성 요소별 기여 (percent=True 면 Net Liquidity 변화율 %p, 아니면 십억 달러)"""
+        position = self.horizons.index(horizon)
+        changes = self.changes[position]
+        values = changes / self.base[position][:, None] * 100 if percent else changes / 1e3
+        return pd.DataFrame(values, index=self.index, columns=self.components)
+
+    def table(self):
+        """최신 시점의 기간별 구성 요소 기여 (%p) 와 Net Liquidity 변화율"""
+        latest = self.changes[:, -1, :] / self.base[:, -1, None] * 100
+        table = pd.DataFrame(latest, index=[f"{h}일" for h in self.horizons], columns=self.components)
+        table['Net Liquidity'] = table.sum(axis=1)
+        return table
+
+
+def netliq_attribution(df, horizons=ATTRIBUTION_HORIZONS):
+    """모든 기간의 Net Liquidity 변화를 구성 요소별 기여로 한 번에 분해 (구성 요소가 없으면 None)"""
+    signs = liquidity_components(df.columns)
+    if not signs:
+        return None
+    components = list(signs)
+    values = df[components].to_numpy(dtype=float) * np.array(list(signs.values()), dtype=float)
+    netliq = df['NetLiq'].to_numpy(dtype=float)
+
+    # lagged[h, t] = t - horizons[h] 시점 (범위 밖은 NaN)
+    lagged = np.arange(len(df))[None, :] - np.array(horizons)[:, None]
+    valid = lagged >= 0
+    lagged = np.where(valid, lagged, 0)
+    changes = np.where(valid[:, :, None], values[None] - values[lagged], np.nan)
+    base = np.where(valid, netliq[lagged], np.nan)
+    return LiquidityAttribution(
+        index=df.index,
+        horizons=tuple(horizons),
+        components=components,
+        changes=changes,
+        base=base,
+    )
+
+# ============================================================
+# 분석 결과
+# ============================================================
+@dataclass(frozen=True)
+class AnalyticsResult:
+    """
+    데이터 버전 × 윈도우 하나에 대한 분석 결과.
+    여러 세션이 같은 객체를 공유하므로 읽기 전용으로 취급해야 합니다.
+    """
+    df_recent: pd.DataFrame
+    ret: pd.DataFrame
+    df_z: pd.DataFrame
+    corr_btc: pd.Series
+    corr_nasdaq: pd.Series
+    corr_dxy_btc: pd.Series
+    corr_dxy_sp: pd.Series
+    corr_hy_sp: pd.Series
+    corr_hy_btc: pd.Series
+    corr_matrices: dict  # 모드 -> 상관계수 매트릭스 (CORRELATION_MODES)
+    netliq_change: pd.Series
+    sp_ret: pd.Series
+    hy_change: pd.Series
+    divergence: object  # compact 모드에서는 pack_flags 로 압축된 uint8 배열
+    recent_divergence: int
+    latest: pd.Series
+    netliq_60d: float
+    compact: bool
+    volatility: pd.DataFrame  # 일간 수익률 변동성 (%), 상관계수와 같은 가중 방식
+    weighting: str            # 표시용 가중 방식 ("90일 롤링" / "EWMA 반감기 30일")
+    effective_window: int     # 신뢰구간 계산용 표본 수 (EWMA 는 유효 표본 수)
+    attribution: object       # LiquidityAttribution (구성 요소가 없으면 None)
+
+    def rolling_correlations(self):
+        """ROLLING_PAIRS 순서의 {필드명: 롤링 상관계수}"""
+        return {name: getattr(self, name) for name in ROLLING_PAIRS}
+
+    def correlation_matrix(self, mode=DEFAULT_CORRELATION_MODE):
+        """mode(CORRELATION_MODES 키) 기준 상관계수 매트릭스"""
+        return self.corr_matrices[mode]
+
+    def correlation_modes_table(self, pairs=ROLLING_PAIRS):
+        """주요 쌍(pairs)의 모드별 상관계수 비교 (행 = 쌍, 열 = 모드 표시 이름)"""
+        return pd.DataFrame(
+            {
+                label: [self.corr_matrices[mode].loc[x, y] for x, y in pairs.values()]
+                for mode, label in CORRELATION_MODES.items()
+            },
+            index=['–'.join(pair) for pair in pairs.values()]
+        )
+
+    def divergence_mask(self):
+        """Divergence 플래그를 불리언 Series 로 반환"""
+        if self.compact:
+            return unpack_flags(self.divergence, self.df_recent.index)
+        return self.divergence
+
+    def memory_report(self):
+        return memory_report({
+            field.name: getattr(self, field.name)
+            for field in fields(self)
+            if isinstance(getattr(self, field.name), (pd.DataFrame, pd.Series, np.ndarray))
+            and field.name != 'latest'
+        } | {'index (공유)': self.df_recent.index})
+
+
+def data_version(df):
+    """데이터 내용 기반 버전 키 (같은 데이터면 같은 값)"""
+    return int(pd.util.hash_pandas_object(df, index=True).sum())
+
+
+def compute_analytics(df_recent, window, compact=False, halflife=None):
+    """
+    상관계수, Z-score, Divergence 등 대시보드 전체 분석 계산.
+    halflife 가 주어지면 롤링 상관계수 / 변동성을 window 대신 EWMA(반감기 halflife 일)로 계산
+    """
+    if compact:
+        df_recent = compact_frame(df_recent)
+
+    # 레지스트리의 모든 분석 컬럼을 한 번에 계산 (Net Liquidity 구성 요소는 기여도 분석에만 사용)
+    analysis = df_recent.drop(columns=list(liquidity_components(df_recent.columns)))
+    ret = analysis.pct_change().dropna()
+    if halflife:
+        cov = ewm_covariance(ret.to_numpy(dtype=float), halflife)
+        std = np.sqrt(np.maximum(np.diagonal(cov, axis1=1, axis2=2), 0))
+        columns = list(ret.columns)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rolling = {
+                name: pd.Series(
+                    cov[:, columns.index(x), columns.index(y)] / (std[:, columns.index(x)] * std[:, columns.index(y)]),
+                    index=ret.index
+                )
+                for name, (x, y) in ROLLING_PAIRS.items()
+            }
+        volatility = pd.DataFrame(std * 100, index=ret.index, columns=ret.columns)
+        weighting = f"EWMA 반감기 {halflife}일"
+        sample_size = effective_window(halflife)
+    else:
+        rolling = {
+            name: ret[x].rolling(window).corr(ret[y])
+            for name, (x, y) in ROLLING_PAIRS.items()
+        }
+        volatility = ret.rolling(window).std() * 100
+        weighting = f"{window}일 롤링"
+        sample_size = window
+    corr_matrices = correlation_matrices(analysis)
+
+    # Z-score (모든 탭이 하나의 프레임과 인덱스를 공유)
+    df_z = analysis.apply(zscore)
+    df_z['DXY_Inverted'] = -df_z['DXY']
+
+    netliq_change = df_recent['NetLiq'].pct_change(periods=60) * 100
+
+    # Divergence 계산
+    sp_ret = df_recent['SP500'].pct_change(periods=20)
+    hy_change = df_recent['HYSpread'].diff(periods=20)
+    divergence = (sp_ret > 0) & (hy_change > 0)
+    recent_divergence = int(divergence.tail(DIVERGENCE_RECENT_DAYS).sum())
+
+    if compact:
+        # 롤링 상관계수는 pandas 내부에서 float64 로 계산되므로 결과만 축소
+        rolling = {name: corr.astype('float32') for name, corr in rolling.items()}
+        df_z = compact_frame(df_z)
+        volatility = compact_frame(volatility)
+        divergence = pack_flags(divergence)
+
+    return AnalyticsResult(
+        df_recent=df_recent,
+        ret=ret,
+        df_z=df_z,
+        **rolling,
+        corr_matrices=corr_matrices,
+        netliq_change=netliq_change,
+        sp_ret=sp_ret,
+        hy_change=hy_change,
+        divergence=divergence,
+        recent_divergence=recent_divergence,
+        latest=df_recent.iloc[-1],
+        netliq_60d=float(netliq_change.iloc[-1]),
+        compact=compact,
+        volatility=volatility,
+        weighting=weighting,
+        effective_window=sample_size,
+        attribution=netliq_attribution(df_recent),
+    )
+
+# ============================================================
+# 세션 간 공유 분석 캐시
+# ============================================================
+class _Entry:
+    def __init__(self):
+        self.ready = threading.Event()
+        self.result = None
+        self.error = None
+        self.sessions = set()
+        self.last_used = time.monotonic()
+
+
+class AnalyticsStore:
+    """
+    (데이터 버전, 윈도우, 모드) 키별 분석 결과를 프로세스 전체에서 공유하는 저장소.
+
+    - 같은 키를 동시에 요청한 세션들은 한 번의 계산 결과를 함께 기다립니다.
+    - 세션별로 현재 사용 중인 키를 참조 카운트로 추적하고, 세션이 다른 키로
+      옮겨가면 이전 키의 참조를 해제합니다.
+    - 참조가 없는 항목은 max_entries 를 넘을 때 오래된 순으로 제거되며,
+      session_ttl 동안 재실행이 없는 세션의 참조는 만료된 것으로 봅니다.
+    """
+
+    def __init__(self, max_entries=8, session_ttl=1800):
+        self.max_entries = max_entries
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._session_keys = {}
+        self._session_seen = {}
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, session_id, key, build):
+        """세션이 key 의 결과를 참조하도록 등록하고 결과를 반환 (없으면 build() 로 생성)"""
+        return self._get(key, build, session_id)
+
+    def warm(self, key, build):
+        """
+        세션 참조 없이 결과를 가져오거나 계산 (백그라운드 예열, 또는 세션의 주 결과와 별개로
+        공유하는 차트 등 부가 결과 - 참조가 없으므로 max_entries 를 넘으면 오래된 순으로 제거)
+        """
+        return self._get(key, build, None)
+
+    def _get(self, key, build, session_id):
+        with self._lock:
+            self._expire_sessions()
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = _Entry()
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._entries.move_to_end(key)
+            entry.last_used = time.monotonic()
+            if session_id is not None:
+                previous = self._session_keys.get(session_id)
+                if previous is not None and previous != key and previous in self._entries:
+                    self._entries[previous].sessions.discard(session_id)
+                entry.sessions.add(session_id)
+                self._session_keys[session_id] = key
+                self._session_seen[session_id] = entry.last_used
+
+        if owner:
+            try:
+                entry.result = build()
+            except Exception as e:
+                entry.error = e
+                with self._lock:
+                    self._entries.pop(key, None)
+            finally:
+                entry.ready.set()
+            with self._lock:
+                self._evict()
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            raise entry.error
+        return entry.result
+
+    def release(self, session_id):
+        """세션의 참조 해제"""
+        with self._lock:
+            key = self._session_keys.pop(session_id, None)
+            self._session_seen.pop(session_id, None)
+            if key in self._entries:
+                self._entries[key].sessions.discard(session_id)
+            self._evict()
+
+    def clear(self):
+        """데이터 갱신 시 전체 초기화 (진행 중인 세션은 다음 재실행에서 재계산)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """항목별 참조 세션 수"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'sessions': len(self._session_keys),
+                'hits': self.hits,
+                'misses': self.misses,
+                'refs': [len(entry.sessions) for entry in self._entries.values()],
+            }
+
+    def _expire_sessions(self):
+        deadline = time.monotonic() - self.session_ttl
+        for session_id, seen in list(self._session_seen.items()):
+            if seen < deadline:
+                key = self._session_keys.pop(session_id, None)
+                del self._session_seen[session_id]
+                if key in self._entries:
+                    self._entries[key].sessions.discard(session_id)
+
+    def _evict(self):
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        for key in list(self._entries):
+            entry = self._entries[key]
+            if excess <= 0:
+                break
+            if not entry.sessions and entry.ready.is_set():
+                del self._entries[key]
+                excess -= 1
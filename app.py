@@ -31,13 +31,49 @@ if not check_password():
 # 메인 임포트
 # ============================================================
 from fredapi import Fred
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import date, datetime
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from ai_analysis import (
+    ANALYSIS_TYPES, GEMINI_MODEL, RESPONSE_TTL, ResponseCache, deep_dive_prompt, get_correlations_summary,
+    get_data_summary, get_signals_summary, standard_prompt
+)
+from alerts import AlertEngine, FileOutbox, WebhookOutbox, alert_metrics, load_rules
+from analytics import (
+    CORRELATION_MODES, DEFAULT_CORRELATION_MODE, ROLLING_PAIRS, AnalyticsStore, compute_analytics,
+    data_version
+)
+from archive import SeriesArchive
+from divergence import DEFAULT_HORIZONS, risk_assets, scan_divergence
+from events import DIVERGENCE_RECENT_DAYS, SIGNALS, build_event_index
+from forward import FORWARD_HORIZONS, build_conditional_returns
+from data_loader import (
+    common_start, fetch_series, fetch_series_info, fetch_start, process_data,
+    slice_raw_data, slice_raw_range, window_start
+)
+from freshness import FreshnessPolicy
+from figures import (
+    build_figures, build_forward_return_figure, build_lead_lag_figure, build_liquidity_attribution_figure,
+    build_nowcast_figure, build_regime_figure, build_regression_figure, build_scenario_figure,
+    build_screener_figure, build_significance_figure, build_watchlist_figure, build_watchlist_history_figure
+)
+from leadlag import analyze_lead_lag
+from nowcast import DtsSource, NowcastTracker, raw_inputs
+from outlook import estimate_outlook
+from regimes import RegimeTracker
+from regression import rolling_regression
+from scenario import (
+    SCENARIO_HORIZON, SCENARIO_PATH_OPTIONS, SCENARIO_PATHS, SCENARIO_PRESETS, build_scenario_model, preset_shocks,
+    simulate_scenario
+)
+from registry import WATCHLIST_PREFIX, active_series, watchlist_key
+from significance import bootstrap_rolling_bands, fisher_interval, significance_table, worker_count
+from watchlist import DEFAULT_WATCHLIST, SCORE_RANGE, compute_watchlist, load_watchlist_csv, parse_series_ids, snapshot_watchlist
+from scheduler import RefreshScheduler
+from screener import SCREENER_WINDOWS, build_screener_cube
 
 warnings.filterwarnings('ignore')
 
@@ -57,571 +93,62 @@ st.set_page_config(
 try:
     GEMINI_API_KEY = st.secrets["GEMINI_API_KEY"]
     genai.configure(api_key=GEMINI_API_KEY)
-    gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
+    gemini_model = genai.GenerativeModel(GEMINI_MODEL)
     GEMINI_ENABLED = True
 except Exception as e:
     GEMINI_ENABLED = False
     st.sidebar.warning("⚠️ Gemini API 키가 설정되지 않았습니다. AI 분석 기능이 비활성화됩니다.")
 
+@st.cache_resource
+def get_ai_cache():
+    """AI 분석 응답 캐시 (프로세스당 1개, 리포트 작업과 같은 AI_CACHE_DIR 을 쓰면 응답 공유)"""
+    return ResponseCache(st.secrets.get("AI_CACHE_DIR", ".ai_cache"))
+
+ai_cache = get_ai_cache()
+
 # ============================================================
 # AI 분석 함수
 # ============================================================
-def analyze_with_gemini(analysis_type, data_summary, correlations, signals):
+def analyze_with_gemini(analysis_type, data_summary, correlations, signals, scenario=None, refresh=False):
     """
-    Gemini API를 사용한 시장 분석 (일반 버전)
+    Gemini API를 사용한 시장 분석 (일반 버전, 같은 프롬프트는 응답 캐시 재사용)
+    scenario: 유동성 충격 시나리오 요약 (ScenarioResult.to_prompt) - 있으면 프롬프트에 추가
+    refresh: True 면 캐시를 무시하고 새로 생성
+    반환: (본문, 생성 시각 epoch 초 또는 None, 캐시 적중 여부)
     """
     if not GEMINI_ENABLED:
-        return "❌ Gemini API가 설정되지 않았습니다. .streamlit/secrets.toml 파일에 GEMINI_API_KEY를 추가하세요."
-    
-    prompts = {
-        "종합분석": f"""
-당신은 20년 경력의 거시경제 및 퀀트 투자 전문가입니다.
-
-## 현재 시장 데이터
-{data_summary}
-
-## 주요 상관관계
-{correlations}
-
-## 현재 시그널
-{signals}
-
-다음을 **명확하고 간결하게** 분석해주세요:
-
-1. **현재 거시경제 상황 요약** (3-4문장)
-2. **주요 리스크 요인** (2-3가지)
-3. **투자 전략 제안** (구체적인 자산별 추천)
-4. **주의사항** (1-2가지)
-
-전문가답게, 하지만 일반 투자자도 이해할 수 있게 작성해주세요.
-""",
-        
-        "유동성분석": f"""
-당신은 연준(Fed) 정책 및 유동성 전문가입니다.
-
-## Net Liquidity 데이터
-{data_summary}
-
-## 상관관계
-{correlations}
-
-다음을 분석해주세요:
-
-1. **현재 유동성 상태 평가** (확장/축소/중립)
-2. **Fed 정책 방향성** 해석
-3. **비트코인/나스닥에 미치는 영향**
-4. **향후 3개월 전망**
-
-간결하고 명확하게 답변해주세요.
-""",
-        
-        "달러분석": f"""
-당신은 외환 및 글로벌 매크로 전문가입니다.
-
-## Dollar Index vs 위험자산 데이터
-{data_summary}
-
-## 상관관계
-{correlations}
-
-다음을 분석해주세요:
-
-1. **현재 달러 강도 평가**
-2. **달러-비트코인 역상관 상태**
-3. **달러-S&P 500 관계**
-4. **글로벌 자금 흐름 해석**
-5. **투자 전략 제안**
-
-핵심만 간결하게 답변해주세요.
-""",
-        
-        "신용분석": f"""
-당신은 신용시장 및 위험관리 전문가입니다.
-
-## High Yield Spread 데이터
-{data_summary}
-
-## 상관관계
-{correlations}
-
-## 현재 시그널
-{signals}
-
-다음을 분석해주세요:
-
-1. **현재 신용시장 상태** (안전/경계/위험)
-2. **HY Spread가 의미하는 것**
-3. **주식시장/비트코인에 대한 시사점**
-4. **리스크 관리 방안**
-
-명확하고 실용적으로 답변해주세요.
-""",
-        
-        "트레이딩전략": f"""
-당신은 퀀트 트레이딩 전문가입니다.
-
-## 현재 시그널 종합
-{signals}
-
-## 상관관계 매트릭스
-{correlations}
-
-## 시장 데이터
-{data_summary}
-
-다음을 제시해주세요:
-
-1. **현재 포지션 추천** (매수/매도/관망)
-2. **자산별 비중** (BTC/주식/현금)
-3. **진입/청산 타이밍**
-4. **손절/익절 기준**
-
-구체적이고 실행 가능한 전략을 제시해주세요.
-"""
-    }
+        return "❌ Gemini API가 설정되지 않았습니다. .streamlit/secrets.toml 파일에 GEMINI_API_KEY를 추가하세요.", None, False
     
-    prompt = prompts.get(analysis_type, prompts["종합분석"])
+    prompt = standard_prompt(analysis_type, data_summary, correlations, signals, scenario)
     
     try:
         with st.spinner(f"🤖 Gemini가 {analysis_type} 중..."):
-            response = gemini_model.generate_content(prompt)
-            return response.text
+            return ai_cache.generate(gemini_model, prompt, refresh=refresh)
     except Exception as e:
-        return f"❌ AI 분석 중 오류 발생: {str(e)}\n\n무료 할당량을 초과했을 수 있습니다. 잠시 후 다시 시도해주세요."
+        return f"❌ AI 분석 중 오류 발생: {str(e)}\n\n무료 할당량을 초과했을 수 있습니다. 잠시 후 다시 시도해주세요.", None, False
 
 # ============================================================
 # AI Deep Dive 분석 함수 (새로 추가)
 # ============================================================
-def analyze_with_gemini_deep_dive(analysis_type, data_summary, correlations, signals, df_recent, latest):
+def analyze_with_gemini_deep_dive(analysis_type, data_summary, correlations, signals, df_recent, latest, volatility=None,
+                                  scenario=None, outlook=None, refresh=False):
     """
-    Gemini API를 사용한 심층 시장 분석 (Deep Dive)
+    Gemini API를 사용한 심층 시장 분석 (Deep Dive, 같은 프롬프트는 응답 캐시 재사용)
+    인자는 ai_analysis.deep_dive_prompt 참고, 반환은 analyze_with_gemini 와 같음
     """
     if not GEMINI_ENABLED:
-        return "❌ Gemini API가 설정되지 않았습니다."
-    
-    # 추가 통계 정보 생성
-    stats_summary = f"""
-## 통계 분석 (최근 90일)
-- Net Liquidity 변동성: {df_recent['NetLiq'].pct_change().tail(90).std()*100:.2f}%
-- BTC 변동성: {df_recent['BTC'].pct_change().tail(90).std()*100:.2f}%
-- NASDAQ 변동성: {df_recent['NASDAQ'].pct_change().tail(90).std()*100:.2f}%
-- DXY 변동성: {df_recent['DXY'].pct_change().tail(90).std()*100:.2f}%
-
-## 추세 분석
-- Net Liquidity 30일 평균: ${df_recent['NetLiq'].tail(30).mean()/1e6:.2f}T
-- Net Liquidity 90일 평균: ${df_recent['NetLiq'].tail(90).mean()/1e6:.2f}T
-- BTC 30일 평균: ${df_recent['BTC'].tail(30).mean():,.0f}
-- BTC 90일 평균: ${df_recent['BTC'].tail(90).mean():,.0f}
-
-## 최근 변화 (7일/30일/90일)
-- Net Liquidity: {df_recent['NetLiq'].pct_change(7).iloc[-1]*100:+.2f}% / {df_recent['NetLiq'].pct_change(30).iloc[-1]*100:+.2f}% / {df_recent['NetLiq'].pct_change(90).iloc[-1]*100:+.2f}%
-- BTC: {df_recent['BTC'].pct_change(7).iloc[-1]*100:+.2f}% / {df_recent['BTC'].pct_change(30).iloc[-1]*100:+.2f}% / {df_recent['BTC'].pct_change(90).iloc[-1]*100:+.2f}%
-- NASDAQ: {df_recent['NASDAQ'].pct_change(7).iloc[-1]*100:+.2f}% / {df_recent['NASDAQ'].pct_change(30).iloc[-1]*100:+.2f}% / {df_recent['NASDAQ'].pct_change(90).iloc[-1]*100:+.2f}%
-"""
-    
-    deep_dive_prompts = {
-        "종합분석": f"""
-당신은 20년 경력의 거시경제 및 퀀트 투자 전문가입니다. **매우 상세하고 심층적인 분석**을 제공해주세요.
-
-## 현재 시장 데이터
-{data_summary}
-
-## 주요 상관관계
-{correlations}
-
-## 현재 시그널
-{signals}
-
-## 통계 및 추세 분석
-{stats_summary}
-
-다음을 **매우 상세하게** 분석해주세요:
-
-### 1. 거시경제 환경 심층 분석 (5-7문장)
-- Fed 정책 사이클상 현재 위치
-- 유동성 확장/축소의 역사적 맥락
-- 주요 중앙은행들의 정책 방향성
-- 글로벌 자금 흐름의 변화
-
-### 2. 기술적 분석 및 패턴 인식 (5-6문장)
-- 가격 추세와 모멘텀 분석
-- 주요 지지/저항 레벨 (데이터 기반)
-- 과매수/과매도 구간 판단
-- 이동평균선 배열과 시사점
-
-### 3. 리스크 매트릭스 (4가지 이상)
-- 단기(1주-1개월) 리스크 요인
-- 중기(1-3개월) 리스크 요인
-- 구조적 리스크 (장기)
-- Black Swan 시나리오
-
-### 4. 시나리오 분석
-**Bull Case (낙관적 시나리오 30%):**
-- 전개 조건
-- 예상 가격 타겟
-- 포지셔닝 전략
-
-**Base Case (중립적 시나리오 50%):**
-- 전개 조건
-- 예상 가격 레인지
-- 포지셔닝 전략
-
-**Bear Case (비관적 시나리오 20%):**
-- 전개 조건
-- 하방 타겟
-- 방어 전략
-
-### 5. 구체적 투자 전략 (자산별)
-**Bitcoin:**
-- 진입 가격대
-- 목표가 / 손절가
-- 포지션 사이징
-
-**NASDAQ / 주식:**
-- 섹터별 전략
-- 진입/청산 타이밍
-- 리스크 관리
-
-**현금 / 안전자산:**
-- 비중 조절 기준
-- 재진입 조건
-
-### 6. 향후 3개월 로드맵
-- Week 1-2: 단기 전략
-- Month 1: 중기 전략
-- Month 2-3: 포지션 조정 계획
-
-### 7. 모니터링 체크리스트
-- 매일 체크할 지표
-- 매주 체크할 지표
-- 트리거 이벤트 (포지션 변경 조건)
-
-**전문가답게, 하지만 실행 가능하게 작성해주세요. 수치와 근거를 명확히 제시하세요.**
-""",
-        
-        "유동성분석": f"""
-당신은 연준(Fed) 정책 및 유동성 전문가입니다. **심층 유동성 분석**을 제공해주세요.
-
-## Net Liquidity 데이터
-{data_summary}
-
-## 상관관계
-{correlations}
-
-## 통계 분석
-{stats_summary}
-
-다음을 **매우 상세하게** 분석해주세요:
-
-### 1. Fed 대차대조표 심층 분석 (5-6문장)
-- WALCL (Fed 총자산) 추세와 의미
-- TGA (재무부 계좌) 변화와 정책 시사점
-- RRP (역RP) 수준과 은행 유동성 상태
-- Net Liquidity의 역사적 위치
-
-### 2. 유동성 사이클 분석
-- 현재 사이클상 위치 (확장/정점/축소/저점)
-- 과거 유사 패턴과 비교
-- 전환점 시그널 (Leading Indicators)
-
-### 3. 시장 영향 메커니즘
-- Net Liquidity → Bitcoin 전달 경로
-- Net Liquidity → 주식시장 영향 시차
-- 유동성 변화의 선행/후행 지표
-
-### 4. Fed 정책 전망 (3-6개월)
-- FOMC 회의 일정과 예상 시나리오
-- QT (양적긴축) 지속 여부
-- 정책 전환 가능성과 조건
-
-### 5. 투자 전략 (유동성 기반)
-**확장 구간 전략:**
-- 공격적 포지셔닝 타이밍
-- 레버리지 활용 방안
-
-**축소 구간 전략:**
-- 방어적 포지셔닝
-- 현금 비중 확대 기준
-
-**전환점 대응:**
-- 조기 시그널 포착 방법
-- 포지션 전환 타이밍
-
-### 6. 리스크 시나리오
-- 급격한 유동성 축소 시나리오
-- 정책 오류 가능성
-- 비상 대응 계획
-
-**수치와 역사적 데이터를 활용하여 설득력 있게 작성해주세요.**
-""",
-        
-        "달러분석": f"""
-당신은 외환 및 글로벌 매크로 전문가입니다. **심층 달러 분석**을 제공해주세요.
-
-## Dollar Index vs 위험자산 데이터
-{data_summary}
-
-## 상관관계
-{correlations}
-
-## 통계 분석
-{stats_summary}
-
-다음을 **매우 상세하게** 분석해주세요:
-
-### 1. 달러 강도 심층 분석 (5-6문장)
-- DXY 현재 수준의 역사적 의미
-- 주요 통화 (EUR, JPY, GBP) 대비 달러 강도
-- 금리 차이와 달러 움직임
-- 실질 달러 vs 명목 달러
-
-### 2. 달러-비트코인 역학 분석
-- 역상관 메커니즘 설명
-- 현재 상관계수의 의미
-- 역상관 붕괴 시나리오
-- 과거 패턴과 비교
-
-### 3. 달러-S&P 500 관계 분석
-- 달러 강세가 미국 주식에 미치는 영향
-- 수출 기업 vs 내수 기업 영향 차이
-- 달러-주식 상관관계 변화 추이
-
-### 4. 글로벌 자금 흐름
-- 신흥국 → 선진국 흐름
-- 안전자산 선호도 (Risk-off 정도)
-- 캐리 트레이드 상황
-- 달러 환류 vs 유출
-
-### 5. 지정학적 요인
-- 미중 관계와 달러
-- 에너지 가격과 달러 연계성
-- BRICS 탈달러화 영향
-
-### 6. 시나리오별 전략
-**달러 강세 시나리오:**
-- BTC/알트코인 대응
-- 신흥국 자산 전략
-- 방어 포트폴리오
-
-**달러 약세 시나리오:**
-- 위험자산 공격적 배분
-- 상품/귀금속 전략
-- 레버리지 활용
-
-### 7. 트레이딩 전략
-- DXY 기준 매매 시그널
-- 옵션 전략 (달러 헤지)
-- 포트폴리오 통화 배분
-
-**글로벌 매크로 관점에서 종합적으로 분석해주세요.**
-""",
-        
-        "신용분석": f"""
-당신은 신용시장 및 위험관리 전문가입니다. **심층 신용 분석**을 제공해주세요.
-
-## High Yield Spread 데이터
-{data_summary}
-
-## 현재 시그널
-{signals}
-
-## 상관관계
-{correlations}
-
-## 통계 분석
-{stats_summary}
-
-다음을 **매우 상세하게** 분석해주세요:
-
-### 1. HY Spread 심층 해석 (5-6문장)
-- 현재 스프레드의 역사적 위치
-- Investment Grade vs High Yield 스프레드 비교
-- 크레딧 사이클상 위치
-- 디폴트율 전망
-
-### 2. 신용 리스크 분석
-- 기업 부채 수준과 지속가능성
-- 이자 커버리지 비율 추세
-- 리파이낸싱 리스크 (만기 wall)
-- 섹터별 신용 건전성
-
-### 3. HY Spread의 선행성 분석
-- 주식 시장 대비 선행/후행
-- 비트코인 시장과의 관계
-- 과거 경기침체 전 패턴
-- 현재와 과거 비교
-- False Signal vs True Signal 구분
-
-### 4. Divergence 심층 분석
-- S&P 상승 + HY Spread 상승의 의미
-- 과거 Divergence 사례 연구
-- 해소 패턴 (수렴 방향 예측)
-- 지속 기간과 거래 전략
-
-### 5. 시나리오별 대응
-**신용경색 시나리오 (HY Spread 급등):**
-- 조기 경보 시그널
-- 포트폴리오 방어 전략
-- 현금 확보 계획
-
-**정상화 시나리오 (스프레드 안정):**
-- 리스크 재진입 타이밍
-- 섹터/종목 선별 전략
-
-### 6. 리스크 관리 프레임워크
-- Stop-loss 기준 (HY Spread 기준)
-- 포지션 사이징 공식
-- 헤지 전략 (옵션, 인버스 ETF)
-
-### 7. 모니터링 체크리스트
-- 일일 체크: HY Spread, 주식 가격, BTC
-- 주간 체크: 신용 등급 변화, 디폴트
-- 월간 체크: 기업 실적, 부채 추이
-
-**신용시장 전문가 관점에서 리스크를 정량화하여 제시해주세요.**
-""",
-        
-        "트레이딩전략": f"""
-당신은 퀀트 트레이딩 전문가입니다. **실행 가능한 상세 트레이딩 전략**을 제공해주세요.
-
-## 현재 시그널 종합
-{signals}
-
-## 상관관계 매트릭스
-{correlations}
-
-## 시장 데이터
-{data_summary}
-
-## 통계 분석
-{stats_summary}
-
-다음을 **매우 구체적으로** 제시해주세요:
-
-### 1. 현재 시장 진단
-- 시장 regime (Trending/Mean-reverting/Volatile)
-- Risk-on vs Risk-off 정도 (0-100 점수)
-- 과매수/과매도 지표
-
-### 2. 포트폴리오 구성 (구체적 비중)
-**현재 추천 배분:**
-- Bitcoin: ___%
-- 주식 (NASDAQ): ___%
-- 현금/안전자산: ___%
-- 이유와 근거
-
-**리밸런싱 조건:**
-- 언제 비중을 조정할 것인가
-- 트리거 가격/지표
-
-### 3. 진입 전략 (자산별)
-**Bitcoin 진입:**
-- 1차 진입가: $____
-- 2차 진입가: $____  
-- 평균 단가 전략
-- 포지션 사이즈: 총 자산의 ___%
-
-**주식 진입:**
-- NASDAQ 레벨: ____포인트
-- 분할 매수 계획
-- 섹터 배분
-
-### 4. 청산 전략
-**익절 기준:**
-- 1차 익절: +___% (물량 ___%)
-- 2차 익절: +___% (물량 ___%)
-- 최종 익절: +___% (잔량 전부)
-
-**손절 기준:**
-- 손절 라인: -___%
-- 타임 스탑 (시간 기반): ___일
-- 시그널 전환 시 즉시 청산 조건
-
-### 5. 리스크 관리
-- 1회 거래 최대 리스크: ___%
-- 총 포트폴리오 리스크: ___%
-- 최대 드로다운 허용: ___%
-- 연속 손실 시 대응 (___회 연속 손실 시 휴식)
-
-### 6. 시나리오별 대응 플레이북
-**시나리오 A: Net Liquidity 급격 확장**
-→ 액션: ________________
-→ 타겟: ________________
-
-**시나리오 B: HY Spread 5% 돌파**
-→ 액션: ________________
-→ 타겟: ________________
-
-**시나리오 C: DXY 급등**
-→ 액션: ________________
-→ 타겟: ________________
-
-### 7. 일간/주간 체크리스트
-**매일 체크할 것:**
-- [ ] Net Liquidity 확인
-- [ ] DXY 레벨 확인
-- [ ] HY Spread 확인
-- [ ] 포지션 손익 계산
-
-**매주 체크할 것:**
-- [ ] 상관관계 변화
-- [ ] 포트폴리오 리밸런싱 필요성
-- [ ] 다음 주 주요 이벤트
-
-### 8. 백테스트 아이디어
-- 과거 유사 상황에서의 성과
-- Win rate / Profit factor 추정
-- 최대 드로다운 예상
-
-**실전에서 바로 실행 가능하도록, 수치와 조건을 명확히 제시해주세요. 
-애매한 표현 없이, 구체적인 가격과 %로 제시하세요.**
-"""
-    }
+        return "❌ Gemini API가 설정되지 않았습니다.", None, False
     
-    prompt = deep_dive_prompts.get(analysis_type, deep_dive_prompts["종합분석"])
+    prompt = deep_dive_prompt(
+        analysis_type, data_summary, correlations, signals, df_recent, latest,
+        volatility=volatility, scenario=scenario, outlook=outlook
+    )
     
     try:
         with st.spinner(f"🔬 Gemini가 Deep Dive {analysis_type} 중... (시간이 조금 걸릴 수 있습니다)"):
-            response = gemini_model.generate_content(prompt)
-            return response.text
+            return ai_cache.generate(gemini_model, prompt, refresh=refresh)
     except Exception as e:
-        return f"❌ AI Deep Dive 분석 중 오류 발생: {str(e)}\n\n무료 할당량을 초과했을 수 있습니다. 잠시 후 다시 시도해주세요."
-
-def get_data_summary(df_recent, latest, netliq_60d):
-    """현재 데이터 요약 생성"""
-    return f"""
-- Net Liquidity: ${latest['NetLiq']/1e6:.2f}T ({netliq_60d:+.2f}% / 60일)
-- Bitcoin: ${latest['BTC']:,.0f} ({df_recent['BTC'].pct_change(30).iloc[-1]*100:+.2f}% / 30일)
-- NASDAQ: {latest['NASDAQ']:,.0f} ({df_recent['NASDAQ'].pct_change(30).iloc[-1]*100:+.2f}% / 30일)
-- S&P 500: {latest['SP500']:,.0f} ({df_recent['SP500'].pct_change(30).iloc[-1]*100:+.2f}% / 30일)
-- Dollar Index: {latest['DXY']:.2f} ({df_recent['DXY'].pct_change(30).iloc[-1]*100:+.2f}% / 30일)
-- HY Spread: {latest['HYSpread']:.2f}%
-"""
-
-def get_correlations_summary(corr_matrix):
-    """상관관계 요약 생성"""
-    return f"""
-- Net Liquidity ↔ BTC: {corr_matrix.loc['NetLiq', 'BTC']:.3f}
-- Net Liquidity ↔ NASDAQ: {corr_matrix.loc['NetLiq', 'NASDAQ']:.3f}
-- Dollar Index ↔ BTC: {corr_matrix.loc['DXY', 'BTC']:.3f}
-- Dollar Index ↔ S&P500: {corr_matrix.loc['DXY', 'SP500']:.3f}
-- HY Spread ↔ S&P500: {corr_matrix.loc['HYSpread', 'SP500']:.3f}
-- HY Spread ↔ BTC: {corr_matrix.loc['HYSpread', 'BTC']:.3f}
-"""
-
-def get_signals_summary(netliq_60d, latest, corr_dxy_btc, recent_divergence):
-    """시그널 요약 생성"""
-    netliq_signal = "확장 🟢" if netliq_60d > 2 else ("축소 🔴" if netliq_60d < -2 else "중립 ⚪")
-    dxy_signal = "강한 역상관 🟢" if corr_dxy_btc < -0.5 else ("비정상 동행 🔴" if corr_dxy_btc > 0 else "약한 역상관 ⚪")
-    hy_signal = "위험 🔴" if latest['HYSpread'] > 5.0 else ("경계 🟡" if latest['HYSpread'] > 4.0 else "안정 🟢")
-    div_signal = f"발생 ({recent_divergence}일) 🔴" if recent_divergence > 0 else "없음 🟢"
-    
-    return f"""
-1. Net Liquidity: {netliq_signal} ({netliq_60d:+.2f}%)
-2. DXY-BTC 관계: {dxy_signal} ({corr_dxy_btc:.3f})
-3. HY Spread: {hy_signal} ({latest['HYSpread']:.2f}%)
-4. Divergence: {div_signal}
-"""
+        return f"❌ AI Deep Dive 분석 중 오류 발생: {str(e)}\n\n무료 할당량을 초과했을 수 있습니다. 잠시 후 다시 시도해주세요.", None, False
 
 # ============================================================
 # 사이드바 설정
@@ -635,27 +162,98 @@ except Exception as e:
     st.error("⚠️ FRED API 키를 찾을 수 없습니다. .streamlit/secrets.toml 파일을 확인하세요.")
     st.stop()
 
+# 기본 시리즈 + secrets 의 EXTRA_SERIES 로 추가한 시리즈 (registry.py 참고)
+try:
+    ACTIVE_SERIES = active_series(st.secrets.get("EXTRA_SERIES", []))
+except KeyError as e:
+    st.error(f"⚠️ EXTRA_SERIES 설정 오류: {e}")
+    st.stop()
+SERIES_KEYS = tuple(spec.key for spec in ACTIVE_SERIES)
+
 period_options = {
     "최근 1년": 365,
     "최근 2년": 365*2,
     "최근 3년": 365*3,
-    "최근 5년": 365*5
+    "최근 5년": 365*5,
+    "최근 10년": 365*10,
+    "최근 20년": 365*20
 }
+FULL_HISTORY = "전체 기간"
+CUSTOM_RANGE = "사용자 지정"
+ARCHIVE_START = date(2002, 12, 18)  # WALCL 최초 관측일
+
 selected_period = st.sidebar.selectbox(
     "📅 분석 기간",
-    list(period_options.keys()),
+    list(period_options.keys()) + [FULL_HISTORY, CUSTOM_RANGE],
     index=2
 )
-days = period_options[selected_period]
+range_end = None
+if selected_period == CUSTOM_RANGE:
+    today = datetime.now().date()
+    selected_range = st.sidebar.date_input(
+        "기간 선택",
+        value=(window_start(365*10).date(), today),
+        min_value=ARCHIVE_START,
+        max_value=today
+    )
+    if len(selected_range) < 2:
+        st.sidebar.info("종료일을 선택하세요")
+        st.stop()
+    range_start, range_end = selected_range
+elif selected_period == FULL_HISTORY:
+    range_start = None  # 데이터 로드 후 모든 시리즈가 겹치는 첫 날로 결정
+else:
+    range_start = window_start(period_options[selected_period])
+
+DEFAULT_WINDOW = 90
 
 window = st.sidebar.slider(
     "📈 상관계수 롤링 윈도우 (일)",
     min_value=30,
     max_value=180,
-    value=90,
+    value=DEFAULT_WINDOW,
     step=10
 )
 
+ewma_mode = st.sidebar.toggle(
+    "📉 EWMA 가중 (지수가중)",
+    value=False,
+    help="롤링 윈도우 대신 반감기 기준 지수가중으로 상관계수 / 변동성을 계산합니다 (최근 데이터에 더 빠르게 반응)"
+)
+halflife = st.sidebar.slider(
+    "EWMA 반감기 (일)",
+    min_value=5,
+    max_value=120,
+    value=30,
+    step=5
+) if ewma_mode else None
+
+compact_mode = st.sidebar.toggle(
+    "💾 메모리 절약 모드",
+    value=False,
+    help="분석 데이터를 float32 로 저장하고 Divergence 플래그를 비트 압축합니다 (동시 접속이 많을 때 권장)"
+)
+
+publication_lag = st.sidebar.toggle(
+    "⏱️ 공표 시차 반영",
+    value=False,
+    help="각 시리즈를 관측일이 아닌 실제 공표일 기준으로 정렬합니다 (예: 수요일 기준 WALCL 은 목요일부터 반영)"
+)
+
+corr_mode = st.sidebar.selectbox(
+    "📐 상관계수 매트릭스 기준",
+    list(CORRELATION_MODES),
+    index=list(CORRELATION_MODES).index(DEFAULT_CORRELATION_MODE),
+    format_func=CORRELATION_MODES.get,
+    help="히트맵, 상관계수 요약, AI 프롬프트에 쓰는 상관계수 (가격 수준은 추세가 섞여 롤링 차트와 다를 수 있음)"
+)
+
+regime_overlay = st.sidebar.toggle(
+    "🧭 레짐 배경 표시",
+    value=False,
+    help="HMM 으로 추정한 유동성·달러·신용 레짐을 차트 배경색으로 표시합니다"
+)
+
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 🤖 AI 분석 상태")
 if GEMINI_ENABLED:
@@ -676,7 +274,7 @@ st.sidebar.info("""
 - Dollar Index (달러 강도)
 - HY Spread (신용 스프레드)
 - Bitcoin, NASDAQ, S&P 500
-
+""" + "".join(f"- {spec.label} ({spec.fred_id})\n" for spec in ACTIVE_SERIES if not spec.core) + """
 **데이터 출처:** FRED API
 **AI 엔진:** Google Gemini 2.0 Flash
 """)
@@ -695,87 +293,334 @@ st.markdown("---")
 # 데이터 로딩 함수
 # ============================================================
 @st.cache_data(ttl=3600, show_spinner=False)
-def load_data(api_key, days):
-    """FRED API에서 데이터 로드"""
+def load_data(api_key, start, keys):
+    """FRED API에서 데이터 로드 (스케줄러 스냅샷이 없을 때의 대체 경로)"""
     try:
         fred = Fred(api_key=api_key)
-        start_date = datetime.now() - timedelta(days=days)
-        
-        walcl = fred.get_series('WALCL', observation_start=start_date)
-        tga = fred.get_series('WTREGEN', observation_start=start_date)
-        rrp = fred.get_series('RRPONTSYD', observation_start=start_date)
-        dxy = fred.get_series('DTWEXAFEGS', observation_start=start_date)
-        hy_spread = fred.get_series('BAMLH0A0HYM2', observation_start=start_date)
-        btc = fred.get_series('CBBTCUSD', observation_start=start_date)
-        nasdaq = fred.get_series('NASDAQCOM', observation_start=start_date)
-        sp500 = fred.get_series('SP500', observation_start=start_date)
-        
-        return {
-            'walcl': walcl, 'tga': tga, 'rrp': rrp,
-            'dxy': dxy, 'hy_spread': hy_spread,
-            'btc': btc, 'nasdaq': nasdaq, 'sp500': sp500
-        }
+        return fetch_series(fred, keys, fetch_start(start))
     except Exception as e:
         st.error(f"❌ 데이터 로딩 실패: {str(e)}")
         return None
 
-def process_data(raw_data):
-    """Net Liquidity 계산 및 데이터 통합"""
-    try:
-        df_liq = pd.DataFrame({
-            'WALCL_Mn': raw_data['walcl'],
-            'TGA_Mn': raw_data['tga'],
-            'RRP_Bn': raw_data['rrp']
-        })
-        
-        df_liq['RRP_Mn'] = df_liq['RRP_Bn'] * 1000
-        df_liq = df_liq.fillna(method='ffill').dropna()
-        df_liq['NetLiquidity'] = (
-            df_liq['WALCL_Mn'] - df_liq['TGA_Mn'] - df_liq['RRP_Mn']
-        )
-        
-        df_all = pd.DataFrame({
-            'NetLiq': df_liq['NetLiquidity'],
-            'DXY': raw_data['dxy'],
-            'HYSpread': raw_data['hy_spread'],
-            'BTC': raw_data['btc'],
-            'NASDAQ': raw_data['nasdaq'],
-            'SP500': raw_data['sp500']
-        })
-        
-        df_all = df_all.fillna(method='ffill').dropna()
-        return df_all
-        
-    except Exception as e:
-        st.error(f"❌ 데이터 처리 실패: {str(e)}")
-        return None
-
-def zscore(series):
-    """Z-score 정규화"""
-    return (series - series.mean()) / series.std()
-
 # ============================================================
 # 데이터 로드
 # ============================================================
+# 분석 결과 저장소 (모두 같은 크기 / 세션 TTL 의 AnalyticsStore, 이름별로 프로세스당 1개)
+STORE_MAX_ENTRIES = 16
+STORE_SESSION_TTL = 1800  # 초
+STORE_NAMES = (
+    "analytics",     # 상관계수 분석 결과
+    "figure",        # 차트 (분석 결과와 같은 키)
+    "leadlag",       # 선행/후행 분석
+    "significance",  # 상관계수 신뢰구간
+    "regression",    # 롤링 베타 / 편상관 (분석 결과와 같은 키)
+    "regime",        # 레짐 결과 / 차트 (전체 이력 데이터 버전 키)
+    "event",         # 시그널 전환 이벤트 인덱스 (전체 이력 기준)
+    "forward",       # 시그널 상태별 미래 수익률 (전체 이력 기준)
+    "watchlist",     # 워치리스트 일괄 분석
+    "screener",      # 스크리너 상관계수 큐브 (윈도우와 무관한 키)
+    "outlook",       # Bull/Base/Bear 확률 (전체 이력 데이터 버전별)
+    "scenario",      # 시나리오 시뮬레이션
+)
+
+@st.cache_resource
+def get_store(name):
+    """프로세스 전체에서 공유하는 이름별 분석 결과 저장소"""
+    if name not in STORE_NAMES:
+        raise KeyError(f"알 수 없는 저장소: {name}")
+    return AnalyticsStore(max_entries=STORE_MAX_ENTRIES, session_ttl=STORE_SESSION_TTL)
+
+@st.cache_resource
+def get_worker_pool():
+    """부트스트랩 등 CPU 집약 계산용 워커 풀 (프로세스당 1개)"""
+    # Streamlit 은 app.py 를 __main__ 으로 실행하므로 프로세스 풀의 워커가 app.py 전체를
+    # 다시 실행하게 됨 → numpy 행렬곱/집계가 GIL 을 놓는 점을 이용해 스레드 풀 사용
+    return ThreadPoolExecutor(max_workers=worker_count(), thread_name_prefix="analytics-worker")
+
+@st.cache_resource
+def get_regime_tracker():
+    """전체 이력 기준 HMM 레짐 추정 (프로세스당 1개, 새 데이터는 warm start 갱신)"""
+    return RegimeTracker()
+
+@st.cache_resource
+def get_alert_engine():
+    """
+    시그널 임계값 알림 엔진 (프로세스당 1개). secrets: ALERT_DIR (상태 / outbox 위치),
+    ALERT_RULES (규칙 목록 또는 JSON 파일 경로, 없으면 트레이딩 시그널 탭 기준), ALERT_WEBHOOK_URL (선택)
+    """
+    directory = st.secrets.get("ALERT_DIR", ".alerts")
+    webhook_url = st.secrets.get("ALERT_WEBHOOK_URL")
+    outbox = WebhookOutbox(directory, webhook_url) if webhook_url else FileOutbox(directory)
+    return AlertEngine(load_rules(st.secrets.get("ALERT_RULES")), outbox, directory)
+
+@st.cache_resource
+def get_nowcast_tracker():
+    """일간 Net Liquidity 나우캐스터 (프로세스당 1개, 새 관측치만 증분 반영)"""
+    return NowcastTracker()
+
+@st.cache_resource
+def get_dts_source():
+    """Daily Treasury Statement TGA 로컬 파일 (파일이 바뀔 때만 다시 읽음)"""
+    return DtsSource(st.secrets.get("DTS_TGA_FILE"))
+
+analytics_store = get_store("analytics")
+figure_store = get_store("figure")
+regime_tracker = get_regime_tracker()
+regime_store = get_store("regime")
+leadlag_store = get_store("leadlag")
+significance_store = get_store("significance")
+regression_store = get_store("regression")
+event_store = get_store("event")
+forward_store = get_store("forward")
+watchlist_store = get_store("watchlist")
+outlook_store = get_store("outlook")
+screener_store = get_store("screener")
+scenario_store = get_store("scenario")
+nowcast_tracker = get_nowcast_tracker()
+alert_engine = get_alert_engine()
+dts_source = get_dts_source()
+
+def prewarm_cache(snapshot):
+    """새 스냅샷으로 기간별 기본 윈도우의 분석 결과와 차트를 미리 계산"""
+    for period_days in period_options.values():
+        df = process_data(slice_raw_data(snapshot.raw, period_days), start=window_start(period_days))
+        key = (data_version(df), DEFAULT_WINDOW, False, None)
+        result = analytics_store.warm(key, lambda: compute_analytics(df, DEFAULT_WINDOW))
+        figure_store.warm(
+            (key, DEFAULT_CORRELATION_MODE),
+            lambda: build_figures(result, DEFAULT_WINDOW, corr_mode=DEFAULT_CORRELATION_MODE)
+        )
+    history_df = process_data(snapshot.raw, start=common_start(snapshot.raw))
+    regime_store.warm((data_version(history_df),), lambda: regime_tracker.update(history_df))
+    history_key = (data_version(history_df), DEFAULT_WINDOW, None)
+    event_index = event_store.warm(history_key, lambda: build_event_index(history_df, DEFAULT_WINDOW))
+    forward_store.warm(history_key, lambda: build_conditional_returns(history_df, event_index.states))
+    outlook_store.warm((data_version(history_df),), lambda: estimate_outlook(history_df, executor=get_worker_pool()))
+    nowcast_tracker.update(
+        **raw_inputs(snapshot.raw), dts_tga=dts_source.load(), version=(snapshot.version, dts_source.mtime())
+    )
+    # 새 영업일의 임계값 돌파만 outbox 로 (이미 보낸 돌파는 상태 파일로 걸러짐)
+    alert_engine.evaluate(alert_metrics(history_df, DEFAULT_WINDOW))
+
+@st.cache_resource
+def get_archive():
+    """시리즈별 전체 이력 로컬 아카이브 (프로세스당 1개)"""
+    return SeriesArchive(st.secrets.get("ARCHIVE_DIR", ".fred_archive"))
+
+archive = get_archive()
+
+@st.cache_resource
+def get_scheduler(api_key, keys):
+    """FRED 발표 주기에 맞춰 데이터를 갱신하는 백그라운드 스케줄러 (시리즈 구성당 1개)"""
+    specs = [spec for spec in ACTIVE_SERIES if spec.key in keys]
+    policy = FreshnessPolicy(
+        get_info=lambda key: fetch_series_info(Fred(api_key=api_key), key),
+        release_rules={spec.key: spec.release_rule for spec in specs},
+        frequencies={spec.key: spec.frequency for spec in specs},
+    )
+    scheduler = RefreshScheduler(
+        fetch=lambda keys: archive.update(Fred(api_key=api_key), keys),
+        keys=keys,
+        policy=policy,
+        on_refresh=prewarm_cache,
+        # 아카이브가 있으면 첫 갱신을 기다리지 않고 바로 사용
+        initial=archive.load_all(keys),
+    )
+    return scheduler.start()
+
+scheduler = get_scheduler(FRED_API_KEY, SERIES_KEYS)
+
+@st.cache_resource
+def get_watchlist_scheduler(api_key):
+    """
+    워치리스트 FRED 시리즈 스케줄러 (프로세스당 1개). 세션이 요청한 시리즈를 track() 으로 추가하고
+    이후에는 기본 시리즈와 같은 아카이브 / 신선도 정책으로 갱신
+    """
+    archived = {key: archive.load(key) for key in archive.stored_keys(WATCHLIST_PREFIX)}
+    archived = {key: series for key, series in archived.items() if series is not None}
+    scheduler = RefreshScheduler(
+        fetch=lambda keys: archive.update(Fred(api_key=api_key), keys),
+        keys=list(archived),
+        policy=FreshnessPolicy(
+            get_info=lambda key: fetch_series_info(Fred(api_key=api_key), key),
+            release_rules={},
+        ),
+        initial=archived,
+    )
+    return scheduler.start()
+
+watchlist_scheduler = get_watchlist_scheduler(FRED_API_KEY)
+
 with st.spinner("🔄 FRED 데이터 다운로드 중..."):
-    raw_data = load_data(FRED_API_KEY, days)
+    snapshot = scheduler.wait_ready(timeout=120)
+    if snapshot is not None:
+        raw_data = slice_raw_range(snapshot.raw, range_start, range_end)
+    else:
+        raw_data = load_data(FRED_API_KEY, range_start, SERIES_KEYS)
 
 if raw_data is None:
     st.stop()
 
-df_recent = process_data(raw_data)
-
-if df_recent is None:
+try:
+    if range_start is None:
+        range_start = common_start(raw_data)
+    df_recent = process_data(raw_data, start=range_start, publication_lag=publication_lag, end=range_end)
+except Exception as e:
+    st.error(f"❌ 데이터 처리 실패: {str(e)}")
     st.stop()
 
+late_start = df_recent.attrs.get('late_start')
+if late_start:
+    st.warning(
+        "⚠️ 일부 시리즈의 첫 데이터가 분석 시작일 이후라 그 이전 구간은 제외되었습니다: "
+        + ", ".join(f"{column} ({date:%Y-%m-%d}~)" for column, date in late_start.items())
+    )
+
+# ============================================================
+# 분석 계산 (세션 간 공유, 전역 변수로 사용)
+# ============================================================
+def get_session_id():
+    """현재 브라우저 세션 ID"""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "anonymous"
+
+session_id = get_session_id()
+analytics_key = (data_version(df_recent), window, compact_mode, halflife)
+analytics = analytics_store.acquire(
+    session_id,
+    analytics_key,
+    lambda: compute_analytics(df_recent, window, compact=compact_mode, halflife=halflife)
+)
+def load_history():
+    """레짐 / 이벤트 인덱스용 전체 이력 프레임 (공표 시차 미반영)"""
+    history = snapshot.raw if snapshot is not None else raw_data
+    try:
+        return process_data(history, start=common_start(history))
+    except ValueError:
+        return None
+
+def current_regimes():
+    """
+    전체 이력 기준 레짐 결과 (이력 프레임의 데이터 버전별로 캐시하므로 대체 경로에서
+    기간이 다른 세션끼리도 서로의 결과를 덮어쓰지 않음)
+    """
+    try:
+        return regime_store.acquire(
+            session_id, (data_version(history_df),), lambda: regime_tracker.update(history_df)
+        )
+    except ValueError:
+        return None
+
+def current_nowcast():
+    """
+    전체 이력 기준 일간 Net Liquidity 나우캐스트 (DTS 파일 오류는 경고 후 DTS 없이 계산).
+    예열에서 같은 스냅샷 / DTS 파일로 이미 갱신했으면 그 결과를 그대로 사용
+    """
+    version = (snapshot.version, dts_source.mtime()) if snapshot is not None else None
+    result = nowcast_tracker.latest(version)
+    if result is not None:
+        return result
+    history = snapshot.raw if snapshot is not None else raw_data
+    try:
+        dts_tga = dts_source.load()
+    except Exception as e:
+        st.warning(f"⚠️ DTS 파일을 읽지 못해 주간 TGA 로 대체합니다: {str(e)}")
+        dts_tga, version = None, None
+    try:
+        return nowcast_tracker.update(**raw_inputs(history), dts_tga=dts_tga, version=version)
+    except (KeyError, IndexError, ValueError):
+        return None
+
+history_df = load_history()
+regimes = current_regimes() if history_df is not None else None
+overlay_regimes = regimes if regime_overlay else None
+figures = figure_store.acquire(
+    session_id,
+    (analytics_key, corr_mode, overlay_regimes.version) if overlay_regimes is not None else (analytics_key, corr_mode),
+    lambda: build_figures(analytics, window, overlay_regimes, corr_mode)
+)
+
+def build_regression():
+    """롤링 회귀 결과와 차트 생성 (세션 간 공유, 종합 대시보드 / 시나리오 탭에서 사용)"""
+    result = rolling_regression(analytics.ret, window, halflife=halflife)
+    return result, build_regression_figure(result)
+
+regression, regression_figure = regression_store.acquire(session_id, analytics_key, build_regression)
+
+df_recent = analytics.df_recent
+ret = analytics.ret
+df_z = analytics.df_z
+corr_btc = analytics.corr_btc
+corr_nasdaq = analytics.corr_nasdaq
+corr_dxy_btc = analytics.corr_dxy_btc
+corr_dxy_sp = analytics.corr_dxy_sp
+corr_hy_sp = analytics.corr_hy_sp
+corr_hy_btc = analytics.corr_hy_btc
+corr_matrix = analytics.correlation_matrix(corr_mode)
+netliq_change = analytics.netliq_change
+divergence = analytics.divergence_mask()
+recent_divergence = analytics.recent_divergence
+latest = analytics.latest
+netliq_60d = analytics.netliq_60d
+
 st.success(f"✅ 데이터 로드 완료: {df_recent.index[0].date()} ~ {df_recent.index[-1].date()} ({len(df_recent)}개 포인트)")
 
+st.sidebar.markdown("---")
+st.sidebar.markdown("### 📡 데이터 갱신 상태")
+refresh_status = scheduler.status()
+if refresh_status['last_refresh'] is not None:
+    st.sidebar.caption(
+        f"마지막 갱신: {refresh_status['last_refresh'].strftime('%Y-%m-%d %H:%M UTC')} "
+        f"(v{refresh_status['version']})"
+    )
+if refresh_status['last_error']:
+    st.sidebar.error(
+        f"갱신 실패 {refresh_status['consecutive_failures']}회: {refresh_status['last_error']}"
+    )
+elif refresh_status['prewarm_error']:
+    st.sidebar.warning(f"캐시 예열 실패: {refresh_status['prewarm_error']}")
+else:
+    st.sidebar.success("✅ 백그라운드 갱신 정상")
+next_due = [due for due in refresh_status['next_due'].values() if due is not None]
+if next_due:
+    st.sidebar.caption(f"다음 확인 예정: {min(next_due).strftime('%Y-%m-%d %H:%M UTC')}")
+with st.sidebar.expander("🗓️ 시리즈별 갱신 정책"):
+    st.dataframe(scheduler.policy.describe(), use_container_width=True)
+with st.sidebar.expander("🗄️ 로컬 아카이브"):
+    st.dataframe(archive.describe(), use_container_width=True)
+
+with st.sidebar.expander("🔔 시그널 알림"):
+    alert_run = alert_engine.last_run
+    if alert_run is not None:
+        st.caption(
+            f"마지막 평가: {alert_run['at']} · 영업일 {alert_run['rows']}개 × 규칙 {alert_run['rules']}개 → "
+            f"알림 {alert_run['alerts']}건"
+        )
+    else:
+        st.caption("다음 데이터 갱신 때 규칙을 평가합니다")
+    st.dataframe(alert_engine.describe(), use_container_width=True)
+    recent_alerts = alert_engine.outbox.recent(20)
+    if not recent_alerts.empty:
+        st.dataframe(
+            recent_alerts[['date', 'rule', 'condition', 'value', 'severity']].round(3),
+            use_container_width=True, hide_index=True
+        )
+    st.caption(f"outbox: {alert_engine.outbox.path}")
+
+with st.sidebar.expander("🧠 분석 메모리 사용량"):
+    shared_memory = analytics.memory_report()
+    store_stats = analytics_store.stats()
+    st.metric("공유 분석 결과", f"{shared_memory['KB'].sum():,.1f} KB",
+              "float32 / 비트 압축" if compact_mode else "float64")
+    st.caption(
+        f"캐시 항목 {store_stats['entries']}개 · 접속 세션 {store_stats['sessions']}개 · "
+        f"적중 {store_stats['hits']} / 계산 {store_stats['misses']}"
+    )
+    st.dataframe(shared_memory.round(1), use_container_width=True)
+
 # ============================================================
 # 최신 지표 요약
 # ============================================================
-latest = df_recent.iloc[-1]
-netliq_60d = df_recent['NetLiq'].pct_change(periods=60).iloc[-1] * 100
-
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
@@ -811,34 +656,20 @@ with col4:
 
 st.markdown("---")
 
-# ============================================================
-# 상관계수 계산 (전역 변수로 사용)
-# ============================================================
-ret = df_recent[['NetLiq', 'BTC', 'NASDAQ', 'DXY', 'HYSpread', 'SP500']].pct_change().dropna()
-corr_btc = ret['NetLiq'].rolling(window).corr(ret['BTC'])
-corr_nasdaq = ret['NetLiq'].rolling(window).corr(ret['NASDAQ'])
-corr_dxy_btc = ret['DXY'].rolling(window).corr(ret['BTC'])
-corr_dxy_sp = ret['DXY'].rolling(window).corr(ret['SP500'])  # 추가
-corr_hy_sp = ret['HYSpread'].rolling(window).corr(ret['SP500'])
-corr_hy_btc = ret['HYSpread'].rolling(window).corr(ret['BTC'])  # 추가
-corr_matrix = df_recent[['NetLiq', 'DXY', 'HYSpread', 'BTC', 'NASDAQ', 'SP500']].corr()
-
-# Divergence 계산
-sp_ret = df_recent['SP500'].pct_change(periods=20)
-hy_change = df_recent['HYSpread'].diff(periods=20)
-divergence = (sp_ret > 0) & (hy_change > 0)
-recent_divergence = divergence.tail(5).sum()
-
 # ============================================================
 # 탭 구성
 # ============================================================
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
     "📈 콤보 1: Net Liquidity",
     "💵 콤보 2: Dollar Index",
     "⚠️ 콤보 3: HY Spread",
     "🎯 종합 대시보드",
     "📊 트레이딩 시그널",
-    "🤖 AI 분석"
+    "🤖 AI 분석",
+    "🔀 선행/후행 분석",
+    "🧪 시나리오",
+    "📋 워치리스트",
+    "🔎 스크리너"
 ])
 
 # ============================================================
@@ -848,91 +679,7 @@ with tab1:
     st.header("📈 콤보 1: Net Liquidity 분석")
     st.markdown("**Fed 총자산 - 재무부 계좌 - 역RP = Net Liquidity**")
     
-    df_z1 = df_recent[['NetLiq', 'BTC', 'NASDAQ']].apply(zscore)
-    netliq_change = df_recent['NetLiq'].pct_change(periods=60) * 100
-    
-    fig1 = make_subplots(
-        rows=3, cols=1,
-        subplot_titles=(
-            'Net Liquidity vs BTC/NASDAQ (Z-score)',
-            f'Net Liquidity 상관계수 ({window}일 롤링)',
-            'Net Liquidity 60일 변화율 (유동성 확장/축소)'
-        ),
-        vertical_spacing=0.08,
-        row_heights=[0.35, 0.3, 0.35]
-    )
-    
-    fig1.add_trace(
-        go.Scatter(x=df_z1.index, y=df_z1['NetLiq'],
-                   name='Net Liquidity', line=dict(color='#2E86AB', width=2.5)),
-        row=1, col=1
-    )
-    fig1.add_trace(
-        go.Scatter(x=df_z1.index, y=df_z1['BTC'],
-                   name='Bitcoin', line=dict(color='#F77F00', width=2.5)),
-        row=1, col=1
-    )
-    fig1.add_trace(
-        go.Scatter(x=df_z1.index, y=df_z1['NASDAQ'],
-                   name='NASDAQ', line=dict(color='#06A77D', width=2.5)),
-        row=1, col=1
-    )
-    fig1.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=1, col=1)
-    
-    fig1.add_trace(
-        go.Scatter(x=corr_btc.index, y=corr_btc,
-                   name='Corr(NetLiq, BTC)',
-                   line=dict(color='#F77F00', width=2.5),
-                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.2)'),
-        row=2, col=1
-    )
-    fig1.add_trace(
-        go.Scatter(x=corr_nasdaq.index, y=corr_nasdaq,
-                   name='Corr(NetLiq, NASDAQ)',
-                   line=dict(color='#06A77D', width=2.5),
-                   fill='tozeroy', fillcolor='rgba(6, 167, 125, 0.2)'),
-        row=2, col=1
-    )
-    fig1.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=1)
-    
-    expansion = netliq_change[netliq_change > 0]
-    fig1.add_trace(
-        go.Scatter(x=expansion.index, y=expansion,
-                   name='확장 구간 🟢',
-                   line=dict(color='#06A77D', width=0),
-                   fill='tozeroy', fillcolor='rgba(6, 167, 125, 0.4)'),
-        row=3, col=1
-    )
-    
-    contraction = netliq_change[netliq_change <= 0]
-    fig1.add_trace(
-        go.Scatter(x=contraction.index, y=contraction,
-                   name='축소 구간 🔴',
-                   line=dict(color='#D62828', width=0),
-                   fill='tozeroy', fillcolor='rgba(214, 40, 40, 0.4)'),
-        row=3, col=1
-    )
-    
-    fig1.add_trace(
-        go.Scatter(x=netliq_change.index, y=netliq_change,
-                   name='변화율', line=dict(color='black', width=2),
-                   showlegend=False),
-        row=3, col=1
-    )
-    fig1.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=1)
-    
-    fig1.update_layout(
-        height=1200,
-        showlegend=True,
-        hovermode='x unified',
-        template='plotly_white'
-    )
-    
-    fig1.update_yaxes(title_text="Z-score", row=1, col=1)
-    fig1.update_yaxes(title_text="Correlation", row=2, col=1)
-    fig1.update_yaxes(title_text="변화율 (%)", row=3, col=1)
-    
-    st.plotly_chart(fig1, use_container_width=True)
+    st.plotly_chart(figures['netliq'], use_container_width=True)
     
     st.markdown("### 📌 분석 인사이트")
     col1, col2 = st.columns(2)
@@ -1080,6 +827,63 @@ with tab1:
             - 현금 확보
             """)
 
+    attribution = analytics.attribution
+    if attribution is not None:
+        st.markdown("#### 🧩 구성 요소별 기여도 (WALCL − TGA − RRP)")
+        attribution_table = attribution.table()
+        st.dataframe(
+            attribution_table.round(2),
+            use_container_width=True,
+            column_config={
+                column: st.column_config.NumberColumn(column, format="%+.2f%%p")
+                for column in attribution_table.columns
+            }
+        )
+        attribution_horizon = st.radio(
+            "기여도 차트 기간",
+            attribution.horizons,
+            index=attribution.horizons.index(30) if 30 in attribution.horizons else 0,
+            format_func=lambda days: f"{days}일",
+            horizontal=True,
+            key="attribution_horizon"
+        )
+        attribution_figure = figure_store.warm(
+            (analytics_key, 'attribution', attribution_horizon),
+            lambda: build_liquidity_attribution_figure(attribution, attribution_horizon)
+        )
+        st.plotly_chart(attribution_figure, use_container_width=True)
+        st.caption(
+            "각 기간의 Net Liquidity 변화율을 Fed 총자산(WALCL), 재무부 계정(TGA), 역RP(RRP) 변화의 기여로 분해 · "
+            "구성 요소 기여의 합 = Net Liquidity 변화율 · 기간은 영업일 기준"
+        )
+
+    nowcast = current_nowcast()
+    if nowcast is not None:
+        st.markdown("---")
+        st.markdown("### 📡 Net Liquidity 나우캐스트")
+        nowcast_latest = nowcast.latest()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("나우캐스트", f"${nowcast_latest['nowcast']/1e6:.3f}T",
+                      f"{nowcast_latest['gap']/1e3:+.1f}B (공표 기준 대비)")
+        with col2:
+            st.metric("주간 공표 기준 (as-of)", f"${nowcast_latest['official']/1e6:.3f}T")
+        with col3:
+            st.metric("기준일", f"{nowcast_latest['date']:%Y-%m-%d}",
+                      "일간 TGA (DTS) 사용" if nowcast.dts_used else "DTS 없음: RRP 만 일간 반영",
+                      delta_color="off")
+        nowcast_figure = figure_store.warm(('nowcast', nowcast.revision), lambda: build_nowcast_figure(nowcast))
+        st.plotly_chart(nowcast_figure, use_container_width=True)
+        st.markdown("#### 🎯 주간 재고정 오차 (최근 52회, 십억 달러)")
+        st.dataframe(nowcast.error_stats().round(2), use_container_width=True)
+        st.caption(
+            "nowcast = WALCL(최근 주간값) − (일간 DTS TGA + 주간 WTREGEN 과의 차이) − 일간 RRP · "
+            "주간 H.4.1 공표가 들어오면 공표 값으로 다시 고정 · "
+            f"{nowcast.confirmed_through:%Y-%m-%d} 이후는 모든 입력이 관측되지 않은 잠정치"
+        )
+        if not nowcast.dts_used:
+            st.info("💡 secrets 의 DTS_TGA_FILE 에 Daily Treasury Statement CSV 경로를 지정하면 TGA 도 일간으로 추정합니다.")
+
 # ============================================================
 # TAB 2: Dollar Index vs BTC & S&P 500 (업데이트)
 # ============================================================
@@ -1087,84 +891,7 @@ with tab2:
     st.header("💵 콤보 2: Dollar Index 분석")
     st.markdown("**달러 강세와 위험자산(BTC, S&P 500)의 관계**")
     
-    df_z2 = pd.DataFrame({
-        'DXY_Inverted': zscore(-df_recent['DXY']),
-        'BTC': zscore(df_recent['BTC']),
-        'SP500': zscore(df_recent['SP500'])
-    })
-    
-    fig2 = make_subplots(
-        rows=3, cols=1,
-        subplot_titles=(
-            'Dollar Index (반전) vs BTC/S&P 500 (Z-score)',
-            f'Dollar Index 상관계수 ({window}일 롤링)',
-            'Dollar Index 원본 차트'
-        ),
-        vertical_spacing=0.10,
-        row_heights=[0.35, 0.35, 0.30]
-    )
-    
-    # 첫 번째 차트: DXY 반전 vs BTC & S&P 500
-    fig2.add_trace(
-        go.Scatter(x=df_z2.index, y=df_z2['DXY_Inverted'],
-                   name='Dollar Index (반전)',
-                   line=dict(color='#D62828', width=2.5)),
-        row=1, col=1
-    )
-    fig2.add_trace(
-        go.Scatter(x=df_z2.index, y=df_z2['BTC'],
-                   name='Bitcoin',
-                   line=dict(color='#F77F00', width=2.5)),
-        row=1, col=1
-    )
-    fig2.add_trace(
-        go.Scatter(x=df_z2.index, y=df_z2['SP500'],
-                   name='S&P 500',
-                   line=dict(color='#2E86AB', width=2.5)),
-        row=1, col=1
-    )
-    fig2.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=1, col=1)
-    
-    # 두 번째 차트: 상관계수
-    fig2.add_trace(
-        go.Scatter(x=corr_dxy_btc.index, y=corr_dxy_btc,
-                   name='Corr(DXY, BTC)',
-                   line=dict(color='#F77F00', width=2.5),
-                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.3)'),
-        row=2, col=1
-    )
-    fig2.add_trace(
-        go.Scatter(x=corr_dxy_sp.index, y=corr_dxy_sp,
-                   name='Corr(DXY, S&P500)',
-                   line=dict(color='#2E86AB', width=2.5),
-                   fill='tozeroy', fillcolor='rgba(46, 134, 171, 0.3)'),
-        row=2, col=1
-    )
-    fig2.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=1)
-    fig2.add_hline(y=-0.5, line_dash="dot", line_color="green", opacity=0.7, 
-                   annotation_text="강한 역상관", row=2, col=1)
-    
-    # 세 번째 차트: DXY 원본
-    fig2.add_trace(
-        go.Scatter(x=df_recent.index, y=df_recent['DXY'],
-                   name='Dollar Index',
-                   line=dict(color='#D62828', width=2.5),
-                   fill='tozeroy', fillcolor='rgba(214, 40, 40, 0.2)'),
-        row=3, col=1
-    )
-    
-    fig2.update_layout(
-        height=1200,
-        showlegend=True,
-        hovermode='x unified',
-        template='plotly_white'
-    )
-    
-    fig2.update_yaxes(title_text="Z-score", row=1, col=1)
-    fig2.update_yaxes(title_text="Correlation", row=2, col=1)
-    fig2.update_yaxes(title_text="Dollar Index", row=3, col=1)
-    
-    st.plotly_chart(fig2, use_container_width=True)
+    st.plotly_chart(figures['dollar'], use_container_width=True)
     
     st.markdown("### 📌 분석 인사이트")
     
@@ -1190,6 +917,13 @@ with tab2:
             - 달러와 비트코인의 연관성 감소
             - 다른 요인이 가격에 더 큰 영향
             """)
+
+        dxy_btc_lower, dxy_btc_upper = fisher_interval(corr_dxy_btc.iloc[-1:], analytics.effective_window)
+        st.caption(
+            f"95% 신뢰구간: [{dxy_btc_lower.iloc[0]:.3f}, {dxy_btc_upper.iloc[0]:.3f}]"
+            + (" · 구간 상단이 −0.5 보다 커 '강한 역상관'은 통계적으로 확정되지 않음"
+               if corr_dxy_btc.iloc[-1] < -0.5 and dxy_btc_upper.iloc[0] > -0.5 else "")
+        )
     
     with col2:
         st.markdown("#### 🔷 DXY vs S&P 500")
@@ -1256,105 +990,7 @@ with tab3:
     st.header("⚠️ 콤보 3: High Yield Spread 분석")
     st.markdown("**HY Spread 상승 = 신용 위험 증가 = 위험자산 경계**")
     
-    # Z-score 정규화 추가
-    df_z3 = pd.DataFrame({
-        'HYSpread': zscore(df_recent['HYSpread']),
-        'SP500': zscore(df_recent['SP500']),
-        'BTC': zscore(df_recent['BTC'])
-    })
-    
-    fig3 = make_subplots(
-        rows=4, cols=1,
-        subplot_titles=(
-            'High Yield Spread vs S&P 500 / BTC (Z-score)',
-            f'HY Spread 상관계수 ({window}일 롤링)',
-            'Divergence 감지: S&P 상승 + HY Spread 상승 (매도 신호)',
-            'HY Spread 원본 차트'
-        ),
-        vertical_spacing=0.08,
-        row_heights=[0.3, 0.25, 0.25, 0.20]
-    )
-    
-    # 첫 번째 차트: HY Spread vs S&P 500 & BTC (Z-score)
-    fig3.add_trace(
-        go.Scatter(x=df_z3.index, y=df_z3['HYSpread'],
-                   name='HY Spread',
-                   line=dict(color='#D62828', width=2.5)),
-        row=1, col=1
-    )
-    fig3.add_trace(
-        go.Scatter(x=df_z3.index, y=df_z3['SP500'],
-                   name='S&P 500',
-                   line=dict(color='#2E86AB', width=2.5)),
-        row=1, col=1
-    )
-    fig3.add_trace(
-        go.Scatter(x=df_z3.index, y=df_z3['BTC'],
-                   name='Bitcoin',
-                   line=dict(color='#F77F00', width=2)),
-        row=1, col=1
-    )
-    fig3.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=1, col=1)
-    
-    # 두 번째 차트: 상관계수
-    fig3.add_trace(
-        go.Scatter(x=corr_hy_sp.index, y=corr_hy_sp,
-                   name='Corr(HY, S&P500)',
-                   line=dict(color='#2E86AB', width=2.5),
-                   fill='tozeroy', fillcolor='rgba(46, 134, 171, 0.3)'),
-        row=2, col=1
-    )
-    fig3.add_trace(
-        go.Scatter(x=corr_hy_btc.index, y=corr_hy_btc,
-                   name='Corr(HY, BTC)',
-                   line=dict(color='#F77F00', width=2.5),
-                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.3)'),
-        row=2, col=1
-    )
-    fig3.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=1)
-    
-    # 세 번째 차트: Divergence (원본 가격 유지)
-    fig3.add_trace(
-        go.Scatter(x=df_recent.index, y=df_recent['SP500'],
-                   name='S&P 500',
-                   line=dict(color='#2E86AB', width=2), opacity=0.6),
-        row=3, col=1
-    )
-    fig3.add_trace(
-        go.Scatter(x=df_recent[divergence].index,
-                   y=df_recent.loc[divergence, 'SP500'],
-                   name='Divergence 경고 ⚠️',
-                   mode='markers',
-                   marker=dict(color='red', size=10, symbol='diamond')),
-        row=3, col=1
-    )
-    
-    # 네 번째 차트: HY Spread 원본
-    fig3.add_trace(
-        go.Scatter(x=df_recent.index, y=df_recent['HYSpread'],
-                   name='HY Spread',
-                   line=dict(color='#D62828', width=2.5),
-                   fill='tozeroy', fillcolor='rgba(214, 40, 40, 0.2)'),
-        row=4, col=1
-    )
-    fig3.add_hline(y=4.0, line_dash="dot", line_color="orange", opacity=0.7,
-                   annotation_text="경계 (4%)", row=4, col=1)
-    fig3.add_hline(y=5.0, line_dash="dash", line_color="darkred", opacity=0.8,
-                   annotation_text="위험 (5%)", row=4, col=1)
-    
-    fig3.update_layout(
-        height=1400,
-        showlegend=True,
-        hovermode='x unified',
-        template='plotly_white'
-    )
-    
-    fig3.update_yaxes(title_text="Z-score", row=1, col=1)
-    fig3.update_yaxes(title_text="Correlation", row=2, col=1)
-    fig3.update_yaxes(title_text="S&P 500", row=3, col=1)
-    fig3.update_yaxes(title_text="HY Spread (%)", row=4, col=1)
-    
-    st.plotly_chart(fig3, use_container_width=True)
+    st.plotly_chart(figures['credit'], use_container_width=True)
     
     st.markdown("### 📌 분석 인사이트")
     
@@ -1398,7 +1034,7 @@ with tab3:
         if recent_divergence > 0:
             st.error(f"""
             ⚠️ **경고 발생**
-            - 최근 5일 중 {recent_divergence}일
+            - 최근 {DIVERGENCE_RECENT_DAYS}일 중 {recent_divergence}일
             - S&P↑ + HY Spread↑
             - 허위 랠리 가능성
             """)
@@ -1440,164 +1076,72 @@ with tab3:
         - 신용 시장 안정
         - 다른 지표 참고
         """)
+
+    st.markdown("---")
+    st.markdown("### 🔎 Divergence 스캐너")
+    st.markdown("**위험자산 상승 & 스트레스 지표(HY Spread / DXY) 상승이 동시에 나타난 구간**")
+
+    scan_col1, scan_col2 = st.columns([3, 1])
+    with scan_col1:
+        scan_horizons = st.multiselect(
+            "기간 (영업일)",
+            [5, 10, 20, 40, 60, 90, 120, 180, 250],
+            default=list(DEFAULT_HORIZONS)
+        )
+    with scan_col2:
+        min_episode_days = st.number_input("최소 지속 (영업일)", min_value=1, max_value=250, value=5)
+
+    if not scan_horizons:
+        st.info("기간을 하나 이상 선택하세요.")
+    else:
+        # 분석 프레임에만 의존하므로 윈도우 / 가중 방식과 무관한 키로 세션 간 공유
+        # (scan_divergence 가 기간을 정렬 / 중복 제거하므로 키도 선택 순서와 무관하게 정규화)
+        scan = analytics_store.warm(
+            ('divergence_scan', analytics_key[0], tuple(sorted(set(scan_horizons)))),
+            lambda: scan_divergence(df_recent, scan_horizons)
+        )
+        scan_summary = scan.summary()
+        st.caption(
+            f"{len(scan.combos())}개 조합 (기간 {len(scan.horizons)} × 자산 {len(scan.assets)} × 지표 {len(scan.indicators)}) · "
+            f"현재 진행 중 {int(scan_summary['현재'].sum())}개"
+        )
+        st.dataframe(
+            scan_summary.round(1),
+            use_container_width=True,
+            hide_index=True,
+            column_config={"현재": st.column_config.CheckboxColumn("현재")}
+        )
+
+        episodes = scan.episodes()
+        episode_query = st.text_input("에피소드 검색 (자산 / 지표, 예: BTC DXY)", "")
+        for term in episode_query.split():
+            episodes = episodes[
+                episodes['자산'].str.contains(term, case=False)
+                | episodes['지표'].str.contains(term, case=False)
+            ]
+        episodes = episodes[episodes['지속(영업일)'] >= min_episode_days]
+        st.dataframe(
+            episodes.sort_values('시작', ascending=False),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "시작": st.column_config.DateColumn("시작"),
+                "끝": st.column_config.DateColumn("끝"),
+            }
+        )
+        st.caption(f"에피소드 {len(episodes):,}개 (최소 {min_episode_days}영업일 이상)")
 # ============================================================
 # TAB 4: 종합 대시보드 (업데이트)
 # ============================================================
 with tab4:
     st.header("🎯 종합 대시보드")
     
-    # Z-score 데이터 준비 (TAB 4용)
-    df_z_combo1 = df_recent[['NetLiq', 'BTC', 'NASDAQ']].apply(zscore)
-    df_z_combo2 = pd.DataFrame({
-        'DXY_Inverted': zscore(-df_recent['DXY']),
-        'BTC': zscore(df_recent['BTC']),
-        'SP500': zscore(df_recent['SP500'])
-    })
-    df_z_combo3 = pd.DataFrame({
-        'HYSpread': zscore(df_recent['HYSpread']),
-        'SP500': zscore(df_recent['SP500']),
-        'BTC': zscore(df_recent['BTC'])
-    })
-    
-    fig_dashboard = make_subplots(
-        rows=3, cols=2,
-        subplot_titles=(
-            'Net Liquidity + BTC/NASDAQ (Z-score)',
-            '상관계수 히트맵',
-            'Dollar Index (반전) vs BTC/S&P500 (Z-score)',
-            'DXY 상관계수',
-            'HY Spread vs S&P500/BTC (Z-score)',
-            'HY Spread 상관계수'
-        ),
-        specs=[
-            [{"type": "xy"}, {"type": "heatmap"}],
-            [{"type": "xy"}, {"type": "xy"}],
-            [{"type": "xy"}, {"type": "xy"}]
-        ],
-        vertical_spacing=0.12,
-        horizontal_spacing=0.12,
-        row_heights=[0.33, 0.33, 0.34]
-    )
-    
-    # Row 1, Col 1: Net Liquidity
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo1.index, y=df_z_combo1['NetLiq'],
-                   name='Net Liquidity', line=dict(color='#2E86AB', width=2)),
-        row=1, col=1
-    )
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo1.index, y=df_z_combo1['BTC'],
-                   name='Bitcoin', line=dict(color='#F77F00', width=2)),
-        row=1, col=1
-    )
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo1.index, y=df_z_combo1['NASDAQ'],
-                   name='NASDAQ', line=dict(color='#06A77D', width=2)),
-        row=1, col=1
-    )
-    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=1, col=1)
-    
-    # Row 1, Col 2: 상관계수 히트맵
-    fig_dashboard.add_trace(
-        go.Heatmap(
-            z=corr_matrix.values,
-            x=corr_matrix.columns,
-            y=corr_matrix.columns,
-            colorscale='RdYlGn',
-            zmid=0,
-            zmin=-1,
-            zmax=1,
-            text=np.round(corr_matrix.values, 2),
-            texttemplate='%{text}',
-            textfont={"size": 10},
-            colorbar=dict(title="Correlation")
-        ),
-        row=1, col=2
-    )
-    
-    # Row 2, Col 1: DXY vs BTC/S&P500
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo2.index, y=df_z_combo2['DXY_Inverted'],
-                   name='DXY (반전)', line=dict(color='#D62828', width=2)),
-        row=2, col=1
-    )
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo2.index, y=df_z_combo2['BTC'],
-                   name='BTC', line=dict(color='#F77F00', width=2)),
-        row=2, col=1
-    )
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo2.index, y=df_z_combo2['SP500'],
-                   name='S&P500', line=dict(color='#2E86AB', width=2)),
-        row=2, col=1
-    )
-    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=1)
-    
-    # Row 2, Col 2: DXY 상관계수
-    fig_dashboard.add_trace(
-        go.Scatter(x=corr_dxy_btc.index, y=corr_dxy_btc,
-                   name='Corr(DXY, BTC)', line=dict(color='#F77F00', width=2),
-                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.2)'),
-        row=2, col=2
-    )
-    fig_dashboard.add_trace(
-        go.Scatter(x=corr_dxy_sp.index, y=corr_dxy_sp,
-                   name='Corr(DXY, S&P500)', line=dict(color='#2E86AB', width=2),
-                   fill='tozeroy', fillcolor='rgba(46, 134, 171, 0.2)'),
-        row=2, col=2
-    )
-    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=2)
-    
-    # Row 3, Col 1: HY Spread vs S&P500/BTC (Z-score)
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo3.index, y=df_z_combo3['HYSpread'],
-                   name='HY Spread', line=dict(color='#D62828', width=2.5)),
-        row=3, col=1
-    )
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo3.index, y=df_z_combo3['SP500'],
-                   name='S&P 500', line=dict(color='#2E86AB', width=2)),
-        row=3, col=1
-    )
-    fig_dashboard.add_trace(
-        go.Scatter(x=df_z_combo3.index, y=df_z_combo3['BTC'],
-                   name='Bitcoin', line=dict(color='#F77F00', width=1.5), opacity=0.7),
-        row=3, col=1
-    )
-    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=1)
-    
-    # Row 3, Col 2: HY Spread 상관계수
-    fig_dashboard.add_trace(
-        go.Scatter(x=corr_hy_sp.index, y=corr_hy_sp,
-                   name='Corr(HY, S&P500)', line=dict(color='#2E86AB', width=2),
-                   fill='tozeroy', fillcolor='rgba(46, 134, 171, 0.2)'),
-        row=3, col=2
-    )
-    fig_dashboard.add_trace(
-        go.Scatter(x=corr_hy_btc.index, y=corr_hy_btc,
-                   name='Corr(HY, BTC)', line=dict(color='#F77F00', width=2),
-                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.2)'),
-        row=3, col=2
-    )
-    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=2)
-    
-    fig_dashboard.update_layout(
-        height=1400,
-        showlegend=True,
-        hovermode='x unified',
-        template='plotly_white'
-    )
-    
-    fig_dashboard.update_yaxes(title_text="Z-score", row=1, col=1)
-    fig_dashboard.update_yaxes(title_text="Z-score", row=2, col=1)
-    fig_dashboard.update_yaxes(title_text="Correlation", row=2, col=2)
-    fig_dashboard.update_yaxes(title_text="Z-score", row=3, col=1)
-    fig_dashboard.update_yaxes(title_text="Correlation", row=3, col=2)
+    st.plotly_chart(figures['dashboard'], use_container_width=True)
     
-    st.plotly_chart(fig_dashboard, use_container_width=True)
-    
-    st.markdown("### 📊 상관계수 매트릭스 (상세)")
+    st.markdown(f"### 📊 상관계수 매트릭스 (상세 · {CORRELATION_MODES[corr_mode]})")
     st.dataframe(corr_matrix.round(3), use_container_width=True)
+    with st.expander("🔍 기준별 비교 (주요 쌍)"):
+        st.dataframe(analytics.correlation_modes_table().round(3), use_container_width=True)
     
     st.markdown("---")
     st.markdown("### 📈 주요 상관관계 요약")
@@ -1628,6 +1172,70 @@ with tab4:
         - vs S&P500: {corr_matrix.loc['HYSpread', 'SP500']:.3f}
         """)
 
+    st.markdown("---")
+    st.markdown("### 📏 롤링 상관계수 신뢰구간")
+
+    sig_col1, sig_col2 = st.columns(2)
+    with sig_col1:
+        use_bootstrap = st.toggle(
+            "블록 부트스트랩",
+            value=False,
+            help="윈도우마다 블록 단위로 재표본을 뽑아 자기상관을 반영한 신뢰구간을 계산합니다 (롤링 모드 전용)",
+            disabled=halflife is not None
+        ) and halflife is None
+    with sig_col2:
+        bootstrap_draws = st.select_slider(
+            "재표본 수",
+            options=[500, 1000, 2000, 5000],
+            value=1000,
+            disabled=not use_bootstrap
+        )
+
+    def build_significance(draws):
+        """부트스트랩 신뢰구간(선택)과 신뢰구간 차트 생성 (세션 간 공유)"""
+        bootstrap = None
+        if draws:
+            bootstrap = bootstrap_rolling_bands(
+                ret, ROLLING_PAIRS, window, draws=draws, executor=get_worker_pool()
+            )
+        return bootstrap, build_significance_figure(analytics, analytics.effective_window, bootstrap)
+
+    significance_draws = bootstrap_draws if use_bootstrap else 0
+    with st.spinner("🔁 부트스트랩 계산 중..." if use_bootstrap else "신뢰구간 계산 중..."):
+        bootstrap, significance_figure = significance_store.acquire(
+            session_id,
+            (analytics_key, significance_draws),
+            lambda: build_significance(significance_draws)
+        )
+
+    st.plotly_chart(significance_figure, use_container_width=True)
+    st.dataframe(
+        significance_table(analytics.rolling_correlations(), ROLLING_PAIRS, analytics.effective_window, bootstrap).round(3),
+        use_container_width=True
+    )
+    st.caption(
+        f"음영: Fisher-z 95% 신뢰구간 ({analytics.weighting}"
+        + (f", 유효 표본 {analytics.effective_window}일)" if halflife else ")")
+        + (f" · 점선: 블록 부트스트랩 95% (재표본 {bootstrap.draws:,}회, 블록 {bootstrap.block}일)" if bootstrap else "")
+        + " · p-value < 0.05 이면 '무상관' 가설 기각"
+    )
+
+    st.markdown("---")
+    st.markdown("### 📐 롤링 베타 · 편상관계수 (다변량 회귀)")
+    st.plotly_chart(regression_figure, use_container_width=True)
+
+    reg_col1, reg_col2 = st.columns([3, 1])
+    with reg_col1:
+        st.dataframe(regression.latest().round(3), use_container_width=True)
+    with reg_col2:
+        for target in regression.targets:
+            st.metric(f"{target} 설명력 (R²)", f"{regression.r_squared[target].iloc[-1]:.1%}")
+    st.caption(
+        f"일간 수익률 기준 {analytics.weighting} 회귀: 대상 ~ NetLiq + DXY + HYSpread (동시 추정) · "
+        "편상관 = 나머지 두 요인을 통제한 상관 · 표준화 베타 = 베타 × σ요인 / σ대상 · "
+        "가격 수준 상관계수와 달리 추세에 의한 허위 상관이 섞이지 않음"
+    )
+
 # ============================================================
 # TAB 5: 트레이딩 시그널 (기존 유지)
 # ============================================================
@@ -1708,7 +1316,7 @@ with tab5:
         st.markdown("---")
         st.error(f"""
         🚨 **Divergence 경고**
-        - 최근 5일 중 {recent_divergence}일 Divergence 발생
+        - 최근 {DIVERGENCE_RECENT_DAYS}일 중 {recent_divergence}일 Divergence 발생
         - S&P 500 상승 + HY Spread 상승
         - 허위 랠리 가능성 (Bear Market Rally)
         - **추천**: 매도 신호, 이익실현 고려
@@ -1775,6 +1383,212 @@ with tab5:
             - 현금 보유 권장
             """)
 
+    st.markdown("---")
+
+    st.subheader("🧭 HMM 레짐 (유동성 · 달러 · 신용)")
+    if regimes is None:
+        st.info("레짐 추정에 필요한 데이터가 부족합니다.")
+    else:
+        current_regime = regimes.current.idxmax()
+        regime_col1, regime_col2, regime_col3 = st.columns(3)
+        with regime_col1:
+            st.metric("현재 레짐", current_regime, f"확률 {regimes.current.max():.0%}", delta_color="off")
+        with regime_col2:
+            st.metric("기대 지속 기간", f"{regimes.expected_duration()[current_regime]:.0f}주")
+        with regime_col3:
+            st.metric(
+                "모델 갱신",
+                f"EM {regimes.iterations}회",
+                "이전 모델에서 갱신" if regimes.warm_start else "새로 적합",
+                delta_color="off"
+            )
+
+        regime_figure = regime_store.warm(
+            (regimes.version, analytics_key[0]), lambda: build_regime_figure(regimes, df_recent.index)
+        )
+        st.plotly_chart(regime_figure, use_container_width=True)
+
+        regime_detail1, regime_detail2 = st.columns(2)
+        with regime_detail1:
+            st.markdown("**레짐별 지표 평균**")
+            st.dataframe(regimes.state_means.round(2), use_container_width=True)
+        with regime_detail2:
+            st.markdown("**주간 전이확률**")
+            st.dataframe(regimes.transition.round(3), use_container_width=True)
+        st.caption(
+            "3-상태 Gaussian HMM (주간 표본, 전체 이력 기준) · 현재 레짐은 미래 정보 없이 계산한 필터링 확률, "
+            "차트는 평활 확률 · 사이드바 '🧭 레짐 배경 표시'로 다른 탭 차트에도 표시"
+        )
+
+    st.markdown("---")
+
+    st.subheader("🗂️ 시그널 전환 이력")
+    if history_df is None:
+        st.info("이벤트 인덱스에 필요한 데이터가 부족합니다.")
+    else:
+        history_key = (data_version(history_df), window, halflife)
+        event_index = event_store.acquire(
+            session_id,
+            history_key,
+            lambda: build_event_index(history_df, window, halflife)
+        )
+        event_col1, event_col2, event_col3 = st.columns([1, 2, 1])
+        with event_col1:
+            event_signal = st.selectbox("시그널", ["전체"] + list(SIGNALS), key="event_signal")
+        with event_col2:
+            event_states = st.multiselect(
+                "전환 후 상태",
+                SIGNALS[event_signal] if event_signal != "전체" else [],
+                disabled=event_signal == "전체",
+                key="event_states",
+                help="비워두면 모든 상태"
+            )
+        with event_col3:
+            event_visible_only = st.checkbox("분석 기간만", value=False, key="event_visible_only")
+
+        events = event_index.query(
+            signal=None if event_signal == "전체" else event_signal,
+            states=event_states or None,
+            start=df_recent.index[0] if event_visible_only else None,
+            end=df_recent.index[-1] if event_visible_only else None,
+        )
+
+        events_col1, events_col2, events_col3 = st.columns(3)
+        with events_col1:
+            st.metric("전환 이벤트", f"{len(events):,}건")
+        with events_col2:
+            finished = events.loc[~events['진행 중'], '지속(영업일)']
+            st.metric("평균 지속", f"{finished.mean():.0f}영업일" if len(finished) else "–")
+        with events_col3:
+            st.metric("마지막 전환", f"{events['날짜'].iloc[-1]:%Y-%m-%d}" if len(events) else "–")
+
+        st.dataframe(
+            events.iloc[::-1].round(2),
+            use_container_width=True,
+            hide_index=True,
+            column_config={'날짜': st.column_config.DateColumn('날짜', format="YYYY-MM-DD")}
+        )
+        st.caption(
+            f"전체 이력({history_df.index[0]:%Y-%m-%d}~)의 상태 전환을 갱신마다 한 번에 인덱싱 · "
+            f"DXY-BTC 상관은 {analytics.weighting} · "
+            f"Divergence 는 최근 {DIVERGENCE_RECENT_DAYS}영업일 중 S&P 500 / HY Spread 20일 동반 상승이 "
+            "한 번이라도 있었는지 (트레이딩 시그널 탭과 같은 기준) · 지표 값은 전환 당일 기준"
+        )
+
+        st.markdown("---")
+
+        st.subheader("🔮 시그널 상태별 미래 수익률")
+        conditional = forward_store.acquire(
+            session_id,
+            history_key,
+            lambda: build_conditional_returns(history_df, event_index.states)
+        )
+        forward_col1, forward_col2 = st.columns([2, 1])
+        with forward_col1:
+            forward_signal = st.selectbox("조건 시그널", list(SIGNALS), key="forward_signal")
+        with forward_col2:
+            forward_horizon = st.radio(
+                "보유 기간",
+                FORWARD_HORIZONS,
+                index=1,
+                format_func=lambda days: f"{days}일",
+                horizontal=True,
+                key="forward_horizon"
+            )
+
+        forward_figure = forward_store.warm(
+            (history_key, forward_signal, forward_horizon),
+            lambda: build_forward_return_figure(conditional, forward_signal, forward_horizon)
+        )
+        st.plotly_chart(forward_figure, use_container_width=True)
+        st.dataframe(
+            conditional.quantile_table(forward_signal, forward_horizon).round(2),
+            use_container_width=True
+        )
+        st.caption(
+            f"전체 이력의 매 영업일을 그날의 '{forward_signal}' 상태로 분류해 이후 {forward_horizon}영업일 수익률 분포를 집계 · "
+            "미래 수익률 행렬은 데이터 갱신마다 한 번 계산해 모든 조건에 재사용 · "
+            "기간이 겹치는 표본이라 서로 독립이 아님에 유의"
+        )
+
+# ============================================================
+# TAB 8: 유동성 충격 시나리오
+# AI 분석 탭이 같은 실행의 시나리오 결과를 쓰도록 TAB 6 보다 먼저 실행 (화면의 탭 순서는 그대로)
+# ============================================================
+def build_scenario(shocks, horizon, paths, spillover):
+    """시나리오 몬테카를로 결과와 차트 생성 (세션 간 공유)"""
+    result = simulate_scenario(scenario_model, shocks, horizon=horizon, paths=paths, spillover=spillover)
+    return result, build_scenario_figure(result)
+
+with tab8:
+    st.header("🧪 유동성 충격 시나리오")
+    st.markdown("**Net Liquidity 구성 요소에 충격을 주고 롤링 다변량 회귀 베타로 BTC / NASDAQ 반응을 투영**")
+
+    scenario_model = build_scenario_model(analytics, regression, halflife)
+    scenario = None
+    if not scenario_model.levels:
+        st.info("💡 Net Liquidity 구성 요소(WALCL, TGA, RRP) 데이터가 없어 시나리오를 계산할 수 없습니다.")
+    else:
+        sc_col1, sc_col2, sc_col3, sc_col4 = st.columns([2, 1, 1, 1])
+        with sc_col1:
+            scenario_preset = st.selectbox("프리셋", list(SCENARIO_PRESETS), index=1, key="scenario_preset")
+        with sc_col2:
+            scenario_horizon = st.slider("반영 기간 (영업일)", 20, 250, SCENARIO_HORIZON, step=10, key="scenario_horizon")
+        with sc_col3:
+            scenario_paths = st.select_slider(
+                "경로 수", options=list(SCENARIO_PATH_OPTIONS), value=SCENARIO_PATHS,
+                format_func=lambda paths: f"{paths:,}", key="scenario_paths"
+            )
+        with sc_col4:
+            scenario_spillover = st.toggle(
+                "요인 동반 이동", value=True, key="scenario_spillover",
+                help="켜면 DXY / HY Spread 도 NetLiq 과의 공분산에 따라 함께 움직인다고 가정 (간접 효과)"
+            )
+
+        preset = preset_shocks(scenario_preset, scenario_model.levels)
+        shock_columns = st.columns(len(scenario_model.levels))
+        scenario_shocks = {}
+        for column, (component, level) in zip(shock_columns, scenario_model.levels.items()):
+            with column:
+                # 프리셋이 바뀌면 입력값도 프리셋 기본값으로 초기화 (키에 프리셋 이름 포함)
+                scenario_shocks[component] = st.number_input(
+                    f"{component} 변화 (십억 달러, 현재 {level:,.0f})",
+                    min_value=-float(round(level)), value=float(round(preset.get(component, 0.0))), step=50.0,
+                    key=f"scenario_{component}_{scenario_preset}"
+                )
+        scenario_shocks = {component: value for component, value in scenario_shocks.items() if value}
+
+        scenario, scenario_figure = scenario_store.acquire(
+            session_id,
+            (analytics_key, tuple(sorted(scenario_shocks.items())), scenario_horizon, scenario_paths, scenario_spillover),
+            lambda: build_scenario(scenario_shocks, scenario_horizon, scenario_paths, scenario_spillover)
+        )
+
+        scenario_summary = scenario.summary()
+        metric_columns = st.columns(1 + len(scenario_model.targets))
+        with metric_columns[0]:
+            st.metric("Net Liquidity 변화", f"{scenario.netliq_change:+,.0f}B", f"{scenario.netliq_change_pct:+.2f}%")
+        for column, target in zip(metric_columns[1:], scenario_model.targets):
+            with column:
+                st.metric(
+                    f"{target} 기대 효과",
+                    f"{scenario_summary.loc[target, '합계(%)']:+.2f}%",
+                    f"상승 확률 {scenario_summary.loc[target, '상승 확률(%)']:.0f}%",
+                    delta_color="off"
+                )
+
+        st.plotly_chart(scenario_figure, use_container_width=True)
+        st.dataframe(scenario_summary.round(2), use_container_width=True)
+        st.caption(
+            f"{scenario_model.weighting} 다변량 회귀(대상 ~ NetLiq + DXY + HYSpread) 최신 베타와 요인 / 잔차 공분산으로 "
+            f"{scenario.paths:,}개 경로 생성 · 충격은 {scenario.horizon}영업일에 걸쳐 균등 반영 · "
+            "직접 = NetLiq 베타 경로, 간접 = 함께 움직이는 DXY / HY Spread 경로 · 충격 외 추세는 0 으로 가정 · "
+            f"기준일 {scenario_model.as_of:%Y-%m-%d}"
+        )
+        with st.expander("🤖 AI 분석에 전달되는 시나리오 요약"):
+            st.code(scenario.to_prompt(), language=None)
+            st.caption("AI 분석 탭에서 '시나리오 결과 포함'을 켜면 이 요약이 프롬프트에 추가됩니다.")
+
 # ============================================================
 # TAB 6: AI 분석 (기존 유지)
 # ============================================================
@@ -1793,331 +1607,377 @@ with tab6:
         
         API 키 발급: https://aistudio.google.com/app/apikey
         """)
-        st.stop()
-    
-    st.markdown("---")
-    
-    # 분석 모드 선택
-    col1, col2, col3 = st.columns([2, 1, 1])
-    
-    with col1:
-        analysis_type = st.selectbox(
-            "📊 분석 유형 선택",
-            ["종합분석", "유동성분석", "달러분석", "신용분석", "트레이딩전략"],
-            help="원하는 분석 유형을 선택하세요"
-        )
-    
-    with col2:
-        # Deep Dive 모드 토글
-        deep_dive_mode = st.toggle(
-            "🔬 Deep Dive",
-            help="심층 분석 모드: 더 상세하고 깊이 있는 분석을 제공합니다 (응답 시간이 더 걸립니다)"
-        )
-    
-    with col3:
-        st.metric("🔋 API 상태", "활성화" if GEMINI_ENABLED else "비활성화")
-    
-    # Deep Dive 모드 설명
-    if deep_dive_mode:
-        st.info("""
-        🔬 **Deep Dive 모드 활성화**
+    else:
+        st.markdown("---")
         
-        이 모드에서는 다음과 같은 심층 분석을 제공합니다:
-        - 📈 시계열 추세 및 변동성 분석
-        - 🎯 다중 시나리오 분석 (Bull/Base/Bear Case)
-        - ⚠️ 리스크 매트릭스 및 스트레스 테스트
-        - 💰 구체적인 진입/청산 가격 제시
-        - 📊 포트폴리오 배분 및 리밸런싱 전략
-        - ✅ 실행 가능한 체크리스트
+        # 분석 모드 선택
+        col1, col2, col3 = st.columns([2, 1, 1])
         
-        ⏱️ 분석 시간: 약 30-60초 소요
-        """)
-    
-    # 분석 실행 버튼
-    button_label = "🚀 Deep Dive 분석 실행" if deep_dive_mode else "🚀 AI 분석 실행"
-    
-    if st.button(button_label, type="primary", use_container_width=True):
-        # 데이터 요약 생성
-        data_summary = get_data_summary(df_recent, latest, netliq_60d)
-        correlations = get_correlations_summary(corr_matrix)
-        signals = get_signals_summary(netliq_60d, latest, corr_dxy_btc.iloc[-1], recent_divergence)
-        
-        # AI 분석 실행 (모드에 따라 다른 함수 호출)
-        if deep_dive_mode:
-            analysis_result = analyze_with_gemini_deep_dive(
-                analysis_type,
-                data_summary,
-                correlations,
-                signals,
-                df_recent,
-                latest
-            )
-            analysis_label = f"Deep Dive {analysis_type}"
-        else:
-            analysis_result = analyze_with_gemini(
-                analysis_type,
-                data_summary,
-                correlations,
-                signals
+        with col1:
+            analysis_type = st.selectbox(
+                "📊 분석 유형 선택",
+                ANALYSIS_TYPES,
+                help="원하는 분석 유형을 선택하세요"
             )
-            analysis_label = analysis_type
         
-        # 결과 표시
-        st.markdown("---")
-        
-        # 분석 메타 정보
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("📊 분석 유형", analysis_label)
         with col2:
-            st.metric("🔬 모드", "Deep Dive" if deep_dive_mode else "Standard")
-        with col3:
-            st.metric("⏰ 생성 시각", datetime.now().strftime("%H:%M:%S"))
-        
-        st.markdown(f"### 📊 {analysis_label} 결과")
+            # Deep Dive 모드 토글
+            deep_dive_mode = st.toggle(
+                "🔬 Deep Dive",
+                help="심층 분석 모드: 더 상세하고 깊이 있는 분석을 제공합니다 (응답 시간이 더 걸립니다)"
+            )
         
-        # 분석 결과를 박스에 표시
-        st.markdown(
-            f"""
-            <div style='background-color: #f0f2f6; padding: 20px; border-radius: 10px; border-left: 5px solid {"#FF6B35" if deep_dive_mode else "#2E86AB"};'>
-            {analysis_result.replace('\n', '<br>')}
-            </div>
-            """,
-            unsafe_allow_html=True
+        with col3:
+            st.metric("🔋 API 상태", "활성화" if GEMINI_ENABLED else "비활성화")
+
+        scenario_prompt = scenario.to_prompt() if scenario is not None else None
+        include_scenario = st.toggle(
+            "🧪 시나리오 결과 포함",
+            value=scenario_prompt is not None,
+            disabled=scenario_prompt is None,
+            help="시나리오 탭에서 설정한 유동성 충격 시뮬레이션 결과를 프롬프트에 추가합니다"
+        )
+        refresh_analysis = st.toggle(
+            "🔄 캐시 무시하고 새로 생성",
+            help=f"같은 데이터 · 같은 설정의 분석은 {RESPONSE_TTL // 3600}시간 동안 저장된 응답을 재사용합니다"
         )
         
-        # 액션 버튼들
-        col1, col2, col3 = st.columns(3)
+        # Deep Dive 모드 설명
+        if deep_dive_mode:
+            st.info("""
+            🔬 **Deep Dive 모드 활성화**
+            
+            이 모드에서는 다음과 같은 심층 분석을 제공합니다:
+            - 📈 시계열 추세 및 변동성 분석
+            - 🎯 다중 시나리오 분석 (Bull/Base/Bear Case)
+            - ⚠️ 리스크 매트릭스 및 스트레스 테스트
+            - 💰 구체적인 진입/청산 가격 제시
+            - 📊 포트폴리오 배분 및 리밸런싱 전략
+            - ✅ 실행 가능한 체크리스트
+            
+            ⏱️ 분석 시간: 약 30-60초 소요
+            """)
+
+        # Bull/Base/Bear 확률 (전체 이력 데이터 버전별로 한 번 계산, Deep Dive 프롬프트에 주입)
+        outlook = None
+        if deep_dive_mode and history_df is not None:
+            with st.spinner("🎲 시나리오 확률 계산 중..."):
+                outlook = outlook_store.acquire(
+                    session_id,
+                    (data_version(history_df),),
+                    lambda: estimate_outlook(history_df, executor=get_worker_pool())
+                )
+            with st.expander("🎲 Bull / Base / Bear 확률 (블록 부트스트랩)"):
+                st.dataframe(outlook.probability_table().round(1), use_container_width=True)
+                st.dataframe(outlook.range_table().round(1), use_container_width=True)
+                st.dataframe(outlook.primary().composite.round(1), use_container_width=True)
+                st.caption(
+                    f"{', '.join(outlook.columns)} 일간 수익률을 {outlook.block}일 블록으로 함께 재표본해 "
+                    f"{outlook.horizon}영업일 경로 {outlook.draws:,}개 생성 · "
+                    f"위험자산({', '.join(outlook.risk_assets)}) 동일가중 수익률 ±{outlook.threshold:.0f}% 기준으로 분류 · "
+                    f"현재 Net Liquidity 상태: {outlook.state} · Deep Dive 프롬프트의 시나리오 확률로 사용"
+                )
         
-        with col1:
-            # 다운로드 버튼
-            st.download_button(
-                "📥 분석 결과 다운로드",
-                analysis_result,
-                file_name=f"gemini_{analysis_type}_{('deep_dive_' if deep_dive_mode else '')}{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
+        # 분석 실행 버튼
+        button_label = "🚀 Deep Dive 분석 실행" if deep_dive_mode else "🚀 AI 분석 실행"
         
-        with col2:
-            # 저장 버튼
-            if 'analysis_history' not in st.session_state:
-                st.session_state.analysis_history = []
+        if st.button(button_label, type="primary", use_container_width=True):
+            # 데이터 요약 생성
+            data_summary = get_data_summary(df_recent, latest, netliq_60d)
+            correlations = get_correlations_summary(corr_matrix, corr_mode)
+            signals = get_signals_summary(netliq_60d, latest, corr_dxy_btc.iloc[-1], recent_divergence)
             
-            if st.button("💾 분석 결과 저장", use_container_width=True):
-                st.session_state.analysis_history.append({
-                    'timestamp': datetime.now(),
-                    'type': analysis_label,
-                    'mode': 'Deep Dive' if deep_dive_mode else 'Standard',
-                    'result': analysis_result
-                })
-                st.success("✅ 분석 결과가 저장되었습니다!")
-                st.rerun()
-        
-        with col3:
-            # 다른 모드로 재분석
-            alt_mode_label = "일반 분석으로" if deep_dive_mode else "Deep Dive로"
-            if st.button(f"🔄 {alt_mode_label} 재분석", use_container_width=True):
-                st.info(f"💡 토글을 전환하고 다시 분석 버튼을 눌러주세요.")
+            # AI 분석 실행 (모드에 따라 다른 함수 호출)
+            if deep_dive_mode:
+                analysis_result, generated_at, from_cache = analyze_with_gemini_deep_dive(
+                    analysis_type,
+                    data_summary,
+                    correlations,
+                    signals,
+                    df_recent,
+                    latest,
+                    volatility=(analytics.volatility.iloc[-1], analytics.weighting),
+                    scenario=scenario_prompt if include_scenario else None,
+                    outlook=outlook,
+                    refresh=refresh_analysis
+                )
+                analysis_label = f"Deep Dive {analysis_type}"
+            else:
+                analysis_result, generated_at, from_cache = analyze_with_gemini(
+                    analysis_type,
+                    data_summary,
+                    correlations,
+                    signals,
+                    scenario=scenario_prompt if include_scenario else None,
+                    refresh=refresh_analysis
+                )
+                analysis_label = analysis_type
+            
+            # 결과 표시
+            st.markdown("---")
+            
+            # 분석 메타 정보
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("📊 분석 유형", analysis_label)
+            with col2:
+                st.metric("🔬 모드", "Deep Dive" if deep_dive_mode else "Standard")
+            with col3:
+                generated = datetime.fromtimestamp(generated_at) if generated_at is not None else datetime.now()
+                st.metric(
+                    "⏰ 생성 시각", generated.strftime("%m-%d %H:%M:%S"),
+                    "캐시된 응답" if from_cache else None, delta_color="off"
+                )
+            if from_cache:
+                st.caption(
+                    f"💾 {(datetime.now() - generated).total_seconds() / 60:.0f}분 전에 생성해 저장된 응답입니다 "
+                    "(같은 데이터 · 같은 설정). 새 응답이 필요하면 '캐시 무시하고 새로 생성' 을 켜고 다시 실행하세요."
+                )
+            
+            st.markdown(f"### 📊 {analysis_label} 결과")
+            
+            # 분석 결과를 박스에 표시
+            st.markdown(
+                f"""
+                <div style='background-color: #f0f2f6; padding: 20px; border-radius: 10px; border-left: 5px solid {"#FF6B35" if deep_dive_mode else "#2E86AB"};'>
+                {analysis_result.replace('\n', '<br>')}
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+            
+            # 액션 버튼들
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                # 다운로드 버튼
+                st.download_button(
+                    "📥 분석 결과 다운로드",
+                    analysis_result,
+                    file_name=f"gemini_{analysis_type}_{('deep_dive_' if deep_dive_mode else '')}{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                    mime="text/plain",
+                    use_container_width=True
+                )
+            
+            with col2:
+                # 저장 버튼
+                if 'analysis_history' not in st.session_state:
+                    st.session_state.analysis_history = []
+                
+                if st.button("💾 분석 결과 저장", use_container_width=True):
+                    st.session_state.analysis_history.append({
+                        'timestamp': datetime.now(),
+                        'type': analysis_label,
+                        'mode': 'Deep Dive' if deep_dive_mode else 'Standard',
+                        'result': analysis_result
+                    })
+                    st.success("✅ 분석 결과가 저장되었습니다!")
+                    st.rerun()
+            
+            with col3:
+                # 다른 모드로 재분석
+                alt_mode_label = "일반 분석으로" if deep_dive_mode else "Deep Dive로"
+                if st.button(f"🔄 {alt_mode_label} 재분석", use_container_width=True):
+                    st.info(f"💡 토글을 전환하고 다시 분석 버튼을 눌러주세요.")
 
 
-    # 저장된 분석 히스토리 표시
-    if 'analysis_history' in st.session_state and len(st.session_state.analysis_history) > 0:
+        # 저장된 분석 히스토리 표시
+        if 'analysis_history' in st.session_state and len(st.session_state.analysis_history) > 0:
+            st.markdown("---")
+            st.markdown("### 📜 분석 히스토리")
+            
+            # 최근 5개만 표시
+            for idx, item in enumerate(reversed(st.session_state.analysis_history[-5:])):
+                mode_badge = "🔬 Deep Dive" if item['mode'] == 'Deep Dive' else "📊 Standard"
+                with st.expander(f"🕐 {item['timestamp'].strftime('%Y-%m-%d %H:%M:%S')} - {item['type']} ({mode_badge})"):
+                    st.markdown(item['result'])
+            
+            col1, col2 = st.columns([3, 1])
+            with col2:
+                if st.button("🗑️ 히스토리 전체 삭제"):
+                    st.session_state.analysis_history = []
+                    st.rerun()
+        
+        # AI 사용 팁
         st.markdown("---")
-        st.markdown("### 📜 분석 히스토리")
+        st.markdown("### 💡 AI 분석 활용 가이드")
         
-        # 최근 5개만 표시
-        for idx, item in enumerate(reversed(st.session_state.analysis_history[-5:])):
-            mode_badge = "🔬 Deep Dive" if item['mode'] == 'Deep Dive' else "📊 Standard"
-            with st.expander(f"🕐 {item['timestamp'].strftime('%Y-%m-%d %H:%M:%S')} - {item['type']} ({mode_badge})"):
-                st.markdown(item['result'])
+        tab_guide1, tab_guide2, tab_guide3 = st.tabs(["📖 분석 유형별 가이드", "🔬 Deep Dive 가이드", "⚠️ 주의사항"])
         
-        col1, col2 = st.columns([3, 1])
-        with col2:
-            if st.button("🗑️ 히스토리 전체 삭제"):
-                st.session_state.analysis_history = []
-                st.rerun()
-    
-    # AI 사용 팁
-    st.markdown("---")
-    st.markdown("### 💡 AI 분석 활용 가이드")
-    
-    tab_guide1, tab_guide2, tab_guide3 = st.tabs(["📖 분석 유형별 가이드", "🔬 Deep Dive 가이드", "⚠️ 주의사항"])
-    
-    with tab_guide1:
-        col1, col2 = st.columns(2)
+        with tab_guide1:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("""
+                **Standard 분석 (빠른 인사이트)**
+                - **종합분석**: 전체 시장 상황 요약 (3-5문장)
+                - **유동성분석**: Fed 정책 방향 (2-4문장)
+                - **달러분석**: 달러 강도와 영향 (2-4문장)
+                - **신용분석**: HY Spread 해석 (2-4문장)
+                - **트레이딩전략**: 실행 가능한 전략 (4-6문장)
+                
+                **추천 상황:**
+                - 빠른 시장 체크가 필요할 때
+                - 핵심 포인트만 파악하고 싶을 때
+                - 매일 아침 브리핑용
+                - 5분 이내 빠른 의사결정
+                """)
+            
+            with col2:
+                st.markdown("""
+                **Deep Dive 분석 (전문적 분석)**
+                - **종합분석**: 7가지 관점 심층 분석 (1,500+ 단어)
+                - **유동성분석**: Fed 정책 완전 분석 (1,000+ 단어)
+                - **달러분석**: 글로벌 매크로 분석 (1,000+ 단어)
+                - **신용분석**: 리스크 매트릭스 (1,000+ 단어)
+                - **트레이딩전략**: 구체적 진입/청산가 (1,500+ 단어)
+                
+                **추천 상황:**
+                - 중요한 투자 결정 전
+                - 주간/월간 전략 수립 시
+                - 포트폴리오 리밸런싱 시
+                - 심층 리서치가 필요할 때
+                """)
         
-        with col1:
+        with tab_guide2:
             st.markdown("""
-            **Standard 분석 (빠른 인사이트)**
-            - **종합분석**: 전체 시장 상황 요약 (3-5문장)
-            - **유동성분석**: Fed 정책 방향 (2-4문장)
-            - **달러분석**: 달러 강도와 영향 (2-4문장)
-            - **신용분석**: HY Spread 해석 (2-4문장)
-            - **트레이딩전략**: 실행 가능한 전략 (4-6문장)
+            ### 🔬 Deep Dive 분석의 특징
+            
+            **1. 다중 시나리오 분석**
+            - **Bull Case (낙관적)**: 확률 20-30%, 전개 조건, 가격 타겟
+            - **Base Case (중립적)**: 확률 40-60%, 가장 가능성 높은 시나리오
+            - **Bear Case (비관적)**: 확률 20-30%, 하방 리스크, 방어 전략
+            - 각 시나리오별 구체적 대응 액션 플랜
             
-            **추천 상황:**
-            - 빠른 시장 체크가 필요할 때
-            - 핵심 포인트만 파악하고 싶을 때
-            - 매일 아침 브리핑용
-            - 5분 이내 빠른 의사결정
+            **2. 리스크 매트릭스**
+            - **단기 리스크** (1주-1개월): 즉각 대응 필요
+            - **중기 리스크** (1-3개월): 모니터링 및 준비
+            - **구조적 리스크** (장기): 포트폴리오 구조 조정
+            - **Black Swan 이벤트**: 극단적 시나리오 대비
+            
+            **3. 실행 가능한 트레이딩 전략**
+            - **진입가**: 구체적인 가격 레벨 ($XX,XXX)
+            - **익절가**: 1차/2차/최종 익절 레벨
+            - **손절가**: 명확한 손절 라인
+            - **포지션 사이징**: 총 자산 대비 %
+            - **리밸런싱 트리거**: 언제 조정할 것인가
+            
+            **4. 통계 기반 분석**
+            - **변동성 분석**: 7일/30일/90일 변동성
+            - **상관관계 추세**: 과거 대비 현재 위치
+            - **이동평균**: 단기/중기/장기 MA 배열
+            - **모멘텀 지표**: 과매수/과매도 판단
+            
+            **5. 3개월 로드맵**
+            - **Week 1-2**: 즉시 실행할 전략
+            - **Month 1**: 첫 달 목표와 체크포인트
+            - **Month 2-3**: 중기 포지션 조정 계획
+            - **주요 이벤트**: FOMC, 경제지표 발표 일정
+            
+            **6. 일일/주간 체크리스트**
+            - 매일 확인할 지표 (Net Liq, DXY, HY Spread)
+            - 주간 리뷰 항목 (상관관계, 포트폴리오 성과)
+            - 트리거 이벤트 (포지션 변경 조건)
+            
+            **7. 역사적 패턴 비교**
+            - 과거 유사 상황 분석
+            - Win Rate / Profit Factor 추정
+            - 최대 드로다운 시나리오
             """)
         
-        with col2:
-            st.markdown("""
-            **Deep Dive 분석 (전문적 분석)**
-            - **종합분석**: 7가지 관점 심층 분석 (1,500+ 단어)
-            - **유동성분석**: Fed 정책 완전 분석 (1,000+ 단어)
-            - **달러분석**: 글로벌 매크로 분석 (1,000+ 단어)
-            - **신용분석**: 리스크 매트릭스 (1,000+ 단어)
-            - **트레이딩전략**: 구체적 진입/청산가 (1,500+ 단어)
+        with tab_guide3:
+            st.warning("""
+            ### ⚠️ 중요한 주의사항
             
-            **추천 상황:**
-            - 중요한 투자 결정 전
-            - 주간/월간 전략 수립 시
-            - 포트폴리오 리밸런싱 시
-            - 심층 리서치가 필요할 때
+            **투자 책임**
+            - ❗ AI 분석은 참고용이며, 투자 조언이 아닙니다
+            - ❗ 최종 투자 결정은 본인의 책임입니다
+            - ❗ 여러 정보원을 종합적으로 검토하세요
+            - ❗ 본인의 리스크 허용도를 반드시 고려하세요
+            
+            **API 사용 제한**
+            - 무료 할당량: 일일 1,500 요청, 분당 15 요청
+            - Deep Dive 모드: 더 많은 토큰 소비 (Standard의 3-5배)
+            - 할당량 초과 시: 24시간 후 재시도 또는 유료 전환
+            - 오류 발생 시: 잠시 후 다시 시도
+            
+            **분석 한계**
+            - AI는 과거 데이터 기반으로 학습됨 (2025년 1월까지)
+            - 예측 불가능한 이벤트 미고려 (전쟁, 자연재해 등)
+            - Black Swan 이벤트 대응 한계
+            - 시장은 항상 비이성적일 수 있음
+            
+            **데이터 시차**
+            - FRED 데이터는 1-2일 지연될 수 있음
+            - 실시간 급변 상황 반영 어려움
+            - 최신 뉴스와 교차 검증 필수
+            - 주말/공휴일 데이터 업데이트 없음
+            
+            **AI의 한계**
+            - 확률적 추론이므로 100% 정확도 보장 안 됨
+            - 동일한 입력에도 다른 결과 가능
+            - 맥락 이해 한계 있음
+            - 창의적 해석은 제한적
             """)
-    
-    with tab_guide2:
-        st.markdown("""
-        ### 🔬 Deep Dive 분석의 특징
-        
-        **1. 다중 시나리오 분석**
-        - **Bull Case (낙관적)**: 확률 20-30%, 전개 조건, 가격 타겟
-        - **Base Case (중립적)**: 확률 40-60%, 가장 가능성 높은 시나리오
-        - **Bear Case (비관적)**: 확률 20-30%, 하방 리스크, 방어 전략
-        - 각 시나리오별 구체적 대응 액션 플랜
-        
-        **2. 리스크 매트릭스**
-        - **단기 리스크** (1주-1개월): 즉각 대응 필요
-        - **중기 리스크** (1-3개월): 모니터링 및 준비
-        - **구조적 리스크** (장기): 포트폴리오 구조 조정
-        - **Black Swan 이벤트**: 극단적 시나리오 대비
         
-        **3. 실행 가능한 트레이딩 전략**
-        - **진입가**: 구체적인 가격 레벨 ($XX,XXX)
-        - **익절가**: 1차/2차/최종 익절 레벨
-        - **손절가**: 명확한 손절 라인
-        - **포지션 사이징**: 총 자산 대비 %
-        - **리밸런싱 트리거**: 언제 조정할 것인가
+        # 대화형 챗봇 섹션
+        st.markdown("---")
+        st.markdown("### 💬 AI와 대화하기")
+        st.caption("궁금한 점을 자유롭게 물어보세요. AI가 현재 시장 데이터를 바탕으로 답변합니다.")
         
-        **4. 통계 기반 분석**
-        - **변동성 분석**: 7일/30일/90일 변동성
-        - **상관관계 추세**: 과거 대비 현재 위치
-        - **이동평균**: 단기/중기/장기 MA 배열
-        - **모멘텀 지표**: 과매수/과매도 판단
+        # 세션 상태 초기화
+        if 'chat_messages' not in st.session_state:
+            st.session_state.chat_messages = []
         
-        **5. 3개월 로드맵**
-        - **Week 1-2**: 즉시 실행할 전략
-        - **Month 1**: 첫 달 목표와 체크포인트
-        - **Month 2-3**: 중기 포지션 조정 계획
-        - **주요 이벤트**: FOMC, 경제지표 발표 일정
+        # 예시 질문 버튼
+        st.markdown("**💡 예시 질문:**")
+        example_col1, example_col2, example_col3 = st.columns(3)
         
-        **6. 일일/주간 체크리스트**
-        - 매일 확인할 지표 (Net Liq, DXY, HY Spread)
-        - 주간 리뷰 항목 (상관관계, 포트폴리오 성과)
-        - 트리거 이벤트 (포지션 변경 조건)
+        with example_col1:
+            if st.button("🤔 지금 비트코인 사도 될까요?", use_container_width=True):
+                example_prompt = "현재 시장 상황에서 비트코인을 매수해도 괜찮을까요? 리스크는 무엇인가요?"
+                st.session_state.example_prompt = example_prompt
         
-        **7. 역사적 패턴 비교**
-        - 과거 유사 상황 분석
-        - Win Rate / Profit Factor 추정
-        - 최대 드로다운 시나리오
-        """)
-    
-    with tab_guide3:
-        st.warning("""
-        ### ⚠️ 중요한 주의사항
+        with example_col2:
+            if st.button("📊 포트폴리오 비중 추천", use_container_width=True):
+                example_prompt = "현재 상황에서 BTC, 주식, 현금 비중을 어떻게 가져가면 좋을까요?"
+                st.session_state.example_prompt = example_prompt
         
-        **투자 책임**
-        - ❗ AI 분석은 참고용이며, 투자 조언이 아닙니다
-        - ❗ 최종 투자 결정은 본인의 책임입니다
-        - ❗ 여러 정보원을 종합적으로 검토하세요
-        - ❗ 본인의 리스크 허용도를 반드시 고려하세요
+        with example_col3:
+            if st.button("⚠️ 현재 가장 큰 리스크는?", use_container_width=True):
+                example_prompt = "지금 시장에서 가장 주의해야 할 리스크 요인은 무엇인가요?"
+                st.session_state.example_prompt = example_prompt
         
-        **API 사용 제한**
-        - 무료 할당량: 일일 1,500 요청, 분당 15 요청
-        - Deep Dive 모드: 더 많은 토큰 소비 (Standard의 3-5배)
-        - 할당량 초과 시: 24시간 후 재시도 또는 유료 전환
-        - 오류 발생 시: 잠시 후 다시 시도
+        # 대화 초기화 버튼
+        if len(st.session_state.chat_messages) > 0:
+            if st.button("🔄 대화 초기화", type="secondary"):
+                st.session_state.chat_messages = []
+                if 'example_prompt' in st.session_state:
+                    del st.session_state.example_prompt
+                st.rerun()
         
-        **분석 한계**
-        - AI는 과거 데이터 기반으로 학습됨 (2025년 1월까지)
-        - 예측 불가능한 이벤트 미고려 (전쟁, 자연재해 등)
-        - Black Swan 이벤트 대응 한계
-        - 시장은 항상 비이성적일 수 있음
+        # 대화 히스토리 표시
+        for message in st.session_state.chat_messages:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
         
-        **데이터 시차**
-        - FRED 데이터는 1-2일 지연될 수 있음
-        - 실시간 급변 상황 반영 어려움
-        - 최신 뉴스와 교차 검증 필수
-        - 주말/공휴일 데이터 업데이트 없음
+        # 사용자 입력 (예시 질문이 있으면 자동 입력)
+        default_prompt = st.session_state.get('example_prompt', '')
+        if default_prompt and 'example_prompt' in st.session_state:
+            del st.session_state.example_prompt
         
-        **AI의 한계**
-        - 확률적 추론이므로 100% 정확도 보장 안 됨
-        - 동일한 입력에도 다른 결과 가능
-        - 맥락 이해 한계 있음
-        - 창의적 해석은 제한적
-        """)
-    
-    # 대화형 챗봇 섹션
-    st.markdown("---")
-    st.markdown("### 💬 AI와 대화하기")
-    st.caption("궁금한 점을 자유롭게 물어보세요. AI가 현재 시장 데이터를 바탕으로 답변합니다.")
-    
-    # 세션 상태 초기화
-    if 'chat_messages' not in st.session_state:
-        st.session_state.chat_messages = []
-    
-    # 예시 질문 버튼
-    st.markdown("**💡 예시 질문:**")
-    example_col1, example_col2, example_col3 = st.columns(3)
-    
-    with example_col1:
-        if st.button("🤔 지금 비트코인 사도 될까요?", use_container_width=True):
-            example_prompt = "현재 시장 상황에서 비트코인을 매수해도 괜찮을까요? 리스크는 무엇인가요?"
-            st.session_state.example_prompt = example_prompt
-    
-    with example_col2:
-        if st.button("📊 포트폴리오 비중 추천", use_container_width=True):
-            example_prompt = "현재 상황에서 BTC, 주식, 현금 비중을 어떻게 가져가면 좋을까요?"
-            st.session_state.example_prompt = example_prompt
-    
-    with example_col3:
-        if st.button("⚠️ 현재 가장 큰 리스크는?", use_container_width=True):
-            example_prompt = "지금 시장에서 가장 주의해야 할 리스크 요인은 무엇인가요?"
-            st.session_state.example_prompt = example_prompt
-    
-    # 대화 초기화 버튼
-    if len(st.session_state.chat_messages) > 0:
-        if st.button("🔄 대화 초기화", type="secondary"):
-            st.session_state.chat_messages = []
-            if 'example_prompt' in st.session_state:
-                del st.session_state.example_prompt
-            st.rerun()
-    
-    # 대화 히스토리 표시
-    for message in st.session_state.chat_messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-    
-    # 사용자 입력 (예시 질문이 있으면 자동 입력)
-    default_prompt = st.session_state.get('example_prompt', '')
-    if default_prompt and 'example_prompt' in st.session_state:
-        del st.session_state.example_prompt
-    
-    if prompt := st.chat_input("질문을 입력하세요...", key="chat_input"):
-        # 사용자 메시지 추가
-        st.session_state.chat_messages.append({
-            "role": "user",
-            "content": prompt
-        })
-        
-        with st.chat_message("user"):
-            st.markdown(prompt)
-        
-        # 컨텍스트 정보 추가
-        context = f"""
+        if prompt := st.chat_input("질문을 입력하세요...", key="chat_input"):
+            # 사용자 메시지 추가
+            st.session_state.chat_messages.append({
+                "role": "user",
+                "content": prompt
+            })
+            
+            with st.chat_message("user"):
+                st.markdown(prompt)
+            
+            # 컨텍스트 정보 추가
+            context = f"""
 당신은 20년 경력의 거시경제 및 퀀트 투자 전문가입니다.
 현재 사용자와 대화 중이며, 아래 최신 시장 데이터를 기반으로 답변해주세요.
 
@@ -2125,7 +1985,7 @@ with tab6:
 {get_data_summary(df_recent, latest, netliq_60d)}
 
 ## 주요 상관관계
-{get_correlations_summary(corr_matrix)}
+{get_correlations_summary(corr_matrix, corr_mode)}
 
 ## 현재 시그널 상태
 {get_signals_summary(netliq_60d, latest, corr_dxy_btc.iloc[-1], recent_divergence)}
@@ -2141,46 +2001,278 @@ with tab6:
 5. 투자 조언이 아닌 참고 정보임을 명시하세요
 6. 확실하지 않은 것은 솔직히 인정하세요
 """
+            
+            # AI 응답 생성
+            with st.chat_message("assistant"):
+                with st.spinner("💭 생각 중..."):
+                    try:
+                        response = gemini_model.generate_content(context)
+                        answer = response.text
+                        st.markdown(answer)
+                        
+                        st.session_state.chat_messages.append({
+                            "role": "assistant",
+                            "content": answer
+                        })
+                    except Exception as e:
+                        error_msg = f"❌ 오류가 발생했습니다: {str(e)}\n\n💡 무료 할당량을 초과했거나 일시적인 문제일 수 있습니다. 잠시 후 다시 시도해주세요."
+                        st.error(error_msg)
+                        st.session_state.chat_messages.append({
+                            "role": "assistant",
+                            "content": error_msg
+                        })
         
-        # AI 응답 생성
-        with st.chat_message("assistant"):
-            with st.spinner("💭 생각 중..."):
-                try:
-                    response = gemini_model.generate_content(context)
-                    answer = response.text
-                    st.markdown(answer)
-                    
-                    st.session_state.chat_messages.append({
-                        "role": "assistant",
-                        "content": answer
-                    })
-                except Exception as e:
-                    error_msg = f"❌ 오류가 발생했습니다: {str(e)}\n\n💡 무료 할당량을 초과했거나 일시적인 문제일 수 있습니다. 잠시 후 다시 시도해주세요."
-                    st.error(error_msg)
-                    st.session_state.chat_messages.append({
-                        "role": "assistant",
-                        "content": error_msg
-                    })
-    
-    # 자동으로 예시 프롬프트 처리
-    elif default_prompt:
-        # 사용자 메시지 추가
-        st.session_state.chat_messages.append({
-            "role": "user",
-            "content": default_prompt
-        })
-        st.rerun()
-    
-    # 대화 통계
-    if len(st.session_state.chat_messages) > 0:
-        st.markdown("---")
-        total_messages = len(st.session_state.chat_messages)
-        user_messages = len([m for m in st.session_state.chat_messages if m["role"] == "user"])
+        # 자동으로 예시 프롬프트 처리
+        elif default_prompt:
+            # 사용자 메시지 추가
+            st.session_state.chat_messages.append({
+                "role": "user",
+                "content": default_prompt
+            })
+            st.rerun()
         
-        stat_col1, stat_col2, stat_col3 = st.columns(3)
-        with stat_col1:
-            st.metric("💬 총 메시지", total_messages)
-        with stat_col2:
-            st.metric("👤 사용자 질문", user_messages)
-        with stat_col3:
-            st.metric("🤖 AI 답변", total_messages - user_messages)
+        # 대화 통계
+        if len(st.session_state.chat_messages) > 0:
+            st.markdown("---")
+            total_messages = len(st.session_state.chat_messages)
+            user_messages = len([m for m in st.session_state.chat_messages if m["role"] == "user"])
+            
+            stat_col1, stat_col2, stat_col3 = st.columns(3)
+            with stat_col1:
+                st.metric("💬 총 메시지", total_messages)
+            with stat_col2:
+                st.metric("👤 사용자 질문", user_messages)
+            with stat_col3:
+                st.metric("🤖 AI 답변", total_messages - user_messages)
+
+# ============================================================
+# TAB 7: 선행/후행 (Lead/Lag) 분석
+# ============================================================
+def build_lead_lag(ret, target, lead_lag_window):
+    """교차상관 결과와 차트를 함께 생성 (세션 간 공유)"""
+    result = analyze_lead_lag(ret, 'NetLiq', target, lead_lag_window)
+    return result, build_lead_lag_figure(result)
+
+with tab7:
+    st.header("🔀 선행/후행 분석")
+    st.markdown("**Net Liquidity 가 위험자산을 선행하는가? (일간 수익률 교차상관, 시차 −90 ~ +90 영업일)**")
+
+    ll_col1, ll_col2 = st.columns(2)
+    with ll_col1:
+        lead_lag_target = st.selectbox(
+            "비교 대상",
+            [column for column in ret.columns if column != 'NetLiq'],
+            index=[column for column in ret.columns if column != 'NetLiq'].index('BTC')
+        )
+    with ll_col2:
+        lead_lag_window = st.select_slider(
+            "롤링 윈도우 (영업일)",
+            options=[120, 180, 250, 365],
+            value=250
+        )
+
+    if len(ret) <= lead_lag_window:
+        st.warning("⚠️ 선택한 기간이 롤링 윈도우보다 짧습니다. 분석 기간을 늘려주세요.")
+    else:
+        lead_lag, lead_lag_figure = leadlag_store.acquire(
+            session_id,
+            (analytics_key[0], lead_lag_target, lead_lag_window),
+            lambda: build_lead_lag(ret, lead_lag_target, lead_lag_window)
+        )
+
+        lead_lag_table = lead_lag.table()
+        peak = lead_lag_table.loc[lead_lag_target]
+        significant = abs(peak['최대 상관']) > lead_lag.significance()
+
+        ll_metric1, ll_metric2, ll_metric3 = st.columns(3)
+        with ll_metric1:
+            st.metric("동시점 상관", f"{peak['동시점 상관']:.3f}")
+        with ll_metric2:
+            st.metric("최대 상관", f"{peak['최대 상관']:.3f}", "유의" if significant else "유의하지 않음")
+        with ll_metric3:
+            lag_days = int(peak['최대 상관 시차(일)'])
+            st.metric(
+                "최대 상관 시차",
+                f"{lag_days:+d}일",
+                "Net Liquidity 선행" if lag_days > 0 else ("동행" if lag_days == 0 else f"{lead_lag_target} 선행")
+            )
+
+        st.plotly_chart(lead_lag_figure, use_container_width=True)
+
+        st.markdown("### 📋 Net Liquidity 대비 전체 시리즈")
+        st.dataframe(lead_lag_table.round(3), use_container_width=True)
+        st.caption(
+            f"양의 시차 = Net Liquidity 변화가 해당 일수만큼 먼저 나타남 · "
+            f"95% 유의 임계값 ±{lead_lag.significance():.3f} (관측치 {lead_lag.observations:,}개)"
+        )
+
+# ============================================================
+# TAB 9: 워치리스트 일괄 분석
+# ============================================================
+with tab9:
+    st.header("📋 워치리스트")
+    st.markdown("**여러 자산의 콤보 분석(NetLiq / DXY / HY 상관, Z-score, Divergence, 종합 점수)을 한 번에 계산**")
+
+    wl_col1, wl_col2 = st.columns([2, 1])
+    with wl_col1:
+        watchlist_text = st.text_area(
+            "FRED 시리즈 ID (쉼표 / 공백 / 줄바꿈 구분)",
+            value=", ".join(st.secrets.get("WATCHLIST", DEFAULT_WATCHLIST)),
+            key="watchlist_ids",
+            help="기본 위험자산(BTC, NASDAQ, SP500 등)은 항상 포함됩니다"
+        )
+    with wl_col2:
+        watchlist_uploads = st.file_uploader(
+            "CSV 업로드 (첫 컬럼 날짜, 나머지 컬럼 가격)",
+            type="csv",
+            accept_multiple_files=True,
+            key="watchlist_uploads"
+        )
+
+    watchlist_ids = parse_series_ids(watchlist_text)
+    with st.spinner("📥 워치리스트 데이터 로드 중..."):
+        watchlist_errors = watchlist_scheduler.track([watchlist_key(sid) for sid in watchlist_ids])
+    if watchlist_errors:
+        st.warning("⚠️ 불러오지 못한 시리즈: " + ", ".join(
+            f"{key[len(WATCHLIST_PREFIX):]} ({error})" for key, error in watchlist_errors.items()
+        ))
+
+    watch_snapshot = watchlist_scheduler.snapshot
+    watchlist_series = snapshot_watchlist(watch_snapshot.raw, watchlist_ids)
+    watchlist_sources = {}
+    for column in risk_assets(df_recent.columns):
+        watchlist_series[column] = df_recent[column]
+        watchlist_sources[column] = '기본'
+    upload_keys = []
+    for upload in watchlist_uploads or []:
+        try:
+            uploaded = load_watchlist_csv(upload, name=upload.name.rsplit('.', 1)[0])
+        except Exception as e:
+            st.warning(f"⚠️ {upload.name} 을(를) 읽지 못했습니다: {str(e)}")
+            continue
+        watchlist_series.update(uploaded)
+        watchlist_sources.update({name: '업로드' for name in uploaded})
+        upload_keys.append(upload.file_id)
+
+    watch_key = (analytics_key, watchlist_ids, tuple(upload_keys), watch_snapshot.version)
+    watch = watchlist_store.acquire(
+        session_id,
+        watch_key,
+        lambda: compute_watchlist(df_recent, watchlist_series, watchlist_sources, window, halflife)
+    )
+
+    watch_table = watch.table()
+    watch_figure = watchlist_store.warm((watch_key, 'figure'), lambda: build_watchlist_figure(watch))
+    st.plotly_chart(watch_figure, use_container_width=True)
+    st.dataframe(
+        watch_table.round(3),
+        use_container_width=True,
+        column_config={
+            "20일(%)": st.column_config.NumberColumn("20일(%)", format="%+.2f"),
+            "60일(%)": st.column_config.NumberColumn("60일(%)", format="%+.2f"),
+            "점수": st.column_config.NumberColumn("점수", format="%+d"),
+        }
+    )
+    st.caption(
+        f"자산 {len(watch.assets)}개 · 상관계수는 일간 수익률 {watch.weighting} · Z-score 는 분석 기간 전체 기준 · "
+        "Divergence = 자산 20일 상승 & HY Spread 20일 상승 · "
+        "점수 = 트레이딩 시그널 탭 규칙 (NetLiq 60일 변화, HY Spread 수준은 공통, DXY 상관과 Divergence 는 자산별)"
+    )
+
+    hist_col1, hist_col2 = st.columns([1, 3])
+    with hist_col1:
+        watch_driver = st.selectbox("상관 요인", list(watch.drivers), key="watchlist_driver")
+    with hist_col2:
+        watch_assets = st.multiselect(
+            "표시할 자산", watch.assets, default=list(watch_table.index[:5]), key="watchlist_assets"
+        )
+    if watch_assets:
+        watch_history_figure = watchlist_store.warm(
+            (watch_key, watch_driver, tuple(watch_assets)),
+            lambda: build_watchlist_history_figure(watch, watch_driver, watch_assets)
+        )
+        st.plotly_chart(watch_history_figure, use_container_width=True)
+
+# ============================================================
+# TAB 10: 유동성 민감도 스크리너
+# ============================================================
+with tab10:
+    st.header("🔎 유동성 민감도 스크리너")
+    st.markdown("**워치리스트 자산을 NetLiq / DXY / HY Spread 상관 · 베타와 종합 점수로 정렬 · 필터링**")
+
+    if not any(w < len(df_recent) for w in SCREENER_WINDOWS):
+        st.info(
+            f"💡 분석 기간({len(df_recent)}영업일)이 가장 짧은 윈도우({min(SCREENER_WINDOWS)}영업일)보다 짧아 "
+            "스크리너를 계산할 수 없습니다. 기간을 늘려주세요."
+        )
+    else:
+        # 워치리스트 탭과 같은 자산 목록, 윈도우와 무관한 키 (윈도우 변경은 큐브 조회만)
+        cube_key = (analytics_key[0], watchlist_ids, tuple(upload_keys), watch_snapshot.version)
+        cube = screener_store.acquire(
+            session_id,
+            cube_key,
+            lambda: build_screener_cube(df_recent, watchlist_series, watchlist_sources)
+        )
+
+        sc_col1, sc_col2, sc_col3 = st.columns([2, 1, 1])
+        with sc_col1:
+            screener_window = st.select_slider(
+                "윈도우 (영업일)", options=list(cube.windows),
+                value=window if window in cube.windows else cube.windows[len(cube.windows) // 2],
+                key="screener_window"
+            )
+        screener_table = cube.table(screener_window)
+        sort_options = [column for column in screener_table.columns if column not in ('출처', 'Divergence')]
+        with sc_col2:
+            screener_sort = st.selectbox("정렬 기준", sort_options, index=sort_options.index('점수'), key="screener_sort")
+        with sc_col3:
+            screener_ascending = st.toggle("오름차순", value=False, key="screener_ascending")
+
+        ft_col1, ft_col2, ft_col3 = st.columns(3)
+        with ft_col1:
+            screener_sources = st.multiselect(
+                "출처", sorted(set(cube.sources.values())), default=sorted(set(cube.sources.values())),
+                key="screener_sources"
+            )
+        with ft_col2:
+            screener_min_corr = st.slider("최소 |NetLiq 상관|", 0.0, 1.0, 0.0, 0.05, key="screener_min_corr")
+        with ft_col3:
+            screener_min_score = st.slider(
+                "최소 점수", SCORE_RANGE[0], SCORE_RANGE[1], SCORE_RANGE[0], key="screener_min_score",
+                help="최솟값이면 점수를 계산할 수 없는(관측이 부족한) 자산도 표시"
+            )
+
+        screener_view = screener_table[
+            screener_table['출처'].isin(screener_sources)
+            & (screener_table['NetLiq 상관'].abs().fillna(0) >= screener_min_corr)
+            & ((screener_table['점수'] >= screener_min_score) | (screener_min_score == SCORE_RANGE[0]))
+        ].sort_values(screener_sort, ascending=screener_ascending, kind='stable', na_position='last')
+
+        st.metric("표시 자산", f"{len(screener_view)} / {len(screener_table)}")
+        st.dataframe(
+            screener_view.round(3),
+            use_container_width=True,
+            column_config={
+                "20일(%)": st.column_config.NumberColumn("20일(%)", format="%+.2f"),
+                "60일(%)": st.column_config.NumberColumn("60일(%)", format="%+.2f"),
+                "점수": st.column_config.NumberColumn("점수", format="%+d"),
+            }
+        )
+
+        axis_options = [column for column in screener_table.columns if '상관' in column or '베타' in column]
+        ax_col1, ax_col2 = st.columns(2)
+        with ax_col1:
+            screener_x = st.selectbox("X 축", axis_options, index=axis_options.index('NetLiq 베타'), key="screener_x")
+        with ax_col2:
+            screener_y = st.selectbox("Y 축", axis_options, index=axis_options.index('DXY 상관'), key="screener_y")
+        screener_figure = screener_store.warm(
+            (cube_key, screener_window, tuple(screener_sources), screener_min_corr, screener_min_score,
+             screener_x, screener_y),
+            lambda: build_screener_figure(screener_view, screener_x, screener_y)
+        )
+        st.plotly_chart(screener_figure, use_container_width=True)
+        st.caption(
+            f"윈도우 {', '.join(str(w) for w in cube.windows)}일 × 최근 {len(cube.index)}영업일의 상관 / 베타를 "
+            "한 번에 계산한 큐브에서 조회 (윈도우를 바꿔도 재계산 없음) · 일간 수익률 동일가중 윈도우 기준 · "
+            "베타 = 요인 1% 변화당 자산 수익률(%) · 점수는 워치리스트 탭과 같은 규칙"
+        )
@@ -0,0 +1,97 @@
+# ============================================================
+# 시리즈 전체 이력 로컬 아카이브 (Streamlit 비의존)
+# 시리즈별로 최초 관측일부터의 전체 이력을 pickle 파일로 보관하고,
+# 이후에는 마지막 관측일 근처부터의 새 관측치만 FRED 에서 받아 이어 붙임
+# ============================================================
+import os
+import pickle
+import tempfile
+import threading
+from datetime import timedelta
+
+import pandas as pd
+
+from data_loader import fetch_series
+
+# 증분 다운로드 시 다시 받는 최근 구간 (FRED 의 사후 수정치 반영)
+REVISION_WINDOW = timedelta(days=30)
+
+
+class SeriesArchive:
+    """directory/{key}.pkl 에 시리즈별 전체 이력을 보관"""
+
+    def __init__(self, directory, revision_window=REVISION_WINDOW):
+        self.directory = directory
+        self.revision_window = revision_window
+        self._series = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def load(self, key):
+        """보관된 전체 이력 (없거나 읽을 수 없으면 None)"""
+        with self._lock:
+            if key not in self._series:
+                try:
+                    with open(self.path(key), 'rb') as f:
+                        self._series[key] = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    return None
+            return self._series[key]
+
+    def stored_keys(self, prefix=''):
+        """보관된 시리즈 키 중 prefix 로 시작하는 것"""
+        return sorted(
+            name[:-len('.pkl')] for name in os.listdir(self.directory)
+            if name.endswith('.pkl') and name.startswith(prefix)
+        )
+
+    def load_all(self, keys):
+        """모든 키가 보관되어 있을 때만 {키: 시리즈} 반환 (하나라도 없으면 None)"""
+        raw = {key: self.load(key) for key in keys}
+        return raw if all(series is not None for series in raw.values()) else None
+
+    def update(self, fred, keys):
+        """
+        키별로 보관된 이력 이후(수정 구간 포함)의 관측치만 받아 병합하고 저장.
+        보관된 이력이 없으면 최초 관측일부터 전체를 받습니다. {키: 전체 이력} 반환
+        """
+        merged = {}
+        for key in keys:
+            existing = self.load(key)
+            if existing is None or existing.empty:
+                merged[key] = fetch_series(fred, [key], None)[key].dropna()
+            else:
+                start = existing.index[-1] - self.revision_window
+                fresh = fetch_series(fred, [key], start)[key].dropna()
+                merged[key] = pd.concat([existing[existing.index < start], fresh])
+            self._save(key, merged[key])
+        return merged
+
+    def _save(self, key, series):
+        """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(series, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._series[key] = series
+
+    def describe(self):
+        """시리즈별 보관 구간 / 관측치 수"""
+        rows = []
+        for key in sorted(self._series):
+            series = self._series[key]
+            rows.append({
+                '시리즈': key,
+                '시작': series.index[0].date() if len(series) else None,
+                '마지막': series.index[-1].date() if len(series) else None,
+                '관측치': len(series),
+            })
+        return pd.DataFrame(rows).set_index('시리즈') if rows else pd.DataFrame()
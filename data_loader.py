@@ -0,0 +1,137 @@
+# ============================================================
+# FRED 데이터 수집 및 통합 (Streamlit 비의존)
+# ============================================================
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from registry import LIQUIDITY, SERIES_REGISTRY, series_spec
+
+# 분석 시작일 이전에 추가로 받는 기간: 주간/월간 시리즈도 시작일 시점의
+# 직전 관측치(as-of 초기값)를 갖도록 함
+SEED_LOOKBACK = timedelta(days=45)
+
+
+def window_start(days, now=None):
+    """분석 기간의 시작일 (일 단위로 고정하여 같은 날에는 같은 구간)"""
+    today = pd.Timestamp((now or datetime.now()).date())
+    return today - timedelta(days=days)
+
+
+def fetch_start(start):
+    """분석 시작일 start 에 필요한 다운로드 시작일 (None 이면 최초 관측일부터)"""
+    return None if start is None else pd.Timestamp(start) - SEED_LOOKBACK
+
+
+def fetch_series(fred, keys, start_date):
+    """FRED 에서 지정한 시리즈들을 다운로드 (start_date=None 이면 최초 관측일부터)"""
+    return {
+        key: fred.get_series(series_spec(key).fred_id, observation_start=start_date)
+        for key in keys
+    }
+
+
+def fetch_series_info(fred, key):
+    """FRED 시리즈 메타데이터 (frequency_short, last_updated, observation_end 등)"""
+    return fred.get_series_info(series_spec(key).fred_id)
+
+
+def slice_raw_data(raw_data, days, now=None):
+    """더 긴 기간으로 받아둔 raw_data 에서 최근 days 일만 잘라냄"""
+    return slice_raw_range(raw_data, window_start(days, now))
+
+
+def slice_raw_range(raw_data, start=None, end=None):
+    """
+    raw_data 에서 start ~ end 구간만 잘라냄 (None 이면 해당 방향 제한 없음)
+    as-of 정렬의 초기값이 되도록 start 이전 SEED_LOOKBACK 구간을 포함
+    """
+    sliced = {}
+    for key, series in raw_data.items():
+        if start is not None:
+            series = series[series.index >= fetch_start(start)]
+        if end is not None:
+            series = series[series.index <= pd.Timestamp(end)]
+        sliced[key] = series
+    return sliced
+
+
+def common_start(raw_data):
+    """모든 시리즈가 관측치를 갖기 시작하는 날 (가장 늦은 최초 관측일)"""
+    return max(series.dropna().index[0] for series in raw_data.values())
+
+
+def business_calendar(start, end):
+    """start ~ end 사이 영업일 (월~금) 인덱스"""
+    days = np.arange(
+        np.datetime64(pd.Timestamp(start).date(), 'D'),
+        np.datetime64(pd.Timestamp(end).date(), 'D') + np.timedelta64(1, 'D')
+    )
+    return pd.DatetimeIndex(days[np.is_busday(days)].astype('datetime64[ns]'))
+
+
+def align_series(series_list, specs, calendar, publication_lag=False):
+    """
+    각 시리즈를 영업일 캘린더에 as-of 결합 (각 일자에 알 수 있었던 최신 관측치, 스케일 적용).
+    publication_lag=True 면 관측일이 아닌 공표일(관측일 + release_rule 일수) 기준으로 결합.
+    관측치가 아직 없는 구간은 NaN
+    """
+    days = calendar.to_numpy(dtype='datetime64[D]')
+    values = np.full((len(calendar), len(specs)), np.nan)
+    for j, (series, spec) in enumerate(zip(series_list, specs)):
+        observed = series.index.to_numpy(dtype='datetime64[D]')
+        if publication_lag:
+            observed = observed + np.timedelta64(spec.release_rule[0], 'D')
+        positions = observed.searchsorted(days, side='right') - 1
+        known = positions >= 0
+        values[known, j] = series.to_numpy(dtype=float)[positions[known]] * spec.scale
+    return values
+
+
+def process_data(raw_data, start=None, publication_lag=False, end=None):
+    """
+    Net Liquidity 계산 및 데이터 통합 (raw_data 에 포함된 레지스트리 시리즈 전체)
+
+    컬럼 순서: NetLiq, 구성 요소 외 시리즈, 마지막에 Net Liquidity 구성 요소(WALCL, TGA, RRP; 백만 달러).
+    구성 요소는 기여도 분석용이며 상관계수 등 분석 대상에서는 제외됩니다 (registry.liquidity_components).
+
+    start(기본: 가장 이른 관측일)부터 end(기본: 마지막 관측일)까지의 영업일 캘린더에 모든 시리즈를
+    as-of 결합합니다. 일부 시리즈의 첫 관측치가 늦어 앞 구간을 제외한 경우
+    df.attrs['late_start'] 에 {컬럼: 첫 관측 반영일} 을 기록합니다.
+    """
+    specs = [spec for spec in SERIES_REGISTRY if spec.key in raw_data]
+    series_list = [raw_data[spec.key].dropna() for spec in specs]
+    if not specs or any(series.empty for series in series_list):
+        raise ValueError("비어 있는 시리즈가 있어 데이터를 통합할 수 없습니다")
+
+    if start is None:
+        start = min(series.index[0] for series in series_list)
+    last = max(series.index[-1] for series in series_list)
+    calendar = business_calendar(start, min(pd.Timestamp(end), last) if end is not None else last)
+    values = align_series(series_list, specs, calendar, publication_lag)
+
+    liquidity = [j for j, spec in enumerate(specs) if spec.role == LIQUIDITY]
+    others = [j for j, spec in enumerate(specs) if spec.role != LIQUIDITY]
+    signs = np.array([specs[j].netliq_sign for j in liquidity], dtype=float)
+    combined = np.column_stack([values[:, liquidity] @ signs, values[:, others], values[:, liquidity]])
+
+    # 모든 시리즈가 값을 갖는 첫 영업일부터 사용 (as-of 결합 이후에는 결측이 생기지 않음)
+    known = ~np.isnan(values)
+    complete = known.all(axis=1)
+    if not complete.any():
+        raise ValueError("모든 시리즈가 겹치는 구간이 없습니다")
+    first = int(complete.argmax())
+
+    df_all = pd.DataFrame(
+        combined[first:],
+        index=calendar[first:],
+        columns=['NetLiq'] + [specs[j].column for j in others + liquidity]
+    )
+    if first > 0:
+        first_known = known.argmax(axis=0)
+        df_all.attrs['late_start'] = {
+            spec.column: calendar[first_known[j]]
+            for j, spec in enumerate(specs) if first_known[j] > 0
+        }
+    return df_all
@@ -0,0 +1,110 @@
+# ============================================================
+# Divergence 스캐너 (Streamlit 비의존)
+# 위험자산 × 스트레스 지표(HY Spread, DXY) × 기간 조합의 Divergence
+# (위험자산 상승 & 스트레스 지표 상승)를 한 번의 broadcast 로 계산하고
+# 연속 구간(에피소드)을 추출
+# ============================================================
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from events import DIVERGENCE_RECENT_DAYS
+from registry import ASSET, SERIES_REGISTRY
+
+DEFAULT_HORIZONS = (5, 10, 20, 40, 60, 90, 120)
+STRESS_INDICATORS = ('HYSpread', 'DXY')
+
+
+def risk_assets(columns):
+    """Divergence 스캔 대상 위험자산 컬럼 (레지스트리의 asset 역할: BTC, NASDAQ, SP500 + 추가 자산)"""
+    return [spec.column for spec in SERIES_REGISTRY if spec.role == ASSET and spec.column in columns]
+
+
+@dataclass(frozen=True)
+class DivergenceScan:
+    """flags[h, t, a, i] = 기간 horizons[h] 동안 assets[a] 상승 & indicators[i] 상승"""
+    index: pd.DatetimeIndex
+    horizons: tuple
+    assets: list
+    indicators: list
+    flags: np.ndarray
+
+    def combos(self):
+        """(기간, 자산, 지표) 조합 목록 - flags 를 (조합, 시점) 으로 펼친 순서"""
+        return [
+            (horizon, asset, indicator)
+            for horizon in self.horizons
+            for asset in self.assets
+            for indicator in self.indicators
+        ]
+
+    def _by_combo(self):
+        # (H, T, A, I) -> (H, A, I, T) -> (조합, T)
+        return self.flags.transpose(0, 2, 3, 1).reshape(-1, len(self.index))
+
+    def episodes(self):
+        """모든 조합의 Divergence 연속 구간 (시작 / 끝 / 지속 영업일 / 진행 중 여부)"""
+        flags = self._by_combo()
+        padded = np.zeros((flags.shape[0], flags.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = flags
+        edges = np.diff(padded, axis=1)
+        start_rows, start_cols = np.nonzero(edges == 1)
+        _, end_cols = np.nonzero(edges == -1)  # 행 우선 순서라 시작과 1:1 대응
+
+        combos = self.combos()
+        last = len(self.index) - 1
+        return pd.DataFrame({
+            '기간(일)': [combos[row][0] for row in start_rows],
+            '자산': [combos[row][1] for row in start_rows],
+            '지표': [combos[row][2] for row in start_rows],
+            '시작': self.index[start_cols],
+            '끝': self.index[end_cols - 1],
+            '지속(영업일)': end_cols - start_cols,
+            '진행 중': end_cols - 1 == last,
+        })
+
+    def summary(self, recent_days=DIVERGENCE_RECENT_DAYS):
+        """조합별 에피소드 수, 발생 비율, 최근 recent_days 일 발생 일수, 현재 상태"""
+        flags = self._by_combo()
+        onsets = (flags[:, 1:] & ~flags[:, :-1]).sum(axis=1) + flags[:, 0]
+        combos = self.combos()
+        return pd.DataFrame({
+            '기간(일)': [combo[0] for combo in combos],
+            '자산': [combo[1] for combo in combos],
+            '지표': [combo[2] for combo in combos],
+            '에피소드': onsets,
+            '발생 비율(%)': flags.mean(axis=1) * 100,
+            f'최근 {recent_days}일': flags[:, -recent_days:].sum(axis=1),
+            '현재': flags[:, -1],
+        })
+
+
+def scan_divergence(df, horizons=DEFAULT_HORIZONS, indicators=STRESS_INDICATORS):
+    """
+    모든 (기간, 위험자산, 스트레스 지표) 조합의 Divergence 플래그를 한 번에 계산.
+    h 일 수익률 > 0 은 "현재 값 > h 일 전 값" 과 같으므로 나눗셈 없이 비교만 사용
+    """
+    horizons = tuple(sorted(set(int(h) for h in horizons)))
+    assets = risk_assets(df.columns)
+    indicators = [column for column in indicators if column in df.columns]
+
+    asset_values = df[assets].to_numpy(dtype=float)
+    indicator_values = df[indicators].to_numpy(dtype=float)
+
+    # lagged[h, t] = t - horizons[h] 시점 (범위 밖은 valid=False 로 표시하고 결과에서 제외)
+    lagged = np.arange(len(df))[None, :] - np.array(horizons)[:, None]
+    valid = lagged >= 0
+    lagged = np.where(valid, lagged, 0)
+
+    asset_up = (asset_values[None] > asset_values[lagged]) & valid[:, :, None]
+    indicator_up = (indicator_values[None] > indicator_values[lagged]) & valid[:, :, None]
+    flags = asset_up[:, :, :, None] & indicator_up[:, :, None, :]
+
+    return DivergenceScan(
+        index=df.index,
+        horizons=horizons,
+        assets=assets,
+        indicators=indicators,
+        flags=flags,
+    )
@@ -0,0 +1,138 @@
+# ============================================================
+# 시그널 상태 / 전환 이벤트 인덱스 (Streamlit 비의존)
+# 트레이딩 시그널 탭의 규칙(Net Liquidity 60일 변화, DXY-BTC 상관, HY Spread 수준,
+# Divergence)을 전체 이력에 한 번에 적용하고, 상태가 바뀐 모든 시점을
+# 날짜 / 당시 지표 값과 함께 인덱싱
+# ============================================================
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# 트레이딩 시그널 탭과 같은 기준값
+NETLIQ_EXPANSION = 2.0
+NETLIQ_CONTRACTION = -2.0
+DXY_BTC_STRONG_INVERSE = -0.5
+DXY_BTC_POSITIVE = 0.0
+HY_CAUTION = 4.0
+HY_DANGER = 5.0
+DIVERGENCE_HORIZON = 20
+# 트레이딩 시그널 탭처럼 최근 며칠 안에 한 번이라도 Divergence 가 있었으면 '발생'
+DIVERGENCE_RECENT_DAYS = 5
+
+# 시그널 -> 상태 이름 (상태 코드 = 목록 순서, 데이터 부족 구간은 -1)
+SIGNALS = {
+    'Net Liquidity': ['축소 (<-2%)', '중립', '확장 (>+2%)'],
+    'DXY-BTC 상관': ['강한 역상관 (<-0.5)', '약한 역상관', '양의 상관 (>0)'],
+    'HY Spread': ['안정 (≤4%)', '경계 (4~5%)', '위험 (>5%)'],
+    'Divergence': ['없음', '발생'],
+}
+
+
+def signal_context(df, window, halflife=None):
+    """시그널 판단에 쓰는 지표 (이벤트 당시 값으로도 기록, halflife 가 있으면 상관은 EWMA)"""
+    ret = df.pct_change()
+    if halflife:
+        corr = ret['DXY'].ewm(halflife=halflife, min_periods=int(halflife)).corr(ret['BTC'])
+    else:
+        corr = ret['DXY'].rolling(window).corr(ret['BTC'])
+    return pd.DataFrame({
+        'NetLiq 60일(%)': df['NetLiq'].pct_change(periods=60) * 100,
+        'DXY-BTC 상관': corr,
+        'HY Spread(%)': df['HYSpread'],
+        'SP500 20일(%)': df['SP500'].pct_change(periods=DIVERGENCE_HORIZON) * 100,
+        'HY 20일 변화(%p)': df['HYSpread'].diff(periods=DIVERGENCE_HORIZON),
+    })
+
+
+def divergence_state(context):
+    """
+    최근 DIVERGENCE_RECENT_DAYS 영업일 중 하루라도 S&P 500 20일 상승 & HY Spread 20일 상승이면 1,
+    아니면 0 (당일 지표가 없으면 NaN). 트레이딩 시그널 탭의 Divergence 판단과 같음
+    """
+    sp_ret, hy_change = context['SP500 20일(%)'], context['HY 20일 변화(%p)']
+    daily = ((sp_ret > 0) & (hy_change > 0)).astype(float)
+    recent = daily.rolling(DIVERGENCE_RECENT_DAYS, min_periods=1).max()
+    return recent.mask(sp_ret.isna() | hy_change.isna())
+
+
+def signal_states(df, window, context=None):
+    """시그널별 상태 코드 (int8, 열 = SIGNALS 순서)"""
+    context = signal_context(df, window) if context is None else context
+    netliq = context['NetLiq 60일(%)'].to_numpy()
+    corr = context['DXY-BTC 상관'].to_numpy()
+    hy = context['HY Spread(%)'].to_numpy()
+    divergence = divergence_state(context).to_numpy()
+
+    states = np.column_stack([
+        np.select([netliq < NETLIQ_CONTRACTION, netliq > NETLIQ_EXPANSION], [0, 2], 1),
+        np.select([corr < DXY_BTC_STRONG_INVERSE, corr > DXY_BTC_POSITIVE], [0, 2], 1),
+        np.select([hy > HY_DANGER, hy > HY_CAUTION], [2, 1], 0),
+        divergence == 1,
+    ]).astype(np.int8)
+    unknown = np.column_stack([np.isnan(netliq), np.isnan(corr), np.isnan(hy), np.isnan(divergence)])
+    states[unknown] = -1
+    return pd.DataFrame(states, index=df.index, columns=list(SIGNALS))
+
+
+@dataclass(frozen=True)
+class EventIndex:
+    """시그널 전환 이벤트 표와 (시그널, 새 상태) -> 행 번호 인덱스"""
+    events: pd.DataFrame
+    groups: dict
+    states: pd.DataFrame
+    window: int
+
+    def query(self, signal=None, states=None, start=None, end=None):
+        """시그널 / 새 상태 / 기간으로 이벤트 조회"""
+        if signal is not None:
+            names = states or SIGNALS[signal]
+            rows = np.concatenate([self.groups.get((signal, name), np.empty(0, dtype=int)) for name in names])
+            result = self.events.iloc[np.sort(rows)]
+        else:
+            result = self.events
+        if start is not None:
+            result = result[result['날짜'] >= pd.Timestamp(start)]
+        if end is not None:
+            result = result[result['날짜'] <= pd.Timestamp(end)]
+        return result
+
+    def current_states(self):
+        """시그널별 현재 상태 이름"""
+        last = self.states.iloc[-1]
+        return {signal: SIGNALS[signal][code] if code >= 0 else None for signal, code in last.items()}
+
+
+def build_event_index(df, window, halflife=None):
+    """전체 이력의 시그널 전환을 한 번에 추출 (이전 상태 → 새 상태, 지속 기간, 당시 지표 값)"""
+    context = signal_context(df, window, halflife)
+    states = signal_states(df, window, context)
+    codes = states.to_numpy()
+
+    changed = (codes[1:] != codes[:-1]) & (codes[:-1] >= 0) & (codes[1:] >= 0)
+    rows, signal_ids = np.nonzero(changed)
+    rows += 1
+
+    # 시그널별 시간 순 정렬 후 다음 전환 시점 = 이 상태의 종료 시점
+    order = np.lexsort((rows, signal_ids))
+    rows, signal_ids = rows[order], signal_ids[order]
+    next_rows = np.append(rows[1:], len(codes))
+    last_of_signal = np.append(signal_ids[1:] != signal_ids[:-1], True)
+    next_rows[last_of_signal] = len(codes)
+
+    signal_names = list(SIGNALS)
+    previous_codes = codes[rows - 1, signal_ids]
+    new_codes = codes[rows, signal_ids]
+    events = pd.DataFrame({
+        '날짜': df.index[rows],
+        '시그널': [signal_names[k] for k in signal_ids],
+        '이전 상태': [SIGNALS[signal_names[k]][c] for k, c in zip(signal_ids, previous_codes)],
+        '새 상태': [SIGNALS[signal_names[k]][c] for k, c in zip(signal_ids, new_codes)],
+        '지속(영업일)': next_rows - rows,
+        '진행 중': next_rows == len(codes),
+    })
+    events = pd.concat([events, context.iloc[rows].reset_index(drop=True)], axis=1)
+    events = events.sort_values('날짜', kind='stable').reset_index(drop=True)
+
+    groups = events.groupby(['시그널', '새 상태']).indices if len(events) else {}
+    return EventIndex(events=events, groups=groups, states=states, window=window)
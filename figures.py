@@ -0,0 +1,861 @@
+# ============================================================
+# 차트 생성 (Streamlit 비의존)
+# 분석 결과(AnalyticsResult)로부터 탭별 Plotly Figure 를 생성
+# 세션 간 공유되므로 생성된 Figure 는 읽기 전용으로 취급합니다
+# ============================================================
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from analytics import CORRELATION_MODES, DEFAULT_CORRELATION_MODE, ROLLING_PAIRS
+from events import SIGNALS
+from regimes import REGIME_COLORS
+from significance import fisher_interval
+from watchlist import SCORE_RANGE
+
+
+def build_netliq_figure(analytics, window):
+    """콤보 1: Net Liquidity vs BTC/NASDAQ, 롤링 상관계수, 60일 변화율"""
+    df_z = analytics.df_z
+    corr_btc = analytics.corr_btc
+    corr_nasdaq = analytics.corr_nasdaq
+    netliq_change = analytics.netliq_change
+    
+    fig1 = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=(
+            'Net Liquidity vs BTC/NASDAQ (Z-score)',
+            f'Net Liquidity 상관계수 ({analytics.weighting})',
+            'Net Liquidity 60일 변화율 (유동성 확장/축소)'
+        ),
+        vertical_spacing=0.08,
+        row_heights=[0.35, 0.3, 0.35]
+    )
+
+    fig1.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['NetLiq'],
+                   name='Net Liquidity', line=dict(color='#2E86AB', width=2.5)),
+        row=1, col=1
+    )
+    fig1.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['BTC'],
+                   name='Bitcoin', line=dict(color='#F77F00', width=2.5)),
+        row=1, col=1
+    )
+    fig1.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['NASDAQ'],
+                   name='NASDAQ', line=dict(color='#06A77D', width=2.5)),
+        row=1, col=1
+    )
+    fig1.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=1, col=1)
+
+    fig1.add_trace(
+        go.Scatter(x=corr_btc.index, y=corr_btc,
+                   name='Corr(NetLiq, BTC)',
+                   line=dict(color='#F77F00', width=2.5),
+                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.2)'),
+        row=2, col=1
+    )
+    fig1.add_trace(
+        go.Scatter(x=corr_nasdaq.index, y=corr_nasdaq,
+                   name='Corr(NetLiq, NASDAQ)',
+                   line=dict(color='#06A77D', width=2.5),
+                   fill='tozeroy', fillcolor='rgba(6, 167, 125, 0.2)'),
+        row=2, col=1
+    )
+    fig1.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=1)
+
+    expansion = netliq_change[netliq_change > 0]
+    fig1.add_trace(
+        go.Scatter(x=expansion.index, y=expansion,
+                   name='확장 구간 🟢',
+                   line=dict(color='#06A77D', width=0),
+                   fill='tozeroy', fillcolor='rgba(6, 167, 125, 0.4)'),
+        row=3, col=1
+    )
+
+    contraction = netliq_change[netliq_change <= 0]
+    fig1.add_trace(
+        go.Scatter(x=contraction.index, y=contraction,
+                   name='축소 구간 🔴',
+                   line=dict(color='#D62828', width=0),
+                   fill='tozeroy', fillcolor='rgba(214, 40, 40, 0.4)'),
+        row=3, col=1
+    )
+
+    fig1.add_trace(
+        go.Scatter(x=netliq_change.index, y=netliq_change,
+                   name='변화율', line=dict(color='black', width=2),
+                   showlegend=False),
+        row=3, col=1
+    )
+    fig1.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=1)
+
+    fig1.update_layout(
+        height=1200,
+        showlegend=True,
+        hovermode='x unified',
+        template='plotly_white'
+    )
+
+    fig1.update_yaxes(title_text="Z-score", row=1, col=1)
+    fig1.update_yaxes(title_text="Correlation", row=2, col=1)
+    fig1.update_yaxes(title_text="변화율 (%)", row=3, col=1)
+
+    return fig1
+
+
+def build_dollar_figure(analytics, window):
+    """콤보 2: Dollar Index (반전) vs BTC/S&P 500, 롤링 상관계수, DXY 원본"""
+    df_recent = analytics.df_recent
+    df_z = analytics.df_z
+    corr_dxy_btc = analytics.corr_dxy_btc
+    corr_dxy_sp = analytics.corr_dxy_sp
+    
+    fig2 = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=(
+            'Dollar Index (반전) vs BTC/S&P 500 (Z-score)',
+            f'Dollar Index 상관계수 ({analytics.weighting})',
+            'Dollar Index 원본 차트'
+        ),
+        vertical_spacing=0.10,
+        row_heights=[0.35, 0.35, 0.30]
+    )
+
+    # 첫 번째 차트: DXY 반전 vs BTC & S&P 500
+    fig2.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['DXY_Inverted'],
+                   name='Dollar Index (반전)',
+                   line=dict(color='#D62828', width=2.5)),
+        row=1, col=1
+    )
+    fig2.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['BTC'],
+                   name='Bitcoin',
+                   line=dict(color='#F77F00', width=2.5)),
+        row=1, col=1
+    )
+    fig2.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['SP500'],
+                   name='S&P 500',
+                   line=dict(color='#2E86AB', width=2.5)),
+        row=1, col=1
+    )
+    fig2.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=1, col=1)
+
+    # 두 번째 차트: 상관계수
+    fig2.add_trace(
+        go.Scatter(x=corr_dxy_btc.index, y=corr_dxy_btc,
+                   name='Corr(DXY, BTC)',
+                   line=dict(color='#F77F00', width=2.5),
+                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.3)'),
+        row=2, col=1
+    )
+    fig2.add_trace(
+        go.Scatter(x=corr_dxy_sp.index, y=corr_dxy_sp,
+                   name='Corr(DXY, S&P500)',
+                   line=dict(color='#2E86AB', width=2.5),
+                   fill='tozeroy', fillcolor='rgba(46, 134, 171, 0.3)'),
+        row=2, col=1
+    )
+    fig2.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=1)
+    fig2.add_hline(y=-0.5, line_dash="dot", line_color="green", opacity=0.7, 
+                   annotation_text="강한 역상관", row=2, col=1)
+
+    # 세 번째 차트: DXY 원본
+    fig2.add_trace(
+        go.Scatter(x=df_recent.index, y=df_recent['DXY'],
+                   name='Dollar Index',
+                   line=dict(color='#D62828', width=2.5),
+                   fill='tozeroy', fillcolor='rgba(214, 40, 40, 0.2)'),
+        row=3, col=1
+    )
+
+    fig2.update_layout(
+        height=1200,
+        showlegend=True,
+        hovermode='x unified',
+        template='plotly_white'
+    )
+
+    fig2.update_yaxes(title_text="Z-score", row=1, col=1)
+    fig2.update_yaxes(title_text="Correlation", row=2, col=1)
+    fig2.update_yaxes(title_text="Dollar Index", row=3, col=1)
+
+    return fig2
+
+
+def build_credit_figure(analytics, window):
+    """콤보 3: HY Spread vs S&P 500/BTC, 롤링 상관계수, Divergence, HY Spread 원본"""
+    df_recent = analytics.df_recent
+    df_z = analytics.df_z
+    corr_hy_sp = analytics.corr_hy_sp
+    corr_hy_btc = analytics.corr_hy_btc
+    divergence = analytics.divergence_mask()
+    
+    fig3 = make_subplots(
+        rows=4, cols=1,
+        subplot_titles=(
+            'High Yield Spread vs S&P 500 / BTC (Z-score)',
+            f'HY Spread 상관계수 ({analytics.weighting})',
+            'Divergence 감지: S&P 상승 + HY Spread 상승 (매도 신호)',
+            'HY Spread 원본 차트'
+        ),
+        vertical_spacing=0.08,
+        row_heights=[0.3, 0.25, 0.25, 0.20]
+    )
+
+    # 첫 번째 차트: HY Spread vs S&P 500 & BTC (Z-score)
+    fig3.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['HYSpread'],
+                   name='HY Spread',
+                   line=dict(color='#D62828', width=2.5)),
+        row=1, col=1
+    )
+    fig3.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['SP500'],
+                   name='S&P 500',
+                   line=dict(color='#2E86AB', width=2.5)),
+        row=1, col=1
+    )
+    fig3.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['BTC'],
+                   name='Bitcoin',
+                   line=dict(color='#F77F00', width=2)),
+        row=1, col=1
+    )
+    fig3.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=1, col=1)
+
+    # 두 번째 차트: 상관계수
+    fig3.add_trace(
+        go.Scatter(x=corr_hy_sp.index, y=corr_hy_sp,
+                   name='Corr(HY, S&P500)',
+                   line=dict(color='#2E86AB', width=2.5),
+                   fill='tozeroy', fillcolor='rgba(46, 134, 171, 0.3)'),
+        row=2, col=1
+    )
+    fig3.add_trace(
+        go.Scatter(x=corr_hy_btc.index, y=corr_hy_btc,
+                   name='Corr(HY, BTC)',
+                   line=dict(color='#F77F00', width=2.5),
+                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.3)'),
+        row=2, col=1
+    )
+    fig3.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=1)
+
+    # 세 번째 차트: Divergence (원본 가격 유지)
+    fig3.add_trace(
+        go.Scatter(x=df_recent.index, y=df_recent['SP500'],
+                   name='S&P 500',
+                   line=dict(color='#2E86AB', width=2), opacity=0.6),
+        row=3, col=1
+    )
+    fig3.add_trace(
+        go.Scatter(x=df_recent[divergence].index,
+                   y=df_recent.loc[divergence, 'SP500'],
+                   name='Divergence 경고 ⚠️',
+                   mode='markers',
+                   marker=dict(color='red', size=10, symbol='diamond')),
+        row=3, col=1
+    )
+
+    # 네 번째 차트: HY Spread 원본
+    fig3.add_trace(
+        go.Scatter(x=df_recent.index, y=df_recent['HYSpread'],
+                   name='HY Spread',
+                   line=dict(color='#D62828', width=2.5),
+                   fill='tozeroy', fillcolor='rgba(214, 40, 40, 0.2)'),
+        row=4, col=1
+    )
+    fig3.add_hline(y=4.0, line_dash="dot", line_color="orange", opacity=0.7,
+                   annotation_text="경계 (4%)", row=4, col=1)
+    fig3.add_hline(y=5.0, line_dash="dash", line_color="darkred", opacity=0.8,
+                   annotation_text="위험 (5%)", row=4, col=1)
+
+    fig3.update_layout(
+        height=1400,
+        showlegend=True,
+        hovermode='x unified',
+        template='plotly_white'
+    )
+
+    fig3.update_yaxes(title_text="Z-score", row=1, col=1)
+    fig3.update_yaxes(title_text="Correlation", row=2, col=1)
+    fig3.update_yaxes(title_text="S&P 500", row=3, col=1)
+    fig3.update_yaxes(title_text="HY Spread (%)", row=4, col=1)
+
+    return fig3
+
+
+def build_dashboard_figure(analytics, window, corr_mode=DEFAULT_CORRELATION_MODE):
+    """종합 대시보드: 3콤보 Z-score, 상관계수 히트맵(corr_mode 기준), DXY/HY 상관계수"""
+    df_z = analytics.df_z
+    corr_matrix = analytics.correlation_matrix(corr_mode)
+    corr_dxy_btc = analytics.corr_dxy_btc
+    corr_dxy_sp = analytics.corr_dxy_sp
+    corr_hy_sp = analytics.corr_hy_sp
+    corr_hy_btc = analytics.corr_hy_btc
+    
+    fig_dashboard = make_subplots(
+        rows=3, cols=2,
+        subplot_titles=(
+            'Net Liquidity + BTC/NASDAQ (Z-score)',
+            f'상관계수 히트맵 ({CORRELATION_MODES[corr_mode]})',
+            'Dollar Index (반전) vs BTC/S&P500 (Z-score)',
+            'DXY 상관계수',
+            'HY Spread vs S&P500/BTC (Z-score)',
+            'HY Spread 상관계수'
+        ),
+        specs=[
+            [{"type": "xy"}, {"type": "heatmap"}],
+            [{"type": "xy"}, {"type": "xy"}],
+            [{"type": "xy"}, {"type": "xy"}]
+        ],
+        vertical_spacing=0.12,
+        horizontal_spacing=0.12,
+        row_heights=[0.33, 0.33, 0.34]
+    )
+
+    # Row 1, Col 1: Net Liquidity
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['NetLiq'],
+                   name='Net Liquidity', line=dict(color='#2E86AB', width=2)),
+        row=1, col=1
+    )
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['BTC'],
+                   name='Bitcoin', line=dict(color='#F77F00', width=2)),
+        row=1, col=1
+    )
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['NASDAQ'],
+                   name='NASDAQ', line=dict(color='#06A77D', width=2)),
+        row=1, col=1
+    )
+    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=1, col=1)
+
+    # Row 1, Col 2: 상관계수 히트맵
+    fig_dashboard.add_trace(
+        go.Heatmap(
+            z=corr_matrix.values,
+            x=corr_matrix.columns,
+            y=corr_matrix.columns,
+            colorscale='RdYlGn',
+            zmid=0,
+            zmin=-1,
+            zmax=1,
+            text=np.round(corr_matrix.values, 2),
+            texttemplate='%{text}',
+            textfont={"size": 10},
+            colorbar=dict(title="Correlation")
+        ),
+        row=1, col=2
+    )
+
+    # Row 2, Col 1: DXY vs BTC/S&P500
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['DXY_Inverted'],
+                   name='DXY (반전)', line=dict(color='#D62828', width=2)),
+        row=2, col=1
+    )
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['BTC'],
+                   name='BTC', line=dict(color='#F77F00', width=2)),
+        row=2, col=1
+    )
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['SP500'],
+                   name='S&P500', line=dict(color='#2E86AB', width=2)),
+        row=2, col=1
+    )
+    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=1)
+
+    # Row 2, Col 2: DXY 상관계수
+    fig_dashboard.add_trace(
+        go.Scatter(x=corr_dxy_btc.index, y=corr_dxy_btc,
+                   name='Corr(DXY, BTC)', line=dict(color='#F77F00', width=2),
+                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.2)'),
+        row=2, col=2
+    )
+    fig_dashboard.add_trace(
+        go.Scatter(x=corr_dxy_sp.index, y=corr_dxy_sp,
+                   name='Corr(DXY, S&P500)', line=dict(color='#2E86AB', width=2),
+                   fill='tozeroy', fillcolor='rgba(46, 134, 171, 0.2)'),
+        row=2, col=2
+    )
+    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=2, col=2)
+
+    # Row 3, Col 1: HY Spread vs S&P500/BTC (Z-score)
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['HYSpread'],
+                   name='HY Spread', line=dict(color='#D62828', width=2.5)),
+        row=3, col=1
+    )
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['SP500'],
+                   name='S&P 500', line=dict(color='#2E86AB', width=2)),
+        row=3, col=1
+    )
+    fig_dashboard.add_trace(
+        go.Scatter(x=df_z.index, y=df_z['BTC'],
+                   name='Bitcoin', line=dict(color='#F77F00', width=1.5), opacity=0.7),
+        row=3, col=1
+    )
+    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=1)
+
+    # Row 3, Col 2: HY Spread 상관계수
+    fig_dashboard.add_trace(
+        go.Scatter(x=corr_hy_sp.index, y=corr_hy_sp,
+                   name='Corr(HY, S&P500)', line=dict(color='#2E86AB', width=2),
+                   fill='tozeroy', fillcolor='rgba(46, 134, 171, 0.2)'),
+        row=3, col=2
+    )
+    fig_dashboard.add_trace(
+        go.Scatter(x=corr_hy_btc.index, y=corr_hy_btc,
+                   name='Corr(HY, BTC)', line=dict(color='#F77F00', width=2),
+                   fill='tozeroy', fillcolor='rgba(247, 127, 0, 0.2)'),
+        row=3, col=2
+    )
+    fig_dashboard.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=2)
+
+    fig_dashboard.update_layout(
+        height=1400,
+        showlegend=True,
+        hovermode='x unified',
+        template='plotly_white'
+    )
+
+    fig_dashboard.update_yaxes(title_text="Z-score", row=1, col=1)
+    fig_dashboard.update_yaxes(title_text="Z-score", row=2, col=1)
+    fig_dashboard.update_yaxes(title_text="Correlation", row=2, col=2)
+    fig_dashboard.update_yaxes(title_text="Z-score", row=3, col=1)
+    fig_dashboard.update_yaxes(title_text="Correlation", row=3, col=2)
+
+    return fig_dashboard
+
+
+# 레짐 배경을 칠할 시계열 subplot (row, col) - 종합 대시보드의 히트맵 칸은 제외
+REGIME_CELLS = {
+    'netliq': [(1, 1), (2, 1), (3, 1)],
+    'dollar': [(1, 1), (2, 1), (3, 1)],
+    'credit': [(1, 1), (2, 1), (3, 1), (4, 1)],
+    'dashboard': [(1, 1), (2, 1), (2, 2), (3, 1), (3, 2)],
+}
+
+
+def add_regime_overlay(fig, segments, cells):
+    """레짐 구간을 subplot 배경색으로 표시 (shape 를 한 번에 추가 - add_vrect 반복보다 훨씬 빠름)"""
+    refs = []
+    for row, col in cells:
+        subplot = fig.get_subplot(row, col)
+        refs.append((
+            subplot.xaxis.plotly_name.replace('axis', ''),
+            subplot.yaxis.plotly_name.replace('axis', '') + ' domain'
+        ))
+    shapes = [
+        dict(type='rect', xref=xref, yref=yref, x0=start, x1=end, y0=0, y1=1,
+             fillcolor=REGIME_COLORS[state % len(REGIME_COLORS)],
+             line_width=0, layer='below')
+        for start, end, state in segments
+        for xref, yref in refs
+    ]
+    fig.update_layout(shapes=list(fig.layout.shapes) + shapes)
+    return fig
+
+
+def build_figures(analytics, window, regimes=None, corr_mode=DEFAULT_CORRELATION_MODE):
+    """탭별 Figure 일괄 생성 (regimes 가 주어지면 레짐 배경 표시, 히트맵은 corr_mode 기준)"""
+    figures = {
+        'netliq': build_netliq_figure(analytics, window),
+        'dollar': build_dollar_figure(analytics, window),
+        'credit': build_credit_figure(analytics, window),
+        'dashboard': build_dashboard_figure(analytics, window, corr_mode),
+    }
+    if regimes is not None:
+        segments = regimes.segments(analytics.df_recent.index)
+        for name, fig in figures.items():
+            add_regime_overlay(fig, segments, REGIME_CELLS[name])
+    return figures
+
+
+# 롤링 교차상관 히트맵의 최대 행 수 (긴 기간은 일정 간격으로 솎아서 표시)
+HEATMAP_MAX_ROWS = 400
+
+
+def build_lead_lag_figure(lead_lag):
+    """선행/후행: 시차별 교차상관, 롤링 교차상관 히트맵, 최대 상관 시차 추이"""
+    base, target = lead_lag.base, lead_lag.target
+    curve = lead_lag.pair(base, target)
+    band = lead_lag.significance()
+
+    fig = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=(
+            f'교차상관: corr({base}[t], {target}[t + 시차])',
+            f'롤링 교차상관 ({lead_lag.window}일 윈도우)',
+            '최대 |상관| 시차 추이 (양수 = Net Liquidity 선행)'
+        ),
+        vertical_spacing=0.1,
+        row_heights=[0.3, 0.45, 0.25]
+    )
+
+    fig.add_trace(
+        go.Bar(x=curve.index, y=curve,
+               name=curve.name,
+               marker_color=np.where(np.abs(curve) > band, '#F77F00', '#A0AEC0')),
+        row=1, col=1
+    )
+    fig.add_hline(y=band, line_dash="dash", line_color="red", opacity=0.6, row=1, col=1,
+                  annotation_text="95% 유의")
+    fig.add_hline(y=-band, line_dash="dash", line_color="red", opacity=0.6, row=1, col=1)
+
+    rolling = lead_lag.rolling.dropna(how='all')
+    step = max(1, len(rolling) // HEATMAP_MAX_ROWS)
+    rolling = rolling.iloc[::step]
+    fig.add_trace(
+        go.Heatmap(x=rolling.index, y=rolling.columns, z=rolling.to_numpy().T,
+                   colorscale='RdBu', zmid=0, zmin=-1, zmax=1,
+                   colorbar=dict(title='Corr', len=0.4, y=0.5),
+                   name='롤링 교차상관'),
+        row=2, col=1
+    )
+
+    peak_lag = lead_lag.peak_lag_path()
+    fig.add_trace(
+        go.Scatter(x=peak_lag.index, y=peak_lag,
+                   name='최대 상관 시차', line=dict(color='#2E86AB', width=2)),
+        row=3, col=1
+    )
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=1)
+
+    fig.update_layout(
+        height=1100,
+        showlegend=False,
+        template='plotly_white'
+    )
+    fig.update_xaxes(title_text="시차 (영업일)", row=1, col=1)
+    fig.update_yaxes(title_text="Correlation", row=1, col=1)
+    fig.update_yaxes(title_text="시차 (영업일)", row=2, col=1)
+    fig.update_yaxes(title_text="시차 (영업일)", row=3, col=1)
+
+    return fig
+
+
+def build_significance_figure(analytics, window, bootstrap=None):
+    """롤링 상관계수별 Fisher-z 신뢰구간 (음영)과 블록 부트스트랩 신뢰구간 (점선)"""
+    rolling = analytics.rolling_correlations()
+    titles = [f"Corr({x}, {y})" for x, y in ROLLING_PAIRS.values()]
+    fig = make_subplots(rows=3, cols=2, subplot_titles=titles, vertical_spacing=0.08)
+
+    for position, (name, corr) in enumerate(rolling.items()):
+        row, col = position // 2 + 1, position % 2 + 1
+        lower, upper = fisher_interval(corr, window)
+        fig.add_trace(
+            go.Scatter(x=upper.index, y=upper, line=dict(width=0),
+                       showlegend=False, hoverinfo='skip'),
+            row=row, col=col
+        )
+        fig.add_trace(
+            go.Scatter(x=lower.index, y=lower, line=dict(width=0),
+                       fill='tonexty', fillcolor='rgba(46, 134, 171, 0.2)',
+                       name='Fisher-z 95%', showlegend=position == 0),
+            row=row, col=col
+        )
+        fig.add_trace(
+            go.Scatter(x=corr.index, y=corr, name='상관계수',
+                       line=dict(color='#2E86AB', width=2), showlegend=position == 0),
+            row=row, col=col
+        )
+        if bootstrap is not None:
+            boot_lower, boot_upper = bootstrap.bands[name]
+            for band, show in ((boot_lower, position == 0), (boot_upper, False)):
+                fig.add_trace(
+                    go.Scatter(x=band.index, y=band, name='블록 부트스트랩 95%',
+                               line=dict(color='#D62828', width=1, dash='dot'),
+                               showlegend=show),
+                    row=row, col=col
+                )
+        fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=row, col=col)
+
+    fig.update_layout(
+        height=900,
+        hovermode='x unified',
+        template='plotly_white'
+    )
+    fig.update_yaxes(range=[-1, 1])
+
+    return fig
+
+
+def build_regime_figure(regimes, index):
+    """index 구간의 주간 레짐 사후확률 (누적 영역)"""
+    probabilities = regimes.probabilities
+    probabilities = probabilities[(probabilities.index >= index[0]) & (probabilities.index <= index[-1] + np.timedelta64(6, 'D'))]
+    line_colors = ['#06A77D', '#A0AEC0', '#D62828']
+
+    fig = go.Figure()
+    for position, name in enumerate(probabilities.columns):
+        fig.add_trace(
+            go.Scatter(x=probabilities.index, y=probabilities[name], name=name,
+                       stackgroup='regime', mode='lines',
+                       line=dict(width=0.5, color=line_colors[position % len(line_colors)]))
+        )
+    fig.update_layout(
+        height=320,
+        hovermode='x unified',
+        template='plotly_white',
+        yaxis=dict(title='확률', range=[0, 1]),
+        margin=dict(t=30)
+    )
+    return fig
+
+
+# events.SIGNALS 상태 순서별 색상 (초록 = 위험자산 우호, 빨강 = 경계)
+SIGNAL_STATE_COLORS = {
+    'Net Liquidity': ['#D62828', '#A0AEC0', '#06A77D'],
+    'DXY-BTC 상관': ['#06A77D', '#A0AEC0', '#D62828'],
+    'HY Spread': ['#06A77D', '#F77F00', '#D62828'],
+    'Divergence': ['#A0AEC0', '#D62828'],
+}
+
+
+def build_forward_return_figure(conditional, signal, horizon):
+    """시그널 상태별 horizon 일 미래 수익률 분포 (자산별 히스토그램)"""
+    histograms = conditional.histograms(signal, horizon)
+    assets = list(histograms)
+    fig = make_subplots(rows=1, cols=max(1, len(assets)), subplot_titles=[f'{asset} {horizon}일 수익률' for asset in assets])
+    colors = SIGNAL_STATE_COLORS.get(signal, [])
+    for col, asset in enumerate(assets, start=1):
+        edges, shares = histograms[asset]
+        centers = (edges[:-1] + edges[1:]) / 2
+        for state, share in shares.items():
+            position = SIGNALS[signal].index(state)
+            fig.add_trace(
+                go.Bar(x=centers, y=share, name=state, legendgroup=state, showlegend=col == 1,
+                       marker_color=colors[position] if position < len(colors) else None,
+                       opacity=0.55, width=edges[1] - edges[0]),
+                row=1, col=col
+            )
+        fig.add_vline(x=0, line_dash='dot', line_color='black', row=1, col=col)
+        fig.update_xaxes(title_text='%', row=1, col=col)
+    fig.update_yaxes(title_text='비율 (%)', row=1, col=1)
+    fig.update_layout(
+        height=380,
+        barmode='overlay',
+        template='plotly_white',
+        legend=dict(orientation='h', y=-0.2),
+        margin=dict(t=40)
+    )
+    return fig
+
+
+DRIVER_COLORS = {'NetLiq': '#2E86AB', 'DXY': '#06A77D', 'HYSpread': '#D62828'}
+
+
+def build_regression_figure(regression):
+    """대상별 롤링 표준화 베타(위)와 편상관계수(아래)"""
+    targets = list(regression.targets)
+    fig = make_subplots(
+        rows=2, cols=max(1, len(targets)),
+        subplot_titles=[f'{target} 표준화 베타' for target in targets] + [f'{target} 편상관계수' for target in targets],
+        shared_xaxes=True,
+        vertical_spacing=0.1
+    )
+    for col, target in enumerate(targets, start=1):
+        for row, frame in ((1, regression.standardized[target]), (2, regression.partial[target])):
+            frame = frame.dropna()
+            for driver in regression.drivers:
+                fig.add_trace(
+                    go.Scatter(x=frame.index, y=frame[driver], name=driver, legendgroup=driver,
+                               showlegend=row == 1 and col == 1,
+                               line=dict(color=DRIVER_COLORS.get(driver), width=1.5)),
+                    row=row, col=col
+                )
+            fig.add_hline(y=0, line_dash='dot', line_color='gray', row=row, col=col)
+    fig.update_layout(
+        height=560,
+        hovermode='x unified',
+        template='plotly_white',
+        legend=dict(orientation='h', y=-0.08),
+        margin=dict(t=40)
+    )
+    return fig
+
+
+COMPONENT_COLORS = {'WALCL': '#2E86AB', 'TGA': '#F77F00', 'RRP': '#06A77D'}
+
+
+def build_liquidity_attribution_figure(attribution, horizon):
+    """horizon 기간 Net Liquidity 변화의 구성 요소별 기여 (십억 달러, 누적 막대) 와 합계 선"""
+    contributions = attribution.contributions(horizon, percent=False).dropna()
+    fig = go.Figure()
+    for component in contributions.columns:
+        fig.add_trace(
+            go.Bar(x=contributions.index, y=contributions[component], name=component,
+                   marker_color=COMPONENT_COLORS.get(component), marker_line_width=0)
+        )
+    fig.add_trace(
+        go.Scatter(x=contributions.index, y=contributions.sum(axis=1), name='Net Liquidity 변화',
+                   line=dict(color='black', width=1.5))
+    )
+    fig.add_hline(y=0, line_dash='dot', line_color='gray')
+    fig.update_layout(
+        title=f'Net Liquidity {horizon}일 변화 기여도 (부호 반영: TGA / RRP 증가는 음의 기여)',
+        height=420,
+        barmode='relative',
+        bargap=0,
+        hovermode='x unified',
+        template='plotly_white',
+        yaxis_title='십억 달러',
+        legend=dict(orientation='h', y=-0.15)
+    )
+    return fig
+
+
+NOWCAST_DAYS = 180
+
+
+def build_nowcast_figure(nowcast, days=NOWCAST_DAYS):
+    """최근 days 일 as-of Net Liquidity(계단) vs 일간 나우캐스트 (십억 달러), 주간 재고정 오차"""
+    official = nowcast.official.iloc[-days:] / 1000
+    estimate = nowcast.nowcast.iloc[-days:] / 1000
+    errors = nowcast.anchor_errors[nowcast.anchor_errors.index >= estimate.index[0]] / 1000
+
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Net Liquidity: 주간 공표 기준 vs 일간 나우캐스트', '주간 재고정 직전 추정 오차'),
+        vertical_spacing=0.12,
+        row_heights=[0.65, 0.35]
+    )
+    fig.add_trace(
+        go.Scatter(x=official.index, y=official, name='as-of (주간 공표)', line=dict(color='gray', width=2, shape='hv')),
+        row=1, col=1
+    )
+    fig.add_trace(
+        go.Scatter(x=estimate.index, y=estimate, name='나우캐스트', line=dict(color='#2E86AB', width=2)),
+        row=1, col=1
+    )
+    if nowcast.confirmed_through is not None and nowcast.confirmed_through < estimate.index[-1]:
+        fig.add_vrect(x0=nowcast.confirmed_through, x1=estimate.index[-1], fillcolor='orange', opacity=0.15,
+                      line_width=0, annotation_text='잠정', annotation_position='top left', row=1, col=1)
+    for column, color in zip(errors.columns, ('#2E86AB', 'gray')):
+        fig.add_trace(
+            go.Bar(x=errors.index, y=errors[column], name=f'오차: {column}', marker_color=color),
+            row=2, col=1
+        )
+    fig.add_hline(y=0, line_dash='dot', line_color='gray', row=2, col=1)
+    fig.update_layout(height=600, hovermode='x unified', template='plotly_white', barmode='group',
+                      legend=dict(orientation='h', y=-0.1))
+    fig.update_yaxes(title_text='십억 달러', row=1, col=1)
+    fig.update_yaxes(title_text='십억 달러', row=2, col=1)
+    return fig
+
+
+SCENARIO_COLORS = {'BTC': '#F77F00', 'NASDAQ': '#06A77D'}
+
+
+def build_scenario_figure(scenario):
+    """대상별 몬테카를로 누적 수익률 팬 차트(5~95%, 25~75%, 중앙값)와 만기 분포 히스토그램"""
+    targets = scenario.model.targets
+    days = np.arange(scenario.horizon + 1)
+    fig = make_subplots(
+        rows=2, cols=len(targets),
+        subplot_titles=[f'{target} 누적 수익률 경로 (%)' for target in targets]
+        + [f'{target} {scenario.horizon}일 후 분포' for target in targets],
+        vertical_spacing=0.15,
+        row_heights=[0.6, 0.4]
+    )
+    for col, target in enumerate(targets, start=1):
+        fan = scenario.fan[:, :, col - 1]
+        color = SCENARIO_COLORS.get(target, '#2E86AB')
+        for low, high, opacity in ((0, 4, 0.15), (1, 3, 0.3)):
+            fig.add_trace(
+                go.Scatter(x=np.concatenate([days, days[::-1]]), y=np.concatenate([fan[:, low], fan[::-1, high]]),
+                           fill='toself', fillcolor=color, opacity=opacity, line=dict(width=0),
+                           name=f'{target} {("5~95%", "25~75%")[low]}', hoverinfo='skip'),
+                row=1, col=col
+            )
+        fig.add_trace(
+            go.Scatter(x=days, y=fan[:, 2], name=f'{target} 중앙값', line=dict(color=color, width=2)),
+            row=1, col=col
+        )
+        fig.add_trace(
+            go.Scatter(x=days, y=np.expm1(np.log1p(scenario.effects.loc[target, '합계(%)'] / 100) * days / scenario.horizon) * 100,
+                       name=f'{target} 충격 효과', line=dict(color='black', width=1.5, dash='dash')),
+            row=1, col=col
+        )
+        fig.add_trace(
+            go.Histogram(x=scenario.terminal[:, col - 1], nbinsx=80, histnorm='percent',
+                         marker_color=color, name=f'{target} 만기', showlegend=False),
+            row=2, col=col
+        )
+        fig.add_vline(x=0, line_dash='dot', line_color='gray', row=2, col=col)
+        fig.update_xaxes(title_text='영업일', row=1, col=col)
+    fig.update_layout(height=650, template='plotly_white', hovermode='x unified', legend=dict(orientation='h', y=-0.12))
+    return fig
+
+
+def build_watchlist_figure(watch):
+    """워치리스트: 자산 × 요인 최신 상관계수 히트맵과 종합 점수 막대 (점수 순)"""
+    table = watch.table()
+    latest = table[[f'{driver} 상관' for driver in watch.drivers]]
+    scores = table['점수']
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=(f'최신 상관계수 ({watch.weighting}, 일간 수익률)', '종합 신호 점수'),
+        column_widths=[0.6, 0.4],
+        shared_yaxes=True,
+        horizontal_spacing=0.05
+    )
+    fig.add_trace(
+        go.Heatmap(x=list(watch.drivers), y=latest.index, z=latest.to_numpy(),
+                   colorscale='RdBu', zmid=0, zmin=-1, zmax=1,
+                   text=np.round(latest.to_numpy(), 2), texttemplate='%{text}',
+                   colorbar=dict(title='Corr', x=0.55)),
+        row=1, col=1
+    )
+    fig.add_trace(
+        go.Bar(x=scores, y=scores.index, orientation='h',
+               marker_color=np.where(scores >= 2, '#06A77D', np.where(scores <= -1, '#D62828', '#A0AEC0'))),
+        row=1, col=2
+    )
+    fig.update_layout(height=max(350, 28 * len(table) + 120), showlegend=False, template='plotly_white')
+    fig.update_yaxes(autorange='reversed', row=1, col=1)
+    return fig
+
+
+def build_watchlist_history_figure(watch, driver, assets):
+    """선택 자산들의 driver 롤링 상관계수 추이"""
+    correlations = watch.correlations(driver)
+    fig = go.Figure()
+    for asset in assets:
+        fig.add_trace(go.Scatter(x=correlations.index, y=correlations[asset], name=asset, line=dict(width=1.5)))
+    fig.add_hline(y=0, line_dash='dot', line_color='gray')
+    fig.update_layout(
+        title=f'{driver} 롤링 상관계수 ({watch.weighting})',
+        height=420,
+        hovermode='x unified',
+        template='plotly_white',
+        yaxis=dict(range=[-1, 1], title='Correlation'),
+        legend=dict(orientation='h', y=-0.15)
+    )
+    return fig
+
+
+def build_screener_figure(table, x_column, y_column):
+    """스크리너: 자산별 두 지표 산점도 (색 = 종합 점수)"""
+    table = table.dropna(subset=[x_column, y_column])
+    fig = go.Figure(
+        go.Scatter(
+            x=table[x_column], y=table[y_column], mode='markers+text', text=table.index,
+            textposition='top center',
+            marker=dict(size=11, color=table['점수'], colorscale='RdYlGn', cmin=SCORE_RANGE[0], cmax=SCORE_RANGE[1],
+                        colorbar=dict(title='점수'), line=dict(width=0.5, color='gray')),
+            hovertemplate='%{text}<br>' + x_column + ': %{x:.3f}<br>' + y_column + ': %{y:.3f}<extra></extra>'
+        )
+    )
+    fig.add_hline(y=0, line_dash='dot', line_color='gray')
+    fig.add_vline(x=0, line_dash='dot', line_color='gray')
+    fig.update_layout(height=520, template='plotly_white', xaxis_title=x_column, yaxis_title=y_column)
+    return fig
@@ -0,0 +1,92 @@
+# ============================================================
+# 시그널 상태별 미래 수익률 분포 (Streamlit 비의존)
+# 전체 이력의 미래 수익률 행렬(기간 × 시점 × 자산)을 한 번 만들고,
+# 트레이딩 시그널 탭의 상태 코드(events.signal_states)로 나눠 분포를 집계
+# ============================================================
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from events import SIGNALS
+
+FORWARD_HORIZONS = (5, 20, 60)
+FORWARD_ASSETS = ('BTC', 'NASDAQ', 'SP500')
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+HISTOGRAM_BINS = 40
+
+
+def forward_return_matrix(df, horizons=FORWARD_HORIZONS, assets=FORWARD_ASSETS):
+    """forward[h, t, a] = t 시점 이후 horizons[h] 영업일 수익률(%) (끝부분은 NaN)"""
+    values = df[list(assets)].to_numpy(dtype=float)
+    forward = np.full((len(horizons), len(values), len(assets)), np.nan)
+    for position, horizon in enumerate(horizons):
+        if horizon < len(values):
+            forward[position, :-horizon] = (values[horizon:] / values[:-horizon] - 1) * 100
+    return forward
+
+
+@dataclass(frozen=True)
+class ConditionalReturns:
+    """미래 수익률 행렬과 시그널 상태 코드 (세션 간 공유, 읽기 전용)"""
+    index: pd.DatetimeIndex
+    horizons: tuple
+    assets: tuple
+    forward: np.ndarray         # (기간, 시점, 자산)
+    states: pd.DataFrame        # 시그널별 상태 코드 (-1 = 판단 불가)
+
+    def _select(self, signal, horizon):
+        codes = self.states[signal].to_numpy()
+        return codes, self.forward[self.horizons.index(horizon)]
+
+    def quantile_table(self, signal, horizon):
+        """상태 × 자산별 표본 수, 평균, 분위수, 상승 확률"""
+        codes, forward = self._select(signal, horizon)
+        current = self.states[signal].iloc[-1]
+        rows = []
+        for code, state in enumerate(SIGNALS[signal]):
+            samples = forward[codes == code]
+            count = np.sum(~np.isnan(samples), axis=0)
+            with np.errstate(invalid='ignore'):
+                quantiles = np.nanquantile(samples, QUANTILES, axis=0) if len(samples) else np.full((len(QUANTILES), len(self.assets)), np.nan)
+                mean = np.nanmean(samples, axis=0) if len(samples) else np.full(len(self.assets), np.nan)
+                win_rate = np.sum(samples > 0, axis=0) / np.maximum(count, 1) * 100
+            for position, asset in enumerate(self.assets):
+                row = {'상태': state + (' ◀ 현재' if code == current else ''), '자산': asset, '표본': int(count[position]),
+                       '평균(%)': mean[position]}
+                row.update({f'{q:.0%}': quantiles[i, position] for i, q in enumerate(QUANTILES)})
+                row['상승 확률(%)'] = win_rate[position] if count[position] else np.nan
+                rows.append(row)
+        return pd.DataFrame(rows).set_index(['상태', '자산'])
+
+    def histograms(self, signal, horizon, bins=HISTOGRAM_BINS):
+        """자산별 공통 구간 경계와 상태별 비율(%) {자산: (경계, {상태: 비율})}"""
+        codes, forward = self._select(signal, horizon)
+        result = {}
+        for position, asset in enumerate(self.assets):
+            values = forward[:, position]
+            valid = ~np.isnan(values) & (codes >= 0)
+            if not valid.any():
+                continue
+            # 극단값 1%를 잘라 구간 폭을 정함 (잘린 값은 양 끝 구간에 포함)
+            low, high = np.quantile(values[valid], [0.005, 0.995])
+            edges = np.linspace(low, high, bins + 1)
+            shares = {}
+            for code, state in enumerate(SIGNALS[signal]):
+                samples = np.clip(values[valid & (codes == code)], low, high)
+                if len(samples):
+                    shares[state] = np.histogram(samples, bins=edges)[0] / len(samples) * 100
+            result[asset] = (edges, shares)
+        return result
+
+
+def build_conditional_returns(df, states, horizons=FORWARD_HORIZONS, assets=FORWARD_ASSETS):
+    """df(전체 이력 프레임)와 같은 인덱스의 상태 코드로 조건부 수익률 엔진 생성"""
+    assets = tuple(asset for asset in assets if asset in df.columns)
+    return ConditionalReturns(
+        index=df.index,
+        horizons=tuple(horizons),
+        assets=assets,
+        forward=forward_return_matrix(df, horizons, assets),
+        states=states,
+    )
@@ -0,0 +1,135 @@
+# ============================================================
+# 시리즈별 데이터 신선도 정책 (Release-calendar-aware invalidation)
+# FRED 메타데이터의 발표 주기와 마지막 관측일로 다음 관측치가 공표될
+# 시각을 계산하고, 그 전에는 API 를 호출하지 않습니다. 예정 시각 이후에도
+# 메타데이터(last_updated)가 바뀌지 않았다면 관측치는 다시 받지 않습니다.
+# ============================================================
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from registry import DEFAULT_RELEASE_RULE
+
+# 공표 예정 시각 이후 데이터가 아직 없을 때 메타데이터를 다시 확인하는 간격
+RECHECK_INTERVAL = timedelta(hours=1)
+
+
+def next_observation_date(last_observation, frequency, includes_weekends=False):
+    """발표 주기(FRED frequency_short) 기준 다음 관측일"""
+    frequency = (frequency or 'D').upper()
+    if frequency.startswith('D'):
+        if includes_weekends:
+            return last_observation + pd.Timedelta(days=1)
+        return last_observation + pd.offsets.BDay(1)
+    if frequency == 'BW':
+        return last_observation + pd.Timedelta(days=14)
+    if frequency.startswith('W'):
+        return last_observation + pd.Timedelta(days=7)
+    if frequency.startswith('M'):
+        return last_observation + pd.DateOffset(months=1)
+    if frequency.startswith('Q'):
+        return last_observation + pd.DateOffset(months=3)
+    if frequency.startswith(('A', 'S')):
+        return last_observation + pd.DateOffset(years=1)
+    return last_observation + pd.Timedelta(days=1)
+
+
+def expected_release(last_observation, frequency, release_rule, includes_weekends=False):
+    """다음 관측치가 FRED 에 공표될 것으로 예상되는 시각 (UTC)"""
+    lag_days, release_time = release_rule
+    observation = next_observation_date(last_observation, frequency, includes_weekends)
+    release_date = (observation + pd.Timedelta(days=lag_days)).date()
+    return datetime.combine(release_date, release_time, tzinfo=timezone.utc)
+
+
+class FreshnessPolicy:
+    """
+    시리즈 키별 갱신 시점을 관리합니다.
+
+    get_info(key) 는 FRED 시리즈 메타데이터(frequency_short, last_updated 등)를
+    반환해야 하며, release_rules 는 키 -> (관측일 이후 공표까지 일수, 공표 시각 UTC),
+    frequencies 는 메타데이터 조회 실패 시 사용할 키 -> 발표 주기입니다.
+    """
+
+    def __init__(self, get_info, release_rules, frequencies=None, recheck_interval=RECHECK_INTERVAL):
+        self.get_info = get_info
+        self.release_rules = dict(release_rules)
+        self.frequencies = dict(frequencies or {})
+        self.recheck_interval = recheck_interval
+        self._states = {}
+        self._pending_info = {}
+
+    def due_keys(self, keys, now):
+        """공표 예정 시각이 지나 확인이 필요한 키"""
+        return [
+            key for key in keys
+            if key not in self._states or self._states[key]['next_check'] <= now
+        ]
+
+    def changed_keys(self, keys):
+        """메타데이터상 새 데이터가 올라온 키 (메타데이터 조회 실패 시 변경으로 간주)"""
+        changed = []
+        for key in keys:
+            try:
+                info = self.get_info(key)
+            except Exception:
+                changed.append(key)
+                continue
+            self._pending_info[key] = info
+            state = self._states.get(key)
+            if state is None or str(info.get('last_updated')) != state['last_updated']:
+                changed.append(key)
+        return changed
+
+    def mark_fetched(self, key, series, now):
+        """관측치를 새로 받은 뒤 다음 확인 시각 계산"""
+        info = self._pending_info.pop(key, {})
+        previous = self._states.get(key, {})
+        frequency = (info.get('frequency_short') or previous.get('frequency')
+                     or self.frequencies.get(key, 'D'))
+        series = series.dropna()
+        if series.empty:
+            self.mark_unchanged(key, now)
+            return
+        last_observation = series.index[-1]
+        includes_weekends = bool((series.index.dayofweek >= 5).any())
+        release = expected_release(
+            last_observation, frequency,
+            self.release_rules.get(key, DEFAULT_RELEASE_RULE), includes_weekends
+        )
+        self._states[key] = {
+            'frequency': frequency,
+            'last_observation': last_observation,
+            'last_updated': str(info.get('last_updated', previous.get('last_updated'))),
+            'includes_weekends': includes_weekends,
+            # 이미 예정 시각이 지났는데 새 관측치가 없으면 (공표 지연) 주기적으로 재확인
+            'next_check': release if release > now else now + self.recheck_interval,
+        }
+
+    def mark_unchanged(self, key, now):
+        """확인했지만 새 데이터가 없을 때: 공표 예정 시각 또는 recheck_interval 뒤 재확인"""
+        info = self._pending_info.pop(key, None)
+        state = self._states.setdefault(key, {
+            'frequency': None, 'last_observation': None,
+            'last_updated': None, 'includes_weekends': False,
+        })
+        if info is not None and state['last_updated'] is None:
+            state['last_updated'] = str(info.get('last_updated'))
+        state['next_check'] = max(state.get('next_check', now), now + self.recheck_interval)
+
+    def next_check(self, key):
+        state = self._states.get(key)
+        return state['next_check'] if state else None
+
+    def describe(self):
+        """시리즈별 주기 / 마지막 관측일 / 다음 확인 시각"""
+        rows = [
+            {
+                '시리즈': key,
+                '주기': state['frequency'],
+                '마지막 관측일': state['last_observation'].date() if state['last_observation'] is not None else None,
+                '다음 확인 (UTC)': state['next_check'].strftime('%m-%d %H:%M'),
+            }
+            for key, state in self._states.items()
+        ]
+        return pd.DataFrame(rows).set_index('시리즈') if rows else pd.DataFrame()
@@ -0,0 +1,138 @@
+# ============================================================
+# 선행/후행 (Lead/Lag) 교차상관 분석 (Streamlit 비의존)
+# 모든 시리즈 쌍의 시차별 상관계수를 FFT 한 번으로 계산하고,
+# 롤링 버전은 누적합으로 모든 시차를 동시에 계산
+# ============================================================
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+MAX_LAG = 90
+
+
+def _standardize(values):
+    """컬럼별 평균 0, 표준편차 1 로 정규화 (상수 컬럼은 0)"""
+    values = values - values.mean(axis=0)
+    std = values.std(axis=0)
+    return values / np.where(std > 0, std, 1.0)
+
+
+def cross_correlation(ret, max_lag=MAX_LAG):
+    """
+    모든 컬럼 쌍의 시차 상관계수를 FFT 로 한 번에 계산.
+
+    반환: (lags, cube) — cube[l, i, j] = corr(x_i[t], x_j[t + lags[l]])
+    양의 시차에서 상관이 크면 i 가 j 를 lags[l] 영업일 선행합니다.
+    """
+    z = _standardize(ret.to_numpy(dtype=float))
+    n = len(z)
+    max_lag = min(max_lag, n - 2)
+    # 순환 상관이 섞이지 않도록 n + max_lag 이상으로 zero-padding
+    nfft = 1 << int(np.ceil(np.log2(n + max_lag)))
+    spectrum = np.fft.rfft(z, n=nfft, axis=0)
+    cross = np.fft.irfft(np.conj(spectrum)[:, :, None] * spectrum[:, None, :], n=nfft, axis=0)
+
+    lags = np.arange(-max_lag, max_lag + 1)
+    cube = cross[lags % nfft] / (n - np.abs(lags))[:, None, None]
+    return lags, cube
+
+
+def _rolling_sum(values, window):
+    """axis=0 방향 롤링 합 (처음 window-1 행은 NaN)"""
+    total = np.cumsum(values, axis=0)
+    out = np.empty_like(total)
+    out[:window] = total[:window]
+    out[window:] = total[window:] - total[:-window]
+    out[:window - 1] = np.nan
+    return out
+
+
+def rolling_lead_lag(x, y, window, max_lag=MAX_LAG):
+    """
+    x[t] 와 y[t + lag] 의 롤링 상관계수를 모든 시차에 대해 한 번에 계산.
+    행은 윈도우의 마지막 x 시점, 열은 시차이며 y 관측치가 부족한 구간은 NaN
+    """
+    xv = x.to_numpy(dtype=float)
+    padded = np.concatenate([np.full(max_lag, np.nan), y.to_numpy(dtype=float), np.full(max_lag, np.nan)])
+    # shifted[s, l] = y[s + lags[l]]
+    shifted = sliding_window_view(padded, 2 * max_lag + 1)[:len(xv)]
+
+    valid = ~np.isnan(shifted) & ~np.isnan(xv)[:, None]
+    xs = np.where(valid, xv[:, None], 0.0)
+    ys = np.where(valid, shifted, 0.0)
+
+    count = _rolling_sum(valid.astype(float), window)
+    sx, sy = _rolling_sum(xs, window), _rolling_sum(ys, window)
+    sxx, syy = _rolling_sum(xs * xs, window), _rolling_sum(ys * ys, window)
+    sxy = _rolling_sum(xs * ys, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = count * sxy - sx * sy
+        var = (count * sxx - sx * sx) * (count * syy - sy * sy)
+        corr = cov / np.sqrt(var)
+    corr[count < window] = np.nan
+
+    return pd.DataFrame(corr, index=x.index, columns=np.arange(-max_lag, max_lag + 1))
+
+
+@dataclass(frozen=True)
+class LeadLagResult:
+    """기준 시리즈(base) 대비 선행/후행 분석 결과 (읽기 전용으로 공유)"""
+    lags: np.ndarray
+    cube: np.ndarray
+    columns: list
+    observations: int
+    base: str
+    target: str
+    window: int
+    rolling: pd.DataFrame
+
+    def pair(self, first, second):
+        """corr(first[t], second[t + lag]) 를 시차별 Series 로 반환"""
+        i, j = self.columns.index(first), self.columns.index(second)
+        return pd.Series(self.cube[:, i, j], index=self.lags, name=f"{first}→{second}")
+
+    def significance(self):
+        """무상관 가정 하의 95% 임계값 (±1.96/√n)"""
+        return 1.96 / np.sqrt(self.observations)
+
+    def table(self):
+        """기준 시리즈와 다른 모든 시리즈의 동시점 상관 / 최대 상관 시차"""
+        i = self.columns.index(self.base)
+        rows = []
+        for j, column in enumerate(self.columns):
+            if j == i:
+                continue
+            curve = self.cube[:, i, j]
+            peak = int(np.nanargmax(np.abs(curve)))
+            rows.append({
+                '시리즈': column,
+                '동시점 상관': curve[self.lags == 0][0],
+                '최대 상관': curve[peak],
+                '최대 상관 시차(일)': int(self.lags[peak]),
+            })
+        return pd.DataFrame(rows).set_index('시리즈')
+
+    def peak_lag_path(self):
+        """롤링 윈도우별 |상관|이 가장 큰 시차"""
+        valid = self.rolling.notna().any(axis=1)
+        rolling = self.rolling[valid]
+        peaks = np.nanargmax(np.abs(rolling.to_numpy()), axis=1)
+        return pd.Series(self.lags[peaks], index=rolling.index, name='peak_lag')
+
+
+def analyze_lead_lag(ret, base, target, window, max_lag=MAX_LAG):
+    """전체 쌍 교차상관 + base→target 롤링 교차상관"""
+    lags, cube = cross_correlation(ret, max_lag)
+    return LeadLagResult(
+        lags=lags,
+        cube=cube,
+        columns=list(ret.columns),
+        observations=len(ret),
+        base=base,
+        target=target,
+        window=window,
+        rolling=rolling_lead_lag(ret[base], ret[target], window, int(lags[-1])),
+    )
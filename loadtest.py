@@ -0,0 +1,297 @@
+# ============================================================
+# 다중 사용자 부하 테스트 (Load Test Harness)
+# ============================================================
+"""
+N개의 가상 세션으로 app.py 를 구동하여 재실행(rerun) 지연시간과
+세션당 서버 메모리를 측정합니다. FRED / Gemini 는 offline.py 의
+대체 구현을 사용하므로 API 키나 네트워크가 필요 없습니다.
+
+사용법:
+    python loadtest.py --sessions 20 --concurrency 8 --actions 12
+    python loadtest.py --sessions 50 --concurrency 16 --llm-latency 1.5 --json report.json
+
+참고:
+- 탭 전환은 브라우저에서만 처리되고 서버 재실행을 일으키지 않으므로
+  지연시간 0으로 기록됩니다 (모든 탭은 매 재실행마다 함께 렌더링됨).
+- 모든 세션은 한 프로세스에서 실행되므로 st.cache_data 는 실제 서버처럼 공유됩니다.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import offline
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# 가상 사용자 행동과 가중치
+ACTION_WEIGHTS = {
+    'tab': 4,
+    'window': 3,
+    'period': 2,
+    'ai': 1,
+}
+WINDOW_VALUES = list(range(30, 181, 10))
+PERIOD_LABELS = ["최근 1년", "최근 2년", "최근 3년", "최근 5년"]
+AI_BUTTON_PREFIX = "🚀"
+
+
+# ============================================================
+# 메모리 측정
+# ============================================================
+def current_rss_mb():
+    """현재 프로세스 RSS (MB)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        # /proc 이 없는 환경 (macOS 등): 최대 RSS 로 대체
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 1024 / 1024 if sys.platform == 'darwin' else maxrss / 1024
+
+
+class RssSampler:
+    """백그라운드에서 RSS 최대값을 주기적으로 기록"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+
+# ============================================================
+# 가상 세션
+# ============================================================
+OFFLINE_SECRETS = {
+    "FRED_API_KEY": "offline",
+    "GEMINI_API_KEY": "offline",
+    "passwords": {"loadtest": "loadtest"},
+    "ARCHIVE_DIR": os.path.join(tempfile.gettempdir(), "netliq-loadtest-archive"),
+    "ALERT_DIR": os.path.join(tempfile.gettempdir(), "netliq-loadtest-alerts"),
+    "AI_CACHE_DIR": os.path.join(tempfile.gettempdir(), "netliq-loadtest-ai-cache"),
+}
+
+
+def install_shared_runtime():
+    """
+    AppTest 는 실행할 때마다 st.secrets 와 global.appTest 설정을 전역으로 바꿨다가
+    되돌리므로, 여러 스레드에서 동시에 실행하면 서로의 설정을 덮어씁니다.
+    모든 세션이 같은 값을 쓰도록 한 번만 전역으로 설정하고 세션별 secrets 는 비워 둡니다.
+    """
+    import streamlit as st
+    from streamlit import config
+    from streamlit.runtime.secrets import Secrets
+
+    secrets = Secrets()
+    secrets._secrets = OFFLINE_SECRETS
+    st.secrets = secrets
+    config.set_option('global.appTest', True)
+
+
+def new_session(timeout):
+    """로그인된 상태의 AppTest 세션 생성"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state["password_correct"] = True
+    return at
+
+
+def perform(at, action, rng):
+    """행동 하나를 실행하고 서버 재실행 지연시간(초)을 반환 (탭 전환은 0)"""
+    if action == 'tab':
+        return 0.0
+
+    start = time.perf_counter()
+    if action == 'window':
+        at.sidebar.slider[0].set_value(rng.choice(WINDOW_VALUES)).run()
+    elif action == 'period':
+        at.sidebar.selectbox[0].select(rng.choice(PERIOD_LABELS)).run()
+    elif action == 'ai':
+        if at.toggle:
+            at.toggle[0].set_value(rng.random() < 0.3)
+        buttons = [b for b in at.button if b.label.startswith(AI_BUTTON_PREFIX)]
+        if not buttons:
+            raise RuntimeError("AI 분석 버튼을 찾을 수 없습니다")
+        buttons[0].click().run()
+    return time.perf_counter() - start
+
+
+def quiet_streamlit_logs():
+    """세션마다 반복되는 Streamlit 경고 로그 억제"""
+    from streamlit import config, logger
+
+    config.set_option('logger.level', 'error')
+    logger.set_log_level(logging.ERROR)
+
+
+def run_session(session_no, args, sessions, samples, errors, lock):
+    """가상 세션 하나의 시나리오 실행 (초기 로드 + 무작위 행동)"""
+    rng = random.Random(args.seed + session_no)
+    actions = list(ACTION_WEIGHTS)
+    weights = list(ACTION_WEIGHTS.values())
+
+    at = new_session(args.timeout)
+    start = time.perf_counter()
+    at.run()
+    records = [('initial', time.perf_counter() - start)]
+
+    for _ in range(args.actions):
+        if args.think > 0:
+            time.sleep(rng.uniform(0, args.think))
+        action = rng.choices(actions, weights)[0]
+        try:
+            records.append((action, perform(at, action, rng)))
+        except Exception as e:
+            with lock:
+                errors.append(f"session {session_no} / {action}: {e}")
+            continue
+        if at.exception:
+            with lock:
+                errors.append(f"session {session_no} / {action}: {at.exception[0].value}")
+
+    with lock:
+        sessions.append(at)
+        for action, latency in records:
+            samples[action].append(latency)
+
+
+def summarize(latencies):
+    values = np.asarray(latencies, dtype=float)
+    return {
+        'count': int(values.size),
+        'p50_ms': float(np.percentile(values, 50) * 1000),
+        'p95_ms': float(np.percentile(values, 95) * 1000),
+        'max_ms': float(values.max() * 1000),
+    }
+
+
+# ============================================================
+# 메인
+# ============================================================
+def run_load_test(args):
+    offline.install(llm_latency=args.llm_latency)
+    quiet_streamlit_logs()
+    install_shared_runtime()
+
+    # 워밍업: 기본 기간의 st.cache_data 를 채워 세션 메모리와 분리
+    if not args.no_warmup:
+        new_session(args.timeout).run()
+    gc.collect()
+    baseline_mb = current_rss_mb()
+
+    sessions, errors = [], []
+    samples = defaultdict(list)
+    lock = threading.Lock()
+
+    wall_start = time.perf_counter()
+    with RssSampler() as sampler:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [
+                pool.submit(run_session, i, args, sessions, samples, errors, lock)
+                for i in range(args.sessions)
+            ]
+            for future in futures:
+                future.result()
+    wall_time = time.perf_counter() - wall_start
+
+    # 모든 세션을 유지한 상태의 상주 메모리
+    gc.collect()
+    retained_mb = current_rss_mb()
+
+    reruns = [v for action, values in samples.items() if action != 'tab' for v in values]
+    report = {
+        'sessions': args.sessions,
+        'concurrency': args.concurrency,
+        'actions_per_session': args.actions,
+        'wall_time_s': wall_time,
+        'reruns_per_s': len(reruns) / wall_time if wall_time > 0 else 0.0,
+        'latency': {action: summarize(values) for action, values in samples.items()},
+        'rerun_latency': summarize(reruns),
+        'memory': {
+            'baseline_mb': baseline_mb,
+            'peak_mb': sampler.peak,
+            'retained_mb': retained_mb,
+            'peak_per_active_session_mb': (sampler.peak - baseline_mb) / args.concurrency,
+            'retained_per_session_mb': (retained_mb - baseline_mb) / args.sessions,
+        },
+        'errors': errors,
+    }
+    del sessions
+    return report
+
+
+def print_report(report):
+    print("=" * 60)
+    print(f"세션 {report['sessions']}개 / 동시 실행 {report['concurrency']}개 / "
+          f"세션당 행동 {report['actions_per_session']}개")
+    print(f"총 소요 {report['wall_time_s']:.1f}초, 재실행 처리량 {report['reruns_per_s']:.2f}/초")
+    print("-" * 60)
+    print(f"{'행동':<10}{'횟수':>8}{'p50 (ms)':>12}{'p95 (ms)':>12}{'max (ms)':>12}")
+    rows = dict(report['latency'], rerun=report['rerun_latency'])
+    for action, stats in rows.items():
+        print(f"{action:<10}{stats['count']:>8}{stats['p50_ms']:>12.0f}"
+              f"{stats['p95_ms']:>12.0f}{stats['max_ms']:>12.0f}")
+    print("-" * 60)
+    memory = report['memory']
+    print(f"RSS 기준 {memory['baseline_mb']:.0f}MB → 최대 {memory['peak_mb']:.0f}MB "
+          f"(활성 세션당 {memory['peak_per_active_session_mb']:.1f}MB)")
+    print(f"세션 유지 후 RSS {memory['retained_mb']:.0f}MB "
+          f"(세션당 상주 {memory['retained_per_session_mb']:.2f}MB)")
+    if report['errors']:
+        print("-" * 60)
+        print(f"오류 {len(report['errors'])}건")
+        for error in report['errors'][:10]:
+            print(f"- {error}")
+    print("=" * 60)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="매크로 대시보드 다중 세션 부하 테스트")
+    parser.add_argument('--sessions', type=int, default=10, help="가상 세션 수")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시 실행 세션 수")
+    parser.add_argument('--actions', type=int, default=10, help="세션당 행동 수")
+    parser.add_argument('--think', type=float, default=0.0, help="행동 사이 최대 대기시간 (초)")
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="가짜 Gemini 응답 지연 (초)")
+    parser.add_argument('--timeout', type=float, default=120.0, help="재실행 타임아웃 (초)")
+    parser.add_argument('--seed', type=int, default=0, help="행동 시퀀스 난수 시드")
+    parser.add_argument('--no-warmup', action='store_true', help="워밍업 세션 생략 (콜드 캐시 측정)")
+    parser.add_argument('--json', help="결과를 JSON 파일로 저장")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run_load_test(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    sys.exit(1 if report['errors'] else 0)
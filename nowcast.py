@@ -0,0 +1,245 @@
+# ============================================================
+# Net Liquidity 나우캐스트 (Streamlit 비의존)
+# 주간 H.4.1 (WALCL, WTREGEN) 공표 사이의 일간 Net Liquidity 를
+# 일간 TGA (Daily Treasury Statement, 로컬 파일) 와 일간 RRP 로 추정하고,
+# 주간 공표가 들어올 때마다 다시 고정(re-anchor)합니다.
+# 관측치가 들어오는 순서대로 상태를 갱신하므로 새 영업일 하나당 O(1)
+# ============================================================
+import copy
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from registry import SERIES_BY_KEY
+
+# Daily Treasury Statement CSV 에서 인식하는 컬럼 이름 (Fiscal Data API 형식 / 단순 형식)
+DTS_DATE_COLUMNS = ('record_date', 'date')
+DTS_VALUE_COLUMNS = ('close_today_bal', 'tga', 'value')
+DTS_ACCOUNT_FILTER = 'Closing Balance'
+ERROR_COLUMNS = ['나우캐스트', 'as-of']
+
+
+def load_dts_tga(path):
+    """
+    DTS 운영 현금 잔고 CSV 를 일간 TGA Series(백만 달러) 로 읽기.
+    Fiscal Data 형식(record_date, account_type, close_today_bal)이면 'Closing Balance' 행만 사용
+    """
+    frame = pd.read_csv(path)
+    columns = {column.lower(): column for column in frame.columns}
+    date_column = next((columns[name] for name in DTS_DATE_COLUMNS if name in columns), None)
+    value_column = next((columns[name] for name in DTS_VALUE_COLUMNS if name in columns), None)
+    if date_column is None or value_column is None:
+        raise ValueError(f"DTS 파일에서 날짜/잔고 컬럼을 찾을 수 없습니다: {list(frame.columns)}")
+
+    if 'account_type' in columns:
+        frame = frame[frame[columns['account_type']].astype(str).str.contains(DTS_ACCOUNT_FILTER, case=False)]
+    values = pd.to_numeric(frame[value_column], errors='coerce')
+    series = pd.Series(values.to_numpy(), index=pd.to_datetime(frame[date_column]), name='DTS_TGA').dropna()
+    return series.groupby(level=0).last().sort_index()
+
+
+class DtsSource:
+    """DTS 로컬 파일 (수정 시각이 바뀔 때만 다시 읽음, 파일이 없으면 None)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._series = None
+
+    def mtime(self):
+        """파일 수정 시각 (없으면 None) - 나우캐스트 결과 재사용 키에 사용"""
+        if not self.path or not os.path.exists(self.path):
+            return None
+        return os.path.getmtime(self.path)
+
+    def load(self):
+        mtime = self.mtime()
+        if mtime is None:
+            return None
+        with self._lock:
+            if mtime != self._mtime:
+                self._series = load_dts_tga(self.path)
+                self._mtime = mtime
+            return self._series
+
+
+def raw_inputs(raw_data):
+    """raw_data(FRED 원본 dict)에서 나우캐스트 입력 (walcl, tga, rrp; 백만 달러)"""
+    return {key: raw_data[key] * SERIES_BY_KEY[key].scale for key in ('walcl', 'tga', 'rrp')}
+
+
+def _value(value):
+    """NaN 이면 None (관측 없음)"""
+    return None if value != value else float(value)
+
+
+class NetLiqNowcaster:
+    """
+    nowcast[t] = WALCL(최근 주간값) − (DTS TGA[t] + TGA 보정) − RRP[t]
+    TGA 보정 = 최근 주간 WTREGEN − 같은 날 DTS TGA (주간 공표마다 다시 계산).
+    DTS 가 없으면 최근 주간 TGA 를 그대로 사용 (= 기존 as-of Net Liquidity)
+    """
+
+    def __init__(self):
+        self.walcl = np.nan
+        self.weekly_tga = np.nan
+        self.tga_offset = 0.0
+        self.dts_tga = np.nan
+        self.rrp = np.nan
+        self.last_date = None
+        self.dates = []
+        self.values = []
+        self.official = []        # 같은 날의 as-of Net Liquidity (최근 주간값 기준)
+        self.anchor_errors = []   # (주간 기준일, 재고정 직전 나우캐스트 / as-of 값 − 공표 Net Liquidity)
+
+    def _estimate(self):
+        tga = self.dts_tga + self.tga_offset if np.isfinite(self.dts_tga) else self.weekly_tga
+        return self.walcl - tga - self.rrp
+
+    def observe(self, date, walcl=None, weekly_tga=None, dts_tga=None, rrp=None):
+        """
+        date 하루의 관측치 반영 후 나우캐스트 기록. 일간 관측(DTS, RRP)을 먼저 반영하므로
+        주간 공표가 있는 날의 TGA 보정은 같은 날 DTS 기준으로 계산됨
+        """
+        if dts_tga is not None:
+            self.dts_tga = dts_tga
+        if rrp is not None:
+            self.rrp = rrp
+        if walcl is not None or weekly_tga is not None:
+            before = self._estimate()
+            before_official = self.walcl - self.weekly_tga - self.rrp
+            if walcl is not None:
+                self.walcl = walcl
+            if weekly_tga is not None:
+                self.weekly_tga = weekly_tga
+                self.tga_offset = weekly_tga - self.dts_tga if np.isfinite(self.dts_tga) else 0.0
+            official = self.walcl - self.weekly_tga - self.rrp
+            if np.isfinite(before) and np.isfinite(official):
+                self.anchor_errors.append((date, before - official, before_official - official))
+        self.last_date = date
+        self.dates.append(date)
+        self.values.append(self._estimate())
+        self.official.append(self.walcl - self.weekly_tga - self.rrp)
+
+    def fork(self):
+        """현재 상태에서 시작하는 임시 나우캐스터 (기록은 비어 있음)"""
+        clone = copy.copy(self)
+        clone.dates, clone.values, clone.official, clone.anchor_errors = [], [], [], []
+        return clone
+
+    def series(self):
+        """지금까지의 일간 나우캐스트 (NaN 구간 제외)"""
+        return pd.Series(self.values, index=pd.DatetimeIndex(self.dates), name='NetLiq_nowcast').dropna()
+
+    def official_series(self):
+        """같은 날짜의 as-of Net Liquidity (주간 공표 사이에는 TGA 가 고정)"""
+        return pd.Series(self.official, index=pd.DatetimeIndex(self.dates), name='NetLiq_official').dropna()
+
+    def anchor_error_series(self):
+        """주간 재고정 시점별 직전 추정 오차 (백만 달러, 열 = 나우캐스트 / as-of)"""
+        dates = pd.DatetimeIndex([row[0] for row in self.anchor_errors])
+        return pd.DataFrame([row[1:] for row in self.anchor_errors], index=dates, columns=ERROR_COLUMNS, dtype=float)
+
+
+@dataclass(frozen=True)
+class NowcastResult:
+    """나우캐스트 결과 (세션 간 공유, 읽기 전용)"""
+    nowcast: pd.Series          # 일간 Net Liquidity 추정 (백만 달러)
+    official: pd.Series         # 같은 날의 as-of Net Liquidity (백만 달러)
+    anchor_errors: pd.DataFrame # 주간 재고정 시점별 직전 추정 오차 (백만 달러, 열 = 나우캐스트 / as-of)
+    confirmed_through: object   # 모든 입력이 관측된 마지막 날 (이후는 잠정치)
+    dts_used: bool
+    revision: int               # 트래커가 결과를 만들 때마다 증가 (차트 캐시 키)
+
+    def latest(self):
+        """최신 나우캐스트 / as-of 값 / 차이 (백만 달러)"""
+        nowcast, official = self.nowcast.iloc[-1], self.official.iloc[-1]
+        return {'date': self.nowcast.index[-1], 'nowcast': nowcast, 'official': official, 'gap': nowcast - official}
+
+    def error_stats(self, recent=52):
+        """최근 recent 번의 주간 재고정 오차 통계 (십억 달러, 행 = 나우캐스트 / as-of)"""
+        errors = self.anchor_errors.tail(recent) / 1000
+        return pd.DataFrame({
+            '횟수': errors.count(),
+            'MAE': errors.abs().mean(),
+            'RMSE': np.sqrt((errors ** 2).mean()),
+            '편향': errors.mean(),
+        })
+
+
+def _observe_rows(nowcaster, table):
+    """입력 표(날짜 × walcl / tga / rrp / dts, 관측 없음 = NaN)를 날짜 순서대로 반영"""
+    for day, walcl, tga, rrp, dts in table.itertuples():
+        nowcaster.observe(day, walcl=_value(walcl), weekly_tga=_value(tga), dts_tga=_value(dts), rrp=_value(rrp))
+
+
+class NowcastTracker:
+    """
+    프로세스당 하나의 나우캐스터를 유지합니다. 모든 입력이 관측된 날(확정 구간)까지만 상태에
+    누적하고, 그 이후 며칠(잠정 구간)은 매번 확정 상태에서 갈라져 다시 계산하므로
+    늦게 도착한 주간 공표 / DTS 도 빠짐없이 반영됩니다. 새 영업일 하나당 O(1).
+    확정 구간의 과거 수정(revision)은 다시 재생하지 않으며 다음 주간 재고정에서 흡수됩니다.
+    마지막 결과는 입력 버전(version)과 함께 보관하므로 같은 입력의 재실행은 계산 없이 재사용
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nowcaster = NetLiqNowcaster()
+        self._dts_used = False
+        self._result = None
+        self._version = None
+        self._revision = 0
+
+    def latest(self, version):
+        """version 이 마지막 update 의 입력 버전과 같으면 그 결과 (아니면 None)"""
+        with self._lock:
+            if version is not None and version == self._version:
+                return self._result
+            return None
+
+    def update(self, walcl, tga, rrp, dts_tga=None, version=None):
+        """
+        walcl / tga(주간), rrp(일간), dts_tga(일간, 선택) 반영 후 NowcastResult 반환.
+        version(예: 스냅샷 버전 + DTS 수정 시각)을 주면 latest(version) 으로 결과 재사용 가능
+        """
+        has_dts = dts_tga is not None and not dts_tga.empty
+        sources = {'walcl': walcl, 'tga': tga, 'rrp': rrp, 'dts': dts_tga if has_dts else None}
+        sources = {name: series.dropna() for name, series in sources.items() if series is not None}
+        confirmed_through = min(series.index[-1] for series in sources.values())
+
+        with self._lock:
+            if has_dts != self._dts_used:
+                # DTS 파일이 생기거나 사라지면 처음부터 다시 계산
+                self._nowcaster = NetLiqNowcaster()
+                self._dts_used = has_dts
+            nowcaster = self._nowcaster
+
+            # 날짜 합집합 위의 표 (관측이 없는 칸은 NaN)
+            last = nowcaster.last_date
+            table = pd.DataFrame({
+                name: series[series.index > last] if last is not None else series
+                for name, series in sources.items()
+            }).reindex(columns=['walcl', 'tga', 'rrp', 'dts']).sort_index()
+            _observe_rows(nowcaster, table[table.index <= confirmed_through])
+
+            provisional = nowcaster.fork()
+            _observe_rows(provisional, table[table.index > confirmed_through])
+
+            anchor_errors = nowcaster.anchor_error_series()
+            if provisional.anchor_errors:
+                anchor_errors = pd.concat([anchor_errors, provisional.anchor_error_series()])
+            self._revision += 1
+            self._result = NowcastResult(
+                nowcast=pd.concat([nowcaster.series(), provisional.series()]),
+                official=pd.concat([nowcaster.official_series(), provisional.official_series()]),
+                anchor_errors=anchor_errors,
+                confirmed_through=nowcaster.last_date,
+                dts_used=has_dts,
+                revision=self._revision,
+            )
+            self._version = version
+            return self._result
@@ -0,0 +1,156 @@
+# ============================================================
+# 오프라인 데이터 / LLM 대체 구현 (Stand-ins)
+# FRED API 키, 네트워크, Gemini 할당량 없이 대시보드를 구동하기 위한
+# 결정론적(deterministic) 가짜 데이터 소스와 가짜 Gemini 모델
+# ============================================================
+import sys
+import time
+import types
+import zlib
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# 가짜 데이터의 시작일 (WALCL 최초 공표일)
+HISTORY_START = "2002-12-18"
+
+# FRED 시리즈 ID -> (발표 주기, 시작 수준, 일간 변동성, 하한)
+# 발표 주기: 'M' = 월간(월초), 'W' = 주간(수요일), 'B' = 영업일, 'D' = 매일(주말 포함)
+SERIES_PROFILES = {
+    'WALCL': ('W', 7.0e6, 0.004, 7.0e5),
+    'WTREGEN': ('W', 7.5e5, 0.03, 5.0e3),
+    'RRPONTSYD': ('B', 500.0, 0.05, 0.0),
+    'DTWEXAFEGS': ('B', 120.0, 0.003, 80.0),
+    'BAMLH0A0HYM2': ('B', 4.0, 0.02, 2.0),
+    'CBBTCUSD': ('D', 60000.0, 0.035, 100.0),
+    'NASDAQCOM': ('B', 15000.0, 0.013, 1000.0),
+    'SP500': ('B', 5000.0, 0.01, 500.0),
+    'CBETHUSD': ('D', 3000.0, 0.045, 10.0),
+    'DGS10': ('B', 4.2, 0.015, 0.5),
+    'ECBASSETSW': ('W', 6.5e6, 0.005, 1.0e6),
+    'JPNASSETS': ('M', 7.5e6, 0.02, 1.0e6),
+}
+
+# 등록되지 않은 시리즈 ID에 사용할 기본 프로파일
+DEFAULT_PROFILE = ('B', 100.0, 0.01, 1.0)
+
+
+@lru_cache(maxsize=None)
+def _synthetic_series(series_id):
+    """시리즈 ID로 시드를 고정한 기하 랜덤워크 생성 (끝 값이 시작 수준에 맞춰짐)"""
+    freq, level, vol, floor = SERIES_PROFILES.get(series_id, DEFAULT_PROFILE)
+    end = pd.Timestamp(datetime.now().date())
+    if freq == 'M':
+        index = pd.date_range(HISTORY_START, end, freq='MS')
+    elif freq == 'W':
+        index = pd.date_range(HISTORY_START, end, freq='W-WED')
+    elif freq == 'B':
+        index = pd.bdate_range(HISTORY_START, end)
+    else:
+        index = pd.date_range(HISTORY_START, end, freq='D')
+
+    rng = np.random.default_rng(zlib.crc32(series_id.encode()))
+    steps = rng.normal(0.0, vol, len(index))
+    path = np.exp(np.cumsum(steps) - steps.sum())
+    values = np.maximum(level * path, floor)
+    return pd.Series(values, index=index, name=series_id)
+
+
+@lru_cache(maxsize=None)
+def synthetic_dts_tga():
+    """
+    Daily Treasury Statement TGA 잔고 대체 데이터 (백만 달러, 영업일).
+    주간 WTREGEN 을 영업일로 선형 보간하고 일간 잡음을 더함 (수요일 값도 주간 값과 약간 다름)
+    """
+    weekly = _synthetic_series('WTREGEN')
+    days = pd.bdate_range(weekly.index[0], weekly.index[-1] + pd.Timedelta(days=2))
+    interpolated = weekly.reindex(weekly.index.union(days)).interpolate(method='time').ffill().reindex(days)
+    rng = np.random.default_rng(zlib.crc32(b'DTS'))
+    return pd.Series(interpolated.to_numpy() * (1 + rng.normal(0.0, 0.01, len(days))), index=days, name='DTS_TGA')
+
+
+def write_dts_tga(path):
+    """synthetic_dts_tga 를 Fiscal Data DTS(운영 현금 잔고) CSV 형식으로 저장"""
+    series = synthetic_dts_tga()
+    pd.DataFrame({
+        'record_date': series.index.strftime('%Y-%m-%d'),
+        'account_type': 'Treasury General Account (TGA) Closing Balance',
+        'close_today_bal': series.round(0).to_numpy(),
+    }).to_csv(path, index=False)
+    return path
+
+
+class OfflineFred:
+    """fredapi.Fred 대체 구현 (get_series / get_series_info 인터페이스 호환)"""
+
+    def __init__(self, api_key=None, **kwargs):
+        self.api_key = api_key
+
+    def get_series(self, series_id, observation_start=None, observation_end=None, **kwargs):
+        series = _synthetic_series(series_id)
+        if observation_start is not None:
+            series = series[series.index >= pd.Timestamp(observation_start)]
+        if observation_end is not None:
+            series = series[series.index <= pd.Timestamp(observation_end)]
+        return series.copy()
+
+    def get_series_info(self, series_id):
+        series = _synthetic_series(series_id)
+        freq = SERIES_PROFILES.get(series_id, DEFAULT_PROFILE)[0]
+        return pd.Series({
+            'id': series_id,
+            'frequency_short': freq if freq in ('M', 'W') else 'D',
+            'observation_start': series.index[0].strftime('%Y-%m-%d'),
+            'observation_end': series.index[-1].strftime('%Y-%m-%d'),
+            'last_updated': f"{series.index[-1]:%Y-%m-%d} 08:00:00-05",
+        })
+
+
+class _OfflineResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class OfflineGenerativeModel:
+    """google.generativeai.GenerativeModel 대체 구현 (고정 지연 후 요약 응답)"""
+
+    latency = 0.0
+
+    def __init__(self, model_name=None, **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt, **kwargs):
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return _OfflineResponse(
+            f"[오프라인 응답] {self.model_name} - 프롬프트 {len(prompt):,}자 수신"
+        )
+
+
+def _ensure_module(name):
+    """모듈을 임포트하고, 설치되어 있지 않으면 빈 모듈을 등록"""
+    try:
+        return __import__(name, fromlist=['_'])
+    except ImportError:
+        module = types.ModuleType(name)
+        sys.modules[name] = module
+        parent_name, _, child = name.rpartition('.')
+        if parent_name:
+            setattr(_ensure_module(parent_name), child, module)
+        return module
+
+
+def install(llm_latency=0.0):
+    """
+    fredapi / google.generativeai 를 오프라인 구현으로 교체
+    (같은 프로세스에서 실행되는 app.py 가 `from fredapi import Fred` 시점에 사용)
+    """
+    fredapi = _ensure_module('fredapi')
+    fredapi.Fred = OfflineFred
+
+    genai = _ensure_module('google.generativeai')
+    genai.configure = lambda **kwargs: None
+    OfflineGenerativeModel.latency = llm_latency
+    genai.GenerativeModel = OfflineGenerativeModel
@@ -0,0 +1,194 @@
+# ============================================================
+# Bull / Base / Bear 시나리오 확률 (Streamlit 비의존)
+# NetLiq, DXY, HYSpread, BTC, NASDAQ, SP500 일간 로그 수익률을 블록 단위로
+# 함께 재표본(moving block bootstrap)해 향후 horizon 영업일 경로를 만들고,
+# 위험자산 동일가중 수익률로 시나리오를 분류해 경험적 확률과 수익률 범위를 집계
+# (워커 풀에서 재표본 묶음 단위로 병렬 계산)
+# ============================================================
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from events import NETLIQ_CONTRACTION, NETLIQ_EXPANSION, SIGNALS
+
+OUTLOOK_COLUMNS = ('NetLiq', 'DXY', 'HYSpread', 'BTC', 'NASDAQ', 'SP500')
+OUTLOOK_RISK_ASSETS = ('BTC', 'NASDAQ', 'SP500')
+OUTLOOK_HORIZON = 63          # 약 3개월
+OUTLOOK_BLOCK = 21            # 약 1개월 (블록 안의 자기상관 / 자산 간 동시 움직임 보존)
+OUTLOOK_DRAWS = 10_000
+OUTLOOK_THRESHOLD = 10.0      # 위험자산 동일가중 수익률 ±10% 를 Bull / Bear 경계로 사용
+DRAWS_PER_TASK = 2_000
+MIN_CONDITIONAL_BLOCKS = 100  # 조건부 재표본에 필요한 최소 블록 시작 위치 수
+SCENARIOS = ('Bull', 'Base', 'Bear')
+RANGE_QUANTILES = (0.1, 0.5, 0.9)
+
+
+def netliq_states(df):
+    """Net Liquidity 60일 변화 상태 코드 (트레이딩 시그널 탭 기준, 판단 불가 = -1)"""
+    change = df['NetLiq'].pct_change(periods=60).to_numpy() * 100
+    codes = np.select([change < NETLIQ_CONTRACTION, change > NETLIQ_EXPANSION], [0, 2], 1)
+    return np.where(np.isnan(change), -1, codes)
+
+
+def _bootstrap_paths(log_returns, starts, draws, horizon, block, risk_positions, seed):
+    """
+    후보 블록 시작 위치(starts)에서 블록을 이어 붙인 draws 개 경로 (워커에서 실행).
+    반환: 만기 수익률 (draws, 시리즈) %, 위험자산 동일가중 수익률 %, 경로 중 최저 수익률 %
+    """
+    rng = np.random.default_rng(seed)
+    blocks = math.ceil(horizon / block)
+    chosen = starts[rng.integers(0, len(starts), size=(draws, blocks))]
+    rows = (chosen[:, :, None] + np.arange(block)).reshape(draws, -1)[:, :horizon]
+    paths = np.cumsum(log_returns[rows], axis=1)
+
+    growth = np.expm1(paths[:, :, risk_positions]).mean(axis=2)
+    return np.expm1(paths[:, -1]) * 100, growth[:, -1] * 100, np.minimum(growth.min(axis=1), 0.0) * 100
+
+
+@dataclass(frozen=True)
+class OutlookSample:
+    """재표본 방식 하나의 결과"""
+    label: str
+    blocks: int                  # 후보 블록 시작 위치 수
+    probabilities: dict          # 시나리오 -> 확률 (%)
+    ranges: pd.DataFrame         # (시나리오, 분위수) × 시리즈 만기 수익률 (%)
+    composite: pd.DataFrame      # 시나리오 × (위험자산 수익률 / 최저 수익률 중앙값)
+
+
+@dataclass(frozen=True)
+class OutlookResult:
+    """블록 부트스트랩 시나리오 확률 (세션 간 공유, 읽기 전용)"""
+    as_of: pd.Timestamp
+    horizon: int
+    block: int
+    draws: int
+    threshold: float
+    columns: tuple
+    risk_assets: tuple
+    state: str                   # 현재 Net Liquidity 상태 이름
+    samples: dict                # 라벨 -> OutlookSample
+
+    def primary(self):
+        """프롬프트에 쓰는 기본 결과 (현재 상태 조건부가 있으면 그것, 없으면 전체 이력)"""
+        return list(self.samples.values())[-1]
+
+    def probability_table(self):
+        """재표본 방식 × 시나리오 확률 (%)"""
+        return pd.DataFrame({label: sample.probabilities for label, sample in self.samples.items()}).T
+
+    def range_table(self, label=None):
+        """시나리오별 시리즈 만기 수익률 10% / 50% / 90% 분위수 (%)"""
+        sample = self.samples[label] if label is not None else self.primary()
+        return sample.ranges
+
+    def to_prompt(self):
+        """Deep Dive 프롬프트에 넣을 시나리오 확률 / 수익률 범위 요약"""
+        sample = self.primary()
+        lines = [
+            f"- 방법: {', '.join(self.columns)} 일간 수익률 {self.block}일 블록 부트스트랩 "
+            f"{self.draws:,}회, {self.horizon}영업일 후 (기준일 {self.as_of:%Y-%m-%d})",
+            f"- 시나리오 정의: 위험자산({', '.join(self.risk_assets)}) 동일가중 수익률 "
+            f"Bull > +{self.threshold:.0f}%, Bear < -{self.threshold:.0f}%, 그 사이 Base",
+            f"- 재표본 구간: {sample.label} (블록 시작 위치 {sample.blocks:,}개, 현재 Net Liquidity 상태: {self.state})",
+        ]
+        for label, other in self.samples.items():
+            probabilities = other.probabilities
+            lines.append(
+                f"- 확률 [{label}]: Bull {probabilities['Bull']:.0f}% / Base {probabilities['Base']:.0f}% / "
+                f"Bear {probabilities['Bear']:.0f}%"
+            )
+        for scenario in SCENARIOS:
+            if scenario not in sample.ranges.index.get_level_values(0):
+                continue
+            ranges = sample.ranges.loc[scenario]
+            assets = ", ".join(
+                f"{column} {ranges.loc[0.5, column]:+.1f}% ({ranges.loc[0.1, column]:+.1f}~{ranges.loc[0.9, column]:+.1f}%)"
+                for column in self.columns
+            )
+            lines.append(f"- {scenario} 수익률 중앙값 (10~90% 범위): {assets}")
+        return "\n".join(lines)
+
+
+def _summarize(label, blocks, terminal, composite, drawdown, columns, threshold):
+    """재표본 결과를 시나리오로 분류해 확률 / 범위 집계"""
+    scenario = np.where(composite > threshold, 0, np.where(composite < -threshold, 2, 1))
+    probabilities = {name: float(np.mean(scenario == code) * 100) for code, name in enumerate(SCENARIOS)}
+    ranges, summary = {}, {}
+    for code, name in enumerate(SCENARIOS):
+        selected = scenario == code
+        if not selected.any():
+            continue
+        quantiles = np.quantile(terminal[selected], RANGE_QUANTILES, axis=0)
+        for q, values in zip(RANGE_QUANTILES, quantiles):
+            ranges[(name, q)] = values
+        summary[name] = {
+            '위험자산 수익률 중앙값(%)': float(np.median(composite[selected])),
+            '경로 중 최저 수익률 중앙값(%)': float(np.median(drawdown[selected])),
+        }
+    return OutlookSample(
+        label=label,
+        blocks=blocks,
+        probabilities=probabilities,
+        ranges=pd.DataFrame(list(ranges.values()), columns=list(columns),
+                            index=pd.MultiIndex.from_tuples(list(ranges), names=['시나리오', '분위수'])),
+        composite=pd.DataFrame(summary).T,
+    )
+
+
+def estimate_outlook(df, horizon=OUTLOOK_HORIZON, block=OUTLOOK_BLOCK, draws=OUTLOOK_DRAWS,
+                     threshold=OUTLOOK_THRESHOLD, seed=0, executor=None):
+    """
+    df(전체 이력 프레임)의 블록 부트스트랩 시나리오 확률.
+    '전체 이력' 과 '현재 Net Liquidity 상태와 같은 구간에서 시작하는 블록' 두 가지로 재표본하며,
+    두 방식은 같은 seed 를 공유. executor 가 주어지면 재표본 묶음을 워커에 나눠 실행
+    """
+    columns = tuple(column for column in OUTLOOK_COLUMNS if column in df.columns)
+    risk_assets = tuple(column for column in OUTLOOK_RISK_ASSETS if column in columns)
+    values = df[list(columns)].to_numpy(dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_returns = np.diff(np.log(values), axis=0)
+    log_returns = np.nan_to_num(log_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # 블록 시작 위치 s 는 수익률 s ~ s+block-1 (가격 s ~ s+block) 을 사용
+    all_starts = np.arange(len(log_returns) - block + 1)
+    states = netliq_states(df)
+    current = states[-1]
+    samplers = {'전체 이력': all_starts}
+    if current >= 0:
+        conditional = all_starts[states[all_starts] == current]
+        if len(conditional) >= MIN_CONDITIONAL_BLOCKS:
+            samplers['현재 유동성 상태 구간'] = conditional
+
+    risk_positions = [columns.index(column) for column in risk_assets]
+    chunks = [min(DRAWS_PER_TASK, draws - offset) for offset in range(0, draws, DRAWS_PER_TASK)]
+    tasks = {}
+    for label, starts in samplers.items():
+        args = [
+            (log_returns, starts, size, horizon, block, risk_positions, seed + position)
+            for position, size in enumerate(chunks)
+        ]
+        if executor is None:
+            tasks[label] = [_bootstrap_paths(*arg) for arg in args]
+        else:
+            tasks[label] = [executor.submit(_bootstrap_paths, *arg) for arg in args]
+
+    samples = {}
+    for label, parts in tasks.items():
+        if executor is not None:
+            parts = [future.result() for future in parts]
+        terminal, composite, drawdown = (np.concatenate(part) for part in zip(*parts))
+        samples[label] = _summarize(label, len(samplers[label]), terminal, composite, drawdown, columns, threshold)
+
+    return OutlookResult(
+        as_of=df.index[-1],
+        horizon=horizon,
+        block=block,
+        draws=draws,
+        threshold=threshold,
+        columns=columns,
+        risk_assets=risk_assets,
+        state=SIGNALS['Net Liquidity'][current] if current >= 0 else '판단 불가',
+        samples=samples,
+    )
@@ -0,0 +1,229 @@
+# ============================================================
+# 레짐 탐지 엔진 (Streamlit 비의존)
+# 유동성 / 달러 / 신용 콤보 지표에 대각 공분산 Gaussian HMM 을 numpy 로 적합.
+# 주간(금요일 기준) 표본으로 학습하고, 새 데이터가 들어오면 이전 파라미터에서
+# 시작하는 짧은 EM(warm start)으로 갱신합니다.
+# ============================================================
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics import data_version
+
+N_STATES = 3
+MAX_ITER = 100
+WARM_MAX_ITER = 10
+TOLERANCE = 1e-4
+VARIANCE_FLOOR = 1e-3
+# 상태 유지 확률 초기값 (주간 기준)
+STICKINESS = 0.9
+
+# 위험 선호 점수 순서대로 붙이는 이름 / 차트 색상
+REGIME_NAMES = ['확장 (Risk-on)', '중립', '스트레스 (Risk-off)']
+REGIME_COLORS = ['rgba(6, 167, 125, 0.10)', 'rgba(160, 174, 192, 0.10)', 'rgba(214, 40, 40, 0.12)']
+
+
+def regime_features(df):
+    """레짐 판단 지표: Net Liquidity / DXY 20일 변화율, HY Spread 수준 (주간 표본)"""
+    features = pd.DataFrame({
+        'NetLiq 20일 변화(%)': df['NetLiq'].pct_change(20) * 100,
+        'DXY 20일 변화(%)': df['DXY'].pct_change(20) * 100,
+        'HY Spread(%)': df['HYSpread'],
+    }).dropna()
+    return features.resample('W-FRI').last().dropna()
+
+
+@dataclass(frozen=True)
+class HMMParams:
+    """표준화된 지표 공간의 HMM 파라미터"""
+    start: np.ndarray        # (K,)
+    transition: np.ndarray   # (K, K)
+    means: np.ndarray        # (K, D)
+    variances: np.ndarray    # (K, D)
+
+
+def _log_emission(x, params):
+    """대각 Gaussian 로그 우도 (T, K)"""
+    diff = x[:, None, :] - params.means[None]
+    return -0.5 * (np.log(2 * np.pi * params.variances)[None] + diff ** 2 / params.variances[None]).sum(axis=2)
+
+
+def _forward_backward(x, params):
+    """스케일링한 forward-backward: (사후확률 gamma, 전이 기대횟수, 로그우도, 필터링 확률)"""
+    log_b = _log_emission(x, params)
+    offset = log_b.max(axis=1, keepdims=True)
+    b = np.exp(log_b - offset)
+    t_len, k = b.shape
+    transition = params.transition
+
+    alpha = np.empty((t_len, k))
+    scale = np.empty(t_len)
+    current = params.start * b[0]
+    for t in range(t_len):
+        if t:
+            current = (alpha[t - 1] @ transition) * b[t]
+        scale[t] = current.sum()
+        alpha[t] = current / scale[t]
+
+    beta = np.empty((t_len, k))
+    beta[-1] = 1.0
+    for t in range(t_len - 2, -1, -1):
+        beta[t] = transition @ (b[t + 1] * beta[t + 1]) / scale[t + 1]
+
+    gamma = alpha * beta
+    gamma /= gamma.sum(axis=1, keepdims=True)
+    xi = transition * (alpha[:-1].T @ (b[1:] * beta[1:] / scale[1:, None]))
+    log_likelihood = float(np.log(scale).sum() + offset.sum())
+    return gamma, xi, log_likelihood, alpha
+
+
+def _initial_params(x, n_states):
+    """위험 선호 점수 분위수로 나눈 구간의 평균/분산으로 초기화"""
+    score = x[:, 0] - x[:, 1] - x[:, 2]
+    bins = np.quantile(score, np.linspace(0, 1, n_states + 1)[1:-1])
+    assignment = np.digitize(score, bins)
+    means = np.array([x[assignment == s].mean(axis=0) for s in range(n_states)])
+    variances = np.array([x[assignment == s].var(axis=0) for s in range(n_states)]) + VARIANCE_FLOOR
+    transition = np.full((n_states, n_states), (1 - STICKINESS) / (n_states - 1))
+    np.fill_diagonal(transition, STICKINESS)
+    return HMMParams(np.full(n_states, 1 / n_states), transition, means, variances)
+
+
+def fit_hmm(x, params, max_iter=MAX_ITER, tol=TOLERANCE):
+    """Baum-Welch (EM). (파라미터, gamma, 로그우도, 필터링 확률, 반복 횟수) 반환"""
+    previous = -np.inf
+    for iteration in range(1, max_iter + 1):
+        gamma, xi, log_likelihood, alpha = _forward_backward(x, params)
+        weights = gamma.sum(axis=0)
+        means = (gamma.T @ x) / weights[:, None]
+        variances = (gamma.T @ (x ** 2)) / weights[:, None] - means ** 2
+        params = HMMParams(
+            start=gamma[0],
+            transition=xi / xi.sum(axis=1, keepdims=True),
+            means=means,
+            variances=np.maximum(variances, VARIANCE_FLOOR),
+        )
+        if log_likelihood - previous < tol * abs(log_likelihood):
+            break
+        previous = log_likelihood
+    gamma, _, log_likelihood, alpha = _forward_backward(x, params)
+    return params, gamma, log_likelihood, alpha, iteration
+
+
+@dataclass(frozen=True)
+class RegimeResult:
+    """데이터 버전 하나에 대한 레짐 추정 결과 (세션 간 공유, 읽기 전용)"""
+    version: int
+    names: list
+    probabilities: pd.DataFrame   # 주간 평활 사후확률 (열 = 레짐 이름)
+    current: pd.Series            # 마지막 주의 필터링 확률 (미래 정보 없음)
+    state_means: pd.DataFrame     # 레짐별 지표 평균 (원래 단위)
+    transition: pd.DataFrame      # 주간 전이확률
+    log_likelihood: float
+    iterations: int
+    warm_start: bool
+    params: HMMParams
+    scaling: tuple               # (지표 평균, 지표 표준편차)
+
+    @property
+    def labels(self):
+        """주간 레짐 번호 (0 = 확장 ... K-1 = 스트레스)"""
+        return pd.Series(self.probabilities.to_numpy().argmax(axis=1), index=self.probabilities.index)
+
+    def daily_labels(self, index):
+        """일간 인덱스의 레짐 번호 (각 날짜가 속한 주의 레짐)"""
+        return self.labels.reindex(index, method='bfill').ffill()
+
+    def segments(self, index):
+        """index 구간에서 같은 레짐이 이어지는 구간 [(시작, 끝, 레짐 번호)]"""
+        labels = self.daily_labels(index).dropna()
+        if labels.empty:
+            return []
+        change = labels.ne(labels.shift()).cumsum()
+        return [
+            (group.index[0], group.index[-1], int(group.iloc[0]))
+            for _, group in labels.groupby(change)
+        ]
+
+    def expected_duration(self):
+        """레짐별 기대 지속 기간 (주)"""
+        stay = np.diag(self.transition.to_numpy())
+        return pd.Series(1 / np.maximum(1 - stay, 1e-9), index=self.names)
+
+
+def fit_regimes(df, previous=None, n_states=N_STATES):
+    """
+    df(정렬된 통합 프레임)에 레짐 모델 적합.
+    previous(RegimeResult)가 있으면 그 파라미터에서 시작해 짧게 갱신
+    """
+    features = regime_features(df)
+    if len(features) < n_states * 10:
+        raise ValueError("레짐 추정에 필요한 데이터가 부족합니다")
+
+    values = features.to_numpy(dtype=float)
+    center, spread = values.mean(axis=0), values.std(axis=0)
+    x = (values - center) / np.where(spread > 0, spread, 1.0)
+
+    if previous is not None:
+        # 이전 모델의 레짐 평균/분산을 새 표준화 기준으로 옮겨서 시작
+        old_center, old_spread = previous.scaling
+        init = HMMParams(
+            start=previous.params.start,
+            transition=previous.params.transition,
+            means=(previous.params.means * old_spread + old_center - center) / spread,
+            variances=previous.params.variances * (old_spread / spread) ** 2,
+        )
+        params, gamma, log_likelihood, alpha, iterations = fit_hmm(x, init, max_iter=WARM_MAX_ITER)
+    else:
+        params, gamma, log_likelihood, alpha, iterations = fit_hmm(x, _initial_params(x, n_states))
+
+    # 위험 선호 점수(유동성 ↑, 달러 ↓, 스프레드 ↓) 순서로 레짐 번호를 고정
+    order = np.argsort(-(params.means[:, 0] - params.means[:, 1] - params.means[:, 2]))
+    params = HMMParams(
+        start=params.start[order],
+        transition=params.transition[np.ix_(order, order)],
+        means=params.means[order],
+        variances=params.variances[order],
+    )
+    names = REGIME_NAMES[:n_states] if n_states == len(REGIME_NAMES) else [f"레짐 {s}" for s in range(n_states)]
+
+    return RegimeResult(
+        version=data_version(df),
+        names=names,
+        probabilities=pd.DataFrame(gamma[:, order], index=features.index, columns=names),
+        current=pd.Series(alpha[-1, order], index=names),
+        state_means=pd.DataFrame(params.means * spread + center, index=names, columns=features.columns),
+        transition=pd.DataFrame(params.transition, index=names, columns=names),
+        log_likelihood=log_likelihood,
+        iterations=iterations,
+        warm_start=previous is not None,
+        params=params,
+        scaling=(center, spread),
+    )
+
+
+class RegimeTracker:
+    """
+    마지막으로 적합한 레짐 결과를 warm start 초기값으로 보관합니다.
+    같은 데이터 버전이면 다시 적합하지 않고, 새 데이터면 이전 결과에서 warm start 합니다.
+    기간이 다른 이력 프레임의 결과는 호출하는 쪽(AnalyticsStore)이 데이터 버전별로 캐시합니다.
+    """
+
+    def __init__(self, n_states=N_STATES):
+        self.n_states = n_states
+        self._lock = threading.Lock()
+        self._result = None
+
+    @property
+    def result(self):
+        return self._result
+
+    def update(self, df):
+        version = data_version(df)
+        with self._lock:
+            if self._result is not None and self._result.version == version:
+                return self._result
+            self._result = fit_regimes(df, previous=self._result, n_states=self.n_states)
+            return self._result
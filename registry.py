@@ -0,0 +1,112 @@
+# ============================================================
+# 시리즈 레지스트리
+# FRED 시리즈별 ID / 단위 / 스케일 / 발표 주기 / 역할을 선언적으로 정의하고
+# 데이터 수집, 정렬, 분석이 모두 이 목록을 기준으로 동작하도록 함
+# ============================================================
+from dataclasses import dataclass
+from datetime import time
+
+# 역할
+#   liquidity: Net Liquidity 구성 요소 (netliq_sign 으로 가감)
+#   dollar / credit / rate: 매크로 지표
+#   asset: 위험자산
+#   central_bank: 해외 중앙은행 대차대조표
+LIQUIDITY = 'liquidity'
+DOLLAR = 'dollar'
+CREDIT = 'credit'
+RATE = 'rate'
+ASSET = 'asset'
+CENTRAL_BANK = 'central_bank'
+
+# 발표 규칙이 지정되지 않은 시리즈: 관측일 다음 날 13:00 UTC
+DEFAULT_RELEASE_RULE = (1, time(13, 0))
+
+
+@dataclass(frozen=True)
+class SeriesSpec:
+    """FRED 시리즈 하나의 정의"""
+    key: str                 # raw_data 키
+    fred_id: str             # FRED 시리즈 ID
+    column: str              # 분석 프레임 컬럼명
+    label: str               # 화면 표시 이름
+    units: str               # 원본 단위
+    role: str
+    frequency: str = 'D'     # FRED frequency_short (메타데이터 조회 실패 시 사용)
+    scale: float = 1.0       # 분석 단위로의 변환 배수
+    netliq_sign: int = 0     # Net Liquidity 합산 부호 (liquidity 역할만)
+    release_rule: tuple = DEFAULT_RELEASE_RULE  # (다음 관측일 이후 공표까지 일수, 공표 시각 UTC)
+    core: bool = True        # 기본 대시보드에 항상 포함되는지 여부
+
+
+SERIES_REGISTRY = (
+    # Net Liquidity = Fed 총자산 - 재무부 계좌 - 역RP (백만 달러)
+    SeriesSpec('walcl', 'WALCL', 'WALCL', 'Fed 총자산', '백만 달러', LIQUIDITY,
+               frequency='W', netliq_sign=1,
+               release_rule=(1, time(21, 30))),      # H.4.1: 수요일 기준, 목요일 16:30 ET 공표
+    SeriesSpec('tga', 'WTREGEN', 'TGA', '재무부 일반계정 (TGA)', '백만 달러', LIQUIDITY,
+               frequency='W', netliq_sign=-1,
+               release_rule=(1, time(21, 30))),      # H.4.1 과 동시 공표
+    SeriesSpec('rrp', 'RRPONTSYD', 'RRP', '역RP', '십억 달러', LIQUIDITY,
+               scale=1000, netliq_sign=-1,            # 십억 → 백만 달러
+               release_rule=(0, time(18, 30))),      # 역RP 결과: 당일 13:15 ET 이후
+
+    SeriesSpec('dxy', 'DTWEXAFEGS', 'DXY', 'Dollar Index', '지수', DOLLAR,
+               release_rule=(7, time(21, 30))),      # H.10: 매주 월요일 전주 일간치 일괄 공표
+    SeriesSpec('hy_spread', 'BAMLH0A0HYM2', 'HYSpread', 'HY Spread', '%', CREDIT,
+               release_rule=(1, time(13, 0))),       # ICE BofA: 다음 영업일 오전
+    SeriesSpec('btc', 'CBBTCUSD', 'BTC', 'Bitcoin', '달러', ASSET,
+               release_rule=(1, time(13, 0))),       # Coinbase 일간 종가
+    SeriesSpec('nasdaq', 'NASDAQCOM', 'NASDAQ', 'NASDAQ', '지수', ASSET),
+    SeriesSpec('sp500', 'SP500', 'SP500', 'S&P 500', '지수', ASSET),
+
+    # 선택 시리즈 (secrets 의 EXTRA_SERIES 로 활성화)
+    SeriesSpec('eth', 'CBETHUSD', 'ETH', 'Ethereum', '달러', ASSET, core=False),
+    SeriesSpec('us10y', 'DGS10', 'US10Y', '미국채 10년', '%', RATE, core=False),
+    SeriesSpec('ecb_assets', 'ECBASSETSW', 'ECBAssets', 'ECB 총자산', '백만 유로', CENTRAL_BANK,
+               frequency='W', core=False, release_rule=(1, time(14, 0))),
+    SeriesSpec('boj_assets', 'JPNASSETS', 'BOJAssets', 'BOJ 총자산', '억 엔', CENTRAL_BANK,
+               frequency='M', core=False, release_rule=(5, time(6, 0))),
+)
+
+SERIES_BY_KEY = {spec.key: spec for spec in SERIES_REGISTRY}
+
+# 워치리스트의 임의 FRED 시리즈는 'watch_<ID>' 키로 아카이브 / 스케줄러에서 관리
+WATCHLIST_PREFIX = 'watch_'
+
+
+def watchlist_key(series_id):
+    """워치리스트 FRED 시리즈 ID -> 아카이브 / 스냅샷 키"""
+    return WATCHLIST_PREFIX + series_id
+
+
+def series_spec(key):
+    """레지스트리 시리즈 또는 워치리스트 키의 SeriesSpec (워치리스트는 ID 를 그대로 컬럼 / 이름으로 사용)"""
+    if key in SERIES_BY_KEY:
+        return SERIES_BY_KEY[key]
+    if key.startswith(WATCHLIST_PREFIX):
+        series_id = key[len(WATCHLIST_PREFIX):]
+        return SeriesSpec(key, series_id, series_id, series_id, '', ASSET, core=False)
+    raise KeyError(f"레지스트리에 없는 시리즈: {key}")
+
+
+def active_series(extra_keys=()):
+    """기본 시리즈 + 요청한 선택 시리즈 (레지스트리 순서 유지)"""
+    extra_keys = set(extra_keys)
+    unknown = extra_keys - set(SERIES_BY_KEY)
+    if unknown:
+        raise KeyError(f"레지스트리에 없는 시리즈: {', '.join(sorted(unknown))}")
+    return tuple(spec for spec in SERIES_REGISTRY if spec.core or spec.key in extra_keys)
+
+
+def analysis_columns(specs):
+    """분석 프레임 컬럼 순서: NetLiq 다음에 유동성 구성 요소 외 시리즈"""
+    return ['NetLiq'] + [spec.column for spec in specs if spec.role != LIQUIDITY]
+
+
+def liquidity_components(columns=None):
+    """Net Liquidity 구성 요소 {컬럼: 합산 부호} (columns 가 주어지면 그 안에 있는 것만)"""
+    return {
+        spec.column: spec.netliq_sign
+        for spec in SERIES_REGISTRY
+        if spec.role == LIQUIDITY and (columns is None or spec.column in columns)
+    }
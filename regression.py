@@ -0,0 +1,113 @@
+# ============================================================
+# 롤링 다변량 회귀 / 편상관계수 (Streamlit 비의존)
+# BTC, NASDAQ 수익률을 NetLiq, DXY, HYSpread 수익률에 동시에 회귀한 롤링 베타와
+# 다른 요인을 통제한 편상관계수. 윈도우를 한 칸 옮길 때 새 관측을 더하고
+# 오래된 관측을 빼는 O(k²) 갱신을 누적합으로 모든 윈도우에 한 번에 적용
+# ============================================================
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics import ewm_covariance
+from leadlag import _rolling_sum
+
+REGRESSION_TARGETS = ('BTC', 'NASDAQ')
+REGRESSION_DRIVERS = ('NetLiq', 'DXY', 'HYSpread')
+
+
+def rolling_covariance(values, window):
+    """values(T, k) 의 롤링 공분산 행렬 (T, k, k), 처음 window-1 행은 NaN"""
+    # 전체 평균을 먼저 빼서 누적합의 자릿수 손실을 줄임 (공분산은 평행이동에 불변)
+    values = values - values.mean(axis=0)
+    sums = _rolling_sum(values, window)
+    cross = _rolling_sum(values[:, :, None] * values[:, None, :], window)
+    return (cross - sums[:, :, None] * sums[:, None, :] / window) / (window - 1)
+
+
+@dataclass(frozen=True)
+class RollingRegression:
+    """대상별 롤링 베타 / 표준화 베타 / 편상관 / 단순상관 / 결정계수 (세션 간 공유, 읽기 전용)"""
+    window: int
+    targets: tuple
+    drivers: tuple
+    betas: dict              # 대상 -> DataFrame(열 = 요인)
+    standardized: dict       # 대상 -> DataFrame(열 = 요인), 베타 × σ요인 / σ대상
+    partial: dict            # 대상 -> DataFrame(열 = 요인)
+    simple: dict             # 대상 -> DataFrame(열 = 요인)
+    r_squared: pd.DataFrame  # 열 = 대상
+
+    def latest(self):
+        """대상 × 요인별 최신 베타, 표준화 베타, 편상관, 단순상관"""
+        rows = []
+        for target in self.targets:
+            for driver in self.drivers:
+                rows.append({
+                    '대상': target,
+                    '요인': driver,
+                    '베타': self.betas[target][driver].iloc[-1],
+                    '표준화 베타': self.standardized[target][driver].iloc[-1],
+                    '편상관': self.partial[target][driver].iloc[-1],
+                    '단순상관': self.simple[target][driver].iloc[-1],
+                })
+        return pd.DataFrame(rows).set_index(['대상', '요인'])
+
+
+def rolling_regression(ret, window, targets=REGRESSION_TARGETS, drivers=REGRESSION_DRIVERS, halflife=None):
+    """
+    ret(수익률 프레임)의 모든 윈도우에 대해 대상별 다변량 회귀 / 편상관 계산.
+    halflife 가 주어지면 동일가중 윈도우 대신 EWMA 공분산 사용
+    """
+    targets = tuple(column for column in targets if column in ret.columns)
+    drivers = tuple(column for column in drivers if column in ret.columns)
+    columns = list(targets) + list(drivers)
+    values = ret[columns].to_numpy(dtype=float)
+    if halflife:
+        cov = ewm_covariance(values, halflife)
+        valid = slice(int(halflife) - 1, None)
+    else:
+        cov = rolling_covariance(values, window)
+        valid = slice(window - 1, None)
+    driver_idx = [columns.index(driver) for driver in drivers]
+
+    betas, standardized, partial, simple = {}, {}, {}, {}
+    r_squared = np.full((len(ret), len(targets)), np.nan)
+    for position, target in enumerate(targets):
+        idx = [columns.index(target)] + driver_idx
+        sub = cov[valid][:, idx][:, :, idx]
+        variance = np.diagonal(sub, axis1=1, axis2=2)
+        scale = np.sqrt(np.maximum(variance, 1e-300))
+
+        # 베타 = Σxx⁻¹ Σxy, 편상관 = -P_0j / √(P_00 P_jj) (P = 공분산의 역행렬)
+        beta = np.einsum('tij,tj->ti', np.linalg.pinv(sub[:, 1:, 1:], hermitian=True), sub[:, 1:, 0])
+        precision = np.linalg.pinv(sub, hermitian=True)
+        diag = np.diagonal(precision, axis1=1, axis2=2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            part = -precision[:, 0, 1:] / np.sqrt(diag[:, :1] * diag[:, 1:])
+
+        frames = {}
+        for name, values in (
+            ('beta', beta),
+            ('standardized', beta * scale[:, 1:] / scale[:, :1]),
+            ('partial', part),
+            ('simple', sub[:, 0, 1:] / (scale[:, :1] * scale[:, 1:])),
+        ):
+            frame = pd.DataFrame(np.nan, index=ret.index, columns=list(drivers))
+            frame.iloc[valid] = values
+            frames[name] = frame
+        betas[target] = frames['beta']
+        standardized[target] = frames['standardized']
+        partial[target] = frames['partial']
+        simple[target] = frames['simple']
+        r_squared[valid, position] = np.einsum('ti,ti->t', beta, sub[:, 1:, 0]) / variance[:, 0]
+
+    return RollingRegression(
+        window=window,
+        targets=targets,
+        drivers=drivers,
+        betas=betas,
+        standardized=standardized,
+        partial=partial,
+        simple=simple,
+        r_squared=pd.DataFrame(r_squared, index=ret.index, columns=list(targets)),
+    )
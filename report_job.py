@@ -0,0 +1,302 @@
+# ============================================================
+# 헤드리스 일간 리포트 작업 (Scheduled Report Job)
+# ============================================================
+"""
+브라우저 세션 없이 데이터 파이프라인 → 분석 → 주요 차트 → (선택) AI 분석을 한 번 실행해
+단일 HTML 리포트 파일로 저장합니다. Streamlit 의 세션별 재실행 경로를 거치지 않으므로
+cron / 작업 스케줄러에서 바로 실행할 수 있습니다.
+
+사용법:
+    python report_job.py
+    python report_job.py --ai 종합분석 --deep-dive --output reports/netliq_%Y%m%d.html
+    python report_job.py --offline --ai 트레이딩전략 --images reports/img
+
+참고:
+- 설정은 대시보드와 같은 .streamlit/secrets.toml 을 읽습니다 (FRED_API_KEY / GEMINI_API_KEY 는
+  환경 변수가 우선). ARCHIVE_DIR 의 로컬 아카이브를 증분 갱신하므로 대시보드와 아카이브를 공유할 수 있습니다.
+- AI 분석은 AI_CACHE_DIR 의 응답 캐시를 거치므로 같은 데이터로 대시보드에서 이미 실행한 분석
+  (또는 그 반대)은 Gemini 를 다시 호출하지 않습니다.
+- --images 는 plotly 의 정적 이미지 내보내기(kaleido)가 설치되어 있을 때만 PNG 를 저장합니다.
+"""
+import argparse
+import html
+import os
+import tempfile
+import time
+import tomllib
+from datetime import datetime
+
+import offline
+from ai_analysis import (
+    ANALYSIS_TYPES, GEMINI_MODEL, ResponseCache, deep_dive_prompt, get_correlations_summary, get_data_summary,
+    get_signals_summary, standard_prompt
+)
+from analytics import DEFAULT_CORRELATION_MODE, compute_analytics
+from archive import SeriesArchive
+from data_loader import common_start, process_data, slice_raw_data, window_start
+from figures import build_figures, build_nowcast_figure
+from nowcast import DtsSource, NowcastTracker, raw_inputs
+from outlook import estimate_outlook
+from registry import active_series
+
+SECRETS_PATH = os.path.join(".streamlit", "secrets.toml")
+REPORT_DAYS = 365 * 3          # 대시보드 기본 분석 기간 (최근 3년)
+REPORT_WINDOW = 90
+# 오프라인 실행은 실제 아카이브 / 응답 캐시를 건드리지 않도록 임시 디렉터리 사용
+OFFLINE_DIRS = {
+    "ARCHIVE_DIR": os.path.join(tempfile.gettempdir(), "netliq-report-archive"),
+    "AI_CACHE_DIR": os.path.join(tempfile.gettempdir(), "netliq-report-ai-cache"),
+}
+REPORT_FIGURES = {
+    'netliq': "💧 Net Liquidity",
+    'dollar': "💵 Dollar Index",
+    'credit': "⚠️ HY Spread",
+    'dashboard': "📊 종합 대시보드",
+    'nowcast': "📡 Net Liquidity 나우캐스트",
+}
+
+
+def load_secrets(path):
+    """Streamlit secrets.toml 읽기 (없으면 빈 dict). API 키는 환경 변수가 우선"""
+    secrets = {}
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            secrets = tomllib.load(f)
+    for name in ('FRED_API_KEY', 'GEMINI_API_KEY'):
+        if os.environ.get(name):
+            secrets[name] = os.environ[name]
+    return secrets
+
+
+class StageTimer:
+    """단계별 소요 시간 기록"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def run(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.stages[name] = time.perf_counter() - start
+
+
+def load_raw_data(secrets, keys):
+    """로컬 아카이브를 증분 갱신한 전체 이력 (갱신 실패 시 아카이브에 있는 이력으로 대체)"""
+    from fredapi import Fred
+
+    archive = SeriesArchive(secrets.get("ARCHIVE_DIR", ".fred_archive"))
+    try:
+        return archive.update(Fred(api_key=secrets["FRED_API_KEY"]), keys), None
+    except Exception as e:
+        raw = archive.load_all(keys)
+        if raw is None:
+            raise
+        return raw, f"FRED 갱신 실패로 로컬 아카이브 사용: {type(e).__name__}: {e}"
+
+
+def generate_analysis(secrets, analysis_type, deep_dive, analytics, corr_matrix, outlook):
+    """AI 분석 (응답 캐시 경유). (본문, 캐시 적중 여부) 반환, 실패 시 오류 메시지를 본문으로"""
+    import google.generativeai as genai
+
+    df_recent, latest = analytics.df_recent, analytics.latest
+    data_summary = get_data_summary(df_recent, latest, analytics.netliq_60d)
+    correlations = get_correlations_summary(corr_matrix, DEFAULT_CORRELATION_MODE)
+    signals = get_signals_summary(
+        analytics.netliq_60d, latest, analytics.corr_dxy_btc.iloc[-1], analytics.recent_divergence
+    )
+    if deep_dive:
+        prompt = deep_dive_prompt(
+            analysis_type, data_summary, correlations, signals, df_recent, latest,
+            volatility=(analytics.volatility.iloc[-1], analytics.weighting), outlook=outlook
+        )
+    else:
+        prompt = standard_prompt(analysis_type, data_summary, correlations, signals)
+
+    cache = ResponseCache(secrets.get("AI_CACHE_DIR", ".ai_cache"))
+    text = cache.get(GEMINI_MODEL, prompt)
+    if text is not None:
+        return text, True
+    try:
+        genai.configure(api_key=secrets["GEMINI_API_KEY"])
+        return cache.generate(genai.GenerativeModel(GEMINI_MODEL), prompt)[0], False
+    except Exception as e:
+        return f"❌ AI 분석 중 오류 발생: {type(e).__name__}: {e}", False
+
+
+def export_images(figures, directory):
+    """차트를 PNG 로 저장 (kaleido 가 없으면 건너뜀). 저장한 파일 목록과 경고 반환"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, fig in figures.items():
+        path = os.path.join(directory, f"{name}.png")
+        try:
+            fig.write_image(path, width=1400, height=fig.layout.height or 800)
+        except (ImportError, ValueError, RuntimeError) as e:
+            return paths, f"정적 이미지 저장 건너뜀 (kaleido 필요): {str(e).strip().splitlines()[0]}"
+        paths.append(path)
+    return paths, None
+
+
+def _table(frame, digits=3):
+    return frame.round(digits).to_html(border=0, classes='table', na_rep='-')
+
+
+def render_report(context, figures, self_contained=False):
+    """리포트 HTML (차트는 plotly HTML 조각, plotly.js 는 CDN 또는 파일 내장)"""
+    analytics = context['analytics']
+    df_recent, latest = analytics.df_recent, analytics.latest
+    sections = [
+        "<h1>📊 매크로 Net Liquidity 일간 리포트</h1>",
+        f"<p class='meta'>생성 시각 {context['generated_at']:%Y-%m-%d %H:%M} · 데이터 "
+        f"{df_recent.index[0]:%Y-%m-%d} ~ {df_recent.index[-1]:%Y-%m-%d} ({len(df_recent)}개 포인트) · "
+        f"{analytics.weighting}</p>",
+    ]
+    for warning in context['warnings']:
+        sections.append(f"<p class='warning'>⚠️ {html.escape(warning)}</p>")
+
+    sections.append("<h2>📌 최신 지표와 시그널</h2>")
+    sections.append(f"<pre>{html.escape(get_data_summary(df_recent, latest, analytics.netliq_60d).strip())}</pre>")
+    sections.append(f"<pre>{html.escape(context['signals'].strip())}</pre>")
+    sections.append("<h2>🔗 상관계수 매트릭스</h2>" + _table(context['corr_matrix']))
+
+    outlook = context['outlook']
+    if outlook is not None:
+        sections.append(
+            f"<h2>🎲 Bull / Base / Bear 확률 ({outlook.horizon}영업일, 블록 부트스트랩 {outlook.draws:,}회)</h2>"
+            + _table(outlook.probability_table(), 1)
+            + f"<p class='meta'>현재 Net Liquidity 상태: {html.escape(outlook.state)}</p>"
+        )
+
+    for position, (name, fig) in enumerate(figures.items()):
+        include = (True if self_contained else 'cdn') if position == 0 else False
+        sections.append(f"<h2>{REPORT_FIGURES[name]}</h2>")
+        sections.append(fig.to_html(full_html=False, include_plotlyjs=include))
+
+    if context['analysis'] is not None:
+        title, text, cached = context['analysis']
+        sections.append(f"<h2>🤖 {html.escape(title)}{' (캐시)' if cached else ''}</h2>")
+        sections.append(f"<div class='analysis'>{html.escape(text)}</div>")
+
+    timings = " · ".join(f"{name} {seconds:.2f}s" for name, seconds in context['timings'].items())
+    sections.append(f"<p class='meta'>단계별 소요 시간: {timings}</p>")
+    return REPORT_TEMPLATE.format(body="\n".join(sections))
+
+
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>매크로 Net Liquidity 일간 리포트</title>
+<style>
+body {{ font-family: -apple-system, 'Segoe UI', 'Malgun Gothic', sans-serif; max-width: 1400px; margin: 24px auto; padding: 0 16px; }}
+.meta {{ color: #666; font-size: 0.9em; }}
+.warning {{ background: #fff4e5; padding: 8px 12px; border-radius: 6px; }}
+.table {{ border-collapse: collapse; font-size: 0.9em; }}
+.table th, .table td {{ padding: 4px 10px; text-align: right; border-bottom: 1px solid #eee; }}
+.analysis {{ background: #f0f2f6; padding: 20px; border-radius: 10px; border-left: 5px solid #2E86AB; white-space: pre-wrap; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def run_report(args):
+    """리포트 한 번 생성. (출력 경로, 단계별 소요 시간) 반환"""
+    if args.offline:
+        offline.install(0.0)
+    secrets = load_secrets(args.secrets)
+    if args.offline:
+        secrets.update(OFFLINE_DIRS, FRED_API_KEY="offline", GEMINI_API_KEY="offline")
+    elif "FRED_API_KEY" not in secrets:
+        raise SystemExit("FRED_API_KEY 가 없습니다 (secrets.toml 또는 환경 변수)")
+
+    timer = StageTimer()
+    warnings = []
+    keys = tuple(spec.key for spec in active_series(secrets.get("EXTRA_SERIES", [])))
+    raw, warning = timer.run("데이터", load_raw_data, secrets, keys)
+    if warning:
+        warnings.append(warning)
+
+    df = timer.run(
+        "전처리", process_data, slice_raw_data(raw, args.days), start=window_start(args.days)
+    )
+    analytics = timer.run("분석", compute_analytics, df, args.window, halflife=args.halflife)
+    corr_matrix = analytics.correlation_matrix(DEFAULT_CORRELATION_MODE)
+
+    history_df = process_data(raw, start=common_start(raw))
+    outlook = timer.run("확률 추정", estimate_outlook, history_df)
+    nowcast = None
+    try:
+        nowcast = timer.run(
+            "나우캐스트", NowcastTracker().update, **raw_inputs(raw), dts_tga=DtsSource(secrets.get("DTS_TGA_FILE")).load()
+        )
+    except Exception as e:
+        warnings.append(f"나우캐스트 생략: {type(e).__name__}: {e}")
+
+    figures = timer.run("차트", build_figures, analytics, args.window)
+    if nowcast is not None:
+        figures['nowcast'] = build_nowcast_figure(nowcast)
+
+    analysis = None
+    if args.ai:
+        if not secrets.get("GEMINI_API_KEY"):
+            warnings.append("GEMINI_API_KEY 가 없어 AI 분석을 생략했습니다")
+        else:
+            text, cached = timer.run(
+                "AI 분석", generate_analysis, secrets, args.ai, args.deep_dive, analytics, corr_matrix, outlook
+            )
+            analysis = (f"{'Deep Dive ' if args.deep_dive else ''}{args.ai}", text, cached)
+
+    if args.images:
+        _, warning = timer.run("이미지", export_images, figures, args.images)
+        if warning:
+            warnings.append(warning)
+
+    generated_at = datetime.now()
+    output = generated_at.strftime(args.output)
+    context = {
+        'generated_at': generated_at,
+        'analytics': analytics,
+        'corr_matrix': corr_matrix,
+        'signals': get_signals_summary(
+            analytics.netliq_60d, analytics.latest, analytics.corr_dxy_btc.iloc[-1], analytics.recent_divergence
+        ),
+        'outlook': outlook,
+        'analysis': analysis,
+        'warnings': warnings,
+        'timings': timer.stages,
+    }
+    report = timer.run("HTML", render_report, context, figures, args.self_contained)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(report)
+    return output, timer.stages, warnings
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="매크로 대시보드 헤드리스 리포트 생성")
+    parser.add_argument('--output', default=os.path.join("reports", "report_%Y%m%d.html"),
+                        help="리포트 파일 경로 (strftime 형식 지원)")
+    parser.add_argument('--days', type=int, default=REPORT_DAYS, help="분석 기간 (일)")
+    parser.add_argument('--window', type=int, default=REPORT_WINDOW, help="상관계수 롤링 윈도우 (일)")
+    parser.add_argument('--halflife', type=int, help="EWMA 반감기 (일, 지정하면 롤링 윈도우 대신 사용)")
+    parser.add_argument('--ai', choices=ANALYSIS_TYPES, help="AI 분석 유형 (생략하면 AI 분석 없음)")
+    parser.add_argument('--deep-dive', action='store_true', help="Deep Dive 프롬프트 사용")
+    parser.add_argument('--images', help="차트 PNG 저장 디렉터리 (kaleido 필요)")
+    parser.add_argument('--self-contained', action='store_true', help="plotly.js 를 리포트 파일에 내장 (오프라인 열람용)")
+    parser.add_argument('--secrets', default=SECRETS_PATH, help="secrets.toml 경로")
+    parser.add_argument('--offline', action='store_true', help="FRED / Gemini 대신 오프라인 대체 구현 사용")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    output, timings, warnings = run_report(args)
+    for warning in warnings:
+        print(f"⚠️ {warning}")
+    print(f"리포트 저장: {output} ({sum(timings.values()):.2f}s)")
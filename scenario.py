@@ -0,0 +1,199 @@
+# ============================================================
+# 유동성 충격 시나리오 시뮬레이터 (Streamlit 비의존)
+# Net Liquidity 구성 요소(WALCL, TGA, RRP)에 충격을 주고, 롤링 다변량 회귀의
+# 최신 베타로 BTC / NASDAQ 의 반응을 투영. 몬테카를로 경로(기본 1만 개)는
+# 요인 공분산 / 잔차 공분산의 제곱근 행렬로 한 번에 생성
+# ============================================================
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics import ewm_covariance
+from registry import liquidity_components
+
+SCENARIO_HORIZON = 60
+SCENARIO_PATHS = 10_000
+# 경로 수 상한과 한 번에 생성하는 경로 수 (난수 / 수익률 배열의 최대 메모리를 제한)
+SCENARIO_PATH_OPTIONS = (1_000, 5_000, 10_000, 20_000)
+SCENARIO_MAX_PATHS = SCENARIO_PATH_OPTIONS[-1]
+PATH_CHUNK = 2_000
+SCENARIO_SEED = 0
+FAN_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# 프리셋 충격 (십억 달러, 양수 = 잔고 증가). DRAIN = 잔고를 0 으로
+DRAIN = 'drain'
+SCENARIO_PRESETS = {
+    '사용자 정의': {},
+    'TGA 5,000억 달러 재적립': {'TGA': 500},
+    'RRP 소진 (0 으로)': {'RRP': DRAIN},
+    'QT 지속 (월 600억 달러 × 3개월)': {'WALCL': -180},
+    'TGA 3,000억 달러 방출': {'TGA': -300},
+    '부채한도 해소 (TGA 재적립 + RRP 소진)': {'TGA': 500, 'RRP': DRAIN},
+}
+
+
+def preset_shocks(name, levels):
+    """프리셋 이름과 구성 요소 현재 잔고(십억 달러) -> {구성 요소: 변화(십억 달러)}"""
+    return {
+        component: -levels[component] if change == DRAIN else float(change)
+        for component, change in SCENARIO_PRESETS[name].items()
+        if component in levels
+    }
+
+
+def _sqrt_psd(matrix):
+    """대칭 준양정치 행렬의 제곱근 (음의 고유값은 0 으로 잘라 수치 오차 흡수)"""
+    values, vectors = np.linalg.eigh(matrix)
+    return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+
+@dataclass(frozen=True)
+class ScenarioModel:
+    """최신 일간 공분산 / 베타 / 구성 요소 잔고 (세션 간 공유, 읽기 전용)"""
+    targets: tuple
+    drivers: tuple
+    betas: np.ndarray            # (대상, 요인) 롤링 회귀 최신 베타
+    driver_cov: np.ndarray       # (요인, 요인) 일간 수익률 공분산
+    residual_cov: np.ndarray     # (대상, 대상) 회귀 잔차 공분산
+    levels: dict                 # 구성 요소 -> 현재 잔고 (십억 달러)
+    signs: dict                  # 구성 요소 -> Net Liquidity 부호
+    netliq: float                # 현재 Net Liquidity (십억 달러)
+    as_of: pd.Timestamp
+    weighting: str
+
+    def netliq_change(self, shocks):
+        """구성 요소 충격(십억 달러) -> Net Liquidity 변화 (십억 달러, %)"""
+        change = sum(self.signs[component] * value for component, value in shocks.items())
+        return change, change / self.netliq * 100
+
+
+def build_scenario_model(analytics, regression, halflife=None):
+    """분석 결과의 수익률 / 구성 요소 잔고와 롤링 회귀 최신 베타로 시나리오 모델 생성"""
+    targets, drivers = regression.targets, regression.drivers
+    values = analytics.ret[list(targets) + list(drivers)].dropna().to_numpy(dtype=float)
+    if halflife:
+        cov = ewm_covariance(values, halflife)[-1]
+    else:
+        cov = np.cov(values[-regression.window:], rowvar=False)
+    k = len(targets)
+    betas = np.array([[regression.betas[target][driver].iloc[-1] for driver in drivers] for target in targets])
+    driver_cov = cov[k:, k:]
+    # 잔차 공분산 = Σyy − βΣxxβᵀ (대상 간 잔차 상관 포함)
+    residual_cov = cov[:k, :k] - betas @ driver_cov @ betas.T
+
+    df = analytics.df_recent
+    signs = liquidity_components(df.columns)
+    return ScenarioModel(
+        targets=targets,
+        drivers=drivers,
+        betas=betas,
+        driver_cov=driver_cov,
+        residual_cov=(residual_cov + residual_cov.T) / 2,
+        levels={component: df[component].iloc[-1] / 1e3 for component in signs},
+        signs=signs,
+        netliq=df['NetLiq'].iloc[-1] / 1e3,
+        as_of=df.index[-1],
+        weighting=analytics.weighting,
+    )
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """시나리오 몬테카를로 결과 (경로 분위수와 만기 분포만 보관)"""
+    model: ScenarioModel
+    shocks: dict                 # 구성 요소 -> 변화 (십억 달러)
+    horizon: int
+    paths: int
+    spillover: bool
+    netliq_change: float         # 십억 달러
+    netliq_change_pct: float
+    effects: pd.DataFrame        # 대상 × (직접 / 간접 / 합계) 기대 효과 (%)
+    fan: np.ndarray              # (기간+1, 분위수, 대상) 누적 수익률 (%)
+    terminal: np.ndarray         # (경로, 대상) 만기 누적 수익률 (%)
+
+    def summary(self):
+        """대상별 기대 효과와 만기 분포 요약"""
+        table = self.effects.copy()
+        quantiles = np.percentile(self.terminal, [5, 50, 95], axis=0)
+        table['5%'] = quantiles[0]
+        table['중앙값'] = quantiles[1]
+        table['95%'] = quantiles[2]
+        table['상승 확률(%)'] = (self.terminal > 0).mean(axis=0) * 100
+        return table
+
+    def to_prompt(self):
+        """Gemini 프롬프트에 넣을 시나리오 요약 문자열"""
+        shocks = ", ".join(f"{component} {value:+,.0f}B" for component, value in self.shocks.items()) or "충격 없음"
+        lines = [
+            f"- 충격: {shocks} ({self.horizon}영업일에 걸쳐 반영, 기준일 {self.model.as_of:%Y-%m-%d})",
+            f"- Net Liquidity 변화: {self.netliq_change:+,.0f}B ({self.netliq_change_pct:+.2f}%)",
+            f"- 추정 방식: {self.model.weighting} 다변량 회귀 베타, 몬테카를로 {self.paths:,}개 경로",
+        ]
+        for target, row in self.summary().iterrows():
+            lines.append(
+                f"- {target}: 기대 {row['합계(%)']:+.2f}% (직접 {row['직접(%)']:+.2f}%, 간접 {row['간접(%)']:+.2f}%), "
+                f"90% 구간 {row['5%']:+.1f}% ~ {row['95%']:+.1f}%, 상승 확률 {row['상승 확률(%)']:.0f}%"
+            )
+        return "\n".join(lines)
+
+
+def simulate_scenario(model, shocks, horizon=SCENARIO_HORIZON, paths=SCENARIO_PATHS, spillover=True,
+                      seed=SCENARIO_SEED):
+    """
+    충격을 horizon 영업일 동안 균등하게 반영한 요인 경로 + 회귀 잔차로 대상 수익률 경로 생성.
+    NetLiq 일간 수익률 평균 = 충격의 일간 로그 수익률, spillover 면 DXY / HYSpread 평균도
+    요인 공분산에 따라 함께 이동 (아니면 0). 충격 외 추세는 0, 일간 수익률은 로그 수익률로 근사.
+    같은 seed 는 같은 난수를 쓰므로 시나리오 간 차이는 충격 효과만 반영.
+    경로는 PATH_CHUNK 개씩 생성하고 누적 수익률만 남기므로 최대 메모리는 누적 수익률 배열 수준
+    """
+    if paths > SCENARIO_MAX_PATHS:
+        raise ValueError(f"경로 수는 최대 {SCENARIO_MAX_PATHS:,}개입니다")
+    netliq_change, netliq_change_pct = model.netliq_change(shocks)
+    drift = np.log1p(netliq_change_pct / 100) / horizon
+
+    netliq_pos = model.drivers.index('NetLiq')
+    if spillover:
+        driver_mean = model.driver_cov[:, netliq_pos] / model.driver_cov[netliq_pos, netliq_pos] * drift
+    else:
+        driver_mean = np.zeros(len(model.drivers))
+        driver_mean[netliq_pos] = drift
+    target_mean = model.betas @ driver_mean
+
+    rng = np.random.default_rng(seed)
+    k, m = len(model.drivers), len(model.targets)
+    driver_root = _sqrt_psd(model.driver_cov).T.astype(np.float32)
+    residual_root = _sqrt_psd(model.residual_cov).T.astype(np.float32)
+    betas = model.betas.T.astype(np.float32)
+    cumulative = np.zeros((paths, horizon + 1, m), dtype=np.float32)
+    # 앞에서부터 나눠 뽑아도 한 번에 뽑은 난수와 같은 순서이므로 결과는 경로 수 분할과 무관
+    for start in range(0, paths, PATH_CHUNK):
+        stop = min(start + PATH_CHUNK, paths)
+        noise = rng.standard_normal((stop - start, horizon, k + m), dtype=np.float32)
+        # 요인 평균은 베타를 거쳐 target_mean 으로 더하므로 경로에는 변동분만 사용
+        returns = (noise[:, :, :k] @ driver_root) @ betas + noise[:, :, k:] @ residual_root + target_mean.astype(np.float32)
+        np.cumsum(returns, axis=1, out=cumulative[start:stop, 1:])
+    cumulative = np.expm1(cumulative, out=cumulative)
+    cumulative *= 100
+
+    direct = model.betas[:, netliq_pos] * driver_mean[netliq_pos] * horizon
+    total = target_mean * horizon
+    effects = pd.DataFrame({
+        'NetLiq 베타': model.betas[:, netliq_pos],
+        '직접(%)': np.expm1(direct) * 100,
+        '간접(%)': (np.expm1(total) - np.expm1(direct)) * 100,
+        '합계(%)': np.expm1(total) * 100,
+    }, index=list(model.targets))
+
+    return ScenarioResult(
+        model=model,
+        shocks=dict(shocks),
+        horizon=horizon,
+        paths=paths,
+        spillover=spillover,
+        netliq_change=netliq_change,
+        netliq_change_pct=netliq_change_pct,
+        effects=effects,
+        fan=np.quantile(cumulative, FAN_QUANTILES, axis=0).transpose(1, 0, 2),
+        terminal=cumulative[:, -1],
+    )
@@ -0,0 +1,206 @@
+# ============================================================
+# 백그라운드 데이터 갱신 스케줄러 (Streamlit 비의존)
+# 시리즈별 신선도 정책(freshness.FreshnessPolicy)에 따라 새 데이터가 공표된
+# 시리즈만 다시 받고, 새 스냅샷으로 원자적으로 교체한 뒤 분석/차트 캐시를
+# 미리 채워 사용자가 콜드 캐시를 만나지 않도록 함
+# ============================================================
+import logging
+import threading
+import types
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """한 시점의 전체 raw_data (교체만 가능, 수정 불가)"""
+    version: int
+    refreshed_at: datetime
+    raw: types.MappingProxyType
+
+
+class RefreshScheduler:
+    """
+    policy 가 새 데이터가 공표되었다고 판단한 시리즈만 fetch(keys) 로 다시 받아
+    스냅샷을 교체합니다. 교체 후 on_refresh(snapshot) 로 캐시 예열을 수행합니다.
+    initial(키 -> 시리즈, 예: 로컬 아카이브)이 주어지면 첫 갱신 전까지 이를 스냅샷으로 사용합니다.
+    """
+
+    def __init__(self, fetch, keys, policy, on_refresh=None, poll_interval=60.0, retry_interval=300.0,
+                 initial=None):
+        self.fetch = fetch
+        self.keys = list(keys)
+        self.policy = policy
+        self.on_refresh = on_refresh
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._next_retry = None
+        self._failed = {}
+        self.last_attempt = None
+        self.last_error = None
+        self.consecutive_failures = 0
+        self.prewarm_error = None
+
+        if initial is not None:
+            self._snapshot = DataSnapshot(
+                version=0,
+                refreshed_at=datetime.now(timezone.utc),
+                raw=types.MappingProxyType(dict(initial)),
+            )
+            self._ready.set()
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def start(self):
+        """백그라운드 스레드 시작 (즉시 첫 갱신 수행)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="fred-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def wait_ready(self, timeout=None):
+        """첫 스냅샷이 준비될 때까지 대기 (실패 시 None)"""
+        self._ready.wait(timeout)
+        return self._snapshot
+
+    def track(self, keys):
+        """
+        keys 를 갱신 대상에 추가하고 스냅샷에 없는 키는 바로 받아 옴 (워치리스트처럼 키 구성이 바뀌는 경우).
+        받지 못한 키 -> 오류 메시지 반환. 실패한 키는 retry_interval 동안 다시 요청하지 않으며,
+        정기 갱신의 재시도 상태(last_error 등)에는 영향을 주지 않음
+        """
+        errors = {}
+        for key in keys:
+            snapshot = self._snapshot
+            if snapshot is None or key not in snapshot.raw:
+                now = datetime.now(timezone.utc)
+                failed_at, error = self._failed.get(key, (None, None))
+                if failed_at is not None and now - failed_at < timedelta(seconds=self.retry_interval):
+                    errors[key] = error
+                    continue
+                with self._refresh_lock:
+                    # 다른 세션이 같은 키를 먼저 받았으면 그대로 사용
+                    if self._snapshot is not None and key in self._snapshot.raw:
+                        self._add_key(key)
+                        continue
+                    try:
+                        fetched = self.fetch([key])
+                    except Exception as e:
+                        self._failed[key] = (now, f"{type(e).__name__}: {e}")
+                        errors[key] = self._failed[key][1]
+                        logger.warning("시리즈 추가 실패 (%s): %s", key, e)
+                        continue
+                    snapshot = self._publish(fetched, now)
+                self._failed.pop(key, None)
+                self._prewarm(snapshot)
+            self._add_key(key)
+        return errors
+
+    def _add_key(self, key):
+        with self._lock:
+            if key not in self.keys:
+                self.keys.append(key)
+
+    def due_keys(self, now=None):
+        """공표 예정 시각이 지나 확인이 필요한 시리즈 키"""
+        now = now or datetime.now(timezone.utc)
+        if self._next_retry is not None and now < self._next_retry:
+            return []
+        return self.policy.due_keys(self.keys, now)
+
+    def refresh(self, keys=None, force=False):
+        """
+        지정한 시리즈(기본: 전체) 중 메타데이터상 바뀐 것만 다시 받아 스냅샷 교체.
+        force=True 면 메타데이터 확인 없이 모두 받습니다. 성공 여부 반환
+        """
+        keys = list(self.keys) if keys is None else list(keys)
+        with self._refresh_lock:
+            now = datetime.now(timezone.utc)
+            self.last_attempt = now
+            try:
+                if not force:
+                    changed = self.policy.changed_keys(keys)
+                    for key in set(keys) - set(changed):
+                        self.policy.mark_unchanged(key, now)
+                    keys = changed
+                if not keys:
+                    return True
+                fetched = self.fetch(keys)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                self.consecutive_failures += 1
+                self._next_retry = now + timedelta(seconds=self.retry_interval)
+                # 대기 중인 세션이 직접 다운로드로 대체할 수 있도록 깨움
+                self._ready.set()
+                logger.warning("데이터 갱신 실패 (%s): %s", ', '.join(keys), e)
+                return False
+
+            snapshot = self._publish(fetched, now)
+            self.last_error = None
+            self.consecutive_failures = 0
+            self._next_retry = None
+
+        self._prewarm(snapshot)
+        return True
+
+    def _publish(self, fetched, now):
+        """fetched 를 반영한 새 스냅샷으로 교체 (_refresh_lock 안에서 호출)"""
+        previous = self._snapshot
+        raw = dict(previous.raw) if previous is not None else {}
+        raw.update(fetched)
+        snapshot = DataSnapshot(
+            version=(previous.version + 1) if previous is not None else 1,
+            refreshed_at=now,
+            raw=types.MappingProxyType(raw),
+        )
+        with self._lock:
+            self._snapshot = snapshot
+        for key, series in fetched.items():
+            self.policy.mark_fetched(key, series, now)
+        self._ready.set()
+        return snapshot
+
+    def _prewarm(self, snapshot):
+        if self.on_refresh is not None:
+            try:
+                self.on_refresh(snapshot)
+                self.prewarm_error = None
+            except Exception as e:
+                self.prewarm_error = f"{type(e).__name__}: {e}"
+                logger.exception("캐시 예열 실패")
+
+    def status(self):
+        """마지막 갱신 시각, 실패 상태, 다음 확인 예정 시각"""
+        next_due = {key: self.policy.next_check(key) for key in self.keys}
+        snapshot = self._snapshot
+        return {
+            'version': snapshot.version if snapshot is not None else None,
+            'last_refresh': snapshot.refreshed_at if snapshot is not None else None,
+            'last_attempt': self.last_attempt,
+            'last_error': self.last_error,
+            'consecutive_failures': self.consecutive_failures,
+            'prewarm_error': self.prewarm_error,
+            'next_due': next_due,
+        }
+
+    def _loop(self):
+        while not self._stop.is_set():
+            keys = self.due_keys()
+            if keys:
+                self.refresh(keys)
+            self._stop.wait(self.poll_interval)
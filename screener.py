@@ -0,0 +1,127 @@
+# ============================================================
+# 유동성 민감도 스크리너 (Streamlit 비의존)
+# 워치리스트 자산 전체 × 여러 윈도우 × 요인(NetLiq, DXY, HYSpread)의 상관계수 / 베타를
+# 누적합 한 번으로 미리 계산한 큐브에 담아 두고, 윈도우를 바꾸면 큐브의 한 면만 읽음
+# ============================================================
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from watchlist import WATCHLIST_DRIVERS, align_watchlist, common_scores, divergence_flags, signal_scores
+
+SCREENER_WINDOWS = (20, 30, 60, 90, 120, 180, 250)
+CUBE_DAYS = 60          # 큐브에 보관하는 최근 영업일 수 (변화량 비교용)
+CHANGE_LOOKBACK = 20    # 상관계수 변화 비교 시점 (영업일 전)
+
+
+def _cumulative(values):
+    """axis=0 누적합 (앞에 0 행 추가)"""
+    return np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+
+
+def correlation_cube(x, y, windows, days):
+    """
+    x(T, D) 와 y(T, A) 의 최근 days 시점 × 모든 윈도우 상관계수 / 베타 (윈도우, 시점, D, A).
+    1차 / 2차 모멘트 누적합을 한 번 만들고 (윈도우 × 시점) 구간 합을 인덱싱으로 한꺼번에 추출
+    """
+    # 전체 평균을 먼저 빼서 2차 모멘트의 자릿수 손실을 줄임 (상관 / 베타는 평행이동에 불변)
+    x_valid, y_valid = ~np.isnan(x), ~np.isnan(y)
+    x = np.where(x_valid, x - np.nanmean(x, axis=0), 0.0)
+    y = np.where(y_valid, y - np.nanmean(y, axis=0), 0.0)
+    both = x_valid.all(axis=1)[:, None] & y_valid
+
+    n = len(x)
+    ends = np.arange(max(n - days, 0), n) + 1                       # 누적합 기준 구간 끝 (배타)
+    windows = np.asarray(windows, dtype=int)
+    starts = np.maximum(ends[None, :] - windows[:, None], 0)        # (W, C)
+
+    def window_sum(values):
+        total = _cumulative(values)
+        return total[ends][None] - total[starts]
+
+    count = window_sum(both.astype(float))                          # (W, C, A)
+    sx, sxx = window_sum(x), window_sum(x * x)                      # (W, C, D)
+    sy, syy = window_sum(y), window_sum(y * y)                      # (W, C, A)
+    sxy = window_sum(x[:, :, None] * y[:, None, :])                 # (W, C, D, A)
+
+    size = windows[:, None, None, None].astype(float)
+    cov = sxy - sx[..., None] * sy[:, :, None, :] / size
+    var_x = (sxx - sx * sx / size[..., 0])[..., None]
+    var_y = (syy - sy * sy / size[..., 0])[:, :, None, :]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = cov / np.sqrt(var_x * var_y)
+        beta = cov / var_x
+    # 윈도우 전체가 관측된 구간만 사용 (상장 전 / 데이터 시작 부근 제외)
+    complete = (count == windows[:, None, None])[:, :, None, :]
+    return np.where(complete, corr, np.nan), np.where(complete, beta, np.nan)
+
+
+@dataclass(frozen=True)
+class ScreenerCube:
+    """윈도우 × 최근 시점 × 요인 × 자산 상관 / 베타 큐브와 윈도우별 점수 (세션 간 공유, 읽기 전용)"""
+    index: pd.DatetimeIndex    # 큐브에 담긴 최근 시점
+    windows: tuple
+    drivers: tuple
+    assets: list
+    sources: dict
+    corr: np.ndarray           # (윈도우, 시점, 요인, 자산)
+    beta: np.ndarray           # (윈도우, 시점, 요인, 자산)
+    scores: np.ndarray         # (윈도우, 시점, 자산)
+    divergence: np.ndarray     # (시점, 자산) 최근 Divergence 여부
+    returns: pd.DataFrame      # 자산 × 20일 / 60일 수익률 (%)
+
+    def table(self, window, lookback=CHANGE_LOOKBACK):
+        """window 기준 자산별 최신 상관 / 베타 / 상관 변화 / 점수 (큐브 조회만 수행)"""
+        w = self.windows.index(window)
+        past = max(len(self.index) - 1 - lookback, 0)
+        table = pd.DataFrame({'출처': pd.Series(self.sources)}, index=self.assets)
+        for d, driver in enumerate(self.drivers):
+            table[f'{driver} 상관'] = self.corr[w, -1, d]
+            table[f'{driver} 베타'] = self.beta[w, -1, d]
+        table[f'NetLiq 상관 {lookback}일 변화'] = (
+            self.corr[w, -1, self.drivers.index('NetLiq')] - self.corr[w, past, self.drivers.index('NetLiq')]
+        )
+        table = table.join(self.returns)
+        table['Divergence'] = self.divergence[-1]
+        table['점수'] = self.scores[w, -1]
+        return table
+
+    def sensitivity_profile(self, asset, driver):
+        """asset 의 driver 상관계수를 윈도우별로 (최신 시점)"""
+        a, d = self.assets.index(asset), self.drivers.index(driver)
+        return pd.Series(self.corr[:, -1, d, a], index=[f'{w}일' for w in self.windows], name=asset)
+
+
+def build_screener_cube(df, series, sources, windows=SCREENER_WINDOWS, days=CUBE_DAYS):
+    """df(분석 프레임) 기준으로 series({이름: Series}) 전체의 스크리너 큐브 생성 (윈도우 무관, 한 번만 계산)"""
+    prices = align_watchlist(series, df.index)
+    prices = prices.loc[:, prices.notna().any()]
+    assets = list(prices.columns)
+    values = prices.to_numpy(dtype=float)
+    windows = tuple(w for w in windows if w < len(df))
+
+    corr, beta = correlation_cube(
+        df[list(WATCHLIST_DRIVERS)].pct_change().to_numpy(dtype=float),
+        prices.pct_change(fill_method=None).to_numpy(dtype=float),
+        windows, days
+    )
+    divergence = divergence_flags(df, values)
+    days = corr.shape[1]
+    scores = signal_scores(common_scores(df)[-days:], corr[:, :, WATCHLIST_DRIVERS.index('DXY')], divergence)
+
+    return ScreenerCube(
+        index=df.index[-days:],
+        windows=windows,
+        drivers=WATCHLIST_DRIVERS,
+        assets=assets,
+        sources={asset: sources.get(asset, 'FRED') for asset in assets},
+        corr=corr,
+        beta=beta,
+        scores=scores,
+        divergence=divergence[-days:],
+        returns=pd.DataFrame({
+            '20일(%)': prices.pct_change(20, fill_method=None).iloc[-1] * 100,
+            '60일(%)': prices.pct_change(60, fill_method=None).iloc[-1] * 100,
+        }),
+    )
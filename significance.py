@@ -0,0 +1,155 @@
+# ============================================================
+# 롤링 상관계수 유의성 (Streamlit 비의존)
+# Fisher-z 신뢰구간(해석적, 벡터화)과 블록 부트스트랩 신뢰구간
+# (워커 풀에서 윈도우 묶음 단위로 병렬 계산)
+# ============================================================
+import math
+import os
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+CONFIDENCE = 0.95
+BOOTSTRAP_DRAWS = 1000
+# 워커 하나가 한 번에 처리하는 윈도우 수 (윈도우 × 재표본 배열 크기 제한)
+WINDOWS_PER_TASK = 256
+
+
+def _normal_quantile(confidence):
+    """양측 신뢰수준에 대한 표준정규 분위수 (0.95 -> 1.96)"""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def fisher_interval(corr, n, confidence=CONFIDENCE):
+    """롤링 상관계수 Series 의 Fisher-z 신뢰구간 (lower, upper)"""
+    z = np.arctanh(corr.clip(-0.999999, 0.999999))
+    half = _normal_quantile(confidence) / math.sqrt(n - 3)
+    return np.tanh(z - half), np.tanh(z + half)
+
+
+def correlation_pvalue(r, n):
+    """무상관 귀무가설에 대한 양측 p-value (Fisher-z 정규 근사)"""
+    if not np.isfinite(r):
+        return np.nan
+    z = math.atanh(min(max(r, -0.999999), 0.999999)) * math.sqrt(n - 3)
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def default_block_length(window):
+    """블록 길이 기본값 (윈도우 길이의 세제곱근, 최소 2)"""
+    return max(2, int(round(window ** (1 / 3))))
+
+
+def block_counts(window, draws, block, seed):
+    """
+    윈도우 내부 moving block bootstrap: 재표본별로 각 블록 시작 위치(윈도우 내 상대 위치)가
+    뽑힌 횟수 (draws × 시작 위치 수). 모든 윈도우가 같은 행렬을 공유하므로
+    (common random numbers) 구간이 날짜 사이에 부드럽게 이어짐
+    """
+    rng = np.random.default_rng(seed)
+    positions = window - block + 1
+    blocks = max(1, round(window / block))
+    starts = rng.integers(0, positions, size=(draws, blocks))
+    flat = (np.arange(draws)[:, None] * positions + starts).ravel()
+    return np.bincount(flat, minlength=draws * positions).reshape(draws, positions).astype(float)
+
+
+def _block_sums(values, block):
+    """각 위치에서 시작하는 길이 block 구간의 합"""
+    total = np.concatenate([[0.0], np.cumsum(values)])
+    return total[block:] - total[:-block]
+
+
+def _bootstrap_chunk(x, y, ends, window, draws, block, seed, confidence):
+    """
+    윈도우 묶음(ends: 윈도우 마지막 위치)의 부트스트랩 상관계수 분위수 (워커에서 실행).
+    재표본의 합계 통계량 = 블록 합계 × 선택 횟수 이므로 윈도우 × 재표본 전체를 행렬곱으로 계산
+    """
+    counts = block_counts(window, draws, block, seed)
+    positions = counts.shape[1]
+    size = counts[0].sum() * block
+    first = ends[0] - window + 1
+    rows = slice(first, first + len(ends))
+
+    sums = [
+        sliding_window_view(_block_sums(stat, block), positions)[rows] @ counts.T
+        for stat in (x, y, x * x, y * y, x * y)
+    ]
+    sx, sy, sxx, syy, sxy = sums
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = (size * sxy - sx * sy) / np.sqrt((size * sxx - sx * sx) * (size * syy - sy * sy))
+    alpha = (1 - confidence) / 2
+    return np.quantile(corr, [alpha, 1 - alpha], axis=1).T
+
+
+@dataclass(frozen=True)
+class BootstrapBands:
+    """롤링 상관계수별 부트스트랩 신뢰구간 (이름 -> (lower, upper))"""
+    bands: dict
+    draws: int
+    block: int
+    confidence: float
+
+
+def bootstrap_rolling_bands(ret, pairs, window, draws=BOOTSTRAP_DRAWS, block=None,
+                            confidence=CONFIDENCE, seed=0, executor=None):
+    """
+    pairs(이름 -> (x 컬럼, y 컬럼))의 모든 롤링 윈도우에 대해 블록 부트스트랩 신뢰구간 계산.
+    executor(ThreadPoolExecutor / ProcessPoolExecutor)가 주어지면 윈도우 묶음을 워커에 나눠 실행
+    """
+    block = block or default_block_length(window)
+    ends = np.arange(window - 1, len(ret))
+    chunks = [ends[i:i + WINDOWS_PER_TASK] for i in range(0, len(ends), WINDOWS_PER_TASK)]
+
+    tasks = {}
+    for name, (x_col, y_col) in pairs.items():
+        x = ret[x_col].to_numpy(dtype=float)
+        y = ret[y_col].to_numpy(dtype=float)
+        args = [(x, y, chunk, window, draws, block, seed, confidence) for chunk in chunks]
+        if executor is None:
+            tasks[name] = [_bootstrap_chunk(*arg) for arg in args]
+        else:
+            tasks[name] = [executor.submit(_bootstrap_chunk, *arg) for arg in args]
+
+    bands = {}
+    for name, parts in tasks.items():
+        if executor is not None:
+            parts = [future.result() for future in parts]
+        quantiles = np.vstack(parts) if parts else np.empty((0, 2))
+        lower = pd.Series(np.nan, index=ret.index)
+        upper = pd.Series(np.nan, index=ret.index)
+        lower.iloc[ends] = quantiles[:, 0]
+        upper.iloc[ends] = quantiles[:, 1]
+        bands[name] = (lower, upper)
+    return BootstrapBands(bands=bands, draws=draws, block=block, confidence=confidence)
+
+
+def significance_table(rolling, pairs, window, bootstrap=None, confidence=CONFIDENCE):
+    """롤링 상관계수별 최신값, Fisher-z 신뢰구간, p-value, (선택) 부트스트랩 신뢰구간"""
+    rows = []
+    for name, corr in rolling.items():
+        r = float(corr.iloc[-1])
+        lower, upper = fisher_interval(corr.iloc[-1:], window, confidence)
+        p_value = correlation_pvalue(r, window)
+        row = {
+            '상관계수': '–'.join(pairs[name]),
+            '현재': r,
+            'CI 하단': float(lower.iloc[0]),
+            'CI 상단': float(upper.iloc[0]),
+            'p-value': p_value,
+            '유의': bool(p_value < 1 - confidence),
+        }
+        if bootstrap is not None:
+            boot_lower, boot_upper = bootstrap.bands[name]
+            row['부트스트랩 하단'] = float(boot_lower.iloc[-1])
+            row['부트스트랩 상단'] = float(boot_upper.iloc[-1])
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('상관계수')
+
+
+def worker_count():
+    """부트스트랩 워커 수 (CPU 코어 수, 최대 8)"""
+    return max(1, min(8, os.cpu_count() or 1))
@@ -0,0 +1,5 @@
+# 저장소 루트의 모듈(data_loader, alerts 등)을 패키지 설치 없이 import
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
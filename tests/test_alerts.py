@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from alerts import OPERATOR_CODES, AlertEngine, AlertRule, FileOutbox, alert_metrics, evaluate_rules, load_rules
+from events import DIVERGENCE_HORIZON, DIVERGENCE_RECENT_DAYS
+
+
+def _metrics(values, start='2024-01-01'):
+    return pd.DataFrame({'m': values}, index=pd.bdate_range(start, periods=len(values)), dtype=float)
+
+
+def _engine(directory, *rules):
+    return AlertEngine(rules or (AlertRule('high', 'm', '>', 1.0),), FileOutbox(str(directory)), str(directory))
+
+
+def test_first_run_only_looks_at_last_two_rows(tmp_path):
+    """처음 실행하면 과거 돌파를 한꺼번에 보내지 않고 마지막 행의 전환만 확인"""
+    engine = _engine(tmp_path)
+    assert engine.evaluate(_metrics([0, 2, 0, 2, 2])) == []
+    engine = _engine(tmp_path / 'other')
+    alerts = engine.evaluate(_metrics([0, 2, 0, 0, 2]))
+    assert [(alert['date'], alert['rule']) for alert in alerts] == [('2024-01-05', 'high')]
+
+
+def test_only_false_to_true_crossings_fire(tmp_path):
+    engine = _engine(tmp_path)
+    history = [0, 0, 2, 2, 0, 3, 0]
+    engine.evaluate(_metrics(history[:2]))
+    alerts = engine.evaluate(_metrics(history))
+    assert [alert['date'] for alert in alerts] == ['2024-01-03', '2024-01-08']
+    assert [alert['value'] for alert in alerts] == [2.0, 3.0]
+    # 같은 데이터로 다시 평가해도 (재시작 포함) 이미 보낸 돌파는 반복하지 않음
+    assert engine.evaluate(_metrics(history)) == []
+    assert _engine(tmp_path).evaluate(_metrics(history)) == []
+    assert len(FileOutbox(str(tmp_path)).recent()) == 2
+
+
+def test_cooldown_suppresses_recrossings(tmp_path):
+    rule = AlertRule('high', 'm', '>', 1.0, cooldown_days=5)
+    engine = _engine(tmp_path, rule)
+    engine.evaluate(_metrics([0, 0]))
+    # 1/3 돌파 -> 1/5 재돌파(2일 뒤, 무시) -> 1/10 재돌파(7일 뒤, 발송)
+    alerts = engine.evaluate(_metrics([0, 0, 2, 0, 2, 0, 0, 2]))
+    assert [alert['date'] for alert in alerts] == ['2024-01-03', '2024-01-10']
+
+
+def test_state_carries_across_incremental_runs(tmp_path):
+    """직전 평가의 참 / 거짓을 저장된 상태로 이어받으므로 이어지는 참은 새 돌파가 아님"""
+    engine = _engine(tmp_path)
+    engine.evaluate(_metrics([0, 0]))
+    assert len(engine.evaluate(_metrics([0, 0, 2]))) == 1
+    assert engine.evaluate(_metrics([0, 0, 2, 2])) == []
+    assert len(engine.evaluate(_metrics([0, 0, 2, 2, 0, 2]))) == 1
+    assert engine.describe().loc['high', '현재 충족']
+
+
+def test_missing_metric_and_invalid_rules_raise(tmp_path):
+    with pytest.raises(KeyError):
+        _engine(tmp_path, AlertRule('x', 'unknown', '>', 0)).evaluate(_metrics([0, 1]))
+    with pytest.raises(ValueError):
+        load_rules([{'name': 'x', 'metric': 'm', 'op': '!=', 'threshold': 0}])
+    with pytest.raises(ValueError):
+        load_rules([{'name': 'x', 'metric': 'm', 'op': '>', 'threshold': 0}] * 2)
+
+
+def test_evaluate_rules_treats_nan_as_false():
+    values = np.array([[np.nan, 1.0], [2.0, -1.0]])
+    op_codes = np.array([OPERATOR_CODES.index('>'), OPERATOR_CODES.index('<=')], dtype=np.int8)
+    result = evaluate_rules(values, np.array([0, 1]), op_codes, np.array([1.0, 0.0]))
+    np.testing.assert_array_equal(result, [[False, False], [True, True]])
+
+
+def test_divergence_metric_matches_signal_tab_window():
+    """Divergence 지표 = 최근 DIVERGENCE_RECENT_DAYS 영업일 중 하루라도 S&P 500 / HY Spread 동반 상승"""
+    n = DIVERGENCE_HORIZON + 20
+    index = pd.bdate_range('2024-01-01', periods=n)
+    sp500 = np.full(n, 100.0)
+    sp500[DIVERGENCE_HORIZON + 5] = 110.0      # 하루만 20일 상승
+    df = pd.DataFrame({
+        'NetLiq': 1.0, 'DXY': 1.0, 'BTC': 1.0, 'SP500': sp500,
+        'HYSpread': np.linspace(3.0, 4.0, n),  # 계속 상승
+    }, index=index)
+    divergence = alert_metrics(df, window=10)['Divergence']
+    assert divergence.iloc[:DIVERGENCE_HORIZON].isna().all()
+    flagged = np.flatnonzero(divergence.to_numpy() == 1)
+    expected = np.arange(DIVERGENCE_HORIZON + 5, DIVERGENCE_HORIZON + 5 + DIVERGENCE_RECENT_DAYS)
+    np.testing.assert_array_equal(flagged, expected)
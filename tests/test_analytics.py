@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import average_ranks, correlation_matrices, kendall_matrix
+
+
+@pytest.fixture
+def tied_returns():
+    """반올림으로 동률이 많은 수익률 (열마다 동률 정도가 다름)"""
+    rng = np.random.default_rng(17)
+    base = rng.standard_normal((700, 1))
+    values = 0.6 * base + rng.standard_normal((700, 4))
+    return pd.DataFrame(
+        {'coarse': np.round(values[:, 0]), 'half': np.round(values[:, 1] * 2) / 2,
+         'fine': np.round(values[:, 2], 1), 'exact': values[:, 3]},
+        index=pd.bdate_range('2020-01-01', periods=700),
+    )
+
+
+def _kendall_tau_b(x, y):
+    """모든 관측 쌍을 직접 비교한 τ-b (동률 보정 포함)"""
+    dx = np.sign(x[:, None] - x[None, :])[np.triu_indices(len(x), 1)]
+    dy = np.sign(y[:, None] - y[None, :])[np.triu_indices(len(y), 1)]
+    return (dx * dy).sum() / np.sqrt(np.abs(dx).sum() * np.abs(dy).sum())
+
+
+def test_average_ranks_match_pandas(tied_returns):
+    np.testing.assert_array_equal(average_ranks(tied_returns.to_numpy()), tied_returns.rank().to_numpy())
+
+
+@pytest.mark.parametrize('block', [7, 256, 1000])
+def test_kendall_matrix_matches_pairwise_tau_b(tied_returns, block):
+    """float32 순위 / 행 묶음 분할과 무관하게 쌍별로 직접 센 τ-b 와 같음"""
+    values = tied_returns.to_numpy()
+    expected = np.array([[_kendall_tau_b(values[:, a], values[:, b]) for b in range(4)] for a in range(4)])
+    np.testing.assert_allclose(kendall_matrix(values, block=block), expected, rtol=1e-10, atol=1e-12)
+
+
+def test_correlation_matrices_match_pandas(tied_returns):
+    levels = np.exp(tied_returns.cumsum() * 0.01)
+    matrices = correlation_matrices(levels)
+    log_returns = np.log(levels).diff().dropna()
+    pd.testing.assert_frame_equal(matrices['levels'], levels.corr())
+    pd.testing.assert_frame_equal(matrices['log_returns'], log_returns.corr())
+    pd.testing.assert_frame_equal(matrices['spearman'], log_returns.corr(method='spearman'))
+
+
+def test_kendall_matches_pandas_with_ties(tied_returns):
+    # pandas 의 Kendall 은 scipy 가 필요 (requirements 에는 없음)
+    pytest.importorskip('scipy')
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(kendall_matrix(tied_returns.to_numpy()), index=tied_returns.columns, columns=tied_returns.columns),
+        tied_returns.corr(method='kendall'),
+    )
+    levels = np.exp(tied_returns.cumsum() * 0.01)
+    log_returns = np.log(levels).diff().dropna()
+    pd.testing.assert_frame_equal(correlation_matrices(levels)['kendall'], log_returns.corr(method='kendall'))
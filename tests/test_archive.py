@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from archive import SeriesArchive
+
+
+class RecordingFred:
+    """get_series 호출 시작일을 기록하고 history 에서 잘라 반환하는 FRED 대체"""
+
+    def __init__(self, history):
+        self.history = history
+        self.starts = []
+
+    def get_series(self, series_id, observation_start=None, **kwargs):
+        self.starts.append((series_id, observation_start))
+        series = self.history[series_id]
+        if observation_start is not None:
+            series = series[series.index >= pd.Timestamp(observation_start)]
+        return series.copy()
+
+
+@pytest.fixture
+def history():
+    index = pd.bdate_range('2024-01-01', periods=120)
+    return pd.Series(range(120), index=index, dtype=float)
+
+
+def test_first_update_downloads_full_history_and_persists(tmp_path, history):
+    fred = RecordingFred({'WALCL': history})
+    archive = SeriesArchive(str(tmp_path))
+    merged = archive.update(fred, ['walcl'])
+    assert fred.starts == [('WALCL', None)]
+    pd.testing.assert_series_equal(merged['walcl'], history)
+    # 새 인스턴스(재시작)도 파일에서 같은 이력을 읽음
+    pd.testing.assert_series_equal(SeriesArchive(str(tmp_path)).load('walcl'), history)
+
+
+def test_incremental_update_fetches_only_recent_window(tmp_path, history):
+    archive = SeriesArchive(str(tmp_path), revision_window=timedelta(days=10))
+    archive.update(RecordingFred({'WALCL': history[:100]}), ['walcl'])
+
+    # 수정 구간 안의 값이 바뀌고 새 관측치가 추가된 이력
+    revised = history.copy()
+    revised.iloc[95:] += 1000
+    fred = RecordingFred({'WALCL': revised})
+    merged = archive.update(fred, ['walcl'])['walcl']
+
+    start = history.index[99] - timedelta(days=10)
+    assert fred.starts == [('WALCL', start)]
+    assert merged.index.equals(history.index)
+    # 수정 구간 이전은 보관본, 이후는 새로 받은 값
+    pd.testing.assert_series_equal(merged[merged.index < start], history[history.index < start])
+    pd.testing.assert_series_equal(merged[merged.index >= start], revised[revised.index >= start])
+
+
+def test_load_all_requires_every_key(tmp_path, history):
+    archive = SeriesArchive(str(tmp_path))
+    archive.update(RecordingFred({'WALCL': history}), ['walcl'])
+    assert archive.load_all(['walcl', 'tga']) is None
+    assert set(archive.load_all(['walcl'])) == {'walcl'}
+
+
+def test_watchlist_keys_are_archived_by_fred_id(tmp_path, history):
+    fred = RecordingFred({'DJIA': history})
+    archive = SeriesArchive(str(tmp_path))
+    archive.update(fred, ['watch_DJIA'])
+    assert fred.starts == [('DJIA', None)]
+    assert archive.stored_keys('watch_') == ['watch_DJIA']
@@ -0,0 +1,55 @@
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from data_loader import align_series, business_calendar
+from registry import ASSET, LIQUIDITY, SeriesSpec
+
+
+def _spec(key, role=ASSET, scale=1.0, release_rule=(0, time(0, 0))):
+    return SeriesSpec(key, key, key, key, '', role, scale=scale, release_rule=release_rule)
+
+
+def test_business_calendar_skips_weekends():
+    calendar = business_calendar('2024-01-05', '2024-01-09')
+    assert list(calendar.strftime('%a')) == ['Fri', 'Mon', 'Tue']
+
+
+def test_weekly_series_is_carried_forward_until_next_observation():
+    """수요일 관측치는 다음 수요일 전까지 유지 (as-of)"""
+    weekly = pd.Series([10.0, 20.0], index=pd.to_datetime(['2024-01-03', '2024-01-10']))
+    calendar = business_calendar('2024-01-02', '2024-01-12')
+    values = align_series([weekly], [_spec('w')], calendar)[:, 0]
+    expected = pd.Series(
+        [np.nan, 10, 10, 10, 10, 10, 20, 20, 20],
+        index=calendar,
+    )
+    np.testing.assert_array_equal(values, expected.to_numpy())
+
+
+def test_weekend_observation_is_known_on_next_business_day():
+    daily = pd.Series([1.0, 2.0, 3.0], index=pd.to_datetime(['2024-01-05', '2024-01-06', '2024-01-07']))
+    calendar = business_calendar('2024-01-05', '2024-01-08')
+    values = align_series([daily], [_spec('d')], calendar)[:, 0]
+    np.testing.assert_array_equal(values, [1.0, 3.0])
+
+
+def test_scale_and_columns_follow_specs():
+    first = pd.Series([1.0], index=pd.to_datetime(['2024-01-02']))
+    second = pd.Series([5.0], index=pd.to_datetime(['2024-01-03']))
+    calendar = business_calendar('2024-01-02', '2024-01-03')
+    values = align_series([first, second], [_spec('a', scale=1000.0), _spec('b', role=LIQUIDITY)], calendar)
+    np.testing.assert_array_equal(values, [[1000.0, np.nan], [1000.0, 5.0]])
+
+
+def test_publication_lag_uses_release_date():
+    """공표 시차를 반영하면 관측일 + release_rule 일수부터 값이 보임"""
+    weekly = pd.Series([10.0, 20.0], index=pd.to_datetime(['2024-01-03', '2024-01-10']))
+    calendar = business_calendar('2024-01-03', '2024-01-12')
+    spec = _spec('w', release_rule=(1, time(21, 0)))
+    values = pd.Series(align_series([weekly], [spec], calendar, publication_lag=True)[:, 0], index=calendar)
+    assert np.isnan(values['2024-01-03'])
+    assert values['2024-01-04'] == 10.0
+    assert values['2024-01-10'] == 10.0
+    assert values['2024-01-11'] == 20.0
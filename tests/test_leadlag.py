@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from leadlag import analyze_lead_lag, cross_correlation, rolling_lead_lag
+
+LEAD = 7
+
+
+@pytest.fixture
+def leading_returns():
+    """x 가 y 를 LEAD 영업일 선행 (y[t] = x[t - LEAD] + 잡음)"""
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(600)
+    y = np.roll(x, LEAD) + 0.3 * rng.standard_normal(600)
+    y[:LEAD] = rng.standard_normal(LEAD)
+    index = pd.bdate_range('2020-01-01', periods=600)
+    return pd.DataFrame({'x': x, 'y': y}, index=index)
+
+
+def test_positive_lag_means_first_series_leads(leading_returns):
+    lags, cube = cross_correlation(leading_returns, max_lag=20)
+    assert lags[np.argmax(cube[:, 0, 1])] == LEAD
+    # 반대 방향 쌍은 음의 시차에서 최대
+    assert lags[np.argmax(cube[:, 1, 0])] == -LEAD
+
+
+def test_fft_matches_direct_correlation(leading_returns):
+    """cube[l, i, j] = corr(x_i[t], x_j[t + lag]) (전체 표준화 기준)"""
+    lags, cube = cross_correlation(leading_returns, max_lag=10)
+    values = leading_returns.to_numpy()
+    z = (values - values.mean(axis=0)) / values.std(axis=0)
+    for lag in (-4, 0, 3, LEAD):
+        if lag >= 0:
+            expected = np.mean(z[:len(z) - lag, 0] * z[lag:, 1])
+        else:
+            expected = np.mean(z[-lag:, 0] * z[:len(z) + lag, 1])
+        assert cube[lags == lag, 0, 1][0] == pytest.approx(expected)
+
+
+def test_rolling_lead_lag_matches_pandas(leading_returns):
+    x, y = leading_returns['x'], leading_returns['y']
+    rolling = rolling_lead_lag(x, y, window=60, max_lag=10)
+    for lag in (-3, 0, LEAD):
+        expected = x.rolling(60).corr(y.shift(-lag))
+        pd.testing.assert_series_equal(rolling[lag], expected, check_names=False, atol=1e-10)
+
+
+def test_analyze_lead_lag_reports_peak_lag(leading_returns):
+    result = analyze_lead_lag(leading_returns, 'x', 'y', window=120, max_lag=20)
+    assert result.table().loc['y', '최대 상관 시차(일)'] == LEAD
+    assert result.pair('x', 'y').idxmax() == LEAD
+    assert (result.peak_lag_path() == LEAD).mean() > 0.9
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nowcast import NowcastTracker
+
+
+@pytest.fixture
+def inputs():
+    """주간 WALCL / WTREGEN (수요일), 일간 RRP / DTS TGA (백만 달러)"""
+    rng = np.random.default_rng(11)
+    days = pd.bdate_range('2023-01-02', periods=160)
+    weeks = days[days.weekday == 2]
+    dts = pd.Series(750_000 + np.cumsum(rng.normal(0, 8_000, len(days))), index=days)
+    return {
+        'walcl': pd.Series(8_000_000 + np.cumsum(rng.normal(0, 5_000, len(weeks))), index=weeks),
+        'tga': dts[weeks] + rng.normal(0, 3_000, len(weeks)),
+        'rrp': pd.Series(1_500_000 + np.cumsum(rng.normal(0, 10_000, len(days))), index=days),
+        'dts_tga': dts,
+    }
+
+
+def _until(inputs, weekly_end, daily_end):
+    """주간 공표는 weekly_end, 일간 관측은 daily_end 까지만 도착한 시점의 입력"""
+    return {
+        name: series[series.index <= (weekly_end if name in ('walcl', 'tga') else daily_end)]
+        for name, series in inputs.items()
+    }
+
+
+def test_incremental_updates_match_batch(inputs):
+    """잠정 구간이 있는 첫 update 뒤 늦은 주간 공표가 와도 한 번에 계산한 결과와 같음"""
+    weeks, days = inputs['walcl'].index, inputs['rrp'].index
+    partial = _until(inputs, weeks[15], days[days.get_loc(weeks[15]) + 4])
+
+    tracker = NowcastTracker()
+    first = tracker.update(**partial)
+    # 확정 구간은 마지막 주간 공표일까지, 이후 일간 관측만 있는 날은 잠정치
+    assert first.confirmed_through == weeks[15]
+    assert first.nowcast.index[-1] > weeks[15]
+    incremental = tracker.update(**inputs)
+
+    batch = NowcastTracker().update(**inputs)
+    pd.testing.assert_series_equal(incremental.nowcast, batch.nowcast)
+    pd.testing.assert_series_equal(incremental.official, batch.official)
+    pd.testing.assert_frame_equal(incremental.anchor_errors, batch.anchor_errors)
+    assert incremental.confirmed_through == batch.confirmed_through
+
+
+@pytest.mark.parametrize('dts_tga', [None, pd.Series(dtype=float)])
+def test_without_dts_nowcast_equals_official(inputs, dts_tga):
+    result = NowcastTracker().update(inputs['walcl'], inputs['tga'], inputs['rrp'], dts_tga)
+    assert not result.dts_used
+    np.testing.assert_array_equal(result.nowcast.to_numpy(), result.official.to_numpy())
+    pd.testing.assert_index_equal(result.nowcast.index, result.official.index)
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import outlook
+from outlook import OUTLOOK_COLUMNS, SCENARIOS, estimate_outlook, netliq_states
+
+CONDITIONAL = '현재 유동성 상태 구간'
+
+
+@pytest.fixture
+def history():
+    """Net Liquidity 가 1년 주기로 확장 / 축소를 반복하는 전체 이력 프레임"""
+    rng = np.random.default_rng(9)
+    n = 800
+    index = pd.bdate_range('2020-01-01', periods=n)
+    log_prices = np.cumsum(0.01 * rng.standard_normal((n, len(OUTLOOK_COLUMNS))), axis=0)
+    log_prices[:, 0] = 0.08 * np.sin(2 * np.pi * np.arange(n) / 250) + 0.002 * rng.standard_normal(n)
+    return pd.DataFrame(np.exp(log_prices) * 100, index=index, columns=list(OUTLOOK_COLUMNS))
+
+
+def _conditional_blocks(df, block):
+    states = netliq_states(df)
+    starts = np.arange(len(df) - block)
+    return int((states[starts] == states[-1]).sum())
+
+
+def test_probabilities_sum_to_100(history):
+    result = estimate_outlook(history, horizon=21, block=5, draws=3_000)
+    for sample in result.samples.values():
+        assert set(sample.probabilities) == set(SCENARIOS)
+        assert sum(sample.probabilities.values()) == pytest.approx(100.0)
+    np.testing.assert_allclose(result.probability_table().sum(axis=1), 100.0)
+
+
+def test_conditional_sampler_requires_min_blocks(history, monkeypatch):
+    blocks = _conditional_blocks(history, 5)
+    monkeypatch.setattr(outlook, 'MIN_CONDITIONAL_BLOCKS', blocks)
+    kept = estimate_outlook(history, horizon=21, block=5, draws=500)
+    assert kept.samples[CONDITIONAL].blocks == blocks
+
+    # 블록 시작 위치가 하나라도 모자라면 전체 이력만 사용
+    monkeypatch.setattr(outlook, 'MIN_CONDITIONAL_BLOCKS', blocks + 1)
+    dropped = estimate_outlook(history, horizon=21, block=5, draws=500)
+    assert list(dropped.samples) == ['전체 이력']
+    assert dropped.primary().label == '전체 이력'
+
+
+def test_fixed_seed_is_identical_serial_and_pooled(history):
+    """재표본 묶음별 seed 가 고정이므로 워커 풀 사용 여부와 무관하게 같은 결과"""
+    serial = estimate_outlook(history, horizon=21, block=5, draws=5_000, seed=3)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        pooled = estimate_outlook(history, horizon=21, block=5, draws=5_000, seed=3, executor=executor)
+    assert list(serial.samples) == list(pooled.samples)
+    pd.testing.assert_frame_equal(serial.probability_table(), pooled.probability_table())
+    for label in serial.samples:
+        pd.testing.assert_frame_equal(serial.range_table(label), pooled.range_table(label))
+        pd.testing.assert_frame_equal(serial.samples[label].composite, pooled.samples[label].composite)
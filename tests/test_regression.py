@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from regression import REGRESSION_DRIVERS, REGRESSION_TARGETS, rolling_covariance, rolling_regression
+
+
+@pytest.fixture
+def returns():
+    """요인 3개에 대상 2개를 선형 결합한 일간 수익률 (가격 수준의 오프셋 포함)"""
+    rng = np.random.default_rng(21)
+    n = 400
+    drivers = 0.01 * rng.standard_normal((n, 3)) + [0.05, -0.02, 0.01]
+    targets = drivers @ np.array([[1.4, 0.7], [-1.8, -0.6], [-0.2, -0.9]]) + 0.015 * rng.standard_normal((n, 2))
+    return pd.DataFrame(np.hstack([targets, drivers]), index=pd.bdate_range('2021-01-04', periods=n),
+                        columns=list(REGRESSION_TARGETS) + list(REGRESSION_DRIVERS))
+
+
+def test_rolling_covariance_matches_numpy(returns):
+    window = 60
+    values = returns.to_numpy()
+    cov = rolling_covariance(values, window)
+    for end in (window - 1, 200, len(values) - 1):
+        np.testing.assert_allclose(cov[end], np.cov(values[end - window + 1:end + 1], rowvar=False), rtol=1e-8)
+
+
+@pytest.mark.parametrize('window', [30, 90])
+def test_rolling_betas_match_lstsq_on_last_window(returns, window):
+    """누적합으로 갱신한 마지막 윈도우 베타 = 절편을 포함한 최소제곱 회귀 계수"""
+    regression = rolling_regression(returns, window)
+    last = returns.iloc[-window:]
+    design = np.column_stack([np.ones(window), last[list(REGRESSION_DRIVERS)].to_numpy()])
+    for target in REGRESSION_TARGETS:
+        coef, *_ = np.linalg.lstsq(design, last[target].to_numpy(), rcond=None)
+        np.testing.assert_allclose(regression.betas[target].iloc[-1].to_numpy(), coef[1:], rtol=1e-8, atol=1e-10)
+        # 결정계수도 같은 회귀의 값과 일치
+        residual = last[target].to_numpy() - design @ coef
+        centered = last[target].to_numpy() - last[target].mean()
+        assert regression.r_squared[target].iloc[-1] == pytest.approx(1 - residual @ residual / (centered @ centered))
+    assert regression.betas[REGRESSION_TARGETS[0]].iloc[:window - 1].isna().all().all()
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scenario
+from regression import REGRESSION_DRIVERS, REGRESSION_TARGETS, rolling_regression
+from scenario import SCENARIO_MAX_PATHS, build_scenario_model, simulate_scenario
+
+
+@pytest.fixture
+def analytics():
+    """build_scenario_model 이 쓰는 분석 결과 필드(수익률, 구성 요소 잔고, 가중 방식)만 가진 대역"""
+    rng = np.random.default_rng(5)
+    index = pd.bdate_range('2022-01-03', periods=300)
+    drivers = 0.01 * rng.standard_normal((300, 3))
+    targets = drivers @ np.array([[1.5, 0.8], [-2.0, -0.5], [-0.3, -0.6]]) + 0.02 * rng.standard_normal((300, 2))
+    ret = pd.DataFrame(np.hstack([targets, drivers]), index=index,
+                       columns=list(REGRESSION_TARGETS) + list(REGRESSION_DRIVERS))
+    # 백만 달러 단위 잔고, NetLiq = WALCL − TGA − RRP
+    levels = pd.DataFrame({'WALCL': 7_500_000.0, 'TGA': 750_000.0, 'RRP': 500_000.0}, index=index)
+    levels['NetLiq'] = levels['WALCL'] - levels['TGA'] - levels['RRP']
+    return SimpleNamespace(ret=ret, df_recent=levels, weighting='동일가중')
+
+
+@pytest.fixture
+def model(analytics):
+    return build_scenario_model(analytics, rolling_regression(analytics.ret, 90))
+
+
+@pytest.mark.parametrize('halflife', [None, 30])
+def test_residual_cov_is_symmetric_psd(analytics, halflife):
+    """잔차 공분산 Σyy − βΣxxβᵀ 는 같은 공분산의 슈어 보수이므로 대칭 준양정치"""
+    regression = rolling_regression(analytics.ret, 90, halflife=halflife)
+    model = build_scenario_model(analytics, regression, halflife)
+    np.testing.assert_array_equal(model.residual_cov, model.residual_cov.T)
+    assert np.linalg.eigvalsh(model.residual_cov).min() > -1e-12
+
+
+def test_zero_shock_has_zero_effects(model):
+    for shocks in ({}, {'TGA': 0.0, 'RRP': 0.0}):
+        result = simulate_scenario(model, shocks, horizon=20, paths=500)
+        assert result.netliq_change == 0
+        np.testing.assert_array_equal(result.effects[['직접(%)', '간접(%)', '합계(%)']].to_numpy(), 0)
+
+
+def test_paths_do_not_depend_on_chunking(model, monkeypatch):
+    """같은 seed 면 앞쪽 경로는 전체 경로 수 / PATH_CHUNK 분할과 무관"""
+    shocks = {'TGA': 500}
+    full = simulate_scenario(model, shocks, horizon=30, paths=1_500)
+    head = simulate_scenario(model, shocks, horizon=30, paths=400)
+    np.testing.assert_allclose(head.terminal, full.terminal[:400], rtol=1e-5, atol=1e-5)
+
+    monkeypatch.setattr(scenario, 'PATH_CHUNK', 333)
+    chunked = simulate_scenario(model, shocks, horizon=30, paths=1_500)
+    np.testing.assert_allclose(chunked.terminal, full.terminal, rtol=1e-5, atol=1e-5)
+
+
+def test_paths_above_limit_raise(model):
+    with pytest.raises(ValueError):
+        simulate_scenario(model, {}, horizon=5, paths=SCENARIO_MAX_PATHS + 1)
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from freshness import FreshnessPolicy
+from scheduler import RefreshScheduler
+
+
+class Fetcher:
+    """호출 기록을 남기고 'BAD' 키는 실패하는 fetch"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(list(keys))
+        if 'BAD' in keys:
+            raise ValueError('Bad Request')
+        index = pd.to_datetime(['2024-01-02', '2024-01-03'])
+        return {key: pd.Series([1.0, 2.0], index=index) for key in keys}
+
+
+def _scheduler(fetch, retry_interval=300.0):
+    policy = FreshnessPolicy(get_info=lambda key: {}, release_rules={})
+    return RefreshScheduler(fetch, [], policy, retry_interval=retry_interval, initial={})
+
+
+def test_track_fetches_only_missing_keys():
+    fetch = Fetcher()
+    scheduler = _scheduler(fetch)
+    assert scheduler.track(['A', 'B']) == {}
+    assert scheduler.track(['A', 'B']) == {}
+    assert fetch.calls == [['A'], ['B']]
+    assert scheduler.keys == ['A', 'B']
+    assert set(scheduler.snapshot.raw) == {'A', 'B'}
+
+
+def test_track_failure_is_reported_and_backed_off():
+    fetch = Fetcher()
+    scheduler = _scheduler(fetch)
+    errors = scheduler.track(['A', 'BAD'])
+    assert list(errors) == ['BAD'] and 'Bad Request' in errors['BAD']
+    # 실패한 키는 정기 갱신 대상에 넣지 않고, 재시도 간격 동안 다시 요청하지 않음
+    assert scheduler.keys == ['A']
+    assert scheduler.track(['BAD']) == errors
+    assert fetch.calls == [['A'], ['BAD']]
+    # 정기 갱신의 실패 상태에는 영향 없음
+    assert scheduler.last_error is None and scheduler.status()['consecutive_failures'] == 0
+
+
+def test_track_retries_after_interval():
+    fetch = Fetcher()
+    scheduler = _scheduler(fetch, retry_interval=0.0)
+    scheduler.track(['BAD'])
+    scheduler.track(['BAD'])
+    assert fetch.calls == [['BAD'], ['BAD']]
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener import build_screener_cube, correlation_cube
+from watchlist import SCORE_RANGE, WATCHLIST_DRIVERS, common_scores, signal_scores
+
+
+@pytest.fixture
+def frame():
+    """분석 프레임(NetLiq, DXY, HYSpread)과 자산 가격 (LATE 는 중간에 상장)"""
+    rng = np.random.default_rng(3)
+    index = pd.bdate_range('2021-01-04', periods=400)
+    drivers = pd.DataFrame(
+        np.exp(np.cumsum(0.01 * rng.standard_normal((400, 3)), axis=0)) * [6000, 100, 4],
+        index=index, columns=list(WATCHLIST_DRIVERS),
+    )
+    dxy_ret = drivers['DXY'].pct_change().fillna(0).to_numpy()
+    early = pd.Series(100 * np.exp(np.cumsum(-0.8 * dxy_ret + 0.01 * rng.standard_normal(400))), index=index)
+    late = pd.Series(50 * np.exp(np.cumsum(0.01 * rng.standard_normal(250))), index=index[150:])
+    return drivers, {'EARLY': early, 'LATE': late}
+
+
+def test_signal_scores_follow_trading_signal_rules():
+    common = np.array([1, 1, -3, 0, 2])
+    dxy_corr = np.array([[-0.6], [0.1], [-0.6], [np.nan], [-0.2]])
+    divergence = np.array([[False], [False], [True], [False], [False]])
+    scores = signal_scores(common, dxy_corr, divergence)[:, 0]
+    # 강한 역상관 +1, 양의 상관 −1, 최근 5일 Divergence −1, 상관이 없으면 NaN
+    np.testing.assert_array_equal(scores[:3], [2, 0, -3])
+    assert np.isnan(scores[3])
+    # Divergence 는 이후 RECENT_DAYS 일 동안 감점
+    assert scores[4] == 2 - 1
+
+
+def test_score_range_bounds_extremes():
+    worst = signal_scores(np.array([-3]), np.array([[0.5]]), np.array([[True]]))
+    best = signal_scores(np.array([2]), np.array([[-0.9]]), np.array([[False]]))
+    assert (worst.min(), best.max()) == SCORE_RANGE
+
+
+def test_common_scores_use_netliq_change_and_hy_level():
+    index = pd.bdate_range('2024-01-01', periods=61)
+    df = pd.DataFrame({
+        'NetLiq': np.linspace(100, 110, 61),    # 60일 +10% -> +1
+        'HYSpread': np.full(61, 5.5),           # 위험 -> -2
+    }, index=index)
+    assert common_scores(df)[-1] == -1
+    assert common_scores(df)[0] == -2           # 60일 변화를 모르면 HY 점수만
+
+
+def test_correlation_cube_matches_rolling_statistics(frame):
+    drivers, series = frame
+    x = drivers.pct_change().to_numpy()
+    prices = pd.DataFrame(series).reindex(drivers.index)
+    y = prices.pct_change(fill_method=None).to_numpy()
+    corr, beta = correlation_cube(x, y, windows=(30, 90), days=50)
+
+    ret = drivers.pct_change()
+    asset_ret = prices.pct_change(fill_method=None)
+    for w, window in enumerate((30, 90)):
+        expected = ret['DXY'].rolling(window).corr(asset_ret['EARLY']).iloc[-50:]
+        np.testing.assert_allclose(corr[w, :, 1, 0], expected, atol=1e-9)
+        cov = ret['NetLiq'].rolling(window).cov(asset_ret['EARLY'])
+        expected_beta = (cov / ret['NetLiq'].rolling(window).var()).iloc[-50:]
+        np.testing.assert_allclose(beta[w, :, 0, 0], expected_beta, atol=1e-9)
+
+
+def test_cube_masks_windows_before_listing(frame):
+    drivers, series = frame
+    cube = build_screener_cube(drivers.assign(SP500=1.0), series, {}, windows=(20, 250), days=60)
+    table_short, table_long = cube.table(20), cube.table(250)
+    assert np.isfinite(table_short.loc['LATE', 'DXY 상관'])
+    # 상장 후 250 영업일이 안 되었으므로 긴 윈도우는 계산하지 않음 -> 점수도 NaN
+    assert np.isnan(table_long.loc['LATE', 'DXY 상관'])
+    assert np.isnan(table_long.loc['LATE', '점수'])
+    assert table_long.loc['EARLY', 'DXY 상관'] < -0.5
+    assert SCORE_RANGE[0] <= table_short['점수'].min() <= table_short['점수'].max() <= SCORE_RANGE[1]
+
+
+def test_correlation_cube_accepts_empty_window_list(frame):
+    """분석 기간이 모든 윈도우보다 짧으면 윈도우 축이 비어 있는 큐브 (인덱스 dtype 오류 없음)"""
+    drivers, series = frame
+    x = drivers.pct_change().to_numpy()
+    y = pd.DataFrame(series).reindex(drivers.index).pct_change(fill_method=None).to_numpy()
+    corr, beta = correlation_cube(x, y, windows=(), days=10)
+    assert corr.shape == beta.shape == (0, 10, 3, 2)
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from significance import (
+    _bootstrap_chunk, block_counts, bootstrap_rolling_bands, correlation_pvalue, fisher_interval
+)
+
+
+@pytest.fixture
+def correlated_returns():
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(300)
+    y = 0.5 * x + rng.standard_normal(300)
+    return pd.DataFrame({'x': x, 'y': y}, index=pd.bdate_range('2022-01-03', periods=300))
+
+
+def test_block_counts_draw_fixed_number_of_blocks():
+    counts = block_counts(window=60, draws=50, block=4, seed=0)
+    assert counts.shape == (50, 57)
+    np.testing.assert_array_equal(counts.sum(axis=1), 15)
+    np.testing.assert_array_equal(counts, block_counts(60, 50, 4, seed=0))
+
+
+def test_bootstrap_chunk_matches_explicit_block_resampling(correlated_returns):
+    """블록 합계 × 선택 횟수 행렬곱 = 블록을 실제로 이어 붙인 재표본의 상관계수"""
+    x, y = correlated_returns['x'].to_numpy(), correlated_returns['y'].to_numpy()
+    window, draws, block, seed = 40, 200, 3, 7
+    end = 120
+    quantiles = _bootstrap_chunk(x, y, np.array([end]), window, draws, block, seed, 0.9)[0]
+
+    rng = np.random.default_rng(seed)
+    positions = window - block + 1
+    starts = rng.integers(0, positions, size=(draws, round(window / block)))
+    first = end - window + 1
+    corrs = []
+    for row in starts:
+        rows = np.concatenate([np.arange(first + s, first + s + block) for s in row])
+        corrs.append(np.corrcoef(x[rows], y[rows])[0, 1])
+    np.testing.assert_allclose(quantiles, np.quantile(corrs, [0.05, 0.95]))
+
+
+def test_bands_bracket_rolling_correlation(correlated_returns):
+    window = 60
+    bands = bootstrap_rolling_bands(correlated_returns, {'xy': ('x', 'y')}, window, draws=300)
+    lower, upper = bands.bands['xy']
+    assert lower.iloc[:window - 1].isna().all() and lower.iloc[window - 1:].notna().all()
+    corr = correlated_returns['x'].rolling(window).corr(correlated_returns['y']).iloc[window - 1:]
+    inside = (lower.iloc[window - 1:] <= corr) & (corr <= upper.iloc[window - 1:])
+    assert inside.mean() > 0.95
+
+
+def test_executor_gives_same_bands(correlated_returns):
+    pairs = {'xy': ('x', 'y')}
+    serial = bootstrap_rolling_bands(correlated_returns, pairs, 60, draws=100)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel = bootstrap_rolling_bands(correlated_returns, pairs, 60, draws=100, executor=executor)
+    for a, b in zip(serial.bands['xy'], parallel.bands['xy']):
+        pd.testing.assert_series_equal(a, b)
+
+
+def test_fisher_interval_and_pvalue():
+    lower, upper = fisher_interval(pd.Series([0.0, 0.5]), n=60)
+    assert lower.iloc[0] == pytest.approx(-upper.iloc[0])
+    assert lower.iloc[1] < 0.5 < upper.iloc[1]
+    assert correlation_pvalue(0.0, 60) == pytest.approx(1.0)
+    assert correlation_pvalue(0.5, 60) < 0.001
+    assert np.isnan(correlation_pvalue(np.nan, 60))
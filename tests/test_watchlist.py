@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from watchlist import batch_correlation, parse_series_ids, snapshot_watchlist
+
+LISTING = 200
+
+
+@pytest.fixture
+def returns():
+    """요인 2개와 자산 2개 (LATE 는 LISTING 행부터 관측)"""
+    rng = np.random.default_rng(5)
+    x = rng.standard_normal((500, 2))
+    y = np.column_stack([
+        0.5 * x[:, 0] + rng.standard_normal(500),
+        -0.7 * x[:, 1] + rng.standard_normal(500),
+    ])
+    y[:LISTING, 1] = np.nan
+    return x, y
+
+
+def test_rolling_correlation_matches_pandas(returns):
+    x, y = returns
+    corr = batch_correlation(x, y, window=60)
+    for d in range(2):
+        for a in range(2):
+            expected = pd.Series(x[:, d]).rolling(60).corr(pd.Series(y[:, a]))
+            np.testing.assert_allclose(corr[:, d, a], expected, atol=1e-9)
+
+
+def test_ewma_ignores_rows_before_listing(returns):
+    """EWMA 는 상장 이후 관측치만으로 계산한 상관과 같아야 함 (0 으로 채운 상장 전 구간의 영향 없음)"""
+    x, y = returns
+    halflife = 30
+    corr = batch_correlation(x, y, halflife=halflife)
+    after = pd.DataFrame(x[LISTING:]).ewm(halflife=halflife, min_periods=halflife)
+    expected = after[1].corr(pd.Series(y[LISTING:, 1]))
+    np.testing.assert_allclose(corr[LISTING:, 1, 1], expected, atol=1e-9)
+    assert np.isnan(corr[:LISTING + halflife - 1, 1, 1]).all()
+    # 처음부터 관측된 자산은 전체 구간 EWMA 상관과 같음
+    full = pd.Series(x[:, 0]).ewm(halflife=halflife, min_periods=halflife).corr(pd.Series(y[:, 0]))
+    np.testing.assert_allclose(corr[:, 0, 0], full, atol=1e-9)
+
+
+def test_parse_series_ids_and_snapshot_lookup():
+    assert parse_series_ids(" djia, NASDAQ100\ndjia  gold ") == ('DJIA', 'NASDAQ100', 'GOLD')
+    series = pd.Series([1.0])
+    raw = {'watch_DJIA': series, 'btc': series}
+    assert snapshot_watchlist(raw, ('DJIA', 'GOLD')) == {'DJIA': series}
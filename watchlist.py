@@ -0,0 +1,226 @@
+# ============================================================
+# 워치리스트 일괄 분석 (Streamlit 비의존)
+# 임의 개수의 자산(FRED 시리즈 / 업로드 CSV)을 분석 캘린더에 as-of 결합하고,
+# 콤보 분석(NetLiq / DXY / HY 롤링 상관, Z-score, Divergence, 종합 점수)을
+# 자산 축을 가진 배열 연산 한 번으로 계산
+# ============================================================
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from data_loader import align_series
+from events import (
+    DIVERGENCE_HORIZON, DIVERGENCE_RECENT_DAYS, DXY_BTC_POSITIVE, DXY_BTC_STRONG_INVERSE, HY_CAUTION, HY_DANGER,
+    NETLIQ_CONTRACTION, NETLIQ_EXPANSION
+)
+from leadlag import _rolling_sum
+from registry import ASSET, SeriesSpec, watchlist_key
+
+WATCHLIST_DRIVERS = ('NetLiq', 'DXY', 'HYSpread')
+DEFAULT_WATCHLIST = ('DJIA', 'NASDAQ100', 'CBETHUSD', 'CBLTCUSD', 'DCOILWTICO')
+RECENT_DAYS = DIVERGENCE_RECENT_DAYS
+# 종합 점수 범위: 공통(NetLiq ±1, HY +1 / -2) + DXY 상관 ±1 - Divergence 1
+SCORE_RANGE = (-5, 3)
+
+
+def parse_series_ids(text):
+    """쉼표 / 공백 / 줄바꿈으로 구분한 FRED 시리즈 ID 목록 (대문자, 중복 제거, 입력 순서 유지)"""
+    ids = [token.strip().upper() for token in text.replace(',', ' ').split()]
+    return tuple(dict.fromkeys(token for token in ids if token))
+
+
+def snapshot_watchlist(raw, series_ids):
+    """스케줄러 스냅샷 raw(키 -> 전체 이력)에서 워치리스트 시리즈 {ID: Series} (없는 ID 는 제외)"""
+    return {
+        series_id: raw[watchlist_key(series_id)]
+        for series_id in series_ids
+        if watchlist_key(series_id) in raw
+    }
+
+
+def load_watchlist_csv(source, name='upload'):
+    """
+    업로드 CSV -> {이름: Series}. 첫 컬럼 = 날짜, 나머지 숫자 컬럼 = 자산 (컬럼이 하나면 name 사용)
+    """
+    frame = pd.read_csv(source)
+    if frame.shape[1] < 2:
+        raise ValueError("CSV 는 날짜 컬럼과 값 컬럼이 최소 하나씩 있어야 합니다")
+    index = pd.to_datetime(frame.iloc[:, 0])
+    values = frame.iloc[:, 1:].apply(pd.to_numeric, errors='coerce')
+    if values.shape[1] == 1:
+        values.columns = [name]
+    return {
+        str(column): pd.Series(values[column].to_numpy(), index=index).dropna().groupby(level=0).last().sort_index()
+        for column in values.columns
+    }
+
+
+def align_watchlist(series, index):
+    """{이름: Series} 를 분석 인덱스(영업일)에 as-of 결합한 프레임 (관측 전 구간은 NaN)"""
+    names = list(series)
+    specs = [SeriesSpec(name, name, name, name, '', ASSET) for name in names]
+    values = align_series([series[name].dropna() for name in names], specs, index)
+    return pd.DataFrame(values, index=index, columns=names)
+
+
+def _smoothed_mean(values, window=None, halflife=None):
+    """
+    axis=0 방향 롤링 평균 (window) 또는 EWMA 평균 (halflife), 처음 구간은 NaN.
+    EWMA 는 NaN 인 시점을 평균에서 제외하고 관측치가 halflife 개 이상일 때부터 값을 냄
+    """
+    if halflife:
+        shape = values.shape
+        flat = pd.DataFrame(values.reshape(shape[0], -1)).ewm(halflife=halflife, min_periods=int(halflife)).mean()
+        return flat.to_numpy().reshape(shape)
+    return _rolling_sum(values, window) / window
+
+
+def _correlation(mx, my, mxx, myy, mxy):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (mxy - mx * my) / np.sqrt((mxx - mx * mx) * (myy - my * my))
+
+
+def batch_correlation(x, y, window=None, halflife=None):
+    """
+    x(T, D) 와 y(T, A) 의 모든 (D, A) 쌍 롤링 상관계수 (T, D, A).
+    1차 / 2차 모멘트를 한 번에 평활하므로 자산 수와 관계없이 배열 연산 한 번
+    (표본 / 가중치 보정 계수는 분자와 분모에서 상쇄됨)
+    """
+    # 전체 평균을 먼저 빼서 2차 모멘트의 자릿수 손실을 줄임 (상관계수는 평행이동에 불변)
+    x = x - np.nanmean(x, axis=0)
+    y = y - np.nanmean(y, axis=0)
+    if halflife:
+        # EWMA 는 과거 전체에 가중치를 주므로 0 으로 채우면 상장 전 구간이 상관을 왜곡함.
+        # (요인, 자산) 쌍마다 둘 다 관측된 시점만 남기고 나머지는 NaN 으로 가려 평균에서 제외
+        valid = ~np.isnan(x)[:, :, None] & ~np.isnan(y)[:, None, :]
+        xs = np.where(valid, x[:, :, None], np.nan)
+        ys = np.where(valid, y[:, None, :], np.nan)
+        return _correlation(
+            _smoothed_mean(xs, halflife=halflife), _smoothed_mean(ys, halflife=halflife),
+            _smoothed_mean(xs * xs, halflife=halflife), _smoothed_mean(ys * ys, halflife=halflife),
+            _smoothed_mean(xs * ys, halflife=halflife),
+        )
+
+    x = np.nan_to_num(x)
+    y_valid = ~np.isnan(y)
+    y = np.where(y_valid, y, 0.0)
+    mx, my = _smoothed_mean(x, window), _smoothed_mean(y, window)
+    mxx, myy = _smoothed_mean(x * x, window), _smoothed_mean(y * y, window)
+    mxy = _smoothed_mean(x[:, :, None] * y[:, None, :], window)
+    corr = _correlation(mx[:, :, None], my[:, None, :], mxx[:, :, None], myy[:, None, :], mxy)
+    # 윈도우 전체가 관측된 시점만 사용 (상장 전 구간을 0 으로 채운 부분 제외)
+    observed = _rolling_sum(y_valid.astype(float), window) == window
+    return np.where(observed[:, None, :], corr, np.nan)
+
+
+def divergence_flags(df, values):
+    """자산 20일 상승 & HY Spread 20일 상승 (T, 자산) - 트레이딩 시그널 탭의 SP500 규칙을 자산별로"""
+    horizon = DIVERGENCE_HORIZON
+    asset_up = np.zeros(values.shape, dtype=bool)
+    asset_up[horizon:] = values[horizon:] > values[:-horizon]
+    hy = df['HYSpread'].to_numpy(dtype=float)
+    hy_up = np.zeros(len(hy), dtype=bool)
+    hy_up[horizon:] = hy[horizon:] > hy[:-horizon]
+    return asset_up & hy_up[:, None]
+
+
+def common_scores(df):
+    """모든 자산에 공통인 점수 (NetLiq 60일 변화, HY Spread 수준) (T,)"""
+    netliq_60d = df['NetLiq'].pct_change(periods=60).to_numpy() * 100
+    hy = df['HYSpread'].to_numpy(dtype=float)
+    return (
+        np.select([netliq_60d > NETLIQ_EXPANSION, netliq_60d < NETLIQ_CONTRACTION], [1, -1], 0)
+        + np.select([hy < HY_CAUTION, hy > HY_DANGER], [1, -2], 0)
+    )
+
+
+def signal_scores(common, dxy_corr, divergence):
+    """
+    자산별 종합 점수 = 공통 점수 + DXY 상관 점수 − 최근 RECENT_DAYS 일 Divergence.
+    common(..., T), dxy_corr(..., T, 자산), divergence(T, 자산) 의 앞쪽 축은 브로드캐스트 (상관이 NaN 이면 NaN)
+    """
+    # 처음 며칠도 있는 관측치만으로 판단 (events.divergence_state 와 같은 기준)
+    recent = pd.DataFrame(divergence).rolling(RECENT_DAYS, min_periods=1).max().to_numpy() > 0
+    scores = (
+        common[..., None]
+        + np.select([dxy_corr < DXY_BTC_STRONG_INVERSE, dxy_corr > DXY_BTC_POSITIVE], [1, -1], 0)
+        - recent[-dxy_corr.shape[-2]:]
+    ).astype(float)
+    scores[np.isnan(dxy_corr)] = np.nan
+    return scores
+
+
+@dataclass(frozen=True)
+class WatchlistAnalytics:
+    """워치리스트 자산 전체의 콤보 분석 (세션 간 공유, 읽기 전용)"""
+    index: pd.DatetimeIndex
+    assets: list
+    sources: dict              # 자산 -> 'FRED' / '업로드' / '기본'
+    drivers: tuple
+    prices: pd.DataFrame       # 분석 인덱스에 정렬한 가격
+    corr: np.ndarray           # (T, 요인, 자산) 일간 수익률 롤링 상관계수
+    zscores: pd.DataFrame
+    divergence: pd.DataFrame   # 자산 20일 상승 & HY Spread 20일 상승
+    scores: pd.DataFrame       # 자산별 종합 신호 점수 (시점별)
+    weighting: str
+
+    def correlations(self, driver):
+        """driver 와 각 자산의 롤링 상관계수 (열 = 자산)"""
+        return pd.DataFrame(self.corr[:, self.drivers.index(driver)], index=self.index, columns=self.assets)
+
+    def latest_correlations(self):
+        """자산 × 요인 최신 상관계수"""
+        return pd.DataFrame(self.corr[-1].T, index=self.assets, columns=[f'{d} 상관' for d in self.drivers])
+
+    def table(self):
+        """자산별 최신 지표 요약 (점수 내림차순)"""
+        prices = self.prices
+        table = pd.DataFrame({
+            '출처': pd.Series(self.sources),
+            '현재가': prices.iloc[-1],
+            '20일(%)': prices.pct_change(20, fill_method=None).iloc[-1] * 100,
+            '60일(%)': prices.pct_change(60, fill_method=None).iloc[-1] * 100,
+            'Z-score': self.zscores.iloc[-1],
+        })
+        table = table.join(self.latest_correlations())
+        table[f'Divergence (최근 {RECENT_DAYS}일)'] = self.divergence.tail(RECENT_DAYS).sum()
+        table['점수'] = self.scores.iloc[-1]
+        return table.sort_values('점수', ascending=False, kind='stable')
+
+
+def compute_watchlist(df, series, sources, window, halflife=None):
+    """
+    df(분석 프레임)의 NetLiq, DXY, HYSpread 를 기준으로 series({이름: Series}) 전체를 한 번에 분석.
+    종합 점수는 트레이딩 시그널 탭 규칙에 DXY 상관 / Divergence 만 자산별로 적용
+    """
+    prices = align_watchlist(series, df.index)
+    prices = prices.loc[:, prices.notna().any()]
+    assets = list(prices.columns)
+    values = prices.to_numpy(dtype=float)
+
+    # 첫 행의 수익률은 NaN 이므로 첫 행을 포함한 윈도우는 결과에서 제외됨
+    corr = batch_correlation(
+        df[list(WATCHLIST_DRIVERS)].pct_change().to_numpy(dtype=float),
+        prices.pct_change(fill_method=None).to_numpy(dtype=float),
+        window, halflife
+    )
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        zscores = (values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0, ddof=1)
+
+    divergence = divergence_flags(df, values)
+    scores = signal_scores(common_scores(df), corr[:, WATCHLIST_DRIVERS.index('DXY')], divergence)
+
+    return WatchlistAnalytics(
+        index=df.index,
+        assets=assets,
+        sources={asset: sources.get(asset, 'FRED') for asset in assets},
+        drivers=WATCHLIST_DRIVERS,
+        prices=prices,
+        corr=corr,
+        zscores=pd.DataFrame(zscores, index=df.index, columns=assets),
+        divergence=pd.DataFrame(divergence, index=df.index, columns=assets),
+        scores=pd.DataFrame(scores, index=df.index, columns=assets),
+        weighting=f"EWMA 반감기 {halflife}일" if halflife else f"{window}일 롤링",
+    )